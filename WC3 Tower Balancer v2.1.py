@@ -1,3719 +1,3342 @@
-import customtkinter as ctk
-from tkinter import filedialog, messagebox, Text
-import tkinter as tk
-import pandas as pd
-import numpy as np
-import math
-import threading
-import logging
-from scipy import stats  # Added for Z-Score and Percent Rank calculations
-
-## Color locator:
-    ## Backgrounds: General (#333333), Click Focus (#7abdf5), Hover Focus (#6897bb), Result Window (#2E2E2E / #151924)
-    ## Text: Result Header (#00FFFF), Outlier Analysis (#FFFF00), Outlier Tower (#00CED1), Outlier Balance Range Reference (#00FF00), Tower Header Highlight (#FFC107)
-
-# Calculation function code as a string
-calculate_dps_per_gold_code = '''
-import math
-
-def calculate_dps_per_gold(
-    base_damage, dice, sides_per_die, cooldown, range_val,
-    full_splash, medium_splash, small_splash, gold_cost,
-    spell_dps=0, spell_dps_cooldown=1, poison=False,
-    utility_boost=1.0, slow_percentage=0, poison_duration=1,
-    slow_duration=3, enemy_speed=415, target_type='All',
-    include_splash=True,
-    unit_density=64 
-):
-    """
-    Calculate Total DPS and DPS per Gold for a tower in Wintermaul Wars.
-
-    Parameters:
-        base_damage (float): Base damage of the tower.
-        dice (int): Number of dice rolled for damage.
-        sides_per_die (int): Number of sides per die.
-        cooldown (float): Time between attacks in seconds.
-        range_val (float): Attack range of the tower.
-        full_splash (float): Radius for full splash damage.
-        medium_splash (float): Radius for medium splash damage.
-        small_splash (float): Radius for small splash damage.
-        gold_cost (float): Gold cost of the tower.
-        spell_dps (float, optional): DPS from spells. Defaults to 0.
-        spell_dps_cooldown (float, optional): Cooldown for spell DPS. Defaults to 1.
-        poison (bool, optional): Whether poison is applied. Defaults to False.
-        utility_boost (float, optional): Utility boost multiplier. Defaults to 1.0.
-        slow_percentage (float, optional): Slow percentage applied. Defaults to 0.
-        poison_duration (float, optional): Duration of poison effect. Defaults to 1.
-        slow_duration (float, optional): Duration of slow effect. Defaults to 3.
-        enemy_speed (float, optional): Speed of the enemy. Defaults to 415.
-        target_type (str, optional): Target type. Defaults to 'All'.
-        include_splash (bool, optional): Whether to include splash damage. Defaults to True.
-        unit_density (float, optional): Approximates unit density in splash damage to be one unit (number is grid radius)
-
-    Returns:
-        tuple: (Total DPS, DPS per Gold)
-    """
-
-    # Calculate average damage per hit
-    avg_damage = base_damage + (dice * (sides_per_die + 1) / 2)
-
-    # Calculate hits per second
-    hits_per_second = 1 / cooldown
-
-    # Polynomial Range Modifier
-    def polynomial_range_modifier(range_val, n=1.0, max_range=2300):
-        normalized_range = (range_val - 200) / (max_range - 200)
-        normalized_range = max(0, min(normalized_range, 1))  # Clamp to [0,1]
-        return 1 + normalized_range ** n
-
-    range_adjustment = polynomial_range_modifier(range_val)
-
-    # Splash Damage Calculation
-    def calculate_splash_damage(avg_damage, full_splash, medium_splash, small_splash, unit_density):
-        """
-        Calculate the total splash damage based on splash radii and unit density.
-
-        Parameters:
-            avg_damage (float): Average damage per hit.
-            full_splash (float): Full splash radius.
-            medium_splash (float): Medium splash radius.
-            small_splash (float): Small splash radius.
-            unit_density (float): Approximates unit density by grid radius
-
-        Returns:
-            float: Total splash damage from a single hit.
-        """
-
-        # Define splash tiers with their respective radii and multipliers
-        all_splash_tiers = [
-            ('full', full_splash, 1.0),
-            ('medium', medium_splash, 0.5),
-            ('small', small_splash, 0.25)
-        ]
-
-        # Filter out splash tiers that are smaller than higher priority tiers
-        # Only include medium_splash if it's >= full_splash
-        # Only include small_splash if it's >= medium_splash and >= full_splash
-        filtered_splash_tiers = []
-
-        # Always include full_splash if it's greater than 0
-        if full_splash > 0:
-            filtered_splash_tiers.append(('full', full_splash, 1.0))
-
-        # Include medium_splash only if it's >= full_splash
-        if medium_splash >= full_splash and medium_splash > 0:
-            filtered_splash_tiers.append(('medium', medium_splash, 0.5))
-
-        # Include small_splash only if it's >= medium_splash and >= full_splash
-        if small_splash >= medium_splash and small_splash >= full_splash and small_splash > 0:
-            filtered_splash_tiers.append(('small', small_splash, 0.25))
-
-        # Sort the filtered splash tiers in ascending order based on radius
-        # This ensures that higher damage tiers (smaller radii) are processed first
-        sorted_splash_tiers = sorted(filtered_splash_tiers, key=lambda x: x[1])
-
-        total_splash_damage = 0.0
-        previous_radius = 0.0
-
-        for tier_name, radius, multiplier in sorted_splash_tiers:
-            if radius <= previous_radius:
-                continue  # Skip if current radius is not greater than previous
-
-            # Calculate units in current tier excluding units in inner tiers
-            units_in_tier = (radius - previous_radius) / unit_density
-
-            units_in_tier = max(units_in_tier, 0)  # Prevent negative units
-
-            # Calculate splash damage for this tier
-            damage = units_in_tier * multiplier * avg_damage
-            total_splash_damage += damage
-
-            # Update previous_radius for the next tier
-            previous_radius = radius
-
-        return total_splash_damage
-
-    # Adjust average damage per hit with splash
-    if include_splash and (full_splash > 0 or medium_splash > 0 or small_splash > 0):
-        splash_damage = calculate_splash_damage(avg_damage, full_splash, medium_splash, small_splash, unit_density)
-        avg_damage_with_splash = avg_damage + splash_damage  # Total damage per hit including splash
-    else:
-        splash_damage = 0.0
-        avg_damage_with_splash = avg_damage
-
-    # Calculate base DPS (damage per second)
-    base_dps = avg_damage_with_splash * hits_per_second
-
-    # Apply range adjustment
-    range_adjusted_dps = base_dps * range_adjustment
-
-    # Add Spell DPS (if provided)
-    if spell_dps and spell_dps_cooldown > 0:
-        special_dps = spell_dps / spell_dps_cooldown
-    else:
-        special_dps = 0
-
-    # Adjusted Poison Effect
-    if poison:
-        poison_dps = 5
-        total_poison_damage = poison_dps * poison_duration
-        poison_dps_contribution = total_poison_damage / poison_duration
-        special_dps += poison_dps_contribution
-
-        # Calculate additional hits due to slow effect from poison
-        effective_speed = enemy_speed * (1 - 0.3)   # slow by 30%
-        # Calculate extra time in range due to slow
-        slow_factor = 1 / (1 - 0.3)
-        extra_time_poison = slow_duration * (slow_factor - 1)
-        additional_hits_poison = extra_time_poison * hits_per_second
-        special_dps += (additional_hits_poison * avg_damage) / slow_duration
-
-    # Enhanced Slow Effect
-    if slow_percentage > 0:
-        effective_speed = enemy_speed * (1 - slow_percentage / 100)
-        # Avoid division by zero or negative speed
-        if effective_speed <= 0:
-            effective_speed = 1  # Or handle as complete immobilization
-
-        # Calculate the factor by which slow increases time in range
-        slow_factor = 1 / (1 - slow_percentage / 100)
-
-        # Extra time exposed due to slow
-        extra_time = slow_duration * (slow_factor - 1)
-
-        # Additional hits during the extra time
-        additional_hits = extra_time * hits_per_second
-
-        # Additional damage per second from the slow
-        slow_dps_contribution = (additional_hits * avg_damage) / slow_duration
-    else:
-        slow_dps_contribution = 0
-
-    # Total DPS before utility boost
-    total_dps = range_adjusted_dps + special_dps + slow_dps_contribution
-
-    # Apply utility boost
-    total_dps *= utility_boost
-
-    # Calculate DPS per Gold using linear scaling
-    dps_per_gold = (total_dps / gold_cost) * 100
-
-    return total_dps, dps_per_gold
-
-'''
-
-class Tooltip(object):
-    def __init__(self, widget, text='widget info'):
-        self.waittime = 2000     # milliseconds
-        self.wraplength = 250   # pixels
-        self.widget = widget
-        self.text = text
-        self.widget.bind("<Enter>", self.enter)
-        self.widget.bind("<Leave>", self.leave)
-        self.widget.bind("<ButtonPress>", self.leave)
-        self.id = None
-        self.tw = None
-        self.result_labels = []
-
-    def enter(self, event=None):
-        self.schedule()
-    def leave(self, event=None):
-        self.unschedule()
-        self.hidetip()
-    def schedule(self):
-        self.unschedule()
-        self.id = self.widget.after(self.waittime, self.showtip)
-    def unschedule(self):
-        id = self.id
-        self.id = None
-        if id:
-            self.widget.after_cancel(id)
-    def showtip(self, event=None):
-        x = y = 0
-        x_left, y_top, x_right, y_bottom = self.widget.bbox("insert")
-        x += self.widget.winfo_rootx() + x_right + 10
-        y += self.widget.winfo_rooty() + y_bottom + 10
-        # creates a toplevel window
-        self.tw = ctk.CTkToplevel(self.widget)
-        self.tw.overrideredirect(True)  # removes the window decorations
-        self.tw.geometry(f"+{x}+{y}")
-        self.tw.attributes("-topmost", True)  # Ensures tooltip is on top
-        label = ctk.CTkLabel(self.tw, text=self.text, justify='left',
-                             fg_color='lightyellow', corner_radius=4,
-                             text_color='black', wraplength=self.wraplength)
-        label.pack(ipadx=1)
-    def hidetip(self):
-        tw = self.tw
-        self.tw= None
-        if tw:
-            tw.destroy()
-
-class TowerApp:
-    def __init__(self, root):
-        super().__init__()
-        self.root = root
-        self.root.title("Warcraft 3 Tower Balancer by Aphotica (Discord: https://discord.gg/Qsg6UDn)")
-        self.root.geometry("1455x910")  # Expanded width by 100 pixels
-        self.root.resizable(False, True)
-        self.validation_errors = False
-        self.outlier_analysis_segments = []
-        self.imported_df = pd.DataFrame()
-        self.original_imported_df = pd.DataFrame()
-        self.balance_ranges = {}
-        self.global_dps_per_gold_ranges = {}
-        self.global_raw_dps_ranges = {}
-        self.outlier_analysis_segments = []
-        self.changes_report = []
-        self.typing_timer = None
-        self.calculate_all_after_id = None # debounce mechanism using after_cancel and after to ensure calculate_all is not called excessively to prevent input lag
-        self.importing_window = None
-        
-
-        # Register the validation function to allow only letters
-        #self.validate_alpha = self.root.register(self.only_letters)
-
-        # Set the appearance mode and color theme
-        ctk.set_appearance_mode("dark")  # Options: "light", "dark", "system"
-        ctk.set_default_color_theme("blue")  # Options: "blue", "green", "dark-blue"
-
-        self.window_tracker = {
-            'algorithm_editor': None,
-            'dynamic_algorithm': None,
-            'analysis': None,
-            'help': None
-        }
-
-        self.focused_row = None
-
-        self.towers = []
-        self.balance_ranges = {}  # Will be dynamically calculated
-        self.global_dps_per_gold_ranges = {}  # For storing global DPS/Gold ranges
-        self.global_raw_dps_ranges = {}  # For storing global Raw DPS ranges
-
-        # Target type balance adjustments
-        self.target_type_balance_adjustments = {
-            'All': (1.0, 1.0),  # (Low adjustment, High adjustment)
-            'Ground Splash': (0.8, 1.25),
-            'Air Splash': (0.8, 1.25),
-        }
-
-        # Preset balance ranges
-        self.preset_balance_ranges = {
-            1: (225, 325),
-            2: (125, 175),
-            3: (100, 125),
-            4: (50, 75),
-            5: (25, 30),
-            6: (15, 25),
-            7: (10, 15),
-            8: (5, 10),
-            9: (3, 5),
-            10: (1, 3),
-            11: (0.5, 1),
-            12: (0.5, 1)
-        }
-
-        # Store the source code as a string
-        self.source_code = ''
-
-        # Initialize calculation function from code string
-        self.calc_function_code = calculate_dps_per_gold_code
-        exec_globals = {}
-        exec(self.calc_function_code, exec_globals)
-        self.calculate_dps_per_gold = exec_globals['calculate_dps_per_gold']
-
-        # Desired canvas height to fit 11 towers without scrolling
-        self.desired_canvas_height = None
-
-        self.imported_df = pd.DataFrame()  # For storing imported data
-        self.original_imported_df = pd.DataFrame()  # For storing original imported data
-
-        self.setup_ui()
-
-        # Bind keys 0-9 to call calculate_all
-        for i in range(10):  # for keys 0 to 9
-            self.root.bind(f"<Key-{i}>", self.on_key_press)
-        self.root.bind('<Delete>', self.on_key_press)
-        self.root.bind('<BackSpace>', self.on_key_press)
-        self.root.bind('<Return>', self.on_enter_pressed) 
-
-    def on_key_press(self, event):
-        # Cancel any previously set timer if a new key is pressed
-        if self.typing_timer:
-            self.typing_timer.cancel()
-
-        # Set a new timer to call calculate_all after a delay (e.g., 500ms)
-        self.typing_timer = threading.Timer(1, self.run_calculate_all)
-        self.typing_timer.start()
-
-    def on_enter_pressed(self, event):
-        """
-        Checks if there are validation errors before running calculations.
-        If validation errors exist, only acknowledges the error message without running calculations.
-        """
-        if self.validation_errors:
-            self.show_validation_error_message()  # Show error message and skip calculation
-            self.validation_errors = False  # Reset error flag after displaying message
-        else:
-            self.calculate_all()  # Run calculations if no errors
-
-    def set_focused_row(self, row_frame):
-        """
-        Sets the given row_frame as the focused row and updates the background colors accordingly.
-        Resets the background of the previously focused row if it's different from the current one.
-        """
-        if self.focused_row and self.focused_row != row_frame:
-            try:
-                if self.focused_row.winfo_exists():
-                    self.focused_row.configure(fg_color="#1c1c1c")  # Reset previous row's background
-            except tk.TclError:
-                pass  # The focused row no longer exists
-
-        self.focused_row = row_frame
-        try:
-            if self.focused_row.winfo_exists():
-                self.focused_row.configure(fg_color="#7abdf5")  # Set current row's background to light blue
-        except tk.TclError:
-            self.focused_row = None  # Reset if the frame no longer exists
-
-    def only_letters(self, proposed_text):
-        """
-        Validates that the proposed_text contains only alphabetic characters and allowed symbols.
-        Allowed symbols can include space and hyphen.
-        """
-        allowed_symbols = " -"
-        for char in proposed_text:
-            if not (char.isalpha() or char in allowed_symbols):
-                return False
-        return True
-    
-    def setup_ui(self):
-        self.main_frame = ctk.CTkFrame(self.root)
-        self.main_frame.pack(fill=ctk.BOTH, expand=True)
-
-        # Register the validation function
-        vcmd = (self.root.register(self.only_letters), '%P')  # '%P' passes the proposed value of the entry
-
-        # Configure grid layout for main_frame
-        self.main_frame.grid_rowconfigure(1, weight=1)
-        self.main_frame.grid_columnconfigure(0, weight=1)
-
-        # Header Frame (Separate from towers)
-        header_frame = ctk.CTkFrame(self.main_frame)
-        header_frame.grid(row=0, column=0, sticky='ew', padx=10, pady=5)
-        header_frame.grid_columnconfigure(0, weight=1)
-
-        # Left side of header (Race Entry and Combobox)
-        race_frame = ctk.CTkFrame(header_frame)
-        race_frame.pack(side=ctk.LEFT, padx=(0, 20))
-
-        race_label = ctk.CTkLabel(race_frame, text="Race:")
-        race_label.grid(row=1, column=0, padx=(0,5), pady=2)
-
-        self.race_entry = ctk.CTkEntry(race_frame, width=200, validate='key', validatecommand=vcmd)
-        self.race_entry.grid(row=1, column=1, padx=(0,10), pady=2)
-
-        # Race selection Combobox with increased width
-        self.race_combobox = ctk.CTkComboBox(race_frame, values=[], state='readonly', command=self.on_race_selected, width=200)
-        self.race_combobox.set('Select Race')  # Show 'Select Race' if no race is selected
-        self.race_combobox.grid(row=0, column=1, padx=(0,10), pady=2)
-
-        # Export and Import buttons in a frame
-        export_import_frame = ctk.CTkFrame(header_frame)
-        export_import_frame.pack(side=ctk.LEFT, padx=(0, 20))
-
-        self.export_button = ctk.CTkButton(export_import_frame, text="Export", command=self.export_data)
-        self.export_button.pack(side=ctk.LEFT, padx=5)
-
-        self.import_button = ctk.CTkButton(export_import_frame, text="Import", command=self.import_data)
-        self.import_button.pack(side=ctk.LEFT, padx=5)
-
-        # Dynamic Comparison Checkbox
-        self.dynamic_comparison_var = ctk.BooleanVar(value=True)
-        self.dynamic_comparison_chk = ctk.CTkCheckBox(header_frame, text="Dynamic Comparison",
-                                                    variable=self.dynamic_comparison_var, command=self.calculate_all)
-        self.dynamic_comparison_chk.pack(side=ctk.LEFT, padx=5)
-
-        # Ignore Outliers Checkbox
-        self.ignore_outliers_var = ctk.BooleanVar(value=True)
-        self.ignore_outliers_chk = ctk.CTkCheckBox(header_frame, text="Ignore Outliers",
-                                                variable=self.ignore_outliers_var, command=self.calculate_all)
-        self.ignore_outliers_chk.pack(side=ctk.LEFT, padx=5)
-
-        # Options Button on the far right
-        options_frame = ctk.CTkFrame(header_frame)
-        options_frame.pack(side=ctk.RIGHT, padx=(0,10))
-
-        self.options_button = ctk.CTkButton(options_frame, text="Options", command=self.open_options_window)
-        self.options_button.pack(side=ctk.LEFT, padx=5)
-
-        # Towers Frame Container (Separate from headers)
-        towers_frame_container = ctk.CTkFrame(self.main_frame)
-        towers_frame_container.grid(row=1, column=0, sticky='nsew', padx=10, pady=5)
-        towers_frame_container.grid_rowconfigure(1, weight=1)
-        towers_frame_container.grid_columnconfigure(0, weight=1)
-
-        # Towers Header Frame (Separate headers from tower data)
-        towers_header_frame = ctk.CTkFrame(towers_frame_container)
-        towers_header_frame.grid(row=0, column=0, sticky='ew')
-        # Call create_headers before configuring columns that depend on self.headers
-        self.create_headers(towers_header_frame)
-        towers_header_frame.grid_columnconfigure(len(self.headers)-1, weight=1)
-
-        # Towers Frame with Scrollbar
-        self.towers_canvas = ctk.CTkCanvas(towers_frame_container, bg='#1c1c1c', highlightthickness=0)
-        self.towers_canvas.grid(row=1, column=0, sticky='nsew')
-
-        towers_scrollbar = ctk.CTkScrollbar(towers_frame_container, orientation=ctk.VERTICAL, command=self.towers_canvas.yview)
-        towers_scrollbar.grid(row=1, column=1, sticky='ns')
-
-        self.towers_canvas.configure(yscrollcommand=towers_scrollbar.set)
-
-        self.towers_frame = ctk.CTkFrame(self.towers_canvas, fg_color='#1c1c1c')
-        self.towers_canvas.create_window((0, 0), window=self.towers_frame, anchor='nw')
-
-        # Update scrollregion when towers_frame is resized
-        self.towers_frame.bind("<Configure>", self.on_towers_frame_configure)
-
-        # Bind scroll wheel only to the towers canvas
-        self.towers_canvas.bind("<Enter>", lambda e: self.towers_canvas.bind_all("<MouseWheel>", self._on_mousewheel))
-        self.towers_canvas.bind("<Leave>", lambda e: self.towers_canvas.unbind_all("<MouseWheel>"))
-
-        # Create initial towers
-        for _ in range(11):
-            self.add_tower()
-
-        # Buttons at the bottom
-        bottom_button_frame = ctk.CTkFrame(self.main_frame)
-        bottom_button_frame.grid(row=2, column=0, sticky='ew', padx=10, pady=5)
-        bottom_button_frame.grid_columnconfigure(0, weight=1)
-
-        self.calculate_button = ctk.CTkButton(bottom_button_frame, text="Calculate All", command=self.calculate_all)
-        self.calculate_button.pack(side=ctk.LEFT, padx=5)
-
-        # Clear All button
-        self.clear_all_button = ctk.CTkButton(bottom_button_frame, text="Clear All", command=self.clear_all_towers)
-        self.clear_all_button.pack(side=ctk.RIGHT, padx=5)
-
-        self.delete_tower_button = ctk.CTkButton(bottom_button_frame, text="Delete Tower", command=self.delete_last_tower)
-        self.delete_tower_button.pack(side=ctk.RIGHT, padx=5)
-        
-        self.add_tower_button = ctk.CTkButton(bottom_button_frame, text="Add Tower", command=self.add_tower)
-        self.add_tower_button.pack(side=ctk.RIGHT, padx=5)
-
-        # Result Text with Scrollbar (Adjusted height for 16 towers)
-        result_frame = ctk.CTkFrame(self.main_frame)
-        result_frame.grid(row=3, column=0, sticky='nsew', padx=10, pady=10)
-        result_frame.grid_rowconfigure(0, weight=1)
-        result_frame.grid_columnconfigure(0, weight=1)
-
-        self.result_text = tk.Text(result_frame, height=16, wrap='none', bg='#2E2E2E', font=("Consolas", 11))  # Changed height from 20 to 16
-        self.result_text.grid(row=0, column=0, sticky='nsew')
-
-        result_scrollbar = ctk.CTkScrollbar(result_frame, orientation=ctk.VERTICAL, command=self.result_text.yview)
-        self.result_text.configure(yscrollcommand=result_scrollbar.set)
-        result_scrollbar.grid(row=0, column=1, sticky='ns')
-
-        # Configure text widget tags for coloring
-        self.result_text.tag_configure("green", foreground="#00D1A0")
-        self.result_text.tag_configure("red", foreground="#FF4C4C")
-        self.result_text.tag_configure("yellow", foreground="#FFFF00")  # Added for yellow color
-        self.result_text.tag_configure("blue", foreground="#00CED1")  # For tower numbers
-        self.result_text.tag_configure("header", foreground="blue", font=("Helvetica", 12, "bold"))
-        self.result_text.tag_configure("outlier_header", foreground="#FFFF00", font=("Helvetica", 12, "bold"))
-
-        # Make the result_text read-only
-        self.result_text.configure(state=tk.DISABLED)
-
-    def bind_mousewheel(self, widget):
-        """
-        Binds mouse wheel events to the given widget for scrolling.
-
-        Parameters:
-            widget (tk.Canvas): The canvas widget to bind the scroll events to.
-        """
-        # Windows and MacOS
-        widget.bind("<Enter>", lambda e: self._bind_to_mousewheel(widget))
-        widget.bind("<Leave>", lambda e: self._unbind_from_mousewheel(widget))
-
-    def _bind_to_mousewheel(self, widget):
-        """
-        Binds the appropriate mouse wheel events based on the operating system.
-        """
-        system = self.root.tk.call('tk', 'windowingsystem')
-        if system == 'aqua':  # macOS
-            widget.bind_all("<MouseWheel>", self.on_mousewheel)
-        elif system == 'x11':  # Linux
-            widget.bind_all("<Button-4>", self.on_mousewheel)
-            widget.bind_all("<Button-5>", self.on_mousewheel)
-        else:  # Windows
-            widget.bind_all("<MouseWheel>", self.on_mousewheel)
-
-    def _unbind_from_mousewheel(self, widget):
-        """
-        Unbinds the mouse wheel events based on the operating system.
-        """
-        system = self.root.tk.call('tk', 'windowingsystem')
-        if system == 'aqua':  # macOS
-            widget.unbind_all("<MouseWheel>")
-        elif system == 'x11':  # Linux
-            widget.unbind_all("<Button-4>")
-            widget.unbind_all("<Button-5>")
-        else:  # Windows
-            widget.unbind_all("<MouseWheel>")
-
-    def on_mousewheel(self, event):
-        """
-        Handles mouse wheel events for scrolling the canvas.
-
-        Parameters:
-            event (tk.Event): The mouse wheel event.
-        """
-        system = self.root.tk.call('tk', 'windowingsystem')
-        if system == 'aqua' or system == 'win32':  # macOS or Windows
-            delta = int(-1 * (event.delta / 120))
-            self.generate_tooltips_canvas.yview_scroll(delta, "units")
-        elif system == 'x11':  # Linux
-            if event.num == 4:
-                self.generate_tooltips_canvas.yview_scroll(-1, "units")
-            elif event.num == 5:
-                self.generate_tooltips_canvas.yview_scroll(1, "units")
-
-
-
-    def start_tab_monitoring(self, tabview):
-        """
-        Starts the periodic check to monitor tab changes for a given tabview.
-        """
-        self.last_selected_tab = tabview.get()
-        self.current_monitored_tabview = tabview
-        self.check_tab_change()
-
-    def check_tab_change(self):
-        """
-        Checks if the selected tab has changed in the monitored tabview.
-        If "View Changes" tab is selected, runs calculate_all.
-        """
-        if hasattr(self, 'current_monitored_tabview') and self.current_monitored_tabview.winfo_exists():
-            current_tab = self.current_monitored_tabview.get()
-            if current_tab != self.last_selected_tab:
-                self.last_selected_tab = current_tab
-                if current_tab == "View Changes":
-                    self.calculate_all()
-        # Schedule the next check after 1000 milliseconds
-        self.root.after(1000, self.check_tab_change)
-
-    def open_options_window(self):
-        if self.window_tracker.get('options_window') is not None:
-            try:
-                self.window_tracker['options_window'].lift()
-                self.window_tracker['options_window'].focus_force()
-            except tk.TclError:
-                self.window_tracker['options_window'] = None
-        if self.window_tracker.get('options_window') is None:
-            options_win = ctk.CTkToplevel(self.root)
-            self.window_tracker['options_window'] = options_win
-            options_win.title("Options")
-            # Set options window size to match main window height
-            main_height = self.root.winfo_height()
-            options_win.geometry(f"800x{main_height}")
-            options_win.resizable(True, True)
-
-            # Position the options window to the right of the main window
-            main_x = self.root.winfo_x()
-            main_y = self.root.winfo_y()
-            main_width = self.root.winfo_width()
-            options_x = main_x + main_width + 10  # 10 pixels gap
-            options_win.geometry(f"+{options_x}+{main_y}")
-
-            # Bind the destroy event to reset the tracker when the window is closed
-            options_win.protocol("WM_DELETE_WINDOW", lambda: self.close_window('options_window', options_win))
-            options_win.bind("<Escape>", lambda event: self.close_window('options_window', options_win))
-
-            # Create the tab view
-            tabview = ctk.CTkTabview(options_win)
-            tabview.pack(fill='both', expand=True)
-
-            # Initialize a list to keep track of tab names
-            self.options_tab_names = []
-
-            # Add existing tabs and track their names
-            tabs_to_add = ["Analysis", "Help", "Algorithm", "Dynamic Algorithm", "View Changes", "Generate Tooltips"]
-            for tab_name in tabs_to_add:
-                tabview.add(tab_name)
-                self.options_tab_names.append(tab_name)
-                if tab_name == "Generate Tooltips":
-                    self.generate_tooltips_tab = tabview.tab(tab_name)
-                    self.create_generate_tooltips_tab(self.generate_tooltips_tab)
-                else:
-                    # Implement content for other tabs
-                    if tab_name == "Help":
-                        self.create_help_tab(tabview.tab(tab_name))
-                    elif tab_name == "Algorithm":
-                        self.create_algorithm_tab(tabview.tab(tab_name))
-                    elif tab_name == "Dynamic Algorithm":
-                        self.create_dynamic_algorithm_tab(tabview.tab(tab_name))
-                    elif tab_name == "Analysis":
-                        self.create_analysis_tab(tabview.tab(tab_name))
-                    elif tab_name == "View Changes":
-                        self.create_view_changes_tab(tabview.tab(tab_name))
-
-            # After creating the tabview
-            self.start_tab_monitoring(tabview)
-
-
-
-    def create_generate_tooltips_tab(self, parent):
-        """
-        Creates the "Generate Tooltips" tab within the Options window.
-        Each tower has a text box displaying its tooltip and a copy button.
-        """
-        # Main frame for the tab with scrollable functionality
-        generate_tooltips_frame = ctk.CTkFrame(parent)
-        generate_tooltips_frame.pack(fill=ctk.BOTH, expand=True, padx=10, pady=10)
-
-        # Create a canvas and scrollbar for scrolling through towers
-        self.generate_tooltips_canvas = ctk.CTkCanvas(generate_tooltips_frame, bg='#1c1c1c', highlightthickness=0)
-        scrollbar = ctk.CTkScrollbar(generate_tooltips_frame, orientation=ctk.VERTICAL, command=self.generate_tooltips_canvas.yview)
-        self.scrollable_frame = ctk.CTkFrame(self.generate_tooltips_canvas, fg_color='#1c1c1c')
-
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.generate_tooltips_canvas.configure(
-                scrollregion=self.generate_tooltips_canvas.bbox("all")
-            )
-        )
-
-        self.generate_tooltips_canvas.create_window((0, 0), window=self.scrollable_frame, anchor='nw')
-        self.generate_tooltips_canvas.configure(yscrollcommand=scrollbar.set)
-
-        self.generate_tooltips_canvas.pack(side=ctk.LEFT, fill=ctk.BOTH, expand=True)
-        scrollbar.pack(side=ctk.RIGHT, fill=ctk.Y)
-
-        # Bind mouse wheel events to the canvas for scrolling
-        self.bind_mousewheel(self.generate_tooltips_canvas)
-
-        # Store references to tooltip widgets for updating
-        self.tooltip_widgets = []
-
-        # Initialize tooltips for existing towers
-        self.update_generate_tooltips()
-
-
-
-    def update_generate_tooltips(self):
-        """
-        Populates the "Generate Tooltips" tab with tooltip information for each tower.
-        Each tower has a label, a read-only text box, and a copy button.
-        """
-        if not hasattr(self, 'scrollable_frame'):
-            print("Scrollable frame not found. Cannot update tooltips.")
-            return
-
-        # Clear existing tooltip widgets
-        for widget in self.tooltip_widgets:
-            widget.destroy()
-        self.tooltip_widgets.clear()
-
-        for idx, tower in enumerate(self.towers, start=1):
-            # Create a frame for each tower's tooltip
-            tower_frame = ctk.CTkFrame(self.scrollable_frame, fg_color='#2E2E2E', corner_radius=8)
-            tower_frame.pack(fill=ctk.X, pady=5, padx=5)
-
-            # Tower Name Label
-            tower_name = tower['Name'].get().strip() or f"Tower {idx}"
-            tower_label = ctk.CTkLabel(tower_frame, text=f"{idx}. {tower_name}", font=("Arial", 12, "bold"), text_color="#FFC107")
-            tower_label.pack(anchor='w', padx=10, pady=(10, 0))
-
-            # Tooltip Text Box
-            tooltip_text = self.generate_tooltip_text(tower)
-            text_box = ctk.CTkTextbox(tower_frame, height=75, width=700, wrap='word', fg_color='#151924', text_color='white', state='disabled')
-            text_box.pack(fill=ctk.BOTH, expand=True, padx=10, pady=5)
-            text_box.configure(state='normal')
-            text_box.insert("1.0", tooltip_text)
-            text_box.configure(state='disabled') # remove to make the tooltips 'read-only'. On by default to prevent errors.
-
-            # Copy Button
-            copy_button = ctk.CTkButton(tower_frame, text="Copy", width=80, command=lambda txt=tooltip_text: self.copy_to_clipboard(txt))
-            copy_button.pack(anchor='e', padx=10, pady=(0, 10))
-
-            # Store the frame for future updates
-            self.tooltip_widgets.append(tower_frame)
-
-        # After updating tooltips, ensure the canvas scrollregion is updated
-        self.generate_tooltips_canvas.configure(scrollregion=self.generate_tooltips_canvas.bbox("all"))
-
-
-
-    def generate_tooltip_text(self, tower):
-        """
-        Generates the tooltip text for a given tower based on its attributes.
-        
-        Parameters:
-            tower (dict): Dictionary containing tower widgets and variables.
-        
-        Returns:
-            str: Formatted tooltip text with color codes.
-        """
-        try:
-            # Extract and calculate necessary values
-            base_damage = float(tower['Damage'].get() or 0)
-            dice = int(float(tower['Dice'].get() or 0))
-            sides = int(float(tower['Sides'].get() or 0))
-            cooldown = float(tower['Cooldown'].get() or 1)
-            utility_boost = float(tower['Utility Boost'].get() or 1.0)
-            range_val = float(tower['Range'].get() or 0)
-            full_splash = float(tower['Full Splash'].get() or 0)
-            med_splash = float(tower['Med Splash'].get() or 0)
-            small_splash = float(tower['Small Splash'].get() or 0)
-            target_type = tower['Target Type'].get()
-
-            # Calculate average DPS
-            avg_damage = base_damage + (dice * (sides + 1) / 2)
-            hits_per_second = 1 / cooldown
-            average_dps = avg_damage * hits_per_second * utility_boost
-
-            # Round DPS if needed
-            average_dps = round(average_dps, 2) if average_dps < 1 else round(average_dps)
-
-            # Round Range if needed
-            range_val = round(range_val, 2) if range_val < 1 else round(range_val)
-
-            # Handle Splash Radii: set missing values to 0 without decimals
-            full_splash = int(full_splash) if full_splash else 0
-            med_splash = int(med_splash) if med_splash else 0
-            small_splash = int(small_splash) if small_splash else 0
-            splash_display = (
-                f"{full_splash} - {med_splash} - {small_splash}" 
-                if any([full_splash, med_splash, small_splash]) 
-                else "None"
-            )
-
-            # Determine Splash Target Line
-            splash_target_line = ""
-            if target_type in ["Air Splash", "Ground Splash"]:
-                splash_target = "Air" if "Air" in target_type else "Ground"
-                splash_target_line = f"|n|cff00adffSplash Target:|r {splash_target}"
-
-            # Format the tooltip text with color codes
-            tooltip = (
-                f"|cffff0000DPS:|r {average_dps} |n"
-                f"|cffff8000Range:|r {range_val} |n"
-                f"|cff00ff00Speed:|r {cooldown} seconds|n"  # Display cooldown with decimal
-                f"|cffffff00Splash Zones:|r {splash_display}"
-            )
-
-            if splash_target_line:
-                tooltip += splash_target_line
-
-            return tooltip
-        except Exception as e:
-            print(f"Error generating tooltip: {e}")
-            return "Error generating tooltip."
-
-
-    def copy_to_clipboard(self, text):
-        """
-        Copies the given text to the system clipboard.
-        
-        Parameters:
-            text (str): The text to be copied.
-        """
-        self.root.clipboard_clear()
-        self.root.clipboard_append(text)
-        self.show_centered_message("Tooltip text has been copied to the clipboard.")
-
-
-    def create_help_tab(self, parent):
-        help_text_frame = ctk.CTkFrame(parent)
-        help_text_frame.pack(fill=ctk.BOTH, expand=True, padx=10, pady=10)
-
-        help_text = tk.Text(help_text_frame, wrap='word', bg='#1e1e1e', fg='#f5f5f5', font=("Arial", 11))
-        help_text.pack(side=ctk.LEFT, fill=ctk.BOTH, expand=True)
-
-        help_scrollbar = ctk.CTkScrollbar(help_text_frame, orientation=ctk.VERTICAL, command=help_text.yview)
-        help_scrollbar.pack(side=ctk.RIGHT, fill=ctk.Y)
-        help_text.configure(yscrollcommand=help_scrollbar.set)
-
-        # Define help content
-        help_content = """
-    Warcraft 3 Tower Balancer Tool: User Guide
-
-    Overview
-    --------
-    The Warcraft 3 Tower Balancer Tool is a comprehensive utility for balancing tower stats within custom Warcraft 3 maps. Designed by Aphotica, this tool provides an interactive interface to calculate various balance metrics such as DPS per Gold, Z-Score, and Percent Rank. Additionally, it offers functionalities to import/export data, perform outlier analysis, and customize algorithms.
-
-    Features
-    --------
-    1. **Dynamic Comparison**: Automatically calculates and adjusts balance ranges based on imported data.
-    2. **Outlier Detection**: Identifies towers that deviate significantly from standard values, making it easy to spot overpowered or underpowered units.
-    3. **Algorithm Customization**: Adjust the calculation logic to fit unique balancing needs by modifying the algorithm directly in the tool.
-    4. **Import/Export Capabilities**: Save and load tower configurations as needed for easier testing and balancing across multiple maps or scenarios.
-    5. **Race Difficulty**: Assess race difficulty on a scale from 1-10 (10 being hardest to play) based on overall race DPS/Gold, Raw DPS, Range, Splash, and Abilities.
-
-    Getting Started
-    ---------------
-    1. **Import Data**: 
-    Use the **Import** button to load existing tower data. Supported formats include Excel files with necessary columns. Ensure your dataset includes essential columns such as **Race**, **Tower Number**, **Gold Cost**, **Damage**, etc.
-    Columns MUST read in order: Name, Gold Cost, Damage, Dice, Sides, Cooldown, Range, Full Splash, Med Splash, Small Splash, Spell DPS, Spell DPS CD, Slow %, Utility Boost, Poison (0 or 1), Target Type, Z-Score, Percent Rank, Race, Tower Number
-
-    ***If uncertain, just use the tool to create the excel for you and continue exporting to add to it.***
-
-    2. **Edit or Add New Towers**:
-    Choose an existing race from the dropdown or type a new race name. Add new towers or edit existing ones by filling in fields like **Name**, **Gold Cost**, **Damage**, **Dice**, **Cooldown**, and more. Use **Add Tower** or **Delete Tower** to adjust the tower list.
-
-    3. **Run Calculations**:
-    Click **Calculate All** to perform the analysis. View calculated DPS, DPS per Gold, and any outliers in the **Results** section.
-
-    4. **Analyze Results**:
-    Open the **Analysis** tab to examine outliers, balance ranges, and specific metrics. Use the **View Changes** tab to see differences in tower data post-editing.
-
-    5. **Export Data**:
-    Save your work using the **Export** button. This will store your tower configuration and analysis results for future reference or sharing.
-
-    Calculations and Algorithm
-    --------------------------
-    **Core Calculation (DPS per Gold)**
-
-    The tool calculates DPS per Gold based on the following formula:
-
-    DPS = (Base Damage + Dice * Average Die Roll) * (1 / Cooldown)
-    Adjusted by **Range Modifier** and **Splash Damage** values, including **Full Splash**, **Medium Splash**, and **Small Splash** percentages.
-
-    Utility Adjustments:
-    Factors in special effects such as **Poison** and **Slow** which influence DPS based on target exposure and movement. **Utility Boost** can scale DPS based on additional benefits.
-
-    Output Metrics:
-    - **Total DPS**: Total calculated damage per second, considering range, splash, poison, and other adjustments.
-    - **DPS per Gold**: Calculated as (Total DPS / Gold Cost) * 100, providing a standard measure of efficiency relative to cost.
-
-    Dynamic Algorithm (For Users with Fewer than 20 Races)
-    ------------------------------------------------------
-    If fewer than 20 races are present, use the **Dynamic Algorithm** tab to configure presets. This dynamically adjusts DPS ranges by calculating mean and standard deviations of existing towers.
-
-    Troubleshooting Tips
-    --------------------
-    - **Error Messages**: If calculation errors appear, verify that all essential fields are filled correctly. Missing or non-numeric values in key fields (like **Gold Cost** or **Cooldown**) can result in calculation errors.
-
-    - **Outliers**: If outliers are identified, consider adjusting tower parameters or using the **Dynamic Comparison** feature to auto-adjust balance ranges.
-
-    - **Custom Algorithm Adjustments**: In the **Algorithm** tab, modify the DPS formula or range modifiers to suit different gameplay styles. Save changes to the algorithm to apply custom calculations universally across all towers.
-
-    Contact
-    ----------
-    Contact Aphotica on the Wintermaul Wars Discord server for assistance.
-        """
-
-        # Insert help content and apply tags for dynamic sections
-        help_text.insert(tk.END, help_content)
-
-        # Dynamic tags
-        sections = {
-            "title": ("Warcraft 3 Tower Balancer Tool: User Guide", "#00d1a0", ("Arial", 18, "bold italic")),
-            "section": [
-                ("Overview", "#00d1a0", ("Arial", 16, "bold italic")),
-                ("Features", "#00d1a0", ("Arial", 16, "bold italic")),
-                ("Getting Started", "#00d1a0", ("Arial", 16, "bold italic")),
-                ("Calculations and Algorithm", "#00d1a0", ("Arial", 16, "bold italic")),
-                ("Dynamic Algorithm", "#00d1a0", ("Arial", 16, "bold italic")),
-                ("Troubleshooting Tips", "#00d1a0", ("Arial", 16, "bold italic")),
-                ("Contact", "#00d1a0", ("Arial", 16, "bold italic"))
-            ],
-            "subsection": [
-                ("Dynamic Comparison", "#FFBF00", ("Arial", 13, "bold")),
-                ("Outlier Detection", "#FFBF00", ("Arial", 13, "bold")),
-                ("Algorithm Customization", "#FFBF00", ("Arial", 13, "bold")),
-                ("Import/Export Capabilities", "#FFBF00", ("Arial", 13, "bold")),
-                ("Race Difficulty", "#FFBF00", ("Arial", 13, "bold")),
-                ("Import Data", "#FFBF00", ("Arial", 13, "bold")),
-                ("Edit or Add New Towers", "#FFBF00", ("Arial", 13, "bold")),
-                ("Run Calculations", "#FFBF00", ("Arial", 13, "bold")),
-                ("Analyze Results", "#FFBF00", ("Arial", 13, "bold")),
-                ("Export Data", "#FFBF00", ("Arial", 13, "bold")),
-                ("Core Calculation (DPS per Gold)", "#FFBF00", ("Arial", 13, "bold")),
-                ("Output Metrics", "#FFBF00", ("Arial", 13, "bold")),
-                ("Error Messages", "#FFBF00", ("Arial", 13, "bold")),
-                ("Outliers", "#FFBF00", ("Arial", 13, "bold")),
-                ("Custom Algorithm Adjustments", "#FFBF00", ("Arial", 13, "bold"))
-            ]
-        }
-
-        # Apply tags based on keywords
-        for tag, values in sections.items():
-            if isinstance(values, tuple):
-                keyword, color, font = values
-                start_index = help_content.index(keyword)
-                end_index = start_index + len(keyword)
-                help_text.tag_add(tag, f"1.0+{start_index}c", f"1.0+{end_index}c")
-                help_text.tag_config(tag, foreground=color, font=font)
-            else:
-                for keyword, color, font in values:
-                    start_index = help_content.index(keyword)
-                    end_index = start_index + len(keyword)
-                    help_text.tag_add(tag, f"1.0+{start_index}c", f"1.0+{end_index}c")
-                    help_text.tag_config(tag, foreground=color, font=font)
-
-        # Disable editing
-        help_text.configure(state=tk.DISABLED)
-
-
-
-
-
-
-    def create_algorithm_tab(self, parent):
-        parent.grid_rowconfigure(0, weight=1)
-        parent.grid_columnconfigure(0, weight=1)
-
-        calc_label = ctk.CTkLabel(master=parent, text="Calculation Function (Python Code):", anchor="w")
-        calc_label.grid(row=0, column=0, sticky="nw", padx=10, pady=5)
-        self.calc_function_text = ctk.CTkTextbox(master=parent, width=760, height=400)
-        self.calc_function_text.grid(row=1, column=0, padx=10, pady=5, sticky="nsew")
-
-        # Load the calculation function code from self.calc_function_code
-        self.calc_function_text.insert("0.0", self.calc_function_code)
-
-        # Adjusted balance ranges to be displayed vertically
-        ranges_label = ctk.CTkLabel(master=parent, text="Preset Balance Ranges (Customizable):", anchor="w")
-        ranges_label.grid(row=2, column=0, sticky="nw", padx=10, pady=5)
-        self.ranges_text = ctk.CTkTextbox(master=parent, width=760, height=200)
-        self.ranges_text.grid(row=3, column=0, padx=10, pady=5, sticky="nsew")
-
-        # Load current preset ranges
-        ranges_code = '{\n' + ',\n'.join([f"    {key}: {value}" for key, value in sorted(self.preset_balance_ranges.items())]) + '\n}'
-        self.ranges_text.insert("0.0", ranges_code)
-
-        # Target Type Balance Adjustments
-        adjustments_label = ctk.CTkLabel(master=parent, text="Target Type Balance Adjustments (Python Dict Format):", anchor="w")
-        adjustments_label.grid(row=4, column=0, sticky="nw", padx=10, pady=5)
-        self.target_type_adjustments_text = ctk.CTkTextbox(master=parent, width=760, height=100)
-        self.target_type_adjustments_text.grid(row=5, column=0, padx=10, pady=5, sticky="nsew")
-
-        # Load current target type adjustments
-        adjustments_code = '{\n' + ',\n'.join([f"    '{key}': {value}" for key, value in self.target_type_balance_adjustments.items()]) + '\n}'
-        self.target_type_adjustments_text.insert("0.0", adjustments_code)
-
-        # Buttons
-        button_frame = ctk.CTkFrame(master=parent)
-        button_frame.grid(row=6, column=0, pady=10)
-
-        save_button = ctk.CTkButton(master=button_frame, text="Save/Apply", command=self.apply_algorithm_changes)
-        save_button.pack(side=ctk.LEFT, padx=5)
-
-        save_file_button = ctk.CTkButton(master=button_frame, text="Save to File", command=self.save_algorithm_to_file)
-        save_file_button.pack(side=ctk.LEFT, padx=5)
-
-        load_button = ctk.CTkButton(master=button_frame, text="Load from File", command=self.load_algorithm)
-        load_button.pack(side=ctk.LEFT, padx=5)
-
-    def create_dynamic_algorithm_tab(self, parent):
-        parent.grid_rowconfigure(0, weight=1)
-        parent.grid_columnconfigure(0, weight=1)
-
-        dynamic_calc_label = ctk.CTkLabel(master=parent, text="Dynamic Balance Range Calculation:", anchor="w")
-        dynamic_calc_label.grid(row=0, column=0, sticky="nw", padx=10, pady=5)
-
-        self.dynamic_calc_text = ctk.CTkTextbox(master=parent, width=760, height=650)
-        self.dynamic_calc_text.grid(row=1, column=0, padx=10, pady=5, sticky="nsew")
-
-        # Load the dynamic calculation code
-        dynamic_code = '''
-    ### Dynamic Balance Range Calculation
-    # Outlier Removal: Uses IQR to exclude extreme outliers.
-    # Mean and Std Dev: Calculates mean and standard deviation for DPS per Gold.
-    # Scaling Factor: Applies a scaling factor inversely proportional to the tower number.
-
-    def calculate_dynamic_balance(df):
-        balance_ranges = {}
-        grouped = df.groupby(['Tower Number', 'Target Type'])
-        for (tower_num, target_type), group in grouped:
-            Q1 = group['DPS per Gold'].quantile(0.25)
-            Q3 = group['DPS per Gold'].quantile(0.75)
-            IQR = Q3 - Q1
-            filtered = group[(group['DPS per Gold'] >= Q1 - 1.5 * IQR) & (group['DPS per Gold'] <= Q3 + 1.5 * IQR)]
-            if filtered.empty:
-                filtered = group
-            mean = filtered['DPS per Gold'].mean()
-            std = filtered['DPS per Gold'].std(ddof=0)
-            if std == 0:
-                std = mean * 0.1
-            low = mean - std
-            high = mean + std
-            scaling_factor = 1 / (tower_num ** 0.05)
-            low *= scaling_factor
-            high *= scaling_factor
-            balance_ranges[(tower_num, target_type)] = (low, high)
-        return balance_ranges
-        '''
-
-        self.dynamic_calc_text.insert("end", dynamic_code)
-        self.dynamic_calc_text.configure(state="disabled")  # Make the text read-only
-
-        # Comments explaining each part
-        comments_text = '''
-    # Explanation of Key Components:
-    # 1. Outlier Removal: This section uses IQR (Interquartile Range) to exclude extreme outliers from the DPS per Gold calculation.
-    #    You can modify the IQR multiplier (currently 1.5) to adjust how strict the outlier removal process is.
-    # 2. Mean and Standard Deviation: These are used to calculate the average DPS per Gold and its acceptable range.
-    # 3. Scaling Factor: As tower numbers increase, this factor slightly widens the acceptable range of balance for more expensive or powerful towers.
-    #    Adjusting the exponent (currently 0.05) will impact how much flexibility is allowed for higher-tier towers.
-        '''
-        comments_label = ctk.CTkLabel(master=parent, text=comments_text, justify='left', wraplength=760, anchor='nw')
-        comments_label.grid(row=2, column=0, padx=10, pady=5, sticky="nsew")
-
-
-
-    def create_view_changes_tab(self, parent):
-        """
-        Creates the "View Changes" tab within the Options window.
-        Displays the list of changes made to towers.
-        
-        Parameters:
-        - parent: The parent frame or tab where the View Changes tab will be placed.
-        """
-        # Set up the main frame for the View Changes tab
-        view_changes_frame = ctk.CTkFrame(parent)
-        view_changes_frame.pack(fill=ctk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Use a Text widget for the changes, enabling color-coded tags
-        changes_text = tk.Text(view_changes_frame, wrap='word', bg='#333333', fg='white', font=("Consolas", 11))
-        changes_text.pack(side=ctk.LEFT, fill=ctk.BOTH, expand=True)
-        
-        # Add a scrollbar
-        changes_scrollbar = ctk.CTkScrollbar(view_changes_frame, orientation=ctk.VERTICAL, command=changes_text.yview)
-        changes_scrollbar.pack(side=ctk.RIGHT, fill=ctk.Y)
-        changes_text.configure(yscrollcommand=changes_scrollbar.set)
-        
-        # Store the text widget for future updates
-        self.view_changes_text = changes_text
-        
-        # Configure color tags
-        changes_text.tag_configure("green", foreground="#00D1A0")
-        changes_text.tag_configure("red", foreground="#FF4C4C")
-        changes_text.tag_configure("yellow", foreground="#FFFF00")
-        changes_text.tag_configure("blue", foreground="#00CED1")
-        changes_text.tag_configure("header", foreground="#FFFF00", font=("Consolas", 12, "bold"))  # For "Outlier Analysis"
-        changes_text.tag_configure("outlier_header", foreground="red", font=("Consolas", 12, "bold"))  # For "Low-End Outliers" and "High-End Outliers"
-        changes_text.tag_configure("race_header", foreground="green", font=("Consolas", 12, "bold"))  # For Race name
-        changes_text.tag_configure("difficulty_white", foreground="white", font=("Consolas", 12))
-        changes_text.tag_configure("difficulty_green", foreground="green", font=("Consolas", 12))
-        changes_text.tag_configure("difficulty_orange", foreground="orange", font=("Consolas", 12))
-        changes_text.tag_configure("difficulty_red", foreground="red", font=("Consolas", 12))
-        
-        # Insert the changes report if available
-        if hasattr(self, 'changes_report') and self.changes_report:
-            for change_line in self.changes_report:
-                for segment in change_line:
-                    if len(segment) >= 2:
-                        text, color = segment[:2]
-                        bold = segment[2] if len(segment) > 2 else False
-                        tag = color + ("_bold" if bold else "")
-                        if tag not in changes_text.tag_names():
-                            font_style = ("Consolas", 12, "bold") if bold else ("Consolas", 12)
-                            changes_text.tag_configure(tag, foreground=color, font=font_style)
-                        changes_text.insert("end", text, tag)
-        else:
-            # Display default message when there's no data
-            changes_text.insert("end", "Import data or add races to view outlier analysis and race difficulty levels.\n", "white")
-        
-        # Disable editing
-        changes_text.configure(state=tk.DISABLED)
-
-
-
-
-    def update_view_changes_tab(self):
-        """
-        Updates the "View Changes" tab with the latest changes_report.
-        """
-        if hasattr(self, 'view_changes_text'):
-            changes_text = self.view_changes_text
-            changes_text.configure(state=tk.NORMAL)
-            changes_text.delete("1.0", "end")  # Clear existing content
-
-            # Define all necessary tags with their color configurations
-            predefined_tags = {
-                "green": {"foreground": "green", "font": ("Consolas", 12)},
-                "red": {"foreground": "red", "font": ("Consolas", 12)},
-                "orange": {"foreground": "orange", "font": ("Consolas", 12)},
-                "blue": {"foreground": "#4DA6FF", "font": ("Consolas", 12, "bold")},
-                "yellow": {"foreground": "#FFFF00", "font": ("Consolas", 12, "bold")},
-                "light_yellow": {"foreground": "#FFD966", "font": ("Consolas", 12, "bold")},
-                "dark_turquoise": {"foreground": "#4DA6FF", "font": ("Consolas", 12, "bold")},
-                "light_gray": {"foreground": "#A0A0A0", "font": ("Consolas", 12)},
-                "white": {"foreground": "white", "font": ("Consolas", 12)},
-                "air_target": {"foreground": "#00CED1", "font": ("Consolas", 12)},
-                "balanced": {"foreground": "green", "font": ("Consolas", 12)},
-                "overpowered": {"foreground": "red", "font": ("Consolas", 12)},
-                "underpowered": {"foreground": "red", "font": ("Consolas", 12)},
-                # Add more tags as needed
-            }
-
-            # Configure all predefined tags
-            for tag_name, tag_attrs in predefined_tags.items():
-                if tag_name not in changes_text.tag_names():
-                    changes_text.tag_configure(tag_name, **tag_attrs)
-
-            # Insert the changes report if available
-            if hasattr(self, 'changes_report') and isinstance(self.changes_report, list) and self.changes_report:
-                for change_line in self.changes_report:
-                    for segment in change_line:
-                        if len(segment) >= 2:
-                            text, color = segment[:2]
-                            bold = segment[2] if len(segment) > 2 else False
-                            # Map the color to a predefined tag or use default
-                            if color in predefined_tags:
-                                tag = color + ("_bold" if bold else "")
-                            else:
-                                tag = "white"  # Default tag
-                            if tag not in changes_text.tag_names():
-                                # Define a default tag if not predefined
-                                font_style = ("Consolas", 12, "bold") if bold else ("Consolas", 12)
-                                changes_text.tag_configure(tag, foreground=color if color in ['green', 'red', 'orange', 'blue', 'yellow', 'light_yellow', 'dark_turquoise', 'light_gray', 'white', 'air_target', 'balanced', 'overpowered', 'underpowered'] else "white", font=font_style)
-                            changes_text.insert("end", text, tag)
-            else:
-                # Display default message when there's no data
-                changes_text.insert("end", "Import data or add races to view outlier analysis and race difficulty levels.\n", "white")
-
-            # Disable editing
-            changes_text.configure(state=tk.DISABLED)
-
-
-
-
-    def generate_changes_report(self):
-        """
-        Generates a report of changes between the original and current data.
-        Returns a list of lists, where each inner list represents a line composed of segments.
-        Each segment is a tuple: (text, color, bold).
-        """
-        report_lines = []
-        if self.original_imported_df.empty:
-            report_lines.append([("No original data to compare changes.", "white", False)])
-            return report_lines
-
-        # Save current race data before generating report
-        self.save_current_race_data()
-
-        races = sorted(self.imported_df['Race'].unique())
-
-        for race in races:
-            original_race_df = self.original_imported_df[self.original_imported_df['Race'] == race]
-            current_race_df = self.imported_df[self.imported_df['Race'] == race]
-
-            # Merge on Tower Number to compare towers
-            merged_df = pd.merge(original_race_df, current_race_df, on='Tower Number', suffixes=('_orig', '_curr'))
-
-            changes_found = False
-            race_title = race + ":\n"
-            report_lines.append([(race_title, "green", True)])  # Race name in green, bold
-
-            for _, row in merged_df.iterrows():
-                tower_changes = []
-                for col in ['Name', 'Gold Cost', 'Damage', 'Dice', 'Sides', 'Cooldown', 'Range',
-                            'Full Splash', 'Med Splash', 'Small Splash', 'Spell DPS', 'Spell DPS CD',
-                            'Slow %', 'Utility Boost', 'Poison', 'Target Type']:
-                    orig_value = row.get(f"{col}_orig", '')
-                    curr_value = row.get(f"{col}_curr", '')
-                    if pd.isnull(orig_value):
-                        orig_value = '0'
-                    if pd.isnull(curr_value):
-                        curr_value = '0'
-
-                    # Ignore specific fields as per your requirements
-                    if col == 'Spell DPS' and (float(orig_value or 0.0) == 0.0 and float(curr_value or 0.0) == 0.0):
-                        continue
-                    if col == 'Utility Boost' and (float(orig_value or 1.0) == 1.0 and float(curr_value or 1.0) == 1.0):
-                        continue
-                    if col in ['Slow %', 'Spell DPS CD']:
-                        orig_value_float = float(orig_value or 0.0)
-                        curr_value_float = float(curr_value or 0.0)
-                        if (orig_value_float in [0.0, 0, 1.0, 1]) and (curr_value_float in [0.0, 0, 1.0, 1]):
-                            continue
-
-                    # Compare values numerically to handle trailing zeroes
-                    change_detected = False
-                    try:
-                        orig_num = float(orig_value)
-                        curr_num = float(curr_value)
-                        if orig_num == curr_num:
-                            change_detected = False
-                        else:
-                            change_detected = True
-                    except ValueError:
-                        # For non-numeric values, compare as strings
-                        if str(orig_value).strip() == str(curr_value).strip():
-                            change_detected = False
-                        else:
-                            change_detected = True
-
-                    if change_detected:
-                        # Determine if the value increased or decreased
-                        if isinstance(orig_num, float) and isinstance(curr_num, float):
-                            if curr_num > orig_num:
-                                # Value increased
-                                from_color = "red"
-                                to_color = "green"
-                            else:
-                                # Value decreased
-                                from_color = "green"
-                                to_color = "red"
-                        else:
-                            # For non-numeric changes, default colors
-                            from_color = "red"
-                            to_color = "green"
-
-                        change_segments = [
-                            ("    - ", "white", False),  # Indent and bullet
-                            (row['Name_curr'] + ": ", "#FFC107", True),  # Tower name in amber color, bold
-                            (col, "#FFC107", True),  # Variable name in amber color, bold
-                            (" changed from ", "white", False),
-                            (str(orig_value), from_color, False),  # Original value
-                            (" to ", "white", False),
-                            (str(curr_value), to_color, False),  # New value
-                            ("\n", "white", False)
-                        ]
-                        tower_changes.append(change_segments)
-                        changes_found = True
-
-                if tower_changes:
-                    # Add changes for this tower
-                    for change in tower_changes:
-                        report_lines.append(change)
-                    # Add a blank line after each tower
-                    report_lines.append([("\n", "white", False)])
-
-            if not changes_found:
-                # If no changes for this race, remove the race header
-                report_lines.pop()
-            else:
-                # Add only one blank line between races
-                report_lines.append([("\n", "white", False)])
-
-        if not report_lines:
-            report_lines.append([("No changes detected across the data set.", "white", False)])
-
-        self.changes_report = report_lines  # Store the changes report
-
-        return report_lines
-
-
-
-
-
-
-
-
-    def toggle_ignore_outliers(self):
-        if self.dynamic_comparison_var.get():
-            self.ignore_outliers_chk.pack(side=ctk.LEFT, padx=5)  # Show if Dynamic Comparison is checked
-        else:
-            self.ignore_outliers_chk.pack_forget()  # Hide otherwise
-
-    def show_clear_all_confirmation(self):
-        # Create a new Toplevel window for the custom confirmation dialog
-        confirmation_dialog = tk.Toplevel(self.root)
-        confirmation_dialog.title("Confirm Clear All")
-        confirmation_dialog.geometry("350x150")
-        confirmation_dialog.configure(bg="#151924")  # Set background color of Toplevel window
-
-        # Center the dialog on the main window
-        self.center_window(confirmation_dialog, 350, 150)
-
-        # Ensure it stays on top and restricts interaction with the main window
-        confirmation_dialog.transient(self.root)
-        confirmation_dialog.grab_set()
-
-        # Add a bold red warning label
-        warning_label = ctk.CTkLabel(
-            confirmation_dialog,
-            text="WARNING: Unsaved data will be lost",
-            text_color="#FF3333",
-            font=("Arial", 16, "bold"),
-            fg_color="#151924",  # Set the background for customtkinter label
-            anchor="center"
-        )
-        warning_label.pack(pady=(20, 10))
-
-        # Add the confirmation question
-        question_label = ctk.CTkLabel(
-            confirmation_dialog,
-            text="Are you sure you want to clear all data?",
-            fg_color="#151924",  # Set the background for customtkinter label
-            anchor="center"
-        )
-        question_label.pack(pady=5)
-
-        # Frame for the Yes and No buttons
-        button_frame = ctk.CTkFrame(confirmation_dialog, fg_color="#151924")
-        button_frame.pack(pady=15)
-
-        # "Yes" button to confirm
-        yes_button = ctk.CTkButton(button_frame, text="Yes", command=lambda: self.confirm_clear_all(confirmation_dialog))
-        yes_button.pack(side=ctk.LEFT, padx=10)
-
-        # "No" button to cancel
-        no_button = ctk.CTkButton(button_frame, text="No", command=confirmation_dialog.destroy)
-        no_button.pack(side=ctk.LEFT, padx=10)
-
-    # Center a Window (used for "Clear All")
-    def center_window(self, window, width, height):
-        """Center a window on the screen or main application window."""
-        x = self.root.winfo_x() + (self.root.winfo_width() // 2) - (width // 2)
-        y = self.root.winfo_y() + (self.root.winfo_height() // 2) - (height // 2)
-        window.geometry(f"{width}x{height}+{x}+{y}")
-    
-    # Center a window with timer (prompts where acknowledgement is not necessary for function to run)
-    def show_centered_message(self, message, duration=2000):
-        message_win = tk.Toplevel(self.root)
-        message_win.overrideredirect(True)
-        message_win.geometry(f"400x100+{self.root.winfo_x() + (self.root.winfo_width() // 2) - 150}+{self.root.winfo_y() + (self.root.winfo_height() // 2) - 50}")
-        message_win.configure(bg="#151924")
-
-        label = ctk.CTkLabel(message_win, text=message, text_color="white", font=("Arial", 14))
-        label.pack(expand=True, fill='both')
-
-        # Destroy the message window after the duration
-        message_win.after(duration, message_win.destroy)
-
-
-    def show_importing_message(self, message="Loading races..."):
-        """
-        Displays a centered importing message window with a dynamic label.
-        
-        Parameters:
-        - message (str): The initial message to display.
-        """
-        if self.importing_window and tk.Toplevel.winfo_exists(self.importing_window):
-            # Importing window already exists
-            return
-
-        self.importing_window = tk.Toplevel(self.root)
-        self.importing_window.title("Importing Data")
-        self.importing_window.geometry("450x120")
-        self.importing_window.resizable(False, False)
-        self.importing_window.configure(bg="#333333")  # Dark background
-
-        # Make the window modal and disable the close button
-        self.importing_window.transient(self.root)
-        self.importing_window.grab_set()
-        self.importing_window.protocol("WM_DELETE_WINDOW", lambda: None)  # Disable close button
-
-        # Center the window
-        self.center_window(self.importing_window, 450, 120)
-
-        # Initial message label
-        self.importing_message_label = tk.Label(
-            master=self.importing_window,
-            text=message,
-            fg="white",
-            bg="#333333",
-            font=("Arial", 14, "bold")
-        )
-        self.importing_message_label.pack(expand=True, fill='both', padx=20, pady=20)
-
-        # Force the window to render
-        self.importing_window.update()
-
-
-
-
-    def hide_importing_message(self):
-        """
-        Hides the importing message window if it exists.
-        """
-        if hasattr(self, 'importing_window') and self.importing_window is not None:
-            try:
-                self.importing_window.destroy()
-            except tk.TclError:
-                pass  # The window might have already been destroyed
-            self.importing_window = None
-
-    def confirm_clear_all(self, dialog):
-        dialog.destroy()  # Close the confirmation dialog
-        
-        # Proceed with clearing all towers and race fields
-        for tower in self.towers:
-            self.clear_tower_fields(tower)  # Assuming clear_tower_fields is defined to reset fields
-
-        # Clear the race name field
-        self.race_entry.configure(state='normal')
-        self.race_entry.delete(0, ctk.END)
-        self.race_entry.configure(state='normal')
-        
-        # Reset the dropdown to "Select Race"
-        self.race_combobox.set("Select Race")
-
-    def show_calculation_error(self, error_message):
-        # Create a custom Toplevel window
-        error_dialog = tk.Toplevel(self.root)
-        error_dialog.title("Calculation Error")
-        error_dialog.geometry("300x150")
-        error_dialog.configure(bg="#1c1c1c")  # Dark background color
-
-        # Center the dialog on the main window
-        self.center_window(error_dialog, 300, 150)
-
-        # Prevent interaction with the main window until closed
-        error_dialog.transient(self.root)
-        error_dialog.grab_set()
-
-        # Add an error message label
-        error_label = ctk.CTkLabel(
-            error_dialog,
-            text="Calculation Error",
-            text_color="#FF3333",  # Red color for the title to highlight the error
-            font=("Arial", 14, "bold"),
-            fg_color="#1c1c1c",  # Dark background color for label
-            anchor="center"
-        )
-        error_label.pack(pady=(10, 5))
-
-        # Add the specific error message text
-        message_label = ctk.CTkLabel(
-            error_dialog,
-            text=error_message,
-            text_color="white",  # White color for the error details
-            fg_color="#1c1c1c",  # Dark background color for label
-            wraplength=280,
-            anchor="center"
-        )
-        message_label.pack(pady=(5, 10))
-
-        # Add a Close button to dismiss the dialog
-        close_button = ctk.CTkButton(
-            error_dialog,
-            text="Close",
-            command=error_dialog.destroy,
-            fg_color="#333333",  # Button color matching the theme
-            text_color="white"
-        )
-        close_button.pack(pady=10)
-
-
-    # Update the clear_all_towers method to use the custom confirmation dialog
-    def clear_all_towers(self):
-        self.show_clear_all_confirmation()
-
-    def on_entry_focus_in(self, col):
-        """
-        Changes the corresponding header label color to green when an entry gains focus.
-        
-        Parameters:
-        - col (int): The column index of the focused entry.
-        """
-        if 0 <= col < len(self.header_labels):
-            self.header_labels[col].configure(text_color="#FFC107")
-
-    def on_entry_focus_out(self, col):
-        """
-        Resets the corresponding header label color to white when an entry loses focus.
-        
-        Parameters:
-        - col (int): The column index of the unfocused entry.
-        """
-        if 0 <= col < len(self.header_labels):
-            self.header_labels[col].configure(text_color="white")
-
-
-    def create_headers(self, parent_frame):
-        self.headers = ['No.', 'Name', 'Gold Cost', 'Damage', 'Dice','Sides\nper Die', 'Cooldown', 'Range', 'Full\nSplash', 'Med\nSplash', 'Small\nSplash', 'Spell\nDPS', 'Spell\nDPS CD', 'Slow %', 'Utility\nBoost', 'Poison', 'Target\nType']  # Updated 'Sides' to 'Sides per Die'
-
-        tooltips = {
-            'No.': 'Tower number',
-            'Gold Cost': 'Cost of the tower in gold',
-            'Damage': 'Base damage of the tower',
-            'Dice': 'Number of dice rolled for damage',
-            'Sides\nper Die': 'Number of sides on each die',  # Updated tooltip
-            'Cooldown': 'Time between attacks (seconds)',
-            'Range': 'Attack range of the tower',
-            'Full\nSplash': 'Radius of 100% AoE damage infliction',
-            'Med\nSplash': 'Radius of 50% AoE damage infliction',
-            'Small\nSplash': 'Radius of 25% AoE damage infliction',
-            'Spell\nDPS': 'Custom spell damage per second',
-            'Spell\nDPS CD': 'Cooldown for spell DPS',
-            'Slow %': 'Percentage reduction in movement speed',
-            'Utility\nBoost': 'Damage multiplier for utility effects',
-            'Poison': 'Applies poison effect that slows and damages over time',
-            'Target\nType': 'Determines if a tower has specific splash damage criteria (All, Ground Splash, Air Splash)',
-        }
-
-        # Increased column widths for better readability and alignment
-        self.column_widths = [30, 145, 85, 75, 60, 70, 80, 80, 80, 80, 75, 85, 75, 85, 85, 50, 115]  # width of the headers above tower data
-
-        # Configure columns in parent_frame
-        for idx in range(len(self.headers)):
-            parent_frame.grid_columnconfigure(idx, weight=1)
-
-        # Initialize a list to store header label widgets
-        self.header_labels = []
-
-        # Create headers with uniform background and increased width
-        for idx, header in enumerate(self.headers):
-            lbl = ctk.CTkLabel(parent_frame, text=header, anchor='w', width=self.column_widths[idx],
-                            fg_color='transparent')  # Ensures uniform background
-            lbl.grid(row=0, column=idx, padx=5, pady=2, sticky='nsew')
-            lbl.configure(font=('Arial', 12, 'bold'))
-            Tooltip(lbl, text=tooltips.get(header, ''))
-            self.header_labels.append(lbl)  # Store the label in the list
-
-
-    def on_towers_frame_configure(self, event):
-        self.towers_canvas.configure(scrollregion=self.towers_canvas.bbox("all"))
-        required_height = self.towers_frame.winfo_reqheight()
-        if self.desired_canvas_height:
-            if required_height <= self.desired_canvas_height:
-                self.towers_canvas.configure(height=required_height)
-                self.towers_canvas.yview_moveto(0)  # Reset the scroll position
-            else:
-                self.towers_canvas.configure(height=self.desired_canvas_height)
-        else:
-            self.towers_canvas.configure(height=required_height)
-
-    def _on_mousewheel(self, event):
-        # Scroll the towers_canvas when mouse wheel is used over the towers section
-        self.towers_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-
-    def close_window(self, window_type, window_instance):
-        """
-        Closes the given window and resets the window tracker for the specific window type.
-        """
-        # Destroy the window
-        window_instance.destroy()
-
-        # Reset the window tracker entry
-        self.window_tracker[window_type] = None
-
-    def create_analysis_tab(self, parent):
-        # Set up the main frame for the Analysis tab
-        analysis_text_frame = ctk.CTkFrame(parent)
-        analysis_text_frame.pack(fill=ctk.BOTH, expand=True, padx=10, pady=10)
-
-        # Use a Text widget for the analysis, enabling color-coded tags
-        analysis_text = tk.Text(analysis_text_frame, wrap='word', bg='#333333', fg='white', font=("Consolas", 11))
-        analysis_text.pack(side=ctk.LEFT, fill=ctk.BOTH, expand=True)
-
-        # Add a scrollbar
-        analysis_scrollbar = ctk.CTkScrollbar(analysis_text_frame, orientation=ctk.VERTICAL, command=analysis_text.yview)
-        analysis_scrollbar.pack(side=ctk.RIGHT, fill=ctk.Y)
-        analysis_text.configure(yscrollcommand=analysis_scrollbar.set)
-
-        # Store the text widget for future updates
-        self.analysis_text = analysis_text
-
-        # Configure color tags like in calculate_all
-        analysis_text.tag_configure("green", foreground="#00D1A0")
-        analysis_text.tag_configure("red", foreground="#FF4C4C")
-        analysis_text.tag_configure("yellow", foreground="#FFFF00")
-        analysis_text.tag_configure("blue", foreground="#00CED1")
-        analysis_text.tag_configure("header", foreground="blue", font=("Helvetica", 12, "bold"))
-        analysis_text.tag_configure("outlier_header", foreground="#FFFF00", font=("Helvetica", 12, "bold"))
-
-        # Display outlier analysis with color-coding
-        if hasattr(self, 'outlier_analysis_segments'):
-            for item in self.outlier_analysis_segments:
-                if isinstance(item, tuple) and len(item) == 2:
-                    text, color = item
-                    tag = "red" if "Outliers" in text else color  # Use the red tag for headers
-                    analysis_text.insert("end", text + "", tag)
-                elif isinstance(item, tuple) and len(item) == 3:
-                    text, color, bold = item
-                    tag = color + ("_bold" if bold else "")
-                    if tag not in analysis_text.tag_names():
-                        font_style = ("Consolas", 12, "bold") if bold else ("Consolas", 12)
-                        analysis_text.tag_configure(tag, foreground=color, font=font_style)
-                    analysis_text.insert("end", text + "", tag)
-                elif isinstance(item, list):
-                    for text_segment, color_segment, *bold in item:
-                        tag = color_segment + ("_bold" if bold else "")
-                        if tag not in analysis_text.tag_names():
-                            font_style = ("Consolas", 12, "bold") if bold else ("Consolas", 12)
-                            analysis_text.tag_configure(tag, foreground=color_segment, font=font_style)
-                        analysis_text.insert("end", text_segment + "", tag)
-        analysis_text.configure(state=tk.DISABLED)
-
-    def add_tower(self):
-        row = len(self.towers)  # No need to offset by 1
-        tower_fields = {}
-
-        # Define specific widths for tower fields (separate from header widths)
-        tower_column_widths = [30, 130, 80, 70, 50, 70, 70, 70, 70, 70, 70, 80, 70, 80, 80, 50, 80]
-
-        # Create the original values dictionary for storing initial field values
-        tower_fields['original_values'] = {
-            'Gold Cost': '',
-            'Damage': '',
-            'Dice': '',
-            'Sides': '',
-            'Cooldown': '',
-            'Range': '',
-            'Full Splash': '',
-            'Med Splash': '',
-            'Small Splash': '',
-            'Spell DPS': '',
-            'Spell DPS CD': '',
-            'Slow %': '',
-            'Utility Boost': '',
-            'Poison': 0,
-            'Target Type': 'All'
-        }
-
-        # Create a Frame for the row
-        row_frame = ctk.CTkFrame(self.towers_frame, fg_color='#1c1c1c')
-        row_frame.grid(row=row, column=0, columnspan=len(self.headers), sticky='nsew', padx=0, pady=3)
-        tower_fields['row_frame'] = row_frame
-
-        # Configure columns in row_frame
-        for idx in range(len(self.headers)):
-            row_frame.grid_columnconfigure(idx, weight=1)
-
-        # Bind events to highlight the row
-        def on_enter_row(event, frame=row_frame):
-            if frame != self.focused_row:
-                frame.configure(fg_color='#6897bb')  # Light blue highlight
-
-        def on_leave_row(event, frame=row_frame):
-            if frame != self.focused_row:
-                frame.configure(fg_color='#1c1c1c')  # Remove highlight
-
-        def on_focus_row(event, frame=row_frame):
-            self.set_focused_row(frame)  # Set this row as focused
-
-        def on_focus_out_row(event, frame=row_frame):
-            # Check if any widget in the row still has focus
-            has_focus = any(widget.focus_displayof() for widget in frame.winfo_children())
-            if not has_focus and self.focused_row == frame:
-                frame.configure(fg_color='#1c1c1c')  # Reset background
-                self.focused_row = None  # Unset the focused row
-
-        # Tower number label
-        tower_number_label = ctk.CTkLabel(row_frame, text=str(row+1), anchor='center', width=tower_column_widths[0], height=30, text_color="#ffffff")
-        tower_number_label.grid(row=0, column=0, padx=2, pady=2, sticky='nsew')
-        tower_fields['No.'] = tower_number_label
-
-        # Create entries for each field
-        fields = ['Name', 'Gold Cost', 'Damage', 'Dice', 'Sides', 'Cooldown', 'Range',
-                'Full Splash', 'Med Splash', 'Small Splash', 'Spell DPS', 'Spell DPS CD',
-                'Slow %', 'Utility Boost']
-
-        for col, field in enumerate(fields, start=1):
-            entry = ctk.CTkEntry(row_frame, width=tower_column_widths[col], justify='center', text_color="white")
-            entry.grid(row=0, column=col, padx=5, pady=2, sticky='nsew')
-            tower_fields[field] = entry
-
-            # Store the initial value in 'original_values'
-            tower_fields['original_values'][field] = entry.get()
-
-            # Bind mousewheel to each widget to ensure scrolling works when mouse is over them
-            entry.bind("<MouseWheel>", self._on_mousewheel)
-            
-            # Bind events for highlighting and header color change
-            entry.bind("<Enter>", lambda e, frame=row_frame: on_enter_row(e, frame))
-            entry.bind("<Leave>", lambda e, frame=row_frame: on_leave_row(e, frame))
-            entry.bind("<FocusIn>", lambda e, frame=row_frame, col=col: (on_focus_row(e, frame), self.on_entry_focus_in(col)))
-            entry.bind("<FocusOut>", lambda e, frame=row_frame, col=col: (on_focus_out_row(e, frame), self.on_entry_focus_out(col)))
-
-
-            # Bind event listeners for change detection with validation
-            #entry.bind("<KeyRelease>", lambda e, field=field, tower_index=row: self.check_for_changes(tower_index, field))
-            # Bind arrow key navigation
-            entry.bind("<Up>", lambda e, current_row=row, col=col-1: self.navigate_entry(current_row, col, 'up'))
-            entry.bind("<Down>", lambda e, current_row=row, col=col-1: self.navigate_entry(current_row, col, 'down'))
-            entry.bind("<Left>", lambda e, current_row=row, col=col-1: self.navigate_entry(current_row, col, 'left', e))
-            entry.bind("<Right>", lambda e, current_row=row, col=col-1: self.navigate_entry(current_row, col, 'right', e))
-
-            # Add tooltip for each field
-            tooltips = {
-                'Name': 'Name of the tower',
-                'Gold Cost': 'Cost of the tower in gold',
-                'Damage': 'Base damage of the tower',
-                'Dice': 'Number of dice rolled for damage',
-                'Sides': 'Number of sides on each die',
-                'Cooldown': 'Time between attacks (seconds)',
-                'Range': 'Attack range of the tower',
-                'Full Splash': 'Radius of 100% AoE damage',
-                'Med Splash': 'Radius of 50% AoE damage',
-                'Small Splash': 'Radius of 25% AoE damage',
-                'Spell DPS': 'Custom spell damage per second',
-                'Spell DPS CD': 'Cooldown for spell DPS',
-                'Slow %': 'Percentage reduction in movement speed',
-                'Utility Boost': 'Damage multiplier for utility effects',
-            }
-            Tooltip(entry, text=tooltips.get(field, ''))
-
-        # Poison Checkbutton
-        poison_var = ctk.IntVar()
-        poison_chk = ctk.CTkCheckBox(row_frame, text="", variable=poison_var, bg_color='#333333', command=self.calculate_all, width=20)
-        poison_chk.grid(row=0, column=len(fields)+1, padx=2, pady=2, sticky='nsew')
-        tower_fields['Poison'] = poison_var
-        tower_fields['Poison_chk'] = poison_chk
-        tower_fields['original_values']['Poison'] = poison_var.get()
-
-        Tooltip(poison_chk, text='Applies poison effect that slows and damages over time')
-
-        # Bind mousewheel to checkbutton
-        poison_chk.bind("<MouseWheel>", self._on_mousewheel)
-        # Bind events for highlighting
-        poison_chk.bind("<Enter>", lambda e, frame=row_frame: on_enter_row(e, frame))
-        poison_chk.bind("<Leave>", lambda e, frame=row_frame: on_leave_row(e, frame))
-        poison_chk.bind("<FocusIn>", lambda e, frame=row_frame: on_focus_row(e, frame))
-        poison_chk.bind("<FocusOut>", lambda e, frame=row_frame: on_focus_out_row(e, frame))
-
-        # Bind event listener for the Poison checkbox change detection
-        #changes(tower_index, field))
-
-        # Target Type Combobox with decreased width
-        target_type_var = ctk.StringVar()
-        target_type_combobox = ctk.CTkComboBox(row_frame, variable=target_type_var, values=('All', 'Ground Splash', 'Air Splash'), state='readonly', width=80)
-        target_type_combobox.set('All')  # default to 'All'
-        target_type_combobox.grid(row=0, column=len(fields)+2, padx=2, pady=2, sticky='nsew')
-        tower_fields['Target Type'] = target_type_var
-        tower_fields['Target Type Combobox'] = target_type_combobox
-
-        # Bind mousewheel to combobox
-        target_type_combobox.bind("<MouseWheel>", self._on_mousewheel)
-        # Bind events for highlighting
-        target_type_combobox.bind("<Enter>", lambda e, frame=row_frame: on_enter_row(e, frame))
-        target_type_combobox.bind("<Leave>", lambda e, frame=row_frame: on_leave_row(e, frame))
-        target_type_combobox.bind("<FocusIn>", lambda e, frame=row_frame: on_focus_row(e, frame))
-        target_type_combobox.bind("<FocusOut>", lambda e, frame=row_frame: on_focus_out_row(e, frame))
-
-        # Add reset button
-        reset_button = ctk.CTkButton(row_frame, text="Reset", width=60, command=lambda idx=len(self.towers): self.reset_tower(idx))
-        reset_button.grid(row=0, column=len(fields)+3, padx=2, pady=2, sticky='nsew')
-        tower_fields['reset_button'] = reset_button
-        # Bind mousewheel to reset button
-        reset_button.bind("<MouseWheel>", self._on_mousewheel)
-        # Bind events for highlighting
-        reset_button.bind("<Enter>", lambda e, frame=row_frame: on_enter_row(e, frame))
-        reset_button.bind("<Leave>", lambda e, frame=row_frame: on_leave_row(e, frame))
-        reset_button.bind("<FocusIn>", lambda e, frame=row_frame: on_focus_row(e, frame))
-        reset_button.bind("<FocusOut>", lambda e, frame=row_frame: on_focus_out_row(e, frame))
-
-        # Add tooltip for reset button
-        Tooltip(reset_button, text='Reset this tower to default values')
-
-        # Store the tower fields in the list of towers
-        self.towers.append(tower_fields)
-
-
-    def delete_tower(self, index):
-        # Remove tower fields from the grid
-        tower = self.towers[index]
-        tower['row_frame'].destroy()
-        # Remove the tower from the list
-        self.towers.pop(index)
-        # Reorder the remaining towers
-        for idx in range(index, len(self.towers)):
-            self.update_tower_row(self.towers[idx], idx)
-        
-
-    def delete_last_tower(self):
-        if self.towers:
-            self.delete_tower(len(self.towers) - 1)
-
-    def update_tower_row(self, tower_fields, row):
-        # Update the tower number label
-        tower_number_label = tower_fields['No.']
-        tower_number_label.configure(text=str(row+1))
-        # Re-grid the row_frame
-        tower_fields['row_frame'].grid(row=row, column=0, columnspan=len(self.headers), sticky='nsew')
-        # Update reset button command
-        reset_button = tower_fields['reset_button']
-        reset_button.configure(command=lambda idx=row: self.reset_tower(idx))
-
-    def reset_tower(self, index):
-        if not self.original_imported_df.empty:
-            # Get the race and tower number
-            race_name = self.race_entry.get().strip()
-            tower_number = index + 1
-            # Ensure 'Tower Number' is integer
-            self.original_imported_df['Tower Number'] = self.original_imported_df['Tower Number'].astype(int)
-            # Strip whitespaces from 'Race' column
-            self.original_imported_df['Race'] = self.original_imported_df['Race'].str.strip()
-            # Filter for the specific tower from the original data
-            tower_data = self.original_imported_df[(self.original_imported_df['Race'] == race_name) & (self.original_imported_df['Tower Number'] == tower_number)]
-            if not tower_data.empty:
-                # Populate the tower fields with original data
-                self.populate_tower_fields(self.towers[index], tower_data.iloc[0])
-                # Also update the temporary imported_df with the original data for this tower
-                self.imported_df = self.imported_df[~((self.imported_df['Race'] == race_name) & (self.imported_df['Tower Number'] == tower_number))]
-                self.imported_df = pd.concat([self.imported_df, tower_data], ignore_index=True)
-            else:
-                # Clear the fields if no original data is available
-                self.clear_tower_fields(self.towers[index])
-        else:
-            # Clear the fields if no data is imported
-            self.clear_tower_fields(self.towers[index])
-        self.calculate_all()
-
-
-
-    def populate_tower_fields(self, tower_fields, tower_row):
-        # Clear fields before populating
-        self.clear_tower_fields(tower_fields)
-
-        # Define default values for specific fields
-        default_values = {
-            'Utility Boost': 1.0,
-            'Slow %': 0,
-            'Spell DPS': 0,
-            'Spell DPS CD': 1,
-            'Poison': 0,
-            'Target Type': 'All'
-        }
-
-        # Populate fields
-        integer_fields = ['Damage', 'Full Splash', 'Med Splash', 'Small Splash']
-        for field in ['Name', 'Gold Cost', 'Damage', 'Dice', 'Sides', 'Cooldown', 'Range',
-                    'Full Splash', 'Med Splash', 'Small Splash', 'Spell DPS', 'Spell DPS CD',
-                    'Slow %', 'Utility Boost']:
-            value = tower_row.get(field, '')
-            if pd.isna(value) or value == 0 or value == 0.0:
-                value = ''
-            elif field in integer_fields:
-                value = str(int(round(value)))
-            elif field in default_values and float(value) == default_values[field]:
-                # Leave the field blank if it has the default value
-                value = ''
-            else:
-                value = str(value)
-
-            # Insert the value into the entry widget
-            tower_fields[field].insert(0, value)
-            # Ensure text color is white
-            tower_fields[field].configure(text_color="#FFFFFF" if value else "#FFFFFF")
-
-        # Set checkboxes and comboboxes
-        poison_value = tower_row.get('Poison', 0)
-        tower_fields['Poison'].set(int(poison_value))
-        target_type_value = tower_row.get('Target Type', 'All')
-        tower_fields['Target Type'].set(target_type_value)
-
-        for field, default in default_values.items():
-            entry_widget = tower_fields.get(field)
-            if entry_widget and hasattr(entry_widget, 'configure'):
-                if field in integer_fields or field in default_values:
-                    try:
-                        current_value = float(tower_row.get(field, default))
-                    except ValueError:
-                        current_value = default
-                    if current_value == default:
-                        entry_widget.configure(text_color="#FFFFFF")  # Grey color for default
-                    else:
-                        entry_widget.configure(text_color="#FFFFFF")  # White color for user-set values
-
-        # Update 'original_values' to reflect the current state
-        for field in ['Name', 'Gold Cost', 'Damage', 'Dice', 'Sides', 'Cooldown', 'Range',
-                    'Full Splash', 'Med Splash', 'Small Splash', 'Spell DPS', 'Spell DPS CD',
-                    'Slow %', 'Utility Boost', 'Poison', 'Target Type']:
-            if field in ['Poison', 'Target Type']:
-                tower_fields['original_values'][field] = tower_fields[field].get()
-            else:
-                val = tower_fields[field].get()
-                tower_fields['original_values'][field] = val if val else '0'
-
-
-    def clear_tower_fields(self, tower_fields):
-        fields_to_clear = [
-            'Name', 'Gold Cost', 'Damage', 'Dice', 'Sides', 'Cooldown', 'Range',
-            'Full Splash', 'Med Splash', 'Small Splash', 'Spell DPS', 'Spell DPS CD',
-            'Slow %', 'Utility Boost'
-        ]
-        for field in fields_to_clear:
-            entry_widget = tower_fields.get(field)
-            if entry_widget:
-                entry_widget.delete(0, ctk.END)
-
-        # Uncheck the Poison checkbox
-        poison_var = tower_fields.get('Poison')
-        if poison_var:
-            poison_var.set(0)
-
-        # Reset Target Type to default ('All')
-        target_type_var = tower_fields.get('Target Type')
-        if target_type_var:
-            target_type_var.set('All')
-
-        # Clear Z-Score and Percent Rank
-        # Assuming these are stored as attributes, adjust if stored differently
-        # Since Z-Score and Percent Rank are not part of the GUI fields, this step might be unnecessary
-
-
-    def navigate_entry(self, current_row, current_col, direction, event=None):
-        if direction == 'up':
-            if current_row > 0:
-                target_entry = self.towers[current_row - 1][self.get_field_by_col(current_col)]
-                target_entry.focus_set()
-        elif direction == 'down':
-            if current_row < len(self.towers) - 1:
-                target_entry = self.towers[current_row + 1][self.get_field_by_col(current_col)]
-                target_entry.focus_set()
-        elif direction == 'left':
-            entry = self.towers[current_row][self.get_field_by_col(current_col)]
-            if event and entry.index(ctk.INSERT) == 0:
-                if current_col > 0:
-                    target_entry = self.towers[current_row][self.get_field_by_col(current_col - 1)]
-                    target_entry.focus_set()
-                    target_entry.icursor(ctk.END)
-        elif direction == 'right':
-            entry = self.towers[current_row][self.get_field_by_col(current_col)]
-            if event and entry.index(ctk.INSERT) == len(entry.get()):
-                if current_col < len(self.headers) - 1:  # Adjusted to include 'Target Type'
-                    target_entry = self.towers[current_row][self.get_field_by_col(current_col + 1)]
-                    target_entry.focus_set()
-                    target_entry.icursor(0)
-
-    def get_field_by_col(self, col):
-        fields = ['Name', 'Gold Cost', 'Damage', 'Dice', 'Sides', 'Cooldown', 'Range',
-                  'Full Splash', 'Med Splash', 'Small Splash', 'Spell DPS', 'Spell DPS CD',
-                  'Slow %', 'Utility Boost']
-        if col < len(fields):
-            return fields[col]
-        elif col == len(fields):  # Poison
-            return 'Poison'
-        elif col == len(fields) + 1:  # Target Type
-            return 'Target Type'
-        # Remove 'Z-Score', 'Percent Rank', 'Balance Status' as they are not GUI fields
-        return None
-
-    def format_number(self, num):
-        if isinstance(num, float):
-            if num >= 100:
-                return str(int(round(num)))
-            elif num >= 10:
-                return f"{round(num,1):.1f}".rstrip('0').rstrip('.')
-            else:
-                return f"{round(num,2):.2f}".rstrip('0').rstrip('.')
-        else:
-            return str(num)
-
-    def _calculate_all_internal(self):
-        import pandas as pd
-        import numpy as np
-        from scipy import stats
-        import tkinter as tk
-        from tkinter import messagebox
-
-        # Clear previous results
-        self.result_text.configure(state=tk.NORMAL)
-        self.result_text.delete("1.0", "end")
-        self.result_text.configure(state=tk.DISABLED)
-
-        # Step 1: Collect current race's data from the GUI
-        selected_race = self.race_entry.get().strip()
-        if not selected_race:
-            messagebox.showerror("Calculation Error", "Please enter a race name.")
-            return
-
-        current_race_data = []
-        for i, tower in enumerate(self.towers):
-            # Check if essential fields are filled
-            if not tower['Name'].get().strip() and not tower['Damage'].get().strip():
-                continue  # Skip this tower if essential fields are empty
-            try:
-                tower_number = i + 1
-                base_damage = float(tower['Damage'].get() or 0)
-                dice = int(float(tower['Dice'].get() or 0))
-                sides = int(float(tower['Sides'].get() or 0))
-                cooldown = float(tower['Cooldown'].get() or 1)
-                cooldown = cooldown if cooldown != 0 else 1
-                range_val = int(float(tower['Range'].get() or 300))
-                full_splash = int(float(tower['Full Splash'].get() or 0))
-                medium_splash = int(float(tower['Med Splash'].get() or 0))
-                small_splash = int(float(tower['Small Splash'].get() or 0))
-                gold_cost = int(float(tower['Gold Cost'].get() or 1))
-                gold_cost = gold_cost if gold_cost != 0 else 1
-                spell_dps = float(tower['Spell DPS'].get() or 0)
-                spell_dps_cooldown = float(tower['Spell DPS CD'].get() or 1)
-                spell_dps_cooldown = spell_dps_cooldown if spell_dps_cooldown != 0 else 1
-                poison = tower['Poison'].get()
-                slow_percentage = float(tower['Slow %'].get() or 0)
-                utility_boost = float(tower['Utility Boost'].get() or 1.0)
-                utility_boost = utility_boost if utility_boost != 0 else 1.0
-                target_type = tower['Target Type'].get()
-                race = self.race_entry.get()
-
-                # Append to current_race_data
-                current_race_data.append({
-                    'Name': tower['Name'].get(),
-                    'Gold Cost': gold_cost,
-                    'Damage': base_damage,
-                    'Dice': dice,
-                    'Sides': sides,
-                    'Cooldown': cooldown,
-                    'Range': range_val,
-                    'Full Splash': full_splash,
-                    'Med Splash': medium_splash,
-                    'Small Splash': small_splash,
-                    'Spell DPS': spell_dps,
-                    'Spell DPS CD': spell_dps_cooldown,
-                    'Slow %': slow_percentage,
-                    'Utility Boost': utility_boost,
-                    'Poison': poison,
-                    'Target Type': target_type,
-                    'Race': selected_race,
-                    'Tower Number': tower_number
-                })
-            except ValueError as e:
-                self.display_result(f"Tower {i+1}: Invalid input - {e}", color="red")
-
-        # Step 2: Remove existing data for the selected race from imported_df
-        if not self.imported_df.empty:
-            self.imported_df = self.imported_df[self.imported_df['Race'] != selected_race]
-
-        # Step 3: Append current race's data to imported_df
-        if current_race_data:
-            df_current_race = pd.DataFrame(current_race_data)
-            self.imported_df = pd.concat([self.imported_df, df_current_race], ignore_index=True)
-
-        # Collect data from all imported towers across all races
-        all_tower_data = []
-        if not self.imported_df.empty:
-            for _, tower_row in self.imported_df.iterrows():
-                try:
-                    tower_number = int(tower_row.get('Tower Number', 0))
-                    base_damage = float(tower_row.get('Damage', 0) or 0)
-                    dice = int(float(tower_row.get('Dice', 0) or 0))
-                    sides = int(float(tower_row.get('Sides', 0) or 0))
-                    cooldown = float(tower_row.get('Cooldown', 1) or 1)
-                    if cooldown == 0:
-                        cooldown = 1
-                    range_val = int(float(tower_row.get('Range', 300) or 300))
-                    full_splash = int(float(tower_row.get('Full Splash', 0) or 0))
-                    medium_splash = int(float(tower_row.get('Med Splash', 0) or 0))
-                    small_splash = int(float(tower_row.get('Small Splash', 0) or 0))
-                    gold_cost = int(float(tower_row.get('Gold Cost', 1) or 1))
-                    if gold_cost == 0:
-                        gold_cost = 1
-                    spell_dps = float(tower_row.get('Spell DPS', 0) or 0)
-                    spell_dps_cooldown = float(tower_row.get('Spell DPS CD', 1) or 1)
-                    if spell_dps_cooldown == 0:
-                        spell_dps_cooldown = 1
-                    poison = tower_row.get('Poison', 0)
-                    slow_percentage = float(tower_row.get('Slow %', 0) or 0)
-                    utility_boost = float(tower_row.get('Utility Boost', 1.0) or 1.0)
-                    if utility_boost == 0:
-                        utility_boost = 1.0
-                    target_type = tower_row.get('Target Type', 'All')
-                    race = tower_row.get('Race', '')
-
-                    total_dps, dps_per_gold = self.calculate_dps_per_gold(
-                        base_damage, dice, sides, cooldown, range_val, full_splash,
-                        medium_splash, small_splash, gold_cost, spell_dps=spell_dps,
-                        spell_dps_cooldown=spell_dps_cooldown, poison=poison,
-                        utility_boost=utility_boost, slow_percentage=slow_percentage,
-                        target_type=target_type, include_splash=True)
-
-                    all_tower_data.append({
-                        'Tower Number': tower_number,
-                        'Total DPS': total_dps,
-                        'DPS per Gold': dps_per_gold,
-                        'Target Type': target_type,
-                        'Race': race
-                    })
-                except ValueError:
-                    continue
-
-        # Perform statistical analysis for dynamic balance ranges
-        df_all_towers = pd.DataFrame(all_tower_data)
-        if not df_all_towers.empty:
-            # Group by Tower Number and Target Type
-            grouped = df_all_towers.groupby(['Tower Number', 'Target Type'])
-            self.balance_ranges = {}
-            self.global_dps_per_gold_ranges = {}
-            self.global_raw_dps_ranges = {}
-            for (tower_num, target_type), group in grouped:
-                # Decide whether to ignore outliers
-                if self.dynamic_comparison_var.get() and self.ignore_outliers_var.get():
-                    # Exclude outliers using IQR
-                    Q1 = group['DPS per Gold'].quantile(0.25)
-                    Q3 = group['DPS per Gold'].quantile(0.75)
-                    IQR = Q3 - Q1
-                    filtered_group = group[(group['DPS per Gold'] >= Q1 - 1.5 * IQR) & (group['DPS per Gold'] <= Q3 + 1.5 * IQR)]
-                    if filtered_group.empty:
-                        filtered_group = group
-                else:
-                    filtered_group = group
-
-                mean_dps_per_gold = filtered_group['DPS per Gold'].mean()
-                std_dps_per_gold = filtered_group['DPS per Gold'].std(ddof=0)  # Population std
-                mean_total_dps = filtered_group['Total DPS'].mean()
-                std_total_dps = filtered_group['Total DPS'].std(ddof=0)
-
-                # Handle cases with zero std deviation
-                if std_dps_per_gold == 0:
-                    std_dps_per_gold = mean_dps_per_gold * 0.1  # Assume 10% variation
-                if std_total_dps == 0:
-                    std_total_dps = mean_total_dps * 0.1
-
-                # Define balance range as mean ± one standard deviation
-                low_range = mean_dps_per_gold - std_dps_per_gold
-                high_range = mean_dps_per_gold + std_dps_per_gold
-
-                # Scaling factor inversely proportional to tower number
-                scaling_factor = 1 / (tower_num ** 0.05)  # Implemented scaling_factor as per request
-                low_range *= scaling_factor
-                high_range *= scaling_factor
-
-                self.balance_ranges[(tower_num, target_type)] = (low_range, high_range)
-                self.global_dps_per_gold_ranges[(tower_num, target_type)] = (filtered_group['DPS per Gold'].min(), filtered_group['DPS per Gold'].max())
-                self.global_raw_dps_ranges[(tower_num, target_type)] = (filtered_group['Total DPS'].min(), filtered_group['Total DPS'].max())
-
-            # Calculate Z-Score and Percent Rank for each race, tower number, and target type
-            def calculate_z_score(x):
-                if len(x) > 1:
-                    return stats.zscore(x, ddof=0)
-                else:
-                    return np.array([0])
-
-            def calculate_percent_rank(x):
-                if len(x) > 1:
-                    return x.rank(pct=True) * 100
-                else:
-                    return np.array([50])
-
-            df_all_towers['Z-Score'] = grouped['DPS per Gold'].transform(calculate_z_score)
-            df_all_towers['Percent Rank'] = grouped['DPS per Gold'].transform(lambda x: x.rank(pct=True) * 100 if len(x) > 1 else np.full(len(x), 50))
-
-        # Prepare data for the towers in the current race
-        race_tower_data = []
-        for i, tower in enumerate(self.towers):
-            # Tower numbering starts from 1
-            tower_number = i + 1
-            # Check if essential fields are filled
-            if not tower['Name'].get().strip() and not tower['Damage'].get().strip():
-                continue  # Skip this tower if essential fields are empty
-            try:
-                base_damage = float(tower['Damage'].get() or 0)
-                dice = int(float(tower['Dice'].get() or 0))
-                sides = int(float(tower['Sides'].get() or 0))
-                cooldown = float(tower['Cooldown'].get() or 1)  # Avoid division by zero
-                if cooldown == 0:
-                    cooldown = 1
-                range_val = int(float(tower['Range'].get() or 300))
-                full_splash = int(float(tower['Full Splash'].get() or 0))
-                medium_splash = int(float(tower['Med Splash'].get() or 0))
-                small_splash = int(float(tower['Small Splash'].get() or 0))
-                gold_cost = int(float(tower['Gold Cost'].get() or 1))  # Avoid division by zero
-                if gold_cost == 0:
-                    gold_cost = 1
-                spell_dps = float(tower['Spell DPS'].get() or 0)
-                spell_dps_cooldown = float(tower['Spell DPS CD'].get() or 1)
-                if spell_dps_cooldown == 0:
-                    spell_dps_cooldown = 1
-                poison = tower['Poison'].get()
-                slow_percentage = float(tower['Slow %'].get() or 0)
-                utility_boost = float(tower['Utility Boost'].get() or 1.0)
-                if utility_boost == 0:
-                    utility_boost = 1.0
-                # Get the target type
-                target_type = tower['Target Type'].get()
-                race = self.race_entry.get()
-
-                # Decide which balance ranges to use
-                if self.dynamic_comparison_var.get():
-                    # Use dynamic balance ranges
-                    base_low, base_high = self.balance_ranges.get((tower_number, target_type), (0, 0))
-                else:
-                    # Use preset balance ranges
-                    base_low, base_high = self.preset_balance_ranges.get(tower_number, (0, 0))
-
-                # Get global ranges
-                global_dps_per_gold_min, global_dps_per_gold_max = self.global_dps_per_gold_ranges.get((tower_number, target_type), (0, 0))
-                global_raw_dps_min, global_raw_dps_max = self.global_raw_dps_ranges.get((tower_number, target_type), (0, 0))
-
-                # Get tower name
-                tower_name = tower['Name'].get()
-
-                if target_type == 'All':
-                    # Calculate total_dps and dps_per_gold as usual
-                    total_dps, dps_per_gold = self.calculate_dps_per_gold(
-                        base_damage, dice, sides, cooldown, range_val, full_splash,
-                        medium_splash, small_splash, gold_cost, spell_dps=spell_dps,
-                        spell_dps_cooldown=spell_dps_cooldown, poison=poison,
-                        utility_boost=utility_boost, slow_percentage=slow_percentage,
-                        target_type=target_type, include_splash=True)
-
-                    # Check if Z-Score exists for the tower in the selected race
-                    z_score_row = df_all_towers.loc[
-                        (df_all_towers['Tower Number'] == tower_number) &
-                        (df_all_towers['Target Type'] == target_type) &
-                        (df_all_towers['Race'] == selected_race),
-                        'Z-Score'
-                    ]
-
-                    # Only proceed if z_score_row is not empty
-                    if not z_score_row.empty:
-                        z_score = z_score_row.values[0]  # Get the first value
-                    else:
-                        z_score = 0  # Default to 0 if no result is found
-
-                    # Check if Percent Rank exists for the tower in the selected race
-                    percent_rank_row = df_all_towers.loc[
-                        (df_all_towers['Tower Number'] == tower_number) &
-                        (df_all_towers['Target Type'] == target_type) &
-                        (df_all_towers['Race'] == selected_race),
-                        'Percent Rank'
-                    ]
-
-                    # Only proceed if percent_rank_row is not empty
-                    if not percent_rank_row.empty:
-                        percent_rank = percent_rank_row.values[0]  # Get the first value
-                    else:
-                        percent_rank = 0  # Default to 0 if no result is found
-
-                    # **Check balance with all conditions (Updated Call)**
-                    balance_status = self.check_balance(dps_per_gold, base_low, base_high, z_score, percent_rank)
-
-                    # Format numbers
-                    dps_per_gold_str = self.format_number(dps_per_gold)
-                    total_dps_str = self.format_number(total_dps)
-                    balance_range_str = f"{self.format_number(base_low)} - {self.format_number(base_high)}"
-                    global_dps_per_gold_str = f"{self.format_number(global_dps_per_gold_min)} - {self.format_number(global_dps_per_gold_max)}"
-                    global_raw_dps_str = f"{self.format_number(global_raw_dps_min)} - {self.format_number(global_raw_dps_max)}"
-                    z_score_str = f"{round(z_score, 2)}"
-
-                    # **Round Percentile Rank to the nearest multiple of 5 (Updated Formatting)**
-                    percent_rank_rounded = int(round(percent_rank / 5.0)) * 5
-                    # Ensure the value is within 0-100%
-                    percent_rank_rounded = max(0, min(percent_rank_rounded, 100))
-                    percent_rank_str = f"{percent_rank_rounded}%"
-
-                    # Prepare data for display
-                    race_tower_data.append({
-                        'Tower Number': tower_number,
-                        'Tower Name': tower_name,
-                        'DPS per Gold': dps_per_gold_str,
-                        'Balance Status': balance_status,
-                        'Balance Range': balance_range_str,
-                        'Z-Score': z_score_str,          # Added
-                        'Percent Rank': percent_rank_str, # Added
-                        'Raw DPS': total_dps_str,
-                        'Target': target_type,
-                        'Global DPS per Gold': global_dps_per_gold_str,
-                        'Global Raw DPS': global_raw_dps_str
-                    })
-
-                elif target_type == 'Ground Splash':
-                    # **Primary Variant: Ground Splash with 1.25x 'All' balance range and splash damage**
-                    
-                    # Retrieve the 'All' target balance range for the current tower
-                    all_balance = self.balance_ranges.get((tower_number, 'All'), None)
-                    
-                    if all_balance and all_balance != (0, 0):
-                        all_low, all_high = all_balance
-                        # Adjust balance ranges (1.25x 'All' balance range)
-                        adjusted_low_ground = all_low * 1.25
-                        adjusted_high_ground = all_high * 1.25
-                    else:
-                        # Use own balance range without scaling
-                        adjusted_low_ground, adjusted_high_ground = self.balance_ranges.get((tower_number, target_type), (0, 0))
-
-                    # Calculate DPS and DPS per Gold for Ground Splash
-                    total_dps_ground, dps_per_gold_ground = self.calculate_dps_per_gold(
-                        base_damage, dice, sides, cooldown, range_val, full_splash,
-                        medium_splash, small_splash, gold_cost, spell_dps=spell_dps,
-                        spell_dps_cooldown=spell_dps_cooldown, poison=poison,
-                        utility_boost=utility_boost, slow_percentage=slow_percentage,
-                        target_type=target_type, include_splash=True)
-
-                    # Check if Z-Score exists for the tower in the selected race
-                    z_score_ground_row = df_all_towers.loc[
-                        (df_all_towers['Tower Number'] == tower_number) &
-                        (df_all_towers['Target Type'] == target_type) &
-                        (df_all_towers['Race'] == selected_race),
-                        'Z-Score'
-                    ]
-
-                    if not z_score_ground_row.empty:
-                        z_score_ground = z_score_ground_row.values[0]
-                    else:
-                        z_score_ground = 0
-
-                    # Check if Percent Rank exists for the tower in the selected race
-                    percent_rank_ground_row = df_all_towers.loc[
-                        (df_all_towers['Tower Number'] == tower_number) &
-                        (df_all_towers['Target Type'] == target_type) &
-                        (df_all_towers['Race'] == selected_race),
-                        'Percent Rank'
-                    ]
-
-                    if not percent_rank_ground_row.empty:
-                        percent_rank_ground = percent_rank_ground_row.values[0]
-                    else:
-                        percent_rank_ground = 0
-
-                    # **Round Percentile Rank to the nearest multiple of 5 (Updated Formatting)**
-                    percent_rank_ground_rounded = int(round(percent_rank_ground / 5.0)) * 5
-                    percent_rank_ground_rounded = max(0, min(percent_rank_ground_rounded, 100))
-                    percent_rank_ground_str = f"{percent_rank_ground_rounded}%"
-
-                    # **Check balance with all conditions (Updated Call)**
-                    balance_status_ground = self.check_balance(
-                        dps_per_gold_ground, adjusted_low_ground, adjusted_high_ground, z_score_ground, percent_rank_ground)
-
-                    # Format numbers
-                    dps_per_gold_ground_str = self.format_number(dps_per_gold_ground)
-                    total_dps_ground_str = self.format_number(total_dps_ground)
-                    balance_range_ground_str = f"{self.format_number(adjusted_low_ground)} - {self.format_number(adjusted_high_ground)}"
-                    global_dps_per_gold_str = f"{self.format_number(global_dps_per_gold_min)} - {self.format_number(global_dps_per_gold_max)}"
-                    global_raw_dps_str = f"{self.format_number(global_raw_dps_min)} - {self.format_number(global_raw_dps_max)}"
-                    z_score_ground_str = f"{round(z_score_ground, 2)}"
-
-                    # **Prepare data for display (Ground Splash)**
-                    race_tower_data.append({
-                        'Tower Number': tower_number,
-                        'Tower Name': tower_name + " (Ground Splash)",
-                        'DPS per Gold': dps_per_gold_ground_str,
-                        'Balance Status': balance_status_ground,
-                        'Balance Range': balance_range_ground_str,
-                        'Z-Score': z_score_ground_str,          # Added
-                        'Percent Rank': percent_rank_ground_str, # Added
-                        'Raw DPS': total_dps_ground_str,
-                        'Target': target_type,
-                        'Global DPS per Gold': global_dps_per_gold_str,
-                        'Global Raw DPS': global_raw_dps_str
-                    })
-
-                    # **Secondary Variant: Air with 0.75x 'All' balance range and no splash damage**
-                    # Retrieve the 'All' target balance range for the current tower
-                    all_balance_air = self.balance_ranges.get((tower_number, 'All'), None)
-                    
-                    if all_balance_air and all_balance_air != (0, 0):
-                        all_low_air, all_high_air = all_balance_air
-                        # Adjust balance ranges (0.5x 'All' balance range)
-                        adjusted_low_air = all_low_air * 0.75
-                        adjusted_high_air = all_high_air * 0.75
-                    else:
-                        # Use own balance range without scaling
-                        adjusted_low_air, adjusted_high_air = self.balance_ranges.get((tower_number, 'Air'), (0, 0))
-
-                    # Calculate DPS and DPS per Gold for Air variant
-                    total_dps_air, dps_per_gold_air = self.calculate_dps_per_gold(
-                        base_damage, dice, sides, cooldown, range_val, 0, 0, 0, gold_cost, spell_dps=spell_dps,
-                        spell_dps_cooldown=spell_dps_cooldown, poison=poison,
-                        utility_boost=utility_boost, slow_percentage=slow_percentage,
-                        target_type='Air', include_splash=False)
-
-                    # Check if Z-Score exists for the tower in the selected race
-                    z_score_air_row = df_all_towers.loc[
-                        (df_all_towers['Tower Number'] == tower_number) &
-                        (df_all_towers['Target Type'] == 'Air') &
-                        (df_all_towers['Race'] == selected_race),
-                        'Z-Score'
-                    ]
-
-                    if not z_score_air_row.empty:
-                        z_score_air = z_score_air_row.values[0]
-                    else:
-                        z_score_air = 0
-
-                    # Check if Percent Rank exists for the tower in the selected race
-                    percent_rank_air_row = df_all_towers.loc[
-                        (df_all_towers['Tower Number'] == tower_number) &
-                        (df_all_towers['Target Type'] == 'Air') &
-                        (df_all_towers['Race'] == selected_race),
-                        'Percent Rank'
-                    ]
-
-                    if not percent_rank_air_row.empty:
-                        percent_rank_air = percent_rank_air_row.values[0]
-                    else:
-                        percent_rank_air = 50
-
-                    # **Round Percentile Rank to the nearest multiple of 5 (Updated Formatting)**
-                    percent_rank_air_rounded = int(round(percent_rank_air / 5.0)) * 5
-                    percent_rank_air_rounded = max(0, min(percent_rank_air_rounded, 100))
-                    percent_rank_air_str = f"{percent_rank_air_rounded}%"
-
-                    # **Check balance with all conditions (Updated Call)**
-                    balance_status_air = self.check_balance(
-                        dps_per_gold_air, adjusted_low_air, adjusted_high_air, z_score_air, percent_rank_air)
-
-                    # Format numbers
-                    dps_per_gold_air_str = self.format_number(dps_per_gold_air)
-                    total_dps_air_str = self.format_number(total_dps_air)
-                    balance_range_air_str = f"{self.format_number(adjusted_low_air)} - {self.format_number(adjusted_high_air)}"
-                    global_dps_per_gold_str = f"{self.format_number(global_dps_per_gold_min)} - {self.format_number(global_dps_per_gold_max)}"
-                    global_raw_dps_str = f"{self.format_number(global_raw_dps_min)} - {self.format_number(global_raw_dps_max)}"
-                    z_score_air_str = f"{round(z_score_air, 2)}"
-
-                    # **Prepare data for display (Air Variant)**
-                    race_tower_data.append({
-                        'Tower Number': tower_number,
-                        'Tower Name': tower_name + " (Air)",
-                        'DPS per Gold': dps_per_gold_air_str,
-                        'Balance Status': balance_status_air,
-                        'Balance Range': balance_range_air_str,
-                        'Z-Score': z_score_air_str,          # Added
-                        'Percent Rank': percent_rank_air_str, # Added
-                        'Raw DPS': total_dps_air_str,
-                        'Target': 'Air',
-                        'Global DPS per Gold': global_dps_per_gold_str,
-                        'Global Raw DPS': global_raw_dps_str
-                    })
-
-                elif target_type == 'Air Splash':
-                    # **Primary Variant: Air Splash with 1.25x 'All' balance range and splash damage**
-                    
-                    # Retrieve the 'All' target balance range for the current tower
-                    all_balance = self.balance_ranges.get((tower_number, 'All'), None)
-                    
-                    if all_balance and all_balance != (0, 0):
-                        all_low, all_high = all_balance
-                        # Adjust balance ranges (1.25x 'All' balance range)
-                        adjusted_low_air_splash = all_low * 1.25
-                        adjusted_high_air_splash = all_high * 1.25
-                    else:
-                        # Use own balance range without scaling
-                        adjusted_low_air_splash, adjusted_high_air_splash = self.balance_ranges.get((tower_number, target_type), (0, 0))
-
-                    # Calculate DPS and DPS per Gold for Air Splash
-                    total_dps_air_splash, dps_per_gold_air_splash = self.calculate_dps_per_gold(
-                        base_damage, dice, sides, cooldown, range_val, full_splash,
-                        medium_splash, small_splash, gold_cost, spell_dps=spell_dps,
-                        spell_dps_cooldown=spell_dps_cooldown, poison=poison,
-                        utility_boost=utility_boost, slow_percentage=slow_percentage,
-                        target_type=target_type, include_splash=True)
-
-                    # Check if Z-Score exists for the tower in the selected race
-                    z_score_air_splash_row = df_all_towers.loc[
-                        (df_all_towers['Tower Number'] == tower_number) &
-                        (df_all_towers['Target Type'] == target_type) &
-                        (df_all_towers['Race'] == selected_race),
-                        'Z-Score'
-                    ]
-
-                    if not z_score_air_splash_row.empty:
-                        z_score_air_splash = z_score_air_splash_row.values[0]
-                    else:
-                        z_score_air_splash = 0
-
-                    # Check if Percent Rank exists for the tower in the selected race
-                    percent_rank_air_splash_row = df_all_towers.loc[
-                        (df_all_towers['Tower Number'] == tower_number) &
-                        (df_all_towers['Target Type'] == target_type) &
-                        (df_all_towers['Race'] == selected_race),
-                        'Percent Rank'
-                    ]
-
-                    if not percent_rank_air_splash_row.empty:
-                        percent_rank_air_splash = percent_rank_air_splash_row.values[0]
-                    else:
-                        percent_rank_air_splash = 0
-
-                    # **Round Percentile Rank to the nearest multiple of 5 (Updated Formatting)**
-                    percent_rank_air_splash_rounded = int(round(percent_rank_air_splash / 5.0)) * 5
-                    percent_rank_air_splash_rounded = max(0, min(percent_rank_air_splash_rounded, 100))
-                    percent_rank_air_splash_str = f"{percent_rank_air_splash_rounded}%"
-
-                    # **Check balance with all conditions (Updated Call)**
-                    balance_status_air_splash = self.check_balance(
-                        dps_per_gold_air_splash, adjusted_low_air_splash, adjusted_high_air_splash, z_score_air_splash, percent_rank_air_splash)
-
-                    # Format numbers
-                    dps_per_gold_air_splash_str = self.format_number(dps_per_gold_air_splash)
-                    total_dps_air_splash_str = self.format_number(total_dps_air_splash)
-                    balance_range_air_splash_str = f"{self.format_number(adjusted_low_air_splash)} - {self.format_number(adjusted_high_air_splash)}"
-                    global_dps_per_gold_str = f"{self.format_number(global_dps_per_gold_min)} - {self.format_number(global_dps_per_gold_max)}"
-                    global_raw_dps_str = f"{self.format_number(global_raw_dps_min)} - {self.format_number(global_raw_dps_max)}"
-                    z_score_air_splash_str = f"{round(z_score_air_splash, 2)}"
-
-                    # **Prepare data for display (Air Splash)**
-                    race_tower_data.append({
-                        'Tower Number': tower_number,
-                        'Tower Name': tower_name + " (Air Splash)",
-                        'DPS per Gold': dps_per_gold_air_splash_str,
-                        'Balance Status': balance_status_air_splash,
-                        'Balance Range': balance_range_air_splash_str,
-                        'Z-Score': z_score_air_splash_str,          # Added
-                        'Percent Rank': percent_rank_air_splash_str, # Added
-                        'Raw DPS': total_dps_air_splash_str,
-                        'Target': target_type,
-                        'Global DPS per Gold': global_dps_per_gold_str,
-                        'Global Raw DPS': global_raw_dps_str
-                    })
-
-                    # **Secondary Variant: Ground (Ignoring Splash Damage)**
-                    # Retrieve the 'All' target balance range for the current tower
-                    all_balance_ground_variant = self.balance_ranges.get((tower_number, 'All'), None)
-                    
-                    if all_balance_ground_variant and all_balance_ground_variant != (0, 0):
-                        all_low_ground_variant, all_high_ground_variant = all_balance_ground_variant
-                        # Adjust balance ranges (0.75x 'All' balance range)
-                        adjusted_low_ground_variant = all_low_ground_variant * 0.75
-                        adjusted_high_ground_variant = all_high_ground_variant * 0.75
-                    else:
-                        # Use own balance range without scaling
-                        adjusted_low_ground_variant, adjusted_high_ground_variant = self.balance_ranges.get((tower_number, 'Ground'), (0, 0))
-
-                    # Calculate DPS and DPS per Gold for Ground Variant
-                    total_dps_ground_variant, dps_per_gold_ground_variant = self.calculate_dps_per_gold(
-                        base_damage, dice, sides, cooldown, range_val, 0, 0, 0, gold_cost,
-                        spell_dps=spell_dps, spell_dps_cooldown=spell_dps_cooldown,
-                        poison=poison, utility_boost=utility_boost,
-                        slow_percentage=slow_percentage, target_type='Ground',
-                        include_splash=False)
-
-                    # Check if Z-Score exists for the tower in the selected race
-                    z_score_ground_variant_row = df_all_towers.loc[
-                        (df_all_towers['Tower Number'] == tower_number) &
-                        (df_all_towers['Target Type'] == 'Ground') &
-                        (df_all_towers['Race'] == selected_race),
-                        'Z-Score'
-                    ]
-
-                    if not z_score_ground_variant_row.empty:
-                        z_score_ground_variant = z_score_ground_variant_row.values[0]
-                    else:
-                        z_score_ground_variant = 0
-
-                    # Check if Percent Rank exists for the tower in the selected race
-                    percent_rank_ground_variant_row = df_all_towers.loc[
-                        (df_all_towers['Tower Number'] == tower_number) &
-                        (df_all_towers['Target Type'] == 'Ground') &
-                        (df_all_towers['Race'] == selected_race),
-                        'Percent Rank'
-                    ]
-
-                    if not percent_rank_ground_variant_row.empty:
-                        percent_rank_ground_variant = percent_rank_ground_variant_row.values[0]
-                    else:
-                        percent_rank_ground_variant = 50
-
-                    # **Round Percentile Rank to the nearest multiple of 5 (Updated Formatting)**
-                    percent_rank_ground_variant_rounded = int(round(percent_rank_ground_variant / 5.0)) * 5
-                    percent_rank_ground_variant_rounded = max(0, min(percent_rank_ground_variant_rounded, 100))
-                    percent_rank_ground_variant_str = f"{percent_rank_ground_variant_rounded}%"
-
-                    # **Check balance with all conditions (Updated Call)**
-                    balance_status_ground_variant = self.check_balance(
-                        dps_per_gold_ground_variant, adjusted_low_ground_variant, adjusted_high_ground_variant, z_score_ground_variant, percent_rank_ground_variant)
-
-                    # Format numbers
-                    dps_per_gold_ground_variant_str = self.format_number(dps_per_gold_ground_variant)
-                    total_dps_ground_variant_str = self.format_number(total_dps_ground_variant)
-                    balance_range_ground_variant_str = f"{self.format_number(adjusted_low_ground_variant)} - {self.format_number(adjusted_high_ground_variant)}"
-                    global_dps_per_gold_str = f"{self.format_number(global_dps_per_gold_min)} - {self.format_number(global_dps_per_gold_max)}"
-                    global_raw_dps_str = f"{self.format_number(global_raw_dps_min)} - {self.format_number(global_raw_dps_max)}"
-                    z_score_ground_variant_str = f"{round(z_score_ground_variant, 2)}"
-
-                    # **Prepare data for display (Ground Variant)**
-                    race_tower_data.append({
-                        'Tower Number': tower_number,
-                        'Tower Name': tower_name + " (Ground)",
-                        'DPS per Gold': dps_per_gold_ground_variant_str,
-                        'Balance Status': balance_status_ground_variant,
-                        'Balance Range': balance_range_ground_variant_str,
-                        'Z-Score': z_score_ground_variant_str,          # Added
-                        'Percent Rank': percent_rank_ground_variant_str, # Added
-                        'Raw DPS': total_dps_ground_variant_str,
-                        'Target': 'Ground',
-                        'Global DPS per Gold': global_dps_per_gold_str,
-                        'Global Raw DPS': global_raw_dps_str
-                    })
-
-                else:
-                    # Handle unexpected target types
-                    continue
-
-            except ValueError as e:
-                self.display_result(f"Tower {tower_number}: Invalid - {e}", color="red")
-
-        # Adjust format_string to reflect the new order and alignment
-        format_string = "{:<6} {:<30} {:<12} {:<15} {:<15} {:<10} {:<10} {:<12} {:<15} {:<15} {:<15}"
-
-        # Insert the header at the beginning of the result box
-        header = format_string.format(
-            "Tower", "Name", "DPS/Gold", "Status", "Balance Range", "Z-Score", "Rank", "Raw DPS",
-            "Target", "Global DPS/Gold", "Global Raw DPS"
-        )
-        self.display_result(header, color="#00FFFF", bold=True)
-        self.display_result("-" * 160, color="black")
-
-        # Display the results
-        for data in race_tower_data:
-            # Determine the color based on Balance Status
-            if data['Balance Status'] == "Balanced":
-                color = "green"
-            elif data['Balance Status'] in ["Underpowered", "Overpowered"]:
-                color = "red"
-            else:
-                color = "yellow"  # For outliers or undefined statuses
-
-            result_line = format_string.format(
-                data['Tower Number'],
-                data['Tower Name'],
-                data['DPS per Gold'],
-                data['Balance Status'],
-                data['Balance Range'],
-                data['Z-Score'],
-                data['Percent Rank'],
-                data['Raw DPS'],
-                data['Target'],
-                data['Global DPS per Gold'],
-                data['Global Raw DPS']
-            )
-            self.display_result(result_line, color=color)
-
-        # Append Outlier Section with Race context
-        outliers_low = df_all_towers[df_all_towers['DPS per Gold'] < df_all_towers.groupby(['Tower Number', 'Target Type'])['DPS per Gold'].transform(lambda x: x.quantile(0.05))]
-        outliers_high = df_all_towers[df_all_towers['DPS per Gold'] > df_all_towers.groupby(['Tower Number', 'Target Type'])['DPS per Gold'].transform(lambda x: x.quantile(0.95))]
-
-        # Create a set of (Tower Number, Target Type, Race) tuples that are outliers
-        outliers_low_set = set(zip(outliers_low['Tower Number'], outliers_low['Target Type'], outliers_low['Race']))
-        outliers_high_set = set(zip(outliers_high['Tower Number'], outliers_high['Target Type'], outliers_high['Race']))
-        all_outliers = outliers_low_set | outliers_high_set
-
-        if not outliers_low.empty or not outliers_high.empty:
-            self.display_result("\n" + "="*160, color="black")
-            self.display_result("Outlier Analysis:", color="#FFFF00", bold=True)
-
-            # Display low-end outliers
-            if not outliers_low.empty:
-                self.display_result("\nLow-End Outliers:", color="red", bold=True)
-                for _, row in outliers_low.iterrows():
-                    tower_info = f"Tower {row['Tower Number']} ("
-                    race_info = f"{row['Race']}"
-                    target_type = f", {row['Target Type']}) - "
-                    dps_gold = f"DPS/Gold: {self.format_number(row['DPS per Gold'])}"
-                    balance_range = self.balance_ranges.get((row['Tower Number'], row['Target Type']), (0, 0))
-                    balance_info = f" (Balance Range: {self.format_number(balance_range[0])} - {self.format_number(balance_range[1])})"
-                    
-                    # Define segments with desired colors
-                    segments = [
-                        (tower_info, "#4DA6FF", True),       # Tower Info in Dark Turquoise
-                        (race_info, "#FFD966", True),        # Race Name in Light Blue
-                        (target_type, "#00CED1"),            # Target Type in Dark Turquoise
-                        (dps_gold, "red" if row['DPS per Gold'] < balance_range[0] else "green"),  # DPS/Gold in Red or Green
-                        (balance_info, "#A0A0A0")            # Balance Range in Light Gray
-                    ]
-                    self.display_colored_line(segments)
-
-            # Display high-end outliers
-            if not outliers_high.empty:
-                self.display_result("\nHigh-End Outliers:", color="red", bold=True)
-                for _, row in outliers_high.iterrows():
-                    tower_info = f"Tower {row['Tower Number']} ("
-                    race_info = f"{row['Race']}"
-                    target_type = f", {row['Target Type']}) - "
-                    dps_gold = f"DPS/Gold: {self.format_number(row['DPS per Gold'])}"
-                    balance_range = self.balance_ranges.get((row['Tower Number'], row['Target Type']), (0, 0))
-                    balance_info = f" (Balance Range: {self.format_number(balance_range[0])} - {self.format_number(balance_range[1])})"
-                    
-                    # Define segments with desired colors
-                    segments = [
-                        (tower_info, "#4DA6FF", True),       # Tower Info in Dark Turquoise
-                        (race_info, "#FFD966", True),        # Race Name in Light Blue
-                        (target_type, "#00CED1"),            # Target Type in Dark Turquoise
-                        (dps_gold, "red" if row['DPS per Gold'] > balance_range[1] else "green"),  # DPS/Gold in Red or Green
-                        (balance_info, "#A0A0A0")            # Balance Range in Light Gray
-                    ]
-                    self.display_colored_line(segments)
-
-        # Step 2: Update color-coding logic based on outlier status
-        for data in race_tower_data:
-            tower_number = data['Tower Number']
-            target_type = data['Target']
-            balance_status = data['Balance Status']
-            is_outlier = (tower_number, target_type, race) in all_outliers  # Check if tower is an outlier
-
-            # Get the tower number label for the respective tower
-            tower_label = self.towers[tower_number - 1]['No.']
-            
-            # Set color based on outlier flag and balance status
-            if is_outlier:
-                color = "#FFFF00"  # Yellow for outliers
-            elif balance_status == "Balanced":
-                color = "#00D1A0"  # Green for Balanced
-            elif balance_status in ["Underpowered", "Overpowered"]:
-                color = "#FF4C4C"  # Red for Underpowered or Overpowered
-            else:
-                color = "white"  # Default color for undefined statuses
-
-            # Update the tower number label color and make it bold
-            tower_label.configure(text_color=color, font=("Arial", 13, "bold"))
-
-        # After inserting text, scroll back to the top
-        self.result_text.yview_moveto(0)
-        self.result_text.configure(state=tk.DISABLED)
-
-        # Initialize outlier_analysis_segments
-        self.outlier_analysis_segments = []
-        self.outlier_analysis_segments.append([("Outlier Analysis:\n", "#FFFF00", True)])  # Use a list of segments for each line
-
-        # Low-End Outliers
-        if not outliers_low.empty:
-            self.outlier_analysis_segments.append([("\nLow-End Outliers:\n", "red", True)])
-            for _, row in outliers_low.iterrows():
-                tower_info = f"Tower {row['Tower Number']} ("
-                race_info = f"{row['Race']}"
-                target_type = f", {row['Target Type']}) - "
-                dps_gold = f"DPS/Gold: {self.format_number(row['DPS per Gold'])}"
-                balance_range = self.balance_ranges.get((row['Tower Number'], row['Target Type']), (0, 0))
-                balance_info = f" (Balance Range: {self.format_number(balance_range[0])} - {self.format_number(balance_range[1])})\n"
-
-                # Define segments with desired colors
-                segments = [
-                    (tower_info, "#4DA6FF", True),       # Tower Info in Dark Turquoise, bold
-                    (race_info, "#FFD966", True),        # Race Name in Light Blue, bold
-                    (target_type, "#00CED1"),            # Target Type in Dark Turquoise
-                    (dps_gold, "red" if row['DPS per Gold'] < balance_range[0] else "green"),  # DPS/Gold in Red or Green
-                    (balance_info, "#A0A0A0")            # Balance Range in Light Gray
-                ]
-                self.outlier_analysis_segments.append(segments)
-
-        # High-End Outliers
-        if not outliers_high.empty:
-            self.outlier_analysis_segments.append([("\nHigh-End Outliers:\n", "red", True)])
-            for _, row in outliers_high.iterrows():
-                tower_info = f"Tower {row['Tower Number']} ("
-                race_info = f"{row['Race']}"
-                target_type = f", {row['Target Type']}) - "
-                dps_gold = f"DPS/Gold: {self.format_number(row['DPS per Gold'])}"
-                balance_range = self.balance_ranges.get((row['Tower Number'], row['Target Type']), (0, 0))
-                balance_info = f" (Balance Range: {self.format_number(balance_range[0])} - {self.format_number(balance_range[1])})\n"
-
-                # Define segments with desired colors
-                segments = [
-                    (tower_info, "#4DA6FF", True),       # Tower Info in Dark Turquoise, bold
-                    (race_info, "#FFD966", True),        # Race Name in Light Blue, bold
-                    (target_type, "#00CED1"),            # Target Type in Dark Turquoise
-                    (dps_gold, "red" if row['DPS per Gold'] > balance_range[1] else "green"),  # DPS/Gold in Red or Green
-                    (balance_info, "#A0A0A0")            # Balance Range in Light Gray
-                ]
-                self.outlier_analysis_segments.append(segments)
-
-        # Now compute Race Difficulty Levels using weighted factors
-        if not self.imported_df.empty:
-            df_all_towers = self.imported_df.copy()
-            df_all_towers['Gold Cost'] = df_all_towers['Gold Cost'].astype(float)
-            df_all_towers['Range'] = df_all_towers['Range'].astype(float)
-            df_all_towers['Utility Boost'] = df_all_towers['Utility Boost'].astype(float)
-            df_all_towers['Full Splash'] = df_all_towers['Full Splash'].astype(float)
-            df_all_towers['Med Splash'] = df_all_towers['Med Splash'].astype(float)
-            df_all_towers['Small Splash'] = df_all_towers['Small Splash'].astype(float)
-            df_all_towers['Slow %'] = df_all_towers['Slow %'].astype(float)
-            df_all_towers['Spell DPS'] = df_all_towers['Spell DPS'].astype(float)
-        
-            # Calculate Total DPS and DPS per Gold
-            df_all_towers['Total DPS'] = df_all_towers.apply(lambda row: self.calculate_dps_per_gold(
-                float(row.get('Damage', 0) or 0),
-                int(float(row.get('Dice', 0) if pd.notnull(row.get('Dice')) else 0)),
-                int(float(row.get('Sides', 0) if pd.notnull(row.get('Sides')) else 0)),
-                float(row.get('Cooldown', 1) or 1),
-                int(float(row.get('Range', 300) if pd.notnull(row.get('Range')) else 300)),
-                int(float(row.get('Full Splash', 0) if pd.notnull(row.get('Full Splash')) else 0)),
-                int(float(row.get('Med Splash', 0) if pd.notnull(row.get('Med Splash')) else 0)),
-                int(float(row.get('Small Splash', 0) if pd.notnull(row.get('Small Splash')) else 0)),
-                float(row.get('Gold Cost', 1) or 1),
-                spell_dps=float(row.get('Spell DPS', 0) or 0),
-                spell_dps_cooldown=float(row.get('Spell DPS CD', 1) or 1),
-                poison=row.get('Poison', 0),
-                utility_boost=float(row.get('Utility Boost', 1.0) if pd.notnull(row.get('Utility Boost')) else 1.0),
-                slow_percentage=float(row.get('Slow %', 0) if pd.notnull(row.get('Slow %')) else 0),
-                target_type=row.get('Target Type', 'All'),
-                include_splash=True
-            )[0], axis=1)
-            df_all_towers['DPS per Gold'] = df_all_towers['Total DPS'] / df_all_towers['Gold Cost'] * 100
-
-            # Compute 'Splash Factor' as a sum of splash radii
-            df_all_towers['Splash'] = df_all_towers['Full Splash'] + df_all_towers['Med Splash'] + df_all_towers['Small Splash']
-
-            # Now, for each factor, normalize the values between 0 and 1
-            factors = ['DPS per Gold', 'Total DPS', 'Range', 'Utility Boost', 'Splash', 'Slow %', 'Spell DPS']
-            for factor in factors:
-                min_value = df_all_towers[factor].min()
-                max_value = df_all_towers[factor].max()
-                if max_value - min_value == 0:
-                    df_all_towers[factor + '_Norm'] = 0.5  # Default to 0.5 if no variation
-                else:
-                    df_all_towers[factor + '_Norm'] = (df_all_towers[factor] - min_value) / (max_value - min_value)
-            
-            # Define weights for each factor
-            weights = {
-                'DPS per Gold_Norm': 0.2,
-                'Total DPS_Norm': 0.2,
-                'Range_Norm': 0.2,
-                'Utility Boost_Norm': 0.1,
-                'Splash_Norm': 0.2,
-                'Slow %_Norm': 0.1,
-            }
-            
-            # Compute weighted score for each tower
-            df_all_towers['Weighted Score'] = 0
-            for factor, weight in weights.items():
-                df_all_towers['Weighted Score'] += df_all_towers[factor] * weight
-
-            # Now compute average score per race
-            race_difficulty = df_all_towers.groupby('Race')['Weighted Score'].mean().reset_index()
-
-            # Normalize the average scores to a scale of 1 to 10
-            min_score = race_difficulty['Weighted Score'].min()
-            max_score = race_difficulty['Weighted Score'].max()
-
-            def map_difficulty(score):
-                if max_score - min_score == 0:
-                    return 5  # Default difficulty if no variation
-                else:
-                    normalized = (score - min_score) / (max_score - min_score)
-                    inverted_score = 1 - normalized # adjusts difficulty from the perspective of the player instead of the opponent
-                    return int(round(inverted_score * 9 + 1))  # Map to 1-10 scale
-
-            race_difficulty['Difficulty'] = race_difficulty['Weighted Score'].apply(map_difficulty)
-
-            # Append Race Difficulty Levels to outlier_analysis_segments
-            self.outlier_analysis_segments.append([("\nRace Difficulty Levels:\n", "#FFFF00", True)])  # Yellow color, bold
-
-            # Sort the races alphabetically
-            race_difficulty = race_difficulty.sort_values('Race')
-
-            for _, row in race_difficulty.iterrows():
-                race_name = row['Race']
-                difficulty = row['Difficulty']
-                difficulty_str = f"Difficulty Level {difficulty}"
-
-                # Determine color for difficulty level
-                if 1 <= difficulty <= 3:
-                    difficulty_color = "green"
-                elif 4 <= difficulty <= 7:
-                    difficulty_color = "orange"
-                elif 8 <= difficulty <= 10:
-                    difficulty_color = "red"
-                else:
-                    difficulty_color = "white"  # Default color
-
-                # Build the segments
-                segments = [
-                    (race_name, "#FFD966", True),  # Race Name in #FFD966, bold
-                    (": ", "white"),
-                    (difficulty_str, difficulty_color),
-                    ("\n", "white")
-                ]
-                self.outlier_analysis_segments.append(segments)
-        else:
-            # If imported_df is empty, display message
-            self.outlier_analysis_segments.append([("Import data or add races to view outlier analysis and race difficulty levels.\n", "white")])
-
-        self.changes_report = self.generate_changes_report()
-        #self.update_view_changes_tab()
-        #self.update_analysis_window()
-        try:
-            if hasattr(self, 'analysis_text') and self.analysis_text.winfo_exists() and self.analysis_text.winfo_ismapped():
-                self.update_analysis_window()
-        except tk.TclError:
-            # Widget no longer exists, skip updating
-            pass
-
-        # Safely check if the View Changes tab is open and update if necessary
-        try:
-            if hasattr(self, 'view_changes_text') and self.view_changes_text.winfo_exists() and self.view_changes_text.winfo_ismapped():
-                # Regenerate the changes report if needed
-                self.changes_report = self.generate_changes_report()
-                self.update_view_changes_tab()
-        except tk.TclError:
-            # Widget no longer exists, skip updating
-            pass
-
-        # **Update the "Generate Tooltips" tab if it's open**
-        try:
-            if hasattr(self, 'generate_tooltips_tab') and self.generate_tooltips_tab.winfo_exists():
-                self.update_generate_tooltips()
-        except Exception as e:
-            print(f"Error updating tooltips: {e}")
-            pass
-
-        self.calculate_all_after_id = None
-
-    def calculate_all(self):
-        if self.calculate_all_after_id:
-                self.root.after_cancel(self.calculate_all_after_id)
-        self.calculate_all_after_id = self.root.after(200, self._calculate_all_internal)
-
-    def run_calculate_all(self):
-        # Ensure calculate all runs on the main thread using after timer. Prevents TKinter issues
-        self.root.after(0, self.calculate_all)
-
-    def display_colored_line(self, segments):
-        """
-        Inserts a line into the result_text with multiple colored segments, with optional bold styling.
-
-        Parameters:
-        - segments (list of tuples): Each tuple contains (text, color, bold).
-        """
-        # Enable the text widget to insert content
-        self.result_text.configure(state=tk.NORMAL)
-        
-        # Insert each segment with its respective color and bold option
-        for segment in segments:
-            if len(segment) == 3:
-                text, color, bold = segment
-            else:
-                text, color = segment
-                bold = False
-            tag = color
-            if bold:
-                tag += "_bold"
-            if tag not in self.result_text.tag_names():
-                # Define a new tag with the specified foreground color and bold option
-                font_style = ("Consolas", 11, "bold") if bold else ("Consolas", 11)
-                self.result_text.tag_configure(tag, foreground=color, font=font_style)
-            
-            self.result_text.insert("end", text, tag)
-        
-        # Insert a newline at the end of the line
-        self.result_text.insert("end", "\n")
-        
-        # Disable the text widget to make it read-only
-        self.result_text.configure(state=tk.DISABLED)
-
-
-
-
-    def display_result(self, text, color="black", bold=False):
-        """
-        Helper method to display text in the result_text with optional color and bold styling.
-        """
-        # Enable the text widget to insert content
-        self.result_text.configure(state=tk.NORMAL)
-        
-        # Define the tag based on color and boldness
-        tag = color
-        if bold:
-            tag += "_bold"
-            if tag not in self.result_text.tag_names():
-                self.result_text.tag_configure(tag, foreground=color, font=("Consolas", 11, "bold"))
-        else:
-            if tag not in self.result_text.tag_names():
-                self.result_text.tag_configure(tag, foreground=color, font=("Consolas", 11))
-        
-        # Insert the text with the defined tag
-        self.result_text.insert("end", text + "\n", tag)
-        
-        # Scroll to the end to show the latest entry
-        self.result_text.see("end")
-        
-        # Disable the text widget to make it read-only
-        self.result_text.configure(state=tk.DISABLED)
-
-
-
-    def check_balance(self, dps_per_gold, low, high, z_score, percentile_rank):
-        """
-        Determines the balance status of a tower based on DPS/Gold, Z-Score, and Percentile Rank.
-
-        Parameters:
-        - dps_per_gold (float): The DPS per Gold value of the tower.
-        - low (float): The lower bound of the balanced DPS/Gold range.
-        - high (float): The upper bound of the balanced DPS/Gold range.
-        - z_score (float): The Z-Score of the tower's DPS/Gold.
-        - percentile_rank (float): The Percentile Rank of the tower's DPS/Gold.
-
-        Returns:
-        - str: "Balanced", "Underpowered", or "Overpowered".
-        """
-        if (low <= dps_per_gold <= high) and (-1 <= z_score <= 1) and (40 <= percentile_rank <= 60):
-            return "Balanced"
-        elif dps_per_gold < low or percentile_rank < 40:
-            return "Underpowered"
-        else:
-            return "Overpowered"
-
-    def export_data(self):
-        # Ask the user where to save the file
-        file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
-        
-        if not file_path:
-            return  # Exit if no file path is selected
-
-        # Check if there is data to export
-        if self.imported_df.empty:
-            messagebox.showerror("Export Error", "No data to export.")
-            return
-
-        # Save all races in the imported DataFrame to a CSV file
-        try:
-            # Saving the DataFrame to the specified CSV file path
-            self.imported_df.to_csv(file_path, index=False)
-            messagebox.showinfo("Export Successful", f"All races have been exported to {file_path}.")
-        except Exception as e:
-            messagebox.showerror("Export Error", f"An error occurred during export: {e}")
-
-
-
-
-    def load_races_sequentially(self, races, index=0, total=0):
-        """
-        Loads races one by one, updating the importing message accordingly.
-        
-        Parameters:
-        - races (list): List of race names to load.
-        - index (int): Current index in the races list.
-        - total (int): Total number of races to load.
-        """
-        if index < total:
-            race = races[index]
-            # Update dynamic label with current race
-            if self.importing_message_label:
-                self.importing_message_label.configure(text=f"Loading race {index + 1} of {total}: {race}")
-            # Load race (Implement your actual loading logic here)
-            self.on_race_selected(race)
-            # Schedule next race loading after a short delay (e.g., 1ms)
-            self.root.after(1, lambda: self.load_races_sequentially(races, index + 1, total))
-        else:
-            # Loading complete
-            self.hide_importing_message()
-            self.show_centered_message("All races loaded successfully!")
-            # Automatically select the first race in the Combobox
-            if races:
-                first_race = races[0]
-                self.race_combobox.set(first_race)
-                self.on_race_selected(first_race)
-
-
-
-
-    def import_data(self):
-        """
-        Imports race data from an Excel or CSV file, updates the race combobox,
-        and sequentially loads all races with a loading message displayed during the process.
-        """
-        file_path = ctk.filedialog.askopenfilename(
-            defaultextension=".xlsx",
-            filetypes=[("Excel and CSV Files", "*.xlsx;*.csv"), ("All Files", "*.*")]
-        )
-        if not file_path:
-            return
-
-        # Determine file extension and load accordingly
-        try:
-            if file_path.endswith('.xlsx'):
-                # Specify engine='openpyxl' for .xlsx files
-                df = pd.read_excel(file_path, engine='openpyxl')
-            elif file_path.endswith('.csv'):
-                df = pd.read_csv(file_path)
-            else:
-                messagebox.showerror("Import Error", "Unsupported file format. Please select an Excel or CSV file.")
-                return
-        except Exception as e:
-            messagebox.showerror("Import Error", f"An error occurred while reading the file: {e}")
-            return
-
-        if 'Race' not in df.columns:
-            messagebox.showerror("Import Error", "No 'Race' column found in the data.")
-            return
-
-        # Clean 'Race' column
-        df['Race'] = df['Race'].astype(str).str.strip()
-
-        self.imported_df = df.copy()  # Working DataFrame for temporary changes
-        self.original_imported_df = df.copy()  # Preserve original data
-
-        # Get unique races and sort them alphabetically
-        races = sorted(df['Race'].dropna().unique().tolist())
-        if not races:
-            messagebox.showerror("Import Error", "No races found in the data.")
-            return
-
-        # Update Combobox values
-        self.race_combobox.configure(values=races)
-
-        if races:
-            # Show the importing message with dynamic updates
-            self.show_importing_message("Loading races...")
-            # Ensure the importing window is rendered before starting race loading
-            self.root.update_idletasks()
-            self.importing_window.update()
-            # Start loading races sequentially
-            self.load_races_sequentially(races, total=len(races))
-        else:
-            self.race_combobox.set('')  # Clear selection if no races found
-
-        # Removed self.show_centered_message("Data Imported Successfully") as it's handled in load_races_sequentially
-        self.calculate_all()  # Ensure calculations are performed after importing
-
-
-
-    def quick_save(self):
-        if self.imported_file_path:
-            self.imported_df.to_excel(self.imported_file_path, index=False)
-            self.show_centered_message("Data Successfully Saved")
-        else:
-            messagebox.showerror("Quick Save Error", "No file imported to save changes.")
-
-    def save_temporary_backup(self):
-        data = []
-        for i, tower in enumerate(self.towers):
-            if not tower['Name'].get().strip() and not tower['Damage'].get().strip():
-                continue  # Skip this tower if essential fields are empty
-
-            row = {
-                'Name': tower['Name'].get() or '0',
-                'Gold Cost': tower['Gold Cost'].get() or '0',
-                'Damage': tower['Damage'].get() or '0',
-                'Dice': tower['Dice'].get() or '0',
-                'Sides': tower['Sides'].get() or '0',
-                'Cooldown': tower['Cooldown'].get() or '0',
-                'Range': tower['Range'].get() or '0',
-                'Full Splash': tower['Full Splash'].get() or '0',
-                'Med Splash': tower['Med Splash'].get() or '0',
-                'Small Splash': tower['Small Splash'].get() or '0',
-                'Spell DPS': tower['Spell DPS'].get() or '0',
-                'Spell DPS CD': tower['Spell DPS CD'].get() or '0',
-                'Slow %': tower['Slow %'].get() or '0',
-                'Utility Boost': tower['Utility Boost'].get() or '0',
-                'Poison': tower['Poison'].get(),
-                'Target Type': tower['Target Type'].get(),
-                'Z-Score': tower.get('Z-Score', ctk.StringVar()).get(),          # Updated
-                'Percent Rank': tower.get('Percent Rank', ctk.StringVar()).get(), # Updated
-                'Balance Status': tower.get('Balance Status', ctk.StringVar()).get(), # Updated
-                'Race': self.race_entry.get(),
-                'Tower Number': i+1
-            }
-            data.append(row)
-
-        if data:
-            temp_df = pd.DataFrame(data)
-            temp_df.to_csv('temp_backup.csv', index=False)
-
-    def save_current_race_data(self):
-        # Collect current GUI data
-        current_race_data = []
-        selected_race = self.race_entry.get().strip()
-        for i, tower in enumerate(self.towers):
-            # Check if essential fields are filled
-            if not tower['Name'].get().strip() and not tower['Damage'].get().strip():
-                continue  # Skip this tower if essential fields are empty
-            try:
-                tower_number = i + 1
-                base_damage = float(tower['Damage'].get() or 0)
-                dice = int(float(tower['Dice'].get() or 0))
-                sides = int(float(tower['Sides'].get() or 0))
-                cooldown = float(tower['Cooldown'].get() or 1)
-                cooldown = cooldown if cooldown != 0 else 1
-                range_val = int(float(tower['Range'].get() or 300))
-                full_splash = int(float(tower['Full Splash'].get() or 0))
-                medium_splash = int(float(tower['Med Splash'].get() or 0))
-                small_splash = int(float(tower['Small Splash'].get() or 0))
-                gold_cost = int(float(tower['Gold Cost'].get() or 1))
-                gold_cost = gold_cost if gold_cost != 0 else 1
-                spell_dps = float(tower['Spell DPS'].get() or 0)
-                spell_dps_cooldown = float(tower['Spell DPS CD'].get() or 1)
-                spell_dps_cooldown = spell_dps_cooldown if spell_dps_cooldown != 0 else 1
-                poison = tower['Poison'].get()
-                slow_percentage = float(tower['Slow %'].get() or 0)
-                utility_boost = float(tower['Utility Boost'].get() or 1.0)
-                utility_boost = utility_boost if utility_boost != 0 else 1.0
-                target_type = tower['Target Type'].get()
-
-                current_race_data.append({
-                    'Name': tower['Name'].get(),
-                    'Gold Cost': gold_cost,
-                    'Damage': base_damage,
-                    'Dice': dice,
-                    'Sides': sides,
-                    'Cooldown': cooldown,
-                    'Range': range_val,
-                    'Full Splash': full_splash,
-                    'Med Splash': medium_splash,
-                    'Small Splash': small_splash,
-                    'Spell DPS': spell_dps,
-                    'Spell DPS CD': spell_dps_cooldown,
-                    'Slow %': slow_percentage,
-                    'Utility Boost': utility_boost,
-                    'Poison': poison,
-                    'Target Type': target_type,
-                    'Race': selected_race,
-                    'Tower Number': tower_number
-                })
-            except ValueError as e:
-                self.display_result(f"Tower {i+1}: Invalid input - {e}", color="red")
-
-        # Remove existing data for the selected race from imported_df
-        if not self.imported_df.empty:
-            self.imported_df = self.imported_df[self.imported_df['Race'] != selected_race]
-
-        # Append current race's data to imported_df
-        if current_race_data:
-            df_current_race = pd.DataFrame(current_race_data)
-            self.imported_df = pd.concat([self.imported_df, df_current_race], ignore_index=True)
-
-
-    def on_race_selected(self, event):
-        """
-        Handles the event when a race is selected from the combobox.
-        Updates the race entry field, populates tower data, and triggers calculations.
-        
-        Parameters:
-        - event (str): The selected race name from the combobox.
-        """
-        try:
-            selected_race = event.strip()  # Correctly assign the stripped event to selected_race
-        except AttributeError:
-            # If event is not a string, handle the error
-            messagebox.showerror("Error", "Invalid race selection.")
-            return
-
-        #print(f"Selected Race: '{selected_race}'")  # Debugging
-        self.save_current_race_data()
-
-        # Update race_entry
-        self.race_entry.configure(state='normal')
-        self.race_entry.delete(0, ctk.END)
-        self.race_entry.insert(0, selected_race)
-        self.race_entry.configure(state='readonly')
-
-        # Check if imported_df is empty or doesn't contain 'Race' column
-        if self.imported_df.empty or 'Race' not in self.imported_df.columns:
-            messagebox.showerror("Error", "No data available for the selected race.")
-            print("imported_df is empty or missing 'Race' column.")
-            return
-
-        # Filter the dataframe for the selected race
-        df_filtered = self.imported_df[self.imported_df['Race'] == selected_race]
-        #print(f"Filtered DataFrame for race '{selected_race}':\n{df_filtered}")  # Debugging
-
-        if df_filtered.empty:
-            messagebox.showinfo("No Data", f"No tower data found for race '{selected_race}'.")
-            print(f"No data found for race '{selected_race}'.")
-            return
-
-        # Populate towers
-        self.populate_towers_from_df(df_filtered)
-
-        # Automatically run calculation
-        self.calculate_all()
-
-
-
-    def populate_towers_from_df(self, df):
-        # Clear the existing towers
-        for tower in self.towers:
-            tower['row_frame'].destroy()
-        self.towers.clear()
-
-        # Remove existing towers from the grid
-        for widget in self.towers_frame.winfo_children():
-            widget.destroy()
-
-        # Recreate towers
-        # Ensure 'Tower Number' is integer
-        df.loc[:, 'Tower Number'] = df['Tower Number'].astype(int)
-        df = df.sort_values('Tower Number')
-
-        for _, tower_row in df.iterrows():
-            self.add_tower()
-            tower_fields = self.towers[-1]
-            self.populate_tower_fields(tower_fields, tower_row)
-
-        # Update the race name in the race_entry field
-        self.race_entry.delete(0, ctk.END)
-        self.race_entry.insert(0, df['Race'].iloc[0] if 'Race' in df.columns else '')
-
-        # Update tower numbers
-        for idx, tower_fields in enumerate(self.towers):
-            self.update_tower_row(tower_fields, idx)
-
-
-
-    def validate_numeric_input(self, value, field):
-        try:
-            if field in ['Dice', 'Sides', 'Full Splash', 'Med Splash', 'Small Splash', 'Poison', 'Gold Cost', 'Damage', 'Cooldown', 'Utility Boost']:
-                int_value = int(float(value))
-                if int_value < 0:
-                    raise self.show_centered_message("Invalid input detected.")
-            return True
-        except ValueError as e:
-            self.show_centered_message("Invalid input detected.")
-            return False
-
-
-    def apply_algorithm_changes(self):
-        errors = []
-        # Update calculation function
-        calc_code = self.calc_function_text.get("1.0", "end")
-        try:
-            # Compile and replace the calculate_dps_per_gold function
-            exec_globals = {}
-            exec(calc_code, exec_globals)
-            self.calculate_dps_per_gold = exec_globals['calculate_dps_per_gold']
-            # Update self.calc_function_code with the new code
-            self.calc_function_code = calc_code
-        except Exception as e:
-            errors.append(f"Calculation function: {e}")
-
-        # Update preset balance ranges
-        ranges_code = self.ranges_text.get("1.0", "end")
-        try:
-            self.preset_balance_ranges = eval(ranges_code)
-        except Exception as e:
-            errors.append(f"Preset balance ranges: {e}")
-
-        # Update target type balance adjustments
-        adjustments_code = self.target_type_adjustments_text.get("1.0", "end")
-        try:
-            self.target_type_balance_adjustments = eval(adjustments_code)
-        except Exception as e:
-            errors.append(f"Target type adjustments: {e}")
-
-        if errors:
-            messagebox.showerror("Error", "\n".join(errors))
-        else:
-            messagebox.showinfo("Success", "All changes saved successfully.")
-            # Recalculate with the new algorithm
-            self.calculate_all()
-
-    def save_algorithm_to_file(self):
-        file_path = filedialog.asksaveasfilename(
-            defaultextension=".txt",
-            filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")]
-        )
-        if not file_path:
-            return
-
-        calc_code = self.calc_function_text.get("1.0", "end")
-        ranges_code = self.ranges_text.get("1.0", "end")
-        adjustments_code = self.target_type_adjustments_text.get("1.0", "end")
-
-        with open(file_path, 'w') as file:
-            file.write("# Calculation Function Code\n")
-            file.write(calc_code.strip())
-            file.write("\n\n# Preset Balance Ranges\n")
-            file.write(ranges_code.strip())
-            file.write("\n\n# Target Type Balance Adjustments\n")
-            file.write(adjustments_code.strip())
-
-        messagebox.showinfo("Saved", "Algorithm and adjustments saved successfully.")
-
-    def load_algorithm(self):
-        file_path = filedialog.askopenfilename(
-            defaultextension=".txt",
-            filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")]
-        )
-        if not file_path:
-            return
-
-        with open(file_path, 'r') as file:
-            content = file.read()
-
-        try:
-            # Split the content based on headers
-            sections = content.split('\n\n')
-            calc_code = ''
-            ranges_code = ''
-            adjustments_code = ''
-            current_section = ''
-            for section in sections:
-                if '# Calculation Function Code' in section:
-                    current_section = 'calc_code'
-                    calc_code = section.replace('# Calculation Function Code', '').strip()
-                elif '# Preset Balance Ranges' in section:
-                    current_section = 'ranges_code'
-                    ranges_code = section.replace('# Preset Balance Ranges', '').strip()
-                elif '# Target Type Balance Adjustments' in section:
-                    current_section = 'adjustments_code'
-                    adjustments_code = section.replace('# Target Type Balance Adjustments', '').strip()
-                else:
-                    if current_section == 'calc_code':
-                        calc_code += '\n\n' + section.strip()
-                    elif current_section == 'ranges_code':
-                        ranges_code += '\n\n' + section.strip()
-                    elif current_section == 'adjustments_code':
-                        adjustments_code += '\n\n' + section.strip()
-
-            # Update the text widgets
-            self.calc_function_text.delete("1.0", "end")
-            self.calc_function_text.insert("end", calc_code)
-
-            self.ranges_text.delete("1.0", "end")
-            self.ranges_text.insert("end", ranges_code)
-
-            self.target_type_adjustments_text.delete("1.0", "end")
-            self.target_type_adjustments_text.insert("end", adjustments_code)
-
-            messagebox.showinfo("Loaded", "Algorithm and adjustments loaded successfully.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load algorithm:\n{e}")
-
-    def view_dynamic_algorithm(self):
-        if self.window_tracker['dynamic_algorithm'] is not None:
-            try:
-                self.window_tracker['dynamic_algorithm'].focus()  # Bring the window to focus if already open
-            except ctk.TclError:
-                # If the window is destroyed, reset the tracker
-                self.window_tracker['dynamic_algorithm'] = None
-        else:
-            # Open a new window for viewing the dynamic algorithm
-            dynamic_editor = ctk.CTkToplevel(self.root)
-            self.window_tracker['dynamic_algorithm'] = dynamic_editor  # Track the window
-            dynamic_editor.title("View Dynamic Algorithm")
-            dynamic_editor.geometry("1100x700")
-
-            # Bind the destroy event to reset the tracker when the window is closed
-            dynamic_editor.protocol("WM_DELETE_WINDOW", lambda: self.close_window('dynamic_algorithm', dynamic_editor))
-            dynamic_editor.bind("<Escape>", lambda event: self.close_window('dynamic_algorithm', dynamic_editor))
-
-            dynamic_editor.grid_rowconfigure(1, weight=1)
-            dynamic_editor.grid_columnconfigure(0, weight=1)
-
-            ctk.CTkLabel(dynamic_editor, text="Dynamic Balance Range Calculation Code:").grid(
-                row=0, column=0, sticky='nw', padx=10, pady=5
-            )
-            self.dynamic_calc_text = ctk.CTkTextbox(dynamic_editor, height=25, width=70)
-            self.dynamic_calc_text.grid(row=1, column=0, padx=10, pady=5, sticky="nsew")
-
-            # Load the current dynamic calculation code
-            dynamic_code = '''
-### Dynamic Balance Range Calculation
-# Outlier Removal: Uses IQR to exclude extreme outliers.
-# Mean and Std Dev: Calculates mean and standard deviation for DPS per Gold.
-# Scaling Factor: Applies a scaling factor inversely proportional to the tower number.
-
-def calculate_dynamic_balance(df):
-    balance_ranges = {}
-    grouped = df.groupby(['Tower Number', 'Target Type'])
-    for (tower_num, target_type), group in grouped:
-        Q1 = group['DPS per Gold'].quantile(0.25)
-        Q3 = group['DPS per Gold'].quantile(0.75)
-        IQR = Q3 - Q1
-        filtered = group[(group['DPS per Gold'] >= Q1 - 1.5 * IQR) & (group['DPS per Gold'] <= Q3 + 1.5 * IQR)]
-        if filtered.empty:
-            filtered = group
-        mean = filtered['DPS per Gold'].mean()
-        std = filtered['DPS per Gold'].std(ddof=0)
-        if std == 0:
-            std = mean * 0.1
-        low = mean - std
-        high = mean + std
-        scaling_factor = 1 / (tower_num ** 0.05)
-        low *= scaling_factor
-        high *= scaling_factor
-        balance_ranges[(tower_num, target_type)] = (low, high)
-    return balance_ranges
-            '''
-
-            self.dynamic_calc_text.insert("end", dynamic_code)
-            self.dynamic_calc_text.configure(state="disabled")  # Make the text read-only
-
-        # Comments explaining each part
-            comments_text = '''
-# Explanation of Key Components:
-# 1. Outlier Removal: This section uses IQR (Interquartile Range) to exclude extreme outliers from the DPS per Gold calculation.
-#    You can modify the IQR multiplier (currently 1.5) to adjust how strict the outlier removal process is.
-# 2. Mean and Standard Deviation: These are used to calculate the average DPS per Gold and its acceptable range.
-# 3. Scaling Factor: As tower numbers increase, this factor slightly widens the acceptable range of balance for more expensive or powerful towers.
-#    Adjusting the exponent (currently 0.05) will impact how much flexibility is allowed for higher-tier towers.
-            '''
-            ctk.CTkLabel(dynamic_editor, text=comments_text, justify='left', wraplength=580).grid(
-                row=2, column=0, padx=10, pady=5
-            )
-
-        # Buttons
-            button_frame = ctk.CTkFrame(dynamic_editor)
-            button_frame.grid(row=3, column=0, pady=10)
-
-            close_button = ctk.CTkButton(
-                button_frame, text="Close", command=dynamic_editor.destroy
-            )
-            close_button.pack(side="left", padx=5)
-
-
-    def update_analysis_window(self):
-        # Check if 'analysis_text' widget exists and is viewable
-        if hasattr(self, 'analysis_text') and self.analysis_text.winfo_exists() and self.analysis_text.winfo_viewable():
-            analysis_text = self.analysis_text
-            analysis_text.configure(state=tk.NORMAL)
-            analysis_text.delete("1.0", "end")  # Clear existing content
-
-            if hasattr(self, 'outlier_analysis_segments') and self.outlier_analysis_segments:
-                for item in self.outlier_analysis_segments:
-                    if isinstance(item, list):
-                        # item is a list of segments
-                        for text, color, *bold in item:
-                            tag = color + ("_bold" if bold and bold[0] else "")
-                            if tag not in analysis_text.tag_names():
-                                font_style = ("Consolas", 12, "bold") if bold and bold[0] else ("Consolas", 12)
-                                analysis_text.tag_configure(tag, foreground=color, font=font_style)
-                            analysis_text.insert("end", text, tag)
-                    elif isinstance(item, tuple) and len(item) >= 2:
-                        # item is a single segment
-                        text, color, *bold = item
-                        tag = color + ("_bold" if bold and bold[0] else "")
-                        if tag not in analysis_text.tag_names():
-                            font_style = ("Consolas", 12, "bold") if bold and bold[0] else ("Consolas", 12)
-                            analysis_text.tag_configure(tag, foreground=color, font=font_style)
-                        analysis_text.insert("end", text, tag)
-                    else:
-                        # Unexpected item format
-                        continue
-            else:
-                # Display message when there's no data
-                analysis_text.insert("end", "Import data or add races to view outlier analysis and race difficulty levels.\n", "white")
-                analysis_text.tag_configure("white", foreground="white", font=("Consolas", 12))
-
-            analysis_text.configure(state=tk.DISABLED)
-        else:
-            print("Analysis window is not initialized or visible, skipping update.")
-
-
-
-
-
-
-
-    def perform_comparison_analysis(self):
-        analysis = ""
-        outliers = {'low': pd.DataFrame(), 'high': pd.DataFrame()}
-        if self.imported_df.empty:
-            return "No data available for comparison analysis.", outliers
-
-        all_tower_numbers = sorted(self.imported_df['Tower Number'].unique())
-        for tower_num in all_tower_numbers:
-            towers = self.imported_df[self.imported_df['Tower Number'] == tower_num]
-            target_types = towers['Target Type'].unique()
-            for target_type in target_types:
-                towers_by_type = towers[towers['Target Type'] == target_type]
-                dps_values = []
-                for _, tower_row in towers_by_type.iterrows():
-                    try:
-                        base_damage = float(tower_row.get('Damage', 0) or 0)
-                        dice = int(float(tower_row.get('Dice', 0) or 0))
-                        sides = int(float(tower_row.get('Sides', 0) or 0))
-                        cooldown = float(tower_row.get('Cooldown', 1) or 1)
-                        if cooldown == 0:
-                            cooldown = 1
-                        range_val = int(float(tower_row.get('Range', 300) or 300))
-                        full_splash = int(float(tower_row.get('Full Splash', 0) or 0))
-                        medium_splash = int(float(tower_row.get('Med Splash', 0) or 0))
-                        small_splash = int(float(tower_row.get('Small Splash', 0) or 0))
-                        gold_cost = int(float(tower_row.get('Gold Cost', 1) or 1))
-                        if gold_cost == 0:
-                            gold_cost = 1
-                        spell_dps = float(tower_row.get('Spell DPS', 0) or 0)
-                        spell_dps_cooldown = float(tower_row.get('Spell DPS CD', 1) or 1)
-                        if spell_dps_cooldown == 0:
-                            spell_dps_cooldown = 1
-                        poison = int(tower_row.get('Poison', 0))
-                        slow_percentage = float(tower_row.get('Slow %', 0) or 0)
-                        utility_boost = float(tower_row.get('Utility Boost', 1.0) or 1.0)
-                        if utility_boost == 0:
-                            utility_boost = 1.0
-                        race = tower_row.get('Race', '')
-                        name = tower_row.get('Name', '')
-
-                        total_dps, dps_per_gold = self.calculate_dps_per_gold(
-                            base_damage, dice, sides, cooldown, range_val, full_splash,
-                            medium_splash, small_splash, gold_cost, spell_dps=spell_dps,
-                            spell_dps_cooldown=spell_dps_cooldown, poison=poison,
-                            utility_boost=utility_boost, slow_percentage=slow_percentage,
-                            target_type=target_type, include_splash=True)
-
-                        dps_values.append({
-                            'Race': race,
-                            'Name': name,
-                            'DPS per Gold': dps_per_gold,
-                            'Total DPS': total_dps,
-                            'Gold Cost': gold_cost,
-                            'Base Damage': base_damage,
-                            'Cooldown': cooldown,
-                            'Range': range_val,
-                            'Utility Boost': utility_boost,
-                            'Slow %': slow_percentage,
-                            'Tower Number': tower_num
-                        })
-                    except ValueError:
-                        continue
-
-            if not dps_values:
-                continue
-
-            # Convert to DataFrame
-            df_tower = pd.DataFrame(dps_values)
-
-            # Identify weakest and strongest
-            weakest = df_tower.loc[df_tower['DPS per Gold'].idxmin()]
-            strongest = df_tower.loc[df_tower['DPS per Gold'].idxmax()]
-
-            # Analyze contributing factors
-            factors = []
-            if strongest['Base Damage'] > weakest['Base Damage']:
-                factors.append("Base Damage")
-            if strongest['Cooldown'] < weakest['Cooldown']:
-                factors.append("Cooldown")
-            if strongest['Range'] > weakest['Range']:
-                factors.append("Range")
-            if strongest['Utility Boost'] > weakest['Slow %']:
-                factors.append("Slow %")
-            if not factors:
-                factors.append("Unknown")
-
-            factor = ", ".join(factors)
-
-            # Recommendation
-            recommended_change = f"Consider adjusting {factor} for balancing."
-
-            # Add to analysis
-            separator = '─' * 50
-            analysis += f"{separator}\n"
-            analysis += f"**Tower {tower_num}** - **Target Type: {target_type}**\n"
-            analysis += f"Weakest: {weakest['Race']} - {weakest['Name']} (DPS/Gold: {self.format_number(weakest['DPS per Gold'])})\n"
-            analysis += f"Strongest: {strongest['Race']} - {strongest['Name']} (DPS/Gold: {self.format_number(strongest['DPS per Gold'])})\n"
-            analysis += f"Main Contributing Factor(s): {factor}\n"
-            analysis += f"Recommendation: {recommended_change}\n\n"
-
-            # Identify Outliers
-            if self.dynamic_comparison_var.get() and self.ignore_outliers_var.get():
-                Q1 = df_tower['DPS per Gold'].quantile(0.25)
-                Q3 = df_tower['DPS per Gold'].quantile(0.75)
-                IQR = Q3 - Q1
-                low_threshold = Q1 - 1.5 * IQR
-                high_threshold = Q3 + 1.5 * IQR
-                outliers_low = df_tower[df_tower['DPS per Gold'] < low_threshold]
-                outliers_high = df_tower[df_tower['DPS per Gold'] > high_threshold]
-                outliers['low'] = pd.concat([outliers['low'], outliers_low])
-                outliers['high'] = pd.concat([outliers['high'], outliers_high])
-
-        return analysis, outliers
-
-        
-
-    def clear_all(self):
-        """
-        Clears all input fields and resets the calculation results box after user confirmation.
-        """
-        if messagebox.askyesno("Confirm Clear All", "Are you sure you want to clear all fields and reset the results?"):
-            # Clear the calculation results text box
-            self.result_text.delete("1.0", "end")
-
-            # Clear the "Race:" text box
-            self.race_entry.delete(0, "end")
-
-            # Clear the race combobox
-            self.race_combobox.set('')
-
-            # Iterate through each tower and reset its fields
-            for tower in self.towers:
-                self.clear_tower_fields(tower)
-
-    def clear_all_skip_message(self):
-            # Clear the calculation results text box
-            self.result_text.delete("1.0", "end")
-
-            # Clear the "Race:" text box
-            self.race_entry.delete(0, "end")
-
-            # Clear the race combobox
-            self.race_combobox.set('')
-
-            # Iterate through each tower and reset its fields
-            for tower in self.towers:
-                self.clear_tower_fields(tower)
-
-if __name__ == "__main__":
-    ctk.set_appearance_mode("Dark")  # Modes: "System" (default), "Dark", "Light"
-    ctk.set_default_color_theme("dark-blue")  # Themes: "blue" (default), "green", "dark-blue"
-
-    root = ctk.CTk()
-    app = TowerApp(root)
+import customtkinter as ctk
+from tkinter import filedialog, messagebox, Text
+import tkinter as tk
+import pandas as pd
+import numpy as np
+import threading
+import queue
+import logging
+import sys
+from collections import namedtuple
+from tower_balancer_core import (
+    calculate_dps_per_gold_code, PRESET_BALANCE_RANGES, BalanceEngine, IncrementalGroupStats,
+    coerce_tower_columns, save_project, load_project, format_number, read_tower_file,
+    parse_algorithm_file, build_changes_report, PhaseTimings, PhaseProfile, measure_phase, count_outcome,
+    TOWER_ID_COLUMN, ROW_HASH_COLUMN, assign_tower_ids, max_tower_id, tower_row_hashes,
+)
+
+## Color locator:
+    ## Backgrounds: General (#333333), Click Focus (#7abdf5), Hover Focus (#6897bb), Result Window (#2E2E2E / #151924)
+    ## Text: Result Header (#00FFFF), Outlier Analysis (#FFFF00), Outlier Tower (#00CED1), Outlier Balance Range Reference (#00FF00), Tower Header Highlight (#FFC107)
+
+RECOMPUTE_DEBOUNCE_MS = 200  # Delay before a requested recalculation runs
+TYPING_DEBOUNCE_MS = 1000  # Delay after the last key press in a tower field
+RECOMPUTE_POLL_MS = 20  # How often the Tk thread checks for a finished recalculation
+
+
+class RecomputeScheduler(object):
+    """
+    Debounces recalculation requests on the Tk event loop.
+
+    Each request cancels the pending run, so a burst of edits runs the callback once. The
+    callback receives the tower rows reported dirty since the last run, or None when a
+    request did not name a row and anything may have changed.
+
+    generation is bumped by every request and cancellation, so work started for an older
+    generation can tell that it has been superseded.
+    """
+
+    def __init__(self, root, callback, delay_ms=RECOMPUTE_DEBOUNCE_MS):
+        self.root = root
+        self.callback = callback
+        self.delay_ms = delay_ms
+        self.after_id = None
+        self.dirty_rows = set()
+        self.all_dirty = False
+        self.generation = 0
+
+    def schedule(self, row=None, delay_ms=None):
+        """
+        Requests a run after delay_ms (default self.delay_ms), superseding any pending one.
+
+        Parameters:
+        - row (int, optional): Index of the edited tower row; None marks everything dirty.
+        - delay_ms (int, optional): Debounce window for this request.
+        """
+        self.generation += 1
+        if row is None:
+            self.all_dirty = True
+        else:
+            self.dirty_rows.add(row)
+        self._cancel_timer()
+        self.after_id = self.root.after(self.delay_ms if delay_ms is None else delay_ms, self.run)
+
+    def cancel(self):
+        """
+        Cancels the pending run and forgets the dirty rows.
+        """
+        self.generation += 1
+        self._cancel_timer()
+        self.dirty_rows = set()
+        self.all_dirty = False
+
+    def run(self):
+        """
+        Runs the callback now with the dirty rows collected so far.
+        """
+        self._cancel_timer()
+        dirty_rows = None if self.all_dirty else self.dirty_rows
+        self.dirty_rows = set()
+        self.all_dirty = False
+        self.callback(dirty_rows)
+
+    def _cancel_timer(self):
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+
+
+class RecomputeCancelled(Exception):
+    """
+    Raised inside a recalculation worker when a newer request has superseded it.
+    """
+
+
+class ResultReport(object):
+    """
+    Colored text collected as one string plus (start, end, style) character ranges, so it can
+    be written to a Text widget with a single insert and one tag_add call per tag.
+
+    Styles are (color, bold) pairs that are only turned into Text tags when the report is
+    rendered, so a report can be built away from the Tk thread.
+    """
+
+    def __init__(self):
+        self.parts = []
+        self.length = 0
+        self.ranges = []  # (start offset, end offset, (color, bold) or None)
+
+    def add(self, text, style):
+        if text:
+            self.ranges.append((self.length, self.length + len(text), style))
+            self.parts.append(text)
+            self.length += len(text)
+
+    def add_line(self, text, color="black", bold=False):
+        self.add(text + "\n", (color, bold))
+
+    def add_segments(self, segments):
+        """
+        Adds a line made of (text, color) or (text, color, bold) segments.
+        """
+        for segment in segments:
+            if len(segment) == 3:
+                text, color, bold = segment
+            else:
+                text, color = segment
+                bold = False
+            self.add(text, (color, bold))
+        # Newline at the end of the line
+        self.add("\n", None)
+
+    def text(self):
+        return ''.join(self.parts)
+
+
+# Everything a recalculation reads, captured on the Tk thread. imported_df and the computed
+# towers table are replaced rather than modified, so the worker can read them as they are.
+BalanceSnapshot = namedtuple('BalanceSnapshot', [
+    'generation', 'data_version', 'selected_race', 'imported_df',
+    'computed_towers', 'computed_towers_version', 'computed_dirty_races', 'group_stats',
+    'dynamic_comparison', 'ignore_outliers', 'preset_balance_ranges',
+    'original_imported_df', 'changes_report_version', 'timings',
+])
+
+# What a recalculation produced, applied to the widgets in one step on the Tk thread
+BalanceResult = namedtuple('BalanceResult', [
+    'generation', 'data_version', 'computed_towers', 'group_stats', 'report',
+    'balance_ranges', 'global_dps_per_gold_ranges', 'global_raw_dps_ranges',
+    'label_colors', 'outlier_analysis_segments', 'changes_report', 'timings',
+])
+
+
+class Tooltip(object):
+    def __init__(self, widget, text='widget info'):
+        self.waittime = 2000     # milliseconds
+        self.wraplength = 250   # pixels
+        self.widget = widget
+        self.text = text
+        self.widget.bind("<Enter>", self.enter)
+        self.widget.bind("<Leave>", self.leave)
+        self.widget.bind("<ButtonPress>", self.leave)
+        self.id = None
+        self.tw = None
+        self.result_labels = []
+
+    def enter(self, event=None):
+        self.schedule()
+    def leave(self, event=None):
+        self.unschedule()
+        self.hidetip()
+    def schedule(self):
+        self.unschedule()
+        self.id = self.widget.after(self.waittime, self.showtip)
+    def unschedule(self):
+        id = self.id
+        self.id = None
+        if id:
+            self.widget.after_cancel(id)
+    def showtip(self, event=None):
+        x = y = 0
+        x_left, y_top, x_right, y_bottom = self.widget.bbox("insert")
+        x += self.widget.winfo_rootx() + x_right + 10
+        y += self.widget.winfo_rooty() + y_bottom + 10
+        # creates a toplevel window
+        self.tw = ctk.CTkToplevel(self.widget)
+        self.tw.overrideredirect(True)  # removes the window decorations
+        self.tw.geometry(f"+{x}+{y}")
+        self.tw.attributes("-topmost", True)  # Ensures tooltip is on top
+        label = ctk.CTkLabel(self.tw, text=self.text, justify='left',
+                             fg_color='lightyellow', corner_radius=4,
+                             text_color='black', wraplength=self.wraplength)
+        label.pack(ipadx=1)
+    def hidetip(self):
+        tw = self.tw
+        self.tw= None
+        if tw:
+            tw.destroy()
+
+class TowerApp:
+    def __init__(self, root):
+        super().__init__()
+        self.root = root
+        self.root.title("Warcraft 3 Tower Balancer by Aphotica (Discord: https://discord.gg/Qsg6UDn)")
+        self.root.geometry("1455x910")  # Expanded width by 100 pixels
+        self.root.resizable(False, True)
+        self.validation_errors = False
+        self.outlier_analysis_segments = []
+        self.imported_df = pd.DataFrame()
+        self.original_imported_df = pd.DataFrame()
+        self.balance_ranges = {}
+        self.global_dps_per_gold_ranges = {}
+        self.global_raw_dps_ranges = {}
+        self.outlier_analysis_segments = []
+        self.changes_report = []
+        self.changes_report_version = None  # data_version changes_report was generated for
+        self.view_changes_version = None  # changes_report_version shown in the View Changes tab
+        self.options_tabview = None
+        self.data_version = 0  # Bumped whenever imported_df or the algorithm changes
+        self.computed_towers = None  # Shared per-tower DPS/statistics table (see get_computed_towers)
+        self.computed_towers_version = None
+        self.computed_dirty_races = None  # Races changed since the table was built (None = full rebuild)
+        self.group_stats = IncrementalGroupStats()  # Per-(Tower Number, Target Type) balance statistics
+        # Debounced recalculation on the Tk event loop to prevent input lag
+        self.recompute_scheduler = RecomputeScheduler(self.root, self._run_scheduled_recompute)
+        self.typing_debounce_ms = TYPING_DEBOUNCE_MS
+        self.gui_row_cache = {}  # Tower row index -> (race, raw field values, parsed row or error)
+        self.last_tower_id = 0  # Highest Tower ID handed out so far (see new_tower_id)
+        self.importing_window = None
+        self.result_report = None  # ResultReport collecting output while a calculation runs
+        self.importing_message_label = None
+        self.import_queue = None  # Progress messages from the import worker thread
+        self.phase_profile = PhaseProfile()  # Phase timings of the last recalculations, shown in the Profiler tab
+        self.profiler_text = None
+        
+
+        # Register the validation function to allow only letters
+        #self.validate_alpha = self.root.register(self.only_letters)
+
+        # Set the appearance mode and color theme
+        ctk.set_appearance_mode("dark")  # Options: "light", "dark", "system"
+        ctk.set_default_color_theme("blue")  # Options: "blue", "green", "dark-blue"
+
+        self.window_tracker = {
+            'algorithm_editor': None,
+            'dynamic_algorithm': None,
+            'analysis': None,
+            'help': None
+        }
+
+        self.focused_row = None
+
+        self.towers = []
+        self.tower_pool = []  # Hidden tower rows kept for reuse by add_tower
+        self.balance_ranges = {}  # Will be dynamically calculated
+        self.global_dps_per_gold_ranges = {}  # For storing global DPS/Gold ranges
+        self.global_raw_dps_ranges = {}  # For storing global Raw DPS ranges
+
+        # Target type balance adjustments
+        self.target_type_balance_adjustments = {
+            'All': (1.0, 1.0),  # (Low adjustment, High adjustment)
+            'Ground Splash': (0.8, 1.25),
+            'Air Splash': (0.8, 1.25),
+        }
+
+        # Preset balance ranges
+        self.preset_balance_ranges = dict(PRESET_BALANCE_RANGES)
+
+        # Store the source code as a string
+        self.source_code = ''
+
+        # Balancing pipeline; compiles the calculation function from its code string once per source hash
+        self.engine = BalanceEngine(calculate_dps_per_gold_code)
+
+        # Desired canvas height to fit 11 towers without scrolling
+        self.desired_canvas_height = None
+
+        self.imported_df = pd.DataFrame()  # For storing imported data
+        self.original_imported_df = pd.DataFrame()  # For storing original imported data
+        self.import_errors = []  # (row index, column, value) of cells the last import could not parse
+
+        self.setup_ui()
+
+        # Bind keys 0-9 to call calculate_all
+        for i in range(10):  # for keys 0 to 9
+            self.root.bind(f"<Key-{i}>", self.on_key_press)
+        self.root.bind('<Delete>', self.on_key_press)
+        self.root.bind('<BackSpace>', self.on_key_press)
+        self.root.bind('<Return>', self.on_enter_pressed) 
+
+    def on_key_press(self, event):
+        # Coalesce key presses into one recalculation once typing pauses, remembering the edited row
+        self.recompute_scheduler.schedule(self.tower_row_of_widget(event.widget), delay_ms=self.typing_debounce_ms)
+
+    def tower_row_of_widget(self, widget):
+        """
+        Returns the index of the tower row containing widget, or None if it is not in a tower row.
+        """
+        widget_path = str(widget)
+        for index, tower in enumerate(self.towers):
+            if widget_path.startswith(str(tower['row_frame']) + '.'):
+                return index
+        return None
+
+    def on_enter_pressed(self, event):
+        """
+        Checks if there are validation errors before running calculations.
+        If validation errors exist, only acknowledges the error message without running calculations.
+        """
+        if self.validation_errors:
+            self.show_validation_error_message()  # Show error message and skip calculation
+            self.validation_errors = False  # Reset error flag after displaying message
+        else:
+            self.calculate_all()  # Run calculations if no errors
+
+    def set_focused_row(self, row_frame):
+        """
+        Sets the given row_frame as the focused row and updates the background colors accordingly.
+        Resets the background of the previously focused row if it's different from the current one.
+        """
+        if self.focused_row and self.focused_row != row_frame:
+            try:
+                if self.focused_row.winfo_exists():
+                    self.focused_row.configure(fg_color="#1c1c1c")  # Reset previous row's background
+            except tk.TclError:
+                pass  # The focused row no longer exists
+
+        self.focused_row = row_frame
+        try:
+            if self.focused_row.winfo_exists():
+                self.focused_row.configure(fg_color="#7abdf5")  # Set current row's background to light blue
+        except tk.TclError:
+            self.focused_row = None  # Reset if the frame no longer exists
+
+    def only_letters(self, proposed_text):
+        """
+        Validates that the proposed_text contains only alphabetic characters and allowed symbols.
+        Allowed symbols can include space and hyphen.
+        """
+        allowed_symbols = " -"
+        for char in proposed_text:
+            if not (char.isalpha() or char in allowed_symbols):
+                return False
+        return True
+    
+    def setup_ui(self):
+        self.main_frame = ctk.CTkFrame(self.root)
+        self.main_frame.pack(fill=ctk.BOTH, expand=True)
+
+        # Register the validation function
+        vcmd = (self.root.register(self.only_letters), '%P')  # '%P' passes the proposed value of the entry
+
+        # Configure grid layout for main_frame
+        self.main_frame.grid_rowconfigure(1, weight=1)
+        self.main_frame.grid_columnconfigure(0, weight=1)
+
+        # Header Frame (Separate from towers)
+        header_frame = ctk.CTkFrame(self.main_frame)
+        header_frame.grid(row=0, column=0, sticky='ew', padx=10, pady=5)
+        header_frame.grid_columnconfigure(0, weight=1)
+
+        # Left side of header (Race Entry and Combobox)
+        race_frame = ctk.CTkFrame(header_frame)
+        race_frame.pack(side=ctk.LEFT, padx=(0, 20))
+
+        race_label = ctk.CTkLabel(race_frame, text="Race:")
+        race_label.grid(row=1, column=0, padx=(0,5), pady=2)
+
+        self.race_entry = ctk.CTkEntry(race_frame, width=200, validate='key', validatecommand=vcmd)
+        self.race_entry.grid(row=1, column=1, padx=(0,10), pady=2)
+
+        # Race selection Combobox with increased width
+        self.race_combobox = ctk.CTkComboBox(race_frame, values=[], state='readonly', command=self.on_race_selected, width=200)
+        self.race_combobox.set('Select Race')  # Show 'Select Race' if no race is selected
+        self.race_combobox.grid(row=0, column=1, padx=(0,10), pady=2)
+
+        # Export and Import buttons in a frame
+        export_import_frame = ctk.CTkFrame(header_frame)
+        export_import_frame.pack(side=ctk.LEFT, padx=(0, 20))
+
+        self.export_button = ctk.CTkButton(export_import_frame, text="Export", command=self.export_data)
+        self.export_button.pack(side=ctk.LEFT, padx=5)
+
+        self.import_button = ctk.CTkButton(export_import_frame, text="Import", command=self.import_data)
+        self.import_button.pack(side=ctk.LEFT, padx=5)
+
+        # Project files hold both data sets and the algorithm in a fast binary format
+        self.save_project_button = ctk.CTkButton(export_import_frame, text="Save Project", command=self.save_project_file)
+        self.save_project_button.pack(side=ctk.LEFT, padx=5)
+
+        self.open_project_button = ctk.CTkButton(export_import_frame, text="Open Project", command=self.open_project_file)
+        self.open_project_button.pack(side=ctk.LEFT, padx=5)
+
+        # Dynamic Comparison Checkbox
+        self.dynamic_comparison_var = ctk.BooleanVar(value=True)
+        self.dynamic_comparison_chk = ctk.CTkCheckBox(header_frame, text="Dynamic Comparison",
+                                                    variable=self.dynamic_comparison_var, command=self.calculate_all)
+        self.dynamic_comparison_chk.pack(side=ctk.LEFT, padx=5)
+
+        # Ignore Outliers Checkbox
+        self.ignore_outliers_var = ctk.BooleanVar(value=True)
+        self.ignore_outliers_chk = ctk.CTkCheckBox(header_frame, text="Ignore Outliers",
+                                                variable=self.ignore_outliers_var, command=self.calculate_all)
+        self.ignore_outliers_chk.pack(side=ctk.LEFT, padx=5)
+
+        # Options Button on the far right
+        options_frame = ctk.CTkFrame(header_frame)
+        options_frame.pack(side=ctk.RIGHT, padx=(0,10))
+
+        self.options_button = ctk.CTkButton(options_frame, text="Options", command=self.open_options_window)
+        self.options_button.pack(side=ctk.LEFT, padx=5)
+
+        # Towers Frame Container (Separate from headers)
+        towers_frame_container = ctk.CTkFrame(self.main_frame)
+        towers_frame_container.grid(row=1, column=0, sticky='nsew', padx=10, pady=5)
+        towers_frame_container.grid_rowconfigure(1, weight=1)
+        towers_frame_container.grid_columnconfigure(0, weight=1)
+
+        # Towers Header Frame (Separate headers from tower data)
+        towers_header_frame = ctk.CTkFrame(towers_frame_container)
+        towers_header_frame.grid(row=0, column=0, sticky='ew')
+        # Call create_headers before configuring columns that depend on self.headers
+        self.create_headers(towers_header_frame)
+        towers_header_frame.grid_columnconfigure(len(self.headers)-1, weight=1)
+
+        # Towers Frame with Scrollbar
+        self.towers_canvas = ctk.CTkCanvas(towers_frame_container, bg='#1c1c1c', highlightthickness=0)
+        self.towers_canvas.grid(row=1, column=0, sticky='nsew')
+
+        towers_scrollbar = ctk.CTkScrollbar(towers_frame_container, orientation=ctk.VERTICAL, command=self.towers_canvas.yview)
+        towers_scrollbar.grid(row=1, column=1, sticky='ns')
+
+        self.towers_canvas.configure(yscrollcommand=towers_scrollbar.set)
+
+        self.towers_frame = ctk.CTkFrame(self.towers_canvas, fg_color='#1c1c1c')
+        self.towers_canvas.create_window((0, 0), window=self.towers_frame, anchor='nw')
+
+        # Update scrollregion when towers_frame is resized
+        self.towers_frame.bind("<Configure>", self.on_towers_frame_configure)
+
+        # Bind scroll wheel only to the towers canvas
+        self.towers_canvas.bind("<Enter>", lambda e: self.towers_canvas.bind_all("<MouseWheel>", self._on_mousewheel))
+        self.towers_canvas.bind("<Leave>", lambda e: self.towers_canvas.unbind_all("<MouseWheel>"))
+
+        # Create initial towers
+        for _ in range(11):
+            self.add_tower()
+
+        # Buttons at the bottom
+        bottom_button_frame = ctk.CTkFrame(self.main_frame)
+        bottom_button_frame.grid(row=2, column=0, sticky='ew', padx=10, pady=5)
+        bottom_button_frame.grid_columnconfigure(0, weight=1)
+
+        self.calculate_button = ctk.CTkButton(bottom_button_frame, text="Calculate All", command=self.calculate_all)
+        self.calculate_button.pack(side=ctk.LEFT, padx=5)
+
+        # Clear All button
+        self.clear_all_button = ctk.CTkButton(bottom_button_frame, text="Clear All", command=self.clear_all_towers)
+        self.clear_all_button.pack(side=ctk.RIGHT, padx=5)
+
+        self.delete_tower_button = ctk.CTkButton(bottom_button_frame, text="Delete Tower", command=self.delete_last_tower)
+        self.delete_tower_button.pack(side=ctk.RIGHT, padx=5)
+        
+        self.add_tower_button = ctk.CTkButton(bottom_button_frame, text="Add Tower", command=self.add_tower)
+        self.add_tower_button.pack(side=ctk.RIGHT, padx=5)
+
+        # Result Text with Scrollbar (Adjusted height for 16 towers)
+        result_frame = ctk.CTkFrame(self.main_frame)
+        result_frame.grid(row=3, column=0, sticky='nsew', padx=10, pady=10)
+        result_frame.grid_rowconfigure(0, weight=1)
+        result_frame.grid_columnconfigure(0, weight=1)
+
+        self.result_text = tk.Text(result_frame, height=16, wrap='none', bg='#2E2E2E', font=("Consolas", 11))  # Changed height from 20 to 16
+        self.result_text.grid(row=0, column=0, sticky='nsew')
+
+        result_scrollbar = ctk.CTkScrollbar(result_frame, orientation=ctk.VERTICAL, command=self.result_text.yview)
+        self.result_text.configure(yscrollcommand=result_scrollbar.set)
+        result_scrollbar.grid(row=0, column=1, sticky='ns')
+
+        # Configure text widget tags for coloring
+        self.result_text.tag_configure("green", foreground="#00D1A0")
+        self.result_text.tag_configure("red", foreground="#FF4C4C")
+        self.result_text.tag_configure("yellow", foreground="#FFFF00")  # Added for yellow color
+        self.result_text.tag_configure("blue", foreground="#00CED1")  # For tower numbers
+        self.result_text.tag_configure("header", foreground="blue", font=("Helvetica", 12, "bold"))
+        self.result_text.tag_configure("outlier_header", foreground="#FFFF00", font=("Helvetica", 12, "bold"))
+
+        # Configure the color tags used by the results and outlier report once, up front
+        self.result_tags = set(self.result_text.tag_names())
+        for color, bold in [("#00FFFF", True), ("black", False), ("green", False), ("red", False), ("yellow", False),
+                            ("#FFFF00", True), ("red", True), ("#4DA6FF", True), ("#FFD966", True),
+                            ("#00CED1", False), ("#A0A0A0", False)]:
+            self.configure_result_tag(color, bold)
+
+        # Make the result_text read-only
+        self.result_text.configure(state=tk.DISABLED)
+
+    def bind_mousewheel(self, widget):
+        """
+        Binds mouse wheel events to the given widget for scrolling.
+
+        Parameters:
+            widget (tk.Canvas): The canvas widget to bind the scroll events to.
+        """
+        # Windows and MacOS
+        widget.bind("<Enter>", lambda e: self._bind_to_mousewheel(widget))
+        widget.bind("<Leave>", lambda e: self._unbind_from_mousewheel(widget))
+
+    def _bind_to_mousewheel(self, widget):
+        """
+        Binds the appropriate mouse wheel events based on the operating system.
+        """
+        system = self.root.tk.call('tk', 'windowingsystem')
+        if system == 'aqua':  # macOS
+            widget.bind_all("<MouseWheel>", self.on_mousewheel)
+        elif system == 'x11':  # Linux
+            widget.bind_all("<Button-4>", self.on_mousewheel)
+            widget.bind_all("<Button-5>", self.on_mousewheel)
+        else:  # Windows
+            widget.bind_all("<MouseWheel>", self.on_mousewheel)
+
+    def _unbind_from_mousewheel(self, widget):
+        """
+        Unbinds the mouse wheel events based on the operating system.
+        """
+        system = self.root.tk.call('tk', 'windowingsystem')
+        if system == 'aqua':  # macOS
+            widget.unbind_all("<MouseWheel>")
+        elif system == 'x11':  # Linux
+            widget.unbind_all("<Button-4>")
+            widget.unbind_all("<Button-5>")
+        else:  # Windows
+            widget.unbind_all("<MouseWheel>")
+
+    def on_mousewheel(self, event):
+        """
+        Handles mouse wheel events for scrolling the canvas.
+
+        Parameters:
+            event (tk.Event): The mouse wheel event.
+        """
+        system = self.root.tk.call('tk', 'windowingsystem')
+        if system == 'aqua' or system == 'win32':  # macOS or Windows
+            delta = int(-1 * (event.delta / 120))
+            self.generate_tooltips_canvas.yview_scroll(delta, "units")
+        elif system == 'x11':  # Linux
+            if event.num == 4:
+                self.generate_tooltips_canvas.yview_scroll(-1, "units")
+            elif event.num == 5:
+                self.generate_tooltips_canvas.yview_scroll(1, "units")
+
+
+
+    def on_options_tab_changed(self):
+        """
+        Called by the Options tabview when a tab is selected.
+        The View Changes tab is refreshed only if the data changed since it was last rendered.
+        """
+        if self.options_tabview is not None and self.options_tabview.get() == "View Changes":
+            self.update_view_changes_if_stale()
+        elif self.options_tabview is not None and self.options_tabview.get() == "Profiler":
+            self.update_profiler_tab()
+
+    def open_options_window(self):
+        if self.window_tracker.get('options_window') is not None:
+            try:
+                self.window_tracker['options_window'].lift()
+                self.window_tracker['options_window'].focus_force()
+            except tk.TclError:
+                self.window_tracker['options_window'] = None
+        if self.window_tracker.get('options_window') is None:
+            options_win = ctk.CTkToplevel(self.root)
+            self.window_tracker['options_window'] = options_win
+            options_win.title("Options")
+            # Set options window size to match main window height
+            main_height = self.root.winfo_height()
+            options_win.geometry(f"800x{main_height}")
+            options_win.resizable(True, True)
+
+            # Position the options window to the right of the main window
+            main_x = self.root.winfo_x()
+            main_y = self.root.winfo_y()
+            main_width = self.root.winfo_width()
+            options_x = main_x + main_width + 10  # 10 pixels gap
+            options_win.geometry(f"+{options_x}+{main_y}")
+
+            # Bind the destroy event to reset the tracker when the window is closed
+            options_win.protocol("WM_DELETE_WINDOW", lambda: self.close_window('options_window', options_win))
+            options_win.bind("<Escape>", lambda event: self.close_window('options_window', options_win))
+
+            # Create the tab view; tab changes are handled by on_options_tab_changed
+            tabview = ctk.CTkTabview(options_win, command=self.on_options_tab_changed)
+            tabview.pack(fill='both', expand=True)
+            self.options_tabview = tabview
+
+            # Initialize a list to keep track of tab names
+            self.options_tab_names = []
+
+            # Add existing tabs and track their names
+            tabs_to_add = ["Analysis", "Help", "Algorithm", "Dynamic Algorithm", "View Changes", "Generate Tooltips", "Profiler"]
+            for tab_name in tabs_to_add:
+                tabview.add(tab_name)
+                self.options_tab_names.append(tab_name)
+                if tab_name == "Generate Tooltips":
+                    self.generate_tooltips_tab = tabview.tab(tab_name)
+                    self.create_generate_tooltips_tab(self.generate_tooltips_tab)
+                else:
+                    # Implement content for other tabs
+                    if tab_name == "Help":
+                        self.create_help_tab(tabview.tab(tab_name))
+                    elif tab_name == "Algorithm":
+                        self.create_algorithm_tab(tabview.tab(tab_name))
+                    elif tab_name == "Dynamic Algorithm":
+                        self.create_dynamic_algorithm_tab(tabview.tab(tab_name))
+                    elif tab_name == "Analysis":
+                        self.create_analysis_tab(tabview.tab(tab_name))
+                    elif tab_name == "View Changes":
+                        self.create_view_changes_tab(tabview.tab(tab_name))
+                    elif tab_name == "Profiler":
+                        self.create_profiler_tab(tabview.tab(tab_name))
+
+
+
+    def create_generate_tooltips_tab(self, parent):
+        """
+        Creates the "Generate Tooltips" tab within the Options window.
+        Each tower has a text box displaying its tooltip and a copy button.
+        """
+        # Main frame for the tab with scrollable functionality
+        generate_tooltips_frame = ctk.CTkFrame(parent)
+        generate_tooltips_frame.pack(fill=ctk.BOTH, expand=True, padx=10, pady=10)
+
+        # Create a canvas and scrollbar for scrolling through towers
+        self.generate_tooltips_canvas = ctk.CTkCanvas(generate_tooltips_frame, bg='#1c1c1c', highlightthickness=0)
+        scrollbar = ctk.CTkScrollbar(generate_tooltips_frame, orientation=ctk.VERTICAL, command=self.generate_tooltips_canvas.yview)
+        self.scrollable_frame = ctk.CTkFrame(self.generate_tooltips_canvas, fg_color='#1c1c1c')
+
+        self.scrollable_frame.bind(
+            "<Configure>",
+            lambda e: self.generate_tooltips_canvas.configure(
+                scrollregion=self.generate_tooltips_canvas.bbox("all")
+            )
+        )
+
+        self.generate_tooltips_canvas.create_window((0, 0), window=self.scrollable_frame, anchor='nw')
+        self.generate_tooltips_canvas.configure(yscrollcommand=scrollbar.set)
+
+        self.generate_tooltips_canvas.pack(side=ctk.LEFT, fill=ctk.BOTH, expand=True)
+        scrollbar.pack(side=ctk.RIGHT, fill=ctk.Y)
+
+        # Bind mouse wheel events to the canvas for scrolling
+        self.bind_mousewheel(self.generate_tooltips_canvas)
+
+        # Store references to tooltip widgets for updating
+        self.tooltip_widgets = []
+
+        # Initialize tooltips for existing towers
+        self.update_generate_tooltips()
+
+
+
+    def update_generate_tooltips(self):
+        """
+        Populates the "Generate Tooltips" tab with tooltip information for each tower.
+        Each tower has a label, a read-only text box, and a copy button.
+        """
+        if not hasattr(self, 'scrollable_frame'):
+            print("Scrollable frame not found. Cannot update tooltips.")
+            return
+
+        # Clear existing tooltip widgets
+        for widget in self.tooltip_widgets:
+            widget.destroy()
+        self.tooltip_widgets.clear()
+
+        # Parsed tower stats for the current race from the computed towers table
+        computed_towers = self.get_computed_towers()
+        race_towers = computed_towers[(computed_towers['Race'] == self.race_entry.get().strip()) & computed_towers['Valid']]
+        race_towers = race_towers.drop_duplicates('Tower Number').set_index('Tower Number')
+
+        for idx, tower in enumerate(self.towers, start=1):
+            # Create a frame for each tower's tooltip
+            tower_frame = ctk.CTkFrame(self.scrollable_frame, fg_color='#2E2E2E', corner_radius=8)
+            tower_frame.pack(fill=ctk.X, pady=5, padx=5)
+
+            # Tower Name Label
+            tower_name = tower['Name'].get().strip() or f"Tower {idx}"
+            tower_label = ctk.CTkLabel(tower_frame, text=f"{idx}. {tower_name}", font=("Arial", 12, "bold"), text_color="#FFC107")
+            tower_label.pack(anchor='w', padx=10, pady=(10, 0))
+
+            # Tooltip Text Box
+            computed_row = race_towers.loc[idx] if idx in race_towers.index else None
+            tooltip_text = self.generate_tooltip_text(tower, computed_row)
+            text_box = ctk.CTkTextbox(tower_frame, height=75, width=700, wrap='word', fg_color='#151924', text_color='white', state='disabled')
+            text_box.pack(fill=ctk.BOTH, expand=True, padx=10, pady=5)
+            text_box.configure(state='normal')
+            text_box.insert("1.0", tooltip_text)
+            text_box.configure(state='disabled') # remove to make the tooltips 'read-only'. On by default to prevent errors.
+
+            # Copy Button
+            copy_button = ctk.CTkButton(tower_frame, text="Copy", width=80, command=lambda txt=tooltip_text: self.copy_to_clipboard(txt))
+            copy_button.pack(anchor='e', padx=10, pady=(0, 10))
+
+            # Store the frame for future updates
+            self.tooltip_widgets.append(tower_frame)
+
+        # After updating tooltips, ensure the canvas scrollregion is updated
+        self.generate_tooltips_canvas.configure(scrollregion=self.generate_tooltips_canvas.bbox("all"))
+
+
+
+    def generate_tooltip_text(self, tower, computed_row=None):
+        """
+        Generates the tooltip text for a given tower based on its attributes.
+        
+        Parameters:
+            tower (dict): Dictionary containing tower widgets and variables.
+            computed_row (pd.Series, optional): The tower's row in the computed towers table.
+                When given, its parsed values are used instead of re-reading the widgets.
+        
+        Returns:
+            str: Formatted tooltip text with color codes.
+        """
+        try:
+            # Extract and calculate necessary values
+            if computed_row is not None:
+                base_damage = float(computed_row['Damage'])
+                dice = int(computed_row['Dice'])
+                sides = int(computed_row['Sides'])
+                cooldown = float(computed_row['Cooldown'])
+                utility_boost = float(computed_row['Utility Boost'])
+                range_val = float(computed_row['Range'])
+                full_splash = float(computed_row['Full Splash'])
+                med_splash = float(computed_row['Med Splash'])
+                small_splash = float(computed_row['Small Splash'])
+                target_type = computed_row['Target Type']
+            else:
+                base_damage = float(tower['Damage'].get() or 0)
+                dice = int(float(tower['Dice'].get() or 0))
+                sides = int(float(tower['Sides'].get() or 0))
+                cooldown = float(tower['Cooldown'].get() or 1)
+                utility_boost = float(tower['Utility Boost'].get() or 1.0)
+                range_val = float(tower['Range'].get() or 0)
+                full_splash = float(tower['Full Splash'].get() or 0)
+                med_splash = float(tower['Med Splash'].get() or 0)
+                small_splash = float(tower['Small Splash'].get() or 0)
+                target_type = tower['Target Type'].get()
+
+            # Calculate average DPS
+            avg_damage = base_damage + (dice * (sides + 1) / 2)
+            hits_per_second = 1 / cooldown
+            average_dps = avg_damage * hits_per_second * utility_boost
+
+            # Round DPS if needed
+            average_dps = round(average_dps, 2) if average_dps < 1 else round(average_dps)
+
+            # Round Range if needed
+            range_val = round(range_val, 2) if range_val < 1 else round(range_val)
+
+            # Handle Splash Radii: set missing values to 0 without decimals
+            full_splash = int(full_splash) if full_splash else 0
+            med_splash = int(med_splash) if med_splash else 0
+            small_splash = int(small_splash) if small_splash else 0
+            splash_display = (
+                f"{full_splash} - {med_splash} - {small_splash}" 
+                if any([full_splash, med_splash, small_splash]) 
+                else "None"
+            )
+
+            # Determine Splash Target Line
+            splash_target_line = ""
+            if target_type in ["Air Splash", "Ground Splash"]:
+                splash_target = "Air" if "Air" in target_type else "Ground"
+                splash_target_line = f"|n|cff00adffSplash Target:|r {splash_target}"
+
+            # Format the tooltip text with color codes
+            tooltip = (
+                f"|cffff0000DPS:|r {average_dps} |n"
+                f"|cffff8000Range:|r {range_val} |n"
+                f"|cff00ff00Speed:|r {cooldown} seconds|n"  # Display cooldown with decimal
+                f"|cffffff00Splash Zones:|r {splash_display}"
+            )
+
+            if splash_target_line:
+                tooltip += splash_target_line
+
+            return tooltip
+        except Exception as e:
+            print(f"Error generating tooltip: {e}")
+            return "Error generating tooltip."
+
+
+    def copy_to_clipboard(self, text):
+        """
+        Copies the given text to the system clipboard.
+        
+        Parameters:
+            text (str): The text to be copied.
+        """
+        self.root.clipboard_clear()
+        self.root.clipboard_append(text)
+        self.show_centered_message("Tooltip text has been copied to the clipboard.")
+
+
+    def create_help_tab(self, parent):
+        help_text_frame = ctk.CTkFrame(parent)
+        help_text_frame.pack(fill=ctk.BOTH, expand=True, padx=10, pady=10)
+
+        help_text = tk.Text(help_text_frame, wrap='word', bg='#1e1e1e', fg='#f5f5f5', font=("Arial", 11))
+        help_text.pack(side=ctk.LEFT, fill=ctk.BOTH, expand=True)
+
+        help_scrollbar = ctk.CTkScrollbar(help_text_frame, orientation=ctk.VERTICAL, command=help_text.yview)
+        help_scrollbar.pack(side=ctk.RIGHT, fill=ctk.Y)
+        help_text.configure(yscrollcommand=help_scrollbar.set)
+
+        # Define help content
+        help_content = """
+    Warcraft 3 Tower Balancer Tool: User Guide
+
+    Overview
+    --------
+    The Warcraft 3 Tower Balancer Tool is a comprehensive utility for balancing tower stats within custom Warcraft 3 maps. Designed by Aphotica, this tool provides an interactive interface to calculate various balance metrics such as DPS per Gold, Z-Score, and Percent Rank. Additionally, it offers functionalities to import/export data, perform outlier analysis, and customize algorithms.
+
+    Features
+    --------
+    1. **Dynamic Comparison**: Automatically calculates and adjusts balance ranges based on imported data.
+    2. **Outlier Detection**: Identifies towers that deviate significantly from standard values, making it easy to spot overpowered or underpowered units.
+    3. **Algorithm Customization**: Adjust the calculation logic to fit unique balancing needs by modifying the algorithm directly in the tool.
+    4. **Import/Export Capabilities**: Save and load tower configurations as needed for easier testing and balancing across multiple maps or scenarios.
+    5. **Race Difficulty**: Assess race difficulty on a scale from 1-10 (10 being hardest to play) based on overall race DPS/Gold, Raw DPS, Range, Splash, and Abilities.
+
+    Getting Started
+    ---------------
+    1. **Import Data**: 
+    Use the **Import** button to load existing tower data. Supported formats include Excel files with necessary columns. Ensure your dataset includes essential columns such as **Race**, **Tower Number**, **Gold Cost**, **Damage**, etc.
+    Columns MUST read in order: Name, Gold Cost, Damage, Dice, Sides, Cooldown, Range, Full Splash, Med Splash, Small Splash, Spell DPS, Spell DPS CD, Slow %, Utility Boost, Poison (0 or 1), Target Type, Z-Score, Percent Rank, Race, Tower Number
+    Exports add a **Tower ID** column. Keep it when you edit the file: it lets **View Changes** follow each tower even after towers are added, deleted or renumbered.
+
+    ***If uncertain, just use the tool to create the excel for you and continue exporting to add to it.***
+
+    2. **Edit or Add New Towers**:
+    Choose an existing race from the dropdown or type a new race name. Add new towers or edit existing ones by filling in fields like **Name**, **Gold Cost**, **Damage**, **Dice**, **Cooldown**, and more. Use **Add Tower** or **Delete Tower** to adjust the tower list.
+
+    3. **Run Calculations**:
+    Click **Calculate All** to perform the analysis. View calculated DPS, DPS per Gold, and any outliers in the **Results** section.
+
+    4. **Analyze Results**:
+    Open the **Analysis** tab to examine outliers, balance ranges, and specific metrics. Use the **View Changes** tab to see differences in tower data post-editing. If recalculation gets slow, the **Profiler** tab shows how long each step took over the last recalculations.
+
+    5. **Export Data**:
+    Save your work using the **Export** button. This will store your tower configuration and analysis results for future reference or sharing.
+
+    Calculations and Algorithm
+    --------------------------
+    **Core Calculation (DPS per Gold)**
+
+    The tool calculates DPS per Gold based on the following formula:
+
+    DPS = (Base Damage + Dice * Average Die Roll) * (1 / Cooldown)
+    Adjusted by **Range Modifier** and **Splash Damage** values, including **Full Splash**, **Medium Splash**, and **Small Splash** percentages.
+
+    Utility Adjustments:
+    Factors in special effects such as **Poison** and **Slow** which influence DPS based on target exposure and movement. **Utility Boost** can scale DPS based on additional benefits.
+
+    Output Metrics:
+    - **Total DPS**: Total calculated damage per second, considering range, splash, poison, and other adjustments.
+    - **DPS per Gold**: Calculated as (Total DPS / Gold Cost) * 100, providing a standard measure of efficiency relative to cost.
+
+    Dynamic Algorithm (For Users with Fewer than 20 Races)
+    ------------------------------------------------------
+    If fewer than 20 races are present, use the **Dynamic Algorithm** tab to configure presets. This dynamically adjusts DPS ranges by calculating mean and standard deviations of existing towers.
+
+    Troubleshooting Tips
+    --------------------
+    - **Error Messages**: If calculation errors appear, verify that all essential fields are filled correctly. Missing or non-numeric values in key fields (like **Gold Cost** or **Cooldown**) can result in calculation errors.
+
+    - **Outliers**: If outliers are identified, consider adjusting tower parameters or using the **Dynamic Comparison** feature to auto-adjust balance ranges.
+
+    - **Custom Algorithm Adjustments**: In the **Algorithm** tab, modify the DPS formula or range modifiers to suit different gameplay styles. Save changes to the algorithm to apply custom calculations universally across all towers.
+
+    Contact
+    ----------
+    Contact Aphotica on the Wintermaul Wars Discord server for assistance.
+        """
+
+        # Insert help content and apply tags for dynamic sections
+        help_text.insert(tk.END, help_content)
+
+        # Dynamic tags
+        sections = {
+            "title": ("Warcraft 3 Tower Balancer Tool: User Guide", "#00d1a0", ("Arial", 18, "bold italic")),
+            "section": [
+                ("Overview", "#00d1a0", ("Arial", 16, "bold italic")),
+                ("Features", "#00d1a0", ("Arial", 16, "bold italic")),
+                ("Getting Started", "#00d1a0", ("Arial", 16, "bold italic")),
+                ("Calculations and Algorithm", "#00d1a0", ("Arial", 16, "bold italic")),
+                ("Dynamic Algorithm", "#00d1a0", ("Arial", 16, "bold italic")),
+                ("Troubleshooting Tips", "#00d1a0", ("Arial", 16, "bold italic")),
+                ("Contact", "#00d1a0", ("Arial", 16, "bold italic"))
+            ],
+            "subsection": [
+                ("Dynamic Comparison", "#FFBF00", ("Arial", 13, "bold")),
+                ("Outlier Detection", "#FFBF00", ("Arial", 13, "bold")),
+                ("Algorithm Customization", "#FFBF00", ("Arial", 13, "bold")),
+                ("Import/Export Capabilities", "#FFBF00", ("Arial", 13, "bold")),
+                ("Race Difficulty", "#FFBF00", ("Arial", 13, "bold")),
+                ("Import Data", "#FFBF00", ("Arial", 13, "bold")),
+                ("Edit or Add New Towers", "#FFBF00", ("Arial", 13, "bold")),
+                ("Run Calculations", "#FFBF00", ("Arial", 13, "bold")),
+                ("Analyze Results", "#FFBF00", ("Arial", 13, "bold")),
+                ("Export Data", "#FFBF00", ("Arial", 13, "bold")),
+                ("Core Calculation (DPS per Gold)", "#FFBF00", ("Arial", 13, "bold")),
+                ("Output Metrics", "#FFBF00", ("Arial", 13, "bold")),
+                ("Error Messages", "#FFBF00", ("Arial", 13, "bold")),
+                ("Outliers", "#FFBF00", ("Arial", 13, "bold")),
+                ("Custom Algorithm Adjustments", "#FFBF00", ("Arial", 13, "bold"))
+            ]
+        }
+
+        # Apply tags based on keywords
+        for tag, values in sections.items():
+            if isinstance(values, tuple):
+                keyword, color, font = values
+                start_index = help_content.index(keyword)
+                end_index = start_index + len(keyword)
+                help_text.tag_add(tag, f"1.0+{start_index}c", f"1.0+{end_index}c")
+                help_text.tag_config(tag, foreground=color, font=font)
+            else:
+                for keyword, color, font in values:
+                    start_index = help_content.index(keyword)
+                    end_index = start_index + len(keyword)
+                    help_text.tag_add(tag, f"1.0+{start_index}c", f"1.0+{end_index}c")
+                    help_text.tag_config(tag, foreground=color, font=font)
+
+        # Disable editing
+        help_text.configure(state=tk.DISABLED)
+
+
+
+
+
+
+    def create_algorithm_tab(self, parent):
+        parent.grid_rowconfigure(0, weight=1)
+        parent.grid_columnconfigure(0, weight=1)
+
+        calc_label = ctk.CTkLabel(master=parent, text="Calculation Function (Python Code):", anchor="w")
+        calc_label.grid(row=0, column=0, sticky="nw", padx=10, pady=5)
+        self.calc_function_text = ctk.CTkTextbox(master=parent, width=760, height=400)
+        self.calc_function_text.grid(row=1, column=0, padx=10, pady=5, sticky="nsew")
+
+        # Load the calculation function code from self.engine.algorithm_source
+        self.calc_function_text.insert("0.0", self.engine.algorithm_source)
+
+        # Adjusted balance ranges to be displayed vertically
+        ranges_label = ctk.CTkLabel(master=parent, text="Preset Balance Ranges (Customizable):", anchor="w")
+        ranges_label.grid(row=2, column=0, sticky="nw", padx=10, pady=5)
+        self.ranges_text = ctk.CTkTextbox(master=parent, width=760, height=200)
+        self.ranges_text.grid(row=3, column=0, padx=10, pady=5, sticky="nsew")
+
+        # Load current preset ranges
+        ranges_code = '{\n' + ',\n'.join([f"    {key}: {value}" for key, value in sorted(self.preset_balance_ranges.items())]) + '\n}'
+        self.ranges_text.insert("0.0", ranges_code)
+
+        # Target Type Balance Adjustments
+        adjustments_label = ctk.CTkLabel(master=parent, text="Target Type Balance Adjustments (Python Dict Format):", anchor="w")
+        adjustments_label.grid(row=4, column=0, sticky="nw", padx=10, pady=5)
+        self.target_type_adjustments_text = ctk.CTkTextbox(master=parent, width=760, height=100)
+        self.target_type_adjustments_text.grid(row=5, column=0, padx=10, pady=5, sticky="nsew")
+
+        # Load current target type adjustments
+        adjustments_code = '{\n' + ',\n'.join([f"    '{key}': {value}" for key, value in self.target_type_balance_adjustments.items()]) + '\n}'
+        self.target_type_adjustments_text.insert("0.0", adjustments_code)
+
+        # Buttons
+        button_frame = ctk.CTkFrame(master=parent)
+        button_frame.grid(row=6, column=0, pady=10)
+
+        save_button = ctk.CTkButton(master=button_frame, text="Save/Apply", command=self.apply_algorithm_changes)
+        save_button.pack(side=ctk.LEFT, padx=5)
+
+        save_file_button = ctk.CTkButton(master=button_frame, text="Save to File", command=self.save_algorithm_to_file)
+        save_file_button.pack(side=ctk.LEFT, padx=5)
+
+        load_button = ctk.CTkButton(master=button_frame, text="Load from File", command=self.load_algorithm)
+        load_button.pack(side=ctk.LEFT, padx=5)
+
+    def create_dynamic_algorithm_tab(self, parent):
+        parent.grid_rowconfigure(0, weight=1)
+        parent.grid_columnconfigure(0, weight=1)
+
+        dynamic_calc_label = ctk.CTkLabel(master=parent, text="Dynamic Balance Range Calculation:", anchor="w")
+        dynamic_calc_label.grid(row=0, column=0, sticky="nw", padx=10, pady=5)
+
+        self.dynamic_calc_text = ctk.CTkTextbox(master=parent, width=760, height=650)
+        self.dynamic_calc_text.grid(row=1, column=0, padx=10, pady=5, sticky="nsew")
+
+        # Load the dynamic calculation code
+        dynamic_code = '''
+    ### Dynamic Balance Range Calculation
+    # Outlier Removal: Uses IQR to exclude extreme outliers.
+    # Mean and Std Dev: Calculates mean and standard deviation for DPS per Gold.
+    # Scaling Factor: Applies a scaling factor inversely proportional to the tower number.
+
+    def calculate_dynamic_balance(df):
+        balance_ranges = {}
+        grouped = df.groupby(['Tower Number', 'Target Type'])
+        for (tower_num, target_type), group in grouped:
+            Q1 = group['DPS per Gold'].quantile(0.25)
+            Q3 = group['DPS per Gold'].quantile(0.75)
+            IQR = Q3 - Q1
+            filtered = group[(group['DPS per Gold'] >= Q1 - 1.5 * IQR) & (group['DPS per Gold'] <= Q3 + 1.5 * IQR)]
+            if filtered.empty:
+                filtered = group
+            mean = filtered['DPS per Gold'].mean()
+            std = filtered['DPS per Gold'].std(ddof=0)
+            if std == 0:
+                std = mean * 0.1
+            low = mean - std
+            high = mean + std
+            scaling_factor = 1 / (tower_num ** 0.05)
+            low *= scaling_factor
+            high *= scaling_factor
+            balance_ranges[(tower_num, target_type)] = (low, high)
+        return balance_ranges
+        '''
+
+        self.dynamic_calc_text.insert("end", dynamic_code)
+        self.dynamic_calc_text.configure(state="disabled")  # Make the text read-only
+
+        # Comments explaining each part
+        comments_text = '''
+    # Explanation of Key Components:
+    # 1. Outlier Removal: This section uses IQR (Interquartile Range) to exclude extreme outliers from the DPS per Gold calculation.
+    #    You can modify the IQR multiplier (currently 1.5) to adjust how strict the outlier removal process is.
+    # 2. Mean and Standard Deviation: These are used to calculate the average DPS per Gold and its acceptable range.
+    # 3. Scaling Factor: As tower numbers increase, this factor slightly widens the acceptable range of balance for more expensive or powerful towers.
+    #    Adjusting the exponent (currently 0.05) will impact how much flexibility is allowed for higher-tier towers.
+        '''
+        comments_label = ctk.CTkLabel(master=parent, text=comments_text, justify='left', wraplength=760, anchor='nw')
+        comments_label.grid(row=2, column=0, padx=10, pady=5, sticky="nsew")
+
+
+
+    def create_view_changes_tab(self, parent):
+        """
+        Creates the "View Changes" tab within the Options window.
+        Displays the list of changes made to towers.
+        
+        Parameters:
+        - parent: The parent frame or tab where the View Changes tab will be placed.
+        """
+        # Set up the main frame for the View Changes tab
+        view_changes_frame = ctk.CTkFrame(parent)
+        view_changes_frame.pack(fill=ctk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Use a Text widget for the changes, enabling color-coded tags
+        changes_text = tk.Text(view_changes_frame, wrap='word', bg='#333333', fg='white', font=("Consolas", 11))
+        changes_text.pack(side=ctk.LEFT, fill=ctk.BOTH, expand=True)
+        
+        # Add a scrollbar
+        changes_scrollbar = ctk.CTkScrollbar(view_changes_frame, orientation=ctk.VERTICAL, command=changes_text.yview)
+        changes_scrollbar.pack(side=ctk.RIGHT, fill=ctk.Y)
+        changes_text.configure(yscrollcommand=changes_scrollbar.set)
+        
+        # Store the text widget for future updates
+        self.view_changes_text = changes_text
+        
+        # Configure color tags
+        changes_text.tag_configure("green", foreground="#00D1A0")
+        changes_text.tag_configure("red", foreground="#FF4C4C")
+        changes_text.tag_configure("yellow", foreground="#FFFF00")
+        changes_text.tag_configure("blue", foreground="#00CED1")
+        changes_text.tag_configure("header", foreground="#FFFF00", font=("Consolas", 12, "bold"))  # For "Outlier Analysis"
+        changes_text.tag_configure("outlier_header", foreground="red", font=("Consolas", 12, "bold"))  # For "Low-End Outliers" and "High-End Outliers"
+        changes_text.tag_configure("race_header", foreground="green", font=("Consolas", 12, "bold"))  # For Race name
+        changes_text.tag_configure("difficulty_white", foreground="white", font=("Consolas", 12))
+        changes_text.tag_configure("difficulty_green", foreground="green", font=("Consolas", 12))
+        changes_text.tag_configure("difficulty_orange", foreground="orange", font=("Consolas", 12))
+        changes_text.tag_configure("difficulty_red", foreground="red", font=("Consolas", 12))
+        
+        # Insert the changes report if available
+        if hasattr(self, 'changes_report') and self.changes_report:
+            for change_line in self.changes_report:
+                for segment in change_line:
+                    if len(segment) >= 2:
+                        text, color = segment[:2]
+                        bold = segment[2] if len(segment) > 2 else False
+                        tag = color + ("_bold" if bold else "")
+                        if tag not in changes_text.tag_names():
+                            font_style = ("Consolas", 12, "bold") if bold else ("Consolas", 12)
+                            changes_text.tag_configure(tag, foreground=color, font=font_style)
+                        changes_text.insert("end", text, tag)
+        else:
+            # Display default message when there's no data
+            changes_text.insert("end", "Import data or add races to view outlier analysis and race difficulty levels.\n", "white")
+        self.view_changes_version = self.changes_report_version
+        
+        # Disable editing
+        changes_text.configure(state=tk.DISABLED)
+
+
+
+
+    def update_view_changes_tab(self):
+        """
+        Updates the "View Changes" tab with the latest changes_report.
+        """
+        if hasattr(self, 'view_changes_text'):
+            changes_text = self.view_changes_text
+            changes_text.configure(state=tk.NORMAL)
+            changes_text.delete("1.0", "end")  # Clear existing content
+
+            # Define all necessary tags with their color configurations
+            predefined_tags = {
+                "green": {"foreground": "green", "font": ("Consolas", 12)},
+                "red": {"foreground": "red", "font": ("Consolas", 12)},
+                "orange": {"foreground": "orange", "font": ("Consolas", 12)},
+                "blue": {"foreground": "#4DA6FF", "font": ("Consolas", 12, "bold")},
+                "yellow": {"foreground": "#FFFF00", "font": ("Consolas", 12, "bold")},
+                "light_yellow": {"foreground": "#FFD966", "font": ("Consolas", 12, "bold")},
+                "dark_turquoise": {"foreground": "#4DA6FF", "font": ("Consolas", 12, "bold")},
+                "light_gray": {"foreground": "#A0A0A0", "font": ("Consolas", 12)},
+                "white": {"foreground": "white", "font": ("Consolas", 12)},
+                "air_target": {"foreground": "#00CED1", "font": ("Consolas", 12)},
+                "balanced": {"foreground": "green", "font": ("Consolas", 12)},
+                "overpowered": {"foreground": "red", "font": ("Consolas", 12)},
+                "underpowered": {"foreground": "red", "font": ("Consolas", 12)},
+                # Add more tags as needed
+            }
+
+            # Configure all predefined tags
+            for tag_name, tag_attrs in predefined_tags.items():
+                if tag_name not in changes_text.tag_names():
+                    changes_text.tag_configure(tag_name, **tag_attrs)
+
+            # Insert the changes report if available
+            if hasattr(self, 'changes_report') and isinstance(self.changes_report, list) and self.changes_report:
+                for change_line in self.changes_report:
+                    for segment in change_line:
+                        if len(segment) >= 2:
+                            text, color = segment[:2]
+                            bold = segment[2] if len(segment) > 2 else False
+                            # Map the color to a predefined tag or use default
+                            if color in predefined_tags:
+                                tag = color + ("_bold" if bold else "")
+                            else:
+                                tag = "white"  # Default tag
+                            if tag not in changes_text.tag_names():
+                                # Define a default tag if not predefined
+                                font_style = ("Consolas", 12, "bold") if bold else ("Consolas", 12)
+                                changes_text.tag_configure(tag, foreground=color if color in ['green', 'red', 'orange', 'blue', 'yellow', 'light_yellow', 'dark_turquoise', 'light_gray', 'white', 'air_target', 'balanced', 'overpowered', 'underpowered'] else "white", font=font_style)
+                            changes_text.insert("end", text, tag)
+            else:
+                # Display default message when there's no data
+                changes_text.insert("end", "Import data or add races to view outlier analysis and race difficulty levels.\n", "white")
+
+            # Disable editing
+            changes_text.configure(state=tk.DISABLED)
+
+
+
+
+    def refresh_changes_report(self, save=True):
+        """
+        Regenerates changes_report only if the data changed since it was last generated.
+
+        Parameters:
+        - save (bool): Whether to save the current race's rows to imported_df first. The
+          recalculation's apply path passes False: its snapshot already holds the rows, and
+          collecting them again would report invalid rows a second time.
+        """
+        if save:
+            # Save current race data first, since it may change the data version
+            self.save_current_race_data()
+        if self.changes_report_version != self.data_version:
+            self.changes_report = self.generate_changes_report()
+            self.changes_report_version = self.data_version
+        return self.changes_report
+
+    def update_view_changes_if_stale(self):
+        """
+        Re-renders the View Changes tab if it shows an older changes report than the current data's.
+        """
+        self.refresh_changes_report()
+        if self.view_changes_version != self.changes_report_version:
+            self.update_view_changes_tab()
+            self.view_changes_version = self.changes_report_version
+
+    def generate_changes_report(self):
+        """
+        Generates a report of changes between the original data and imported_df; callers
+        save the current race's rows first (see refresh_changes_report).
+        Returns a list of lists, where each inner list represents a line composed of segments.
+        Each segment is a tuple: (text, color, bold).
+        """
+        report_lines = build_changes_report(self.original_imported_df, self.imported_df)
+        self.changes_report = report_lines  # Store the changes report
+
+        return report_lines
+
+    def create_profiler_tab(self, parent):
+        """
+        Creates the "Profiler" tab within the Options window: wall time per phase of the
+        last recalculations, call counts and cache hit rates.
+
+        Parameters:
+        - parent: The parent frame or tab where the Profiler tab will be placed.
+        """
+        profiler_frame = ctk.CTkFrame(parent)
+        profiler_frame.pack(fill=ctk.BOTH, expand=True, padx=10, pady=10)
+
+        button_frame = ctk.CTkFrame(profiler_frame, fg_color='transparent')
+        button_frame.pack(fill=ctk.X, pady=(0, 5))
+        ctk.CTkButton(button_frame, text="Refresh", width=100, command=self.update_profiler_tab).pack(side=ctk.LEFT, padx=(0, 5))
+        ctk.CTkButton(button_frame, text="Reset", width=100, command=self.reset_profiler).pack(side=ctk.LEFT)
+
+        profiler_text = tk.Text(profiler_frame, wrap='none', bg='#333333', fg='white', font=("Consolas", 11))
+        profiler_text.pack(side=ctk.LEFT, fill=ctk.BOTH, expand=True)
+        profiler_scrollbar = ctk.CTkScrollbar(profiler_frame, orientation=ctk.VERTICAL, command=profiler_text.yview)
+        profiler_scrollbar.pack(side=ctk.RIGHT, fill=ctk.Y)
+        profiler_text.configure(yscrollcommand=profiler_scrollbar.set)
+        profiler_text.tag_configure("header", foreground="#00FFFF", font=("Consolas", 11, "bold"))
+        profiler_text.tag_configure("slowest", foreground="#FFFF00")
+        self.profiler_text = profiler_text
+
+        self.update_profiler_tab()
+
+    def reset_profiler(self):
+        self.phase_profile.reset()
+        self.engine.dps_memo.reset_stats()
+        self.update_profiler_tab()
+
+    def update_profiler_tab(self):
+        """
+        Shows the phase timings and cache counters of self.phase_profile in the Profiler tab.
+        """
+        try:
+            if self.profiler_text is None or not self.profiler_text.winfo_exists():
+                return
+        except tk.TclError:
+            return
+
+        profile = self.phase_profile
+        profiler_text = self.profiler_text
+        profiler_text.configure(state=tk.NORMAL)
+        profiler_text.delete("1.0", "end")
+
+        if not profile.runs:
+            profiler_text.insert("end", "No recalculations measured yet. Edit a tower or select a race to recalculate.\n")
+        else:
+            last_total = profile.runs[-1].total
+            mean_total = sum(timings.total for timings in profile.runs) / len(profile.runs)
+            profiler_text.insert("end", f"Last {len(profile.runs)} recalculation(s) (of up to {profile.history}), "
+                                        f"wall time in ms\n\n", "header")
+
+            format_string = "{:<26} {:>10} {:>10} {:>10} {:>8} {:>7}\n"
+            profiler_text.insert("end", format_string.format("Phase", "Last", "Mean", "Max", "Share", "Calls"), "header")
+            rows = profile.summary()
+            slowest = max(rows, key=lambda row: row[2])[0] if rows else None
+            for phase, last, mean, maximum, calls in rows:
+                share = f"{100 * mean / mean_total:.0f}%" if mean_total > 0 else "-"
+                line = format_string.format(phase, f"{last * 1000:.2f}", f"{mean * 1000:.2f}", f"{maximum * 1000:.2f}", share, calls)
+                profiler_text.insert("end", line, "slowest" if phase == slowest else ())
+            # Time not covered by a phase: snapshot, queueing and waiting for the worker to be polled
+            profiler_text.insert("end", format_string.format(
+                "Total (incl. waiting)", f"{last_total * 1000:.2f}", f"{mean_total * 1000:.2f}",
+                f"{max(timings.total for timings in profile.runs) * 1000:.2f}", "", len(profile.runs)), "header")
+
+        profiler_text.insert("end", "\nCaches\n", "header")
+        row_cache = profile.outcomes('GUI row cache')
+        lookups = row_cache.get('hit', 0) + row_cache.get('miss', 0)
+        if lookups:
+            profiler_text.insert("end", f"GUI row cache: {100 * row_cache.get('hit', 0) / lookups:.0f}% hits "
+                                        f"({row_cache.get('hit', 0)} hits, {row_cache.get('miss', 0)} misses)\n")
+        for counter, outcomes in (('Computed towers', ['reused', 'incremental', 'rebuilt']),
+                                  ('Changes report', ['reused', 'rebuilt'])):
+            counts = profile.outcomes(counter)
+            if counts:
+                profiler_text.insert("end", f"{counter}: " + ", ".join(f"{counts.get(outcome, 0)} {outcome}" for outcome in outcomes) + "\n")
+        memo = self.engine.dps_memo.stats()
+        if memo['hits'] + memo['misses']:
+            profiler_text.insert("end", f"DPS memo (custom algorithm): {100 * memo['hit_rate']:.0f}% hits "
+                                        f"({memo['hits']} hits, {memo['misses']} misses, {memo['size']} of {memo['max_size']} cached)\n")
+        profiler_text.insert("end", f"Recalculations not shown: {profile.superseded} superseded, {profile.cancelled} cancelled\n")
+
+        profiler_text.configure(state=tk.DISABLED)
+
+    def toggle_ignore_outliers(self):
+        if self.dynamic_comparison_var.get():
+            self.ignore_outliers_chk.pack(side=ctk.LEFT, padx=5)  # Show if Dynamic Comparison is checked
+        else:
+            self.ignore_outliers_chk.pack_forget()  # Hide otherwise
+
+    def show_clear_all_confirmation(self):
+        # Create a new Toplevel window for the custom confirmation dialog
+        confirmation_dialog = tk.Toplevel(self.root)
+        confirmation_dialog.title("Confirm Clear All")
+        confirmation_dialog.geometry("350x150")
+        confirmation_dialog.configure(bg="#151924")  # Set background color of Toplevel window
+
+        # Center the dialog on the main window
+        self.center_window(confirmation_dialog, 350, 150)
+
+        # Ensure it stays on top and restricts interaction with the main window
+        confirmation_dialog.transient(self.root)
+        confirmation_dialog.grab_set()
+
+        # Add a bold red warning label
+        warning_label = ctk.CTkLabel(
+            confirmation_dialog,
+            text="WARNING: Unsaved data will be lost",
+            text_color="#FF3333",
+            font=("Arial", 16, "bold"),
+            fg_color="#151924",  # Set the background for customtkinter label
+            anchor="center"
+        )
+        warning_label.pack(pady=(20, 10))
+
+        # Add the confirmation question
+        question_label = ctk.CTkLabel(
+            confirmation_dialog,
+            text="Are you sure you want to clear all data?",
+            fg_color="#151924",  # Set the background for customtkinter label
+            anchor="center"
+        )
+        question_label.pack(pady=5)
+
+        # Frame for the Yes and No buttons
+        button_frame = ctk.CTkFrame(confirmation_dialog, fg_color="#151924")
+        button_frame.pack(pady=15)
+
+        # "Yes" button to confirm
+        yes_button = ctk.CTkButton(button_frame, text="Yes", command=lambda: self.confirm_clear_all(confirmation_dialog))
+        yes_button.pack(side=ctk.LEFT, padx=10)
+
+        # "No" button to cancel
+        no_button = ctk.CTkButton(button_frame, text="No", command=confirmation_dialog.destroy)
+        no_button.pack(side=ctk.LEFT, padx=10)
+
+    # Center a Window (used for "Clear All")
+    def center_window(self, window, width, height):
+        """Center a window on the screen or main application window."""
+        x = self.root.winfo_x() + (self.root.winfo_width() // 2) - (width // 2)
+        y = self.root.winfo_y() + (self.root.winfo_height() // 2) - (height // 2)
+        window.geometry(f"{width}x{height}+{x}+{y}")
+    
+    # Center a window with timer (prompts where acknowledgement is not necessary for function to run)
+    def show_centered_message(self, message, duration=2000):
+        message_win = tk.Toplevel(self.root)
+        message_win.overrideredirect(True)
+        message_win.geometry(f"400x100+{self.root.winfo_x() + (self.root.winfo_width() // 2) - 150}+{self.root.winfo_y() + (self.root.winfo_height() // 2) - 50}")
+        message_win.configure(bg="#151924")
+
+        label = ctk.CTkLabel(message_win, text=message, text_color="white", font=("Arial", 14))
+        label.pack(expand=True, fill='both')
+
+        # Destroy the message window after the duration
+        message_win.after(duration, message_win.destroy)
+
+
+    def show_importing_message(self, message="Loading races..."):
+        """
+        Displays a centered importing message window with a dynamic label.
+        
+        Parameters:
+        - message (str): The initial message to display.
+        """
+        if self.importing_window and tk.Toplevel.winfo_exists(self.importing_window):
+            # Importing window already exists
+            return
+
+        self.importing_window = tk.Toplevel(self.root)
+        self.importing_window.title("Importing Data")
+        self.importing_window.geometry("450x120")
+        self.importing_window.resizable(False, False)
+        self.importing_window.configure(bg="#333333")  # Dark background
+
+        # Make the window modal and disable the close button
+        self.importing_window.transient(self.root)
+        self.importing_window.grab_set()
+        self.importing_window.protocol("WM_DELETE_WINDOW", lambda: None)  # Disable close button
+
+        # Center the window
+        self.center_window(self.importing_window, 450, 120)
+
+        # Initial message label
+        self.importing_message_label = tk.Label(
+            master=self.importing_window,
+            text=message,
+            fg="white",
+            bg="#333333",
+            font=("Arial", 14, "bold")
+        )
+        self.importing_message_label.pack(expand=True, fill='both', padx=20, pady=20)
+
+        # Force the window to render
+        self.importing_window.update()
+
+
+
+
+    def hide_importing_message(self):
+        """
+        Hides the importing message window if it exists.
+        """
+        if hasattr(self, 'importing_window') and self.importing_window is not None:
+            try:
+                self.importing_window.destroy()
+            except tk.TclError:
+                pass  # The window might have already been destroyed
+            self.importing_window = None
+
+    def confirm_clear_all(self, dialog):
+        dialog.destroy()  # Close the confirmation dialog
+        
+        # Proceed with clearing all towers and race fields
+        for tower in self.towers:
+            self.clear_tower_fields(tower)  # Assuming clear_tower_fields is defined to reset fields
+
+        # Clear the race name field
+        self.race_entry.configure(state='normal')
+        self.race_entry.delete(0, ctk.END)
+        self.race_entry.configure(state='normal')
+        
+        # Reset the dropdown to "Select Race"
+        self.race_combobox.set("Select Race")
+
+    def show_calculation_error(self, error_message):
+        # Create a custom Toplevel window
+        error_dialog = tk.Toplevel(self.root)
+        error_dialog.title("Calculation Error")
+        error_dialog.geometry("300x150")
+        error_dialog.configure(bg="#1c1c1c")  # Dark background color
+
+        # Center the dialog on the main window
+        self.center_window(error_dialog, 300, 150)
+
+        # Prevent interaction with the main window until closed
+        error_dialog.transient(self.root)
+        error_dialog.grab_set()
+
+        # Add an error message label
+        error_label = ctk.CTkLabel(
+            error_dialog,
+            text="Calculation Error",
+            text_color="#FF3333",  # Red color for the title to highlight the error
+            font=("Arial", 14, "bold"),
+            fg_color="#1c1c1c",  # Dark background color for label
+            anchor="center"
+        )
+        error_label.pack(pady=(10, 5))
+
+        # Add the specific error message text
+        message_label = ctk.CTkLabel(
+            error_dialog,
+            text=error_message,
+            text_color="white",  # White color for the error details
+            fg_color="#1c1c1c",  # Dark background color for label
+            wraplength=280,
+            anchor="center"
+        )
+        message_label.pack(pady=(5, 10))
+
+        # Add a Close button to dismiss the dialog
+        close_button = ctk.CTkButton(
+            error_dialog,
+            text="Close",
+            command=error_dialog.destroy,
+            fg_color="#333333",  # Button color matching the theme
+            text_color="white"
+        )
+        close_button.pack(pady=10)
+
+
+    # Update the clear_all_towers method to use the custom confirmation dialog
+    def clear_all_towers(self):
+        self.show_clear_all_confirmation()
+
+    def on_entry_focus_in(self, col):
+        """
+        Changes the corresponding header label color to green when an entry gains focus.
+        
+        Parameters:
+        - col (int): The column index of the focused entry.
+        """
+        if 0 <= col < len(self.header_labels):
+            self.header_labels[col].configure(text_color="#FFC107")
+
+    def on_entry_focus_out(self, col):
+        """
+        Resets the corresponding header label color to white when an entry loses focus.
+        
+        Parameters:
+        - col (int): The column index of the unfocused entry.
+        """
+        if 0 <= col < len(self.header_labels):
+            self.header_labels[col].configure(text_color="white")
+
+
+    def create_headers(self, parent_frame):
+        self.headers = ['No.', 'Name', 'Gold Cost', 'Damage', 'Dice','Sides\nper Die', 'Cooldown', 'Range', 'Full\nSplash', 'Med\nSplash', 'Small\nSplash', 'Spell\nDPS', 'Spell\nDPS CD', 'Slow %', 'Utility\nBoost', 'Poison', 'Target\nType']  # Updated 'Sides' to 'Sides per Die'
+
+        tooltips = {
+            'No.': 'Tower number',
+            'Gold Cost': 'Cost of the tower in gold',
+            'Damage': 'Base damage of the tower',
+            'Dice': 'Number of dice rolled for damage',
+            'Sides\nper Die': 'Number of sides on each die',  # Updated tooltip
+            'Cooldown': 'Time between attacks (seconds)',
+            'Range': 'Attack range of the tower',
+            'Full\nSplash': 'Radius of 100% AoE damage infliction',
+            'Med\nSplash': 'Radius of 50% AoE damage infliction',
+            'Small\nSplash': 'Radius of 25% AoE damage infliction',
+            'Spell\nDPS': 'Custom spell damage per second',
+            'Spell\nDPS CD': 'Cooldown for spell DPS',
+            'Slow %': 'Percentage reduction in movement speed',
+            'Utility\nBoost': 'Damage multiplier for utility effects',
+            'Poison': 'Applies poison effect that slows and damages over time',
+            'Target\nType': 'Determines if a tower has specific splash damage criteria (All, Ground Splash, Air Splash)',
+        }
+
+        # Increased column widths for better readability and alignment
+        self.column_widths = [30, 145, 85, 75, 60, 70, 80, 80, 80, 80, 75, 85, 75, 85, 85, 50, 115]  # width of the headers above tower data
+
+        # Configure columns in parent_frame
+        for idx in range(len(self.headers)):
+            parent_frame.grid_columnconfigure(idx, weight=1)
+
+        # Initialize a list to store header label widgets
+        self.header_labels = []
+
+        # Create headers with uniform background and increased width
+        for idx, header in enumerate(self.headers):
+            lbl = ctk.CTkLabel(parent_frame, text=header, anchor='w', width=self.column_widths[idx],
+                            fg_color='transparent')  # Ensures uniform background
+            lbl.grid(row=0, column=idx, padx=5, pady=2, sticky='nsew')
+            lbl.configure(font=('Arial', 12, 'bold'))
+            Tooltip(lbl, text=tooltips.get(header, ''))
+            self.header_labels.append(lbl)  # Store the label in the list
+
+
+    def on_towers_frame_configure(self, event):
+        self.towers_canvas.configure(scrollregion=self.towers_canvas.bbox("all"))
+        required_height = self.towers_frame.winfo_reqheight()
+        if self.desired_canvas_height:
+            if required_height <= self.desired_canvas_height:
+                self.towers_canvas.configure(height=required_height)
+                self.towers_canvas.yview_moveto(0)  # Reset the scroll position
+            else:
+                self.towers_canvas.configure(height=self.desired_canvas_height)
+        else:
+            self.towers_canvas.configure(height=required_height)
+
+    def _on_mousewheel(self, event):
+        # Scroll the towers_canvas when mouse wheel is used over the towers section
+        self.towers_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+
+    def close_window(self, window_type, window_instance):
+        """
+        Closes the given window and resets the window tracker for the specific window type.
+        """
+        # Destroy the window
+        window_instance.destroy()
+
+        # Reset the window tracker entry
+        self.window_tracker[window_type] = None
+
+    def create_analysis_tab(self, parent):
+        # Set up the main frame for the Analysis tab
+        analysis_text_frame = ctk.CTkFrame(parent)
+        analysis_text_frame.pack(fill=ctk.BOTH, expand=True, padx=10, pady=10)
+
+        # Use a Text widget for the analysis, enabling color-coded tags
+        analysis_text = tk.Text(analysis_text_frame, wrap='word', bg='#333333', fg='white', font=("Consolas", 11))
+        analysis_text.pack(side=ctk.LEFT, fill=ctk.BOTH, expand=True)
+
+        # Add a scrollbar
+        analysis_scrollbar = ctk.CTkScrollbar(analysis_text_frame, orientation=ctk.VERTICAL, command=analysis_text.yview)
+        analysis_scrollbar.pack(side=ctk.RIGHT, fill=ctk.Y)
+        analysis_text.configure(yscrollcommand=analysis_scrollbar.set)
+
+        # Store the text widget for future updates
+        self.analysis_text = analysis_text
+
+        # Configure color tags like in calculate_all
+        analysis_text.tag_configure("green", foreground="#00D1A0")
+        analysis_text.tag_configure("red", foreground="#FF4C4C")
+        analysis_text.tag_configure("yellow", foreground="#FFFF00")
+        analysis_text.tag_configure("blue", foreground="#00CED1")
+        analysis_text.tag_configure("header", foreground="blue", font=("Helvetica", 12, "bold"))
+        analysis_text.tag_configure("outlier_header", foreground="#FFFF00", font=("Helvetica", 12, "bold"))
+
+        # Display outlier analysis with color-coding
+        if hasattr(self, 'outlier_analysis_segments'):
+            for item in self.outlier_analysis_segments:
+                if isinstance(item, tuple) and len(item) == 2:
+                    text, color = item
+                    tag = "red" if "Outliers" in text else color  # Use the red tag for headers
+                    analysis_text.insert("end", text + "", tag)
+                elif isinstance(item, tuple) and len(item) == 3:
+                    text, color, bold = item
+                    tag = color + ("_bold" if bold else "")
+                    if tag not in analysis_text.tag_names():
+                        font_style = ("Consolas", 12, "bold") if bold else ("Consolas", 12)
+                        analysis_text.tag_configure(tag, foreground=color, font=font_style)
+                    analysis_text.insert("end", text + "", tag)
+                elif isinstance(item, list):
+                    for text_segment, color_segment, *bold in item:
+                        tag = color_segment + ("_bold" if bold else "")
+                        if tag not in analysis_text.tag_names():
+                            font_style = ("Consolas", 12, "bold") if bold else ("Consolas", 12)
+                            analysis_text.tag_configure(tag, foreground=color_segment, font=font_style)
+                        analysis_text.insert("end", text_segment + "", tag)
+        analysis_text.configure(state=tk.DISABLED)
+
+    def add_tower(self):
+        row = len(self.towers)  # No need to offset by 1
+
+        # Reuse a hidden row from the pool before building new widgets
+        if self.tower_pool:
+            tower_fields = self.tower_pool.pop()
+            self.clear_tower_fields(tower_fields)
+            self.reset_tower_number_label(tower_fields)
+            tower_fields['tower_id'] = self.new_tower_id()
+            self.towers.append(tower_fields)
+            self.update_tower_row(tower_fields, row)
+            return
+
+        tower_fields = {'tower_id': self.new_tower_id()}
+
+        # Define specific widths for tower fields (separate from header widths)
+        tower_column_widths = [30, 130, 80, 70, 50, 70, 70, 70, 70, 70, 70, 80, 70, 80, 80, 50, 80]
+
+        # Create the original values dictionary for storing initial field values
+        tower_fields['original_values'] = {
+            'Gold Cost': '',
+            'Damage': '',
+            'Dice': '',
+            'Sides': '',
+            'Cooldown': '',
+            'Range': '',
+            'Full Splash': '',
+            'Med Splash': '',
+            'Small Splash': '',
+            'Spell DPS': '',
+            'Spell DPS CD': '',
+            'Slow %': '',
+            'Utility Boost': '',
+            'Poison': 0,
+            'Target Type': 'All'
+        }
+
+        # Create a Frame for the row
+        row_frame = ctk.CTkFrame(self.towers_frame, fg_color='#1c1c1c')
+        row_frame.grid(row=row, column=0, columnspan=len(self.headers), sticky='nsew', padx=0, pady=3)
+        tower_fields['row_frame'] = row_frame
+
+        # Configure columns in row_frame
+        for idx in range(len(self.headers)):
+            row_frame.grid_columnconfigure(idx, weight=1)
+
+        # Bind events to highlight the row
+        def on_enter_row(event, frame=row_frame):
+            if frame != self.focused_row:
+                frame.configure(fg_color='#6897bb')  # Light blue highlight
+
+        def on_leave_row(event, frame=row_frame):
+            if frame != self.focused_row:
+                frame.configure(fg_color='#1c1c1c')  # Remove highlight
+
+        def on_focus_row(event, frame=row_frame):
+            self.set_focused_row(frame)  # Set this row as focused
+
+        def on_focus_out_row(event, frame=row_frame):
+            # Check if any widget in the row still has focus
+            has_focus = any(widget.focus_displayof() for widget in frame.winfo_children())
+            if not has_focus and self.focused_row == frame:
+                frame.configure(fg_color='#1c1c1c')  # Reset background
+                self.focused_row = None  # Unset the focused row
+
+        # Tower number label
+        tower_number_label = ctk.CTkLabel(row_frame, text=str(row+1), anchor='center', width=tower_column_widths[0], height=30, text_color="#ffffff")
+        tower_number_label.grid(row=0, column=0, padx=2, pady=2, sticky='nsew')
+        tower_fields['No.'] = tower_number_label
+
+        # Create entries for each field
+        fields = ['Name', 'Gold Cost', 'Damage', 'Dice', 'Sides', 'Cooldown', 'Range',
+                'Full Splash', 'Med Splash', 'Small Splash', 'Spell DPS', 'Spell DPS CD',
+                'Slow %', 'Utility Boost']
+
+        for col, field in enumerate(fields, start=1):
+            entry = ctk.CTkEntry(row_frame, width=tower_column_widths[col], justify='center', text_color="white")
+            entry.grid(row=0, column=col, padx=5, pady=2, sticky='nsew')
+            tower_fields[field] = entry
+
+            # Store the initial value in 'original_values'
+            tower_fields['original_values'][field] = entry.get()
+
+            # Bind mousewheel to each widget to ensure scrolling works when mouse is over them
+            entry.bind("<MouseWheel>", self._on_mousewheel)
+            
+            # Bind events for highlighting and header color change
+            entry.bind("<Enter>", lambda e, frame=row_frame: on_enter_row(e, frame))
+            entry.bind("<Leave>", lambda e, frame=row_frame: on_leave_row(e, frame))
+            entry.bind("<FocusIn>", lambda e, frame=row_frame, col=col: (on_focus_row(e, frame), self.on_entry_focus_in(col)))
+            entry.bind("<FocusOut>", lambda e, frame=row_frame, col=col: (on_focus_out_row(e, frame), self.on_entry_focus_out(col)))
+
+
+            # Bind event listeners for change detection with validation
+            #entry.bind("<KeyRelease>", lambda e, field=field, tower_index=row: self.check_for_changes(tower_index, field))
+            # Bind arrow key navigation (the row index is looked up at key press, since pooled rows move)
+            entry.bind("<Up>", lambda e, fields=tower_fields, col=col-1: self.navigate_entry(self.towers.index(fields), col, 'up'))
+            entry.bind("<Down>", lambda e, fields=tower_fields, col=col-1: self.navigate_entry(self.towers.index(fields), col, 'down'))
+            entry.bind("<Left>", lambda e, fields=tower_fields, col=col-1: self.navigate_entry(self.towers.index(fields), col, 'left', e))
+            entry.bind("<Right>", lambda e, fields=tower_fields, col=col-1: self.navigate_entry(self.towers.index(fields), col, 'right', e))
+
+            # Add tooltip for each field
+            tooltips = {
+                'Name': 'Name of the tower',
+                'Gold Cost': 'Cost of the tower in gold',
+                'Damage': 'Base damage of the tower',
+                'Dice': 'Number of dice rolled for damage',
+                'Sides': 'Number of sides on each die',
+                'Cooldown': 'Time between attacks (seconds)',
+                'Range': 'Attack range of the tower',
+                'Full Splash': 'Radius of 100% AoE damage',
+                'Med Splash': 'Radius of 50% AoE damage',
+                'Small Splash': 'Radius of 25% AoE damage',
+                'Spell DPS': 'Custom spell damage per second',
+                'Spell DPS CD': 'Cooldown for spell DPS',
+                'Slow %': 'Percentage reduction in movement speed',
+                'Utility Boost': 'Damage multiplier for utility effects',
+            }
+            Tooltip(entry, text=tooltips.get(field, ''))
+
+        # Poison Checkbutton
+        poison_var = ctk.IntVar()
+        poison_chk = ctk.CTkCheckBox(row_frame, text="", variable=poison_var, bg_color='#333333', command=self.calculate_all, width=20)
+        poison_chk.grid(row=0, column=len(fields)+1, padx=2, pady=2, sticky='nsew')
+        tower_fields['Poison'] = poison_var
+        tower_fields['Poison_chk'] = poison_chk
+        tower_fields['original_values']['Poison'] = poison_var.get()
+
+        Tooltip(poison_chk, text='Applies poison effect that slows and damages over time')
+
+        # Bind mousewheel to checkbutton
+        poison_chk.bind("<MouseWheel>", self._on_mousewheel)
+        # Bind events for highlighting
+        poison_chk.bind("<Enter>", lambda e, frame=row_frame: on_enter_row(e, frame))
+        poison_chk.bind("<Leave>", lambda e, frame=row_frame: on_leave_row(e, frame))
+        poison_chk.bind("<FocusIn>", lambda e, frame=row_frame: on_focus_row(e, frame))
+        poison_chk.bind("<FocusOut>", lambda e, frame=row_frame: on_focus_out_row(e, frame))
+
+        # Bind event listener for the Poison checkbox change detection
+        #changes(tower_index, field))
+
+        # Target Type Combobox with decreased width
+        target_type_var = ctk.StringVar()
+        target_type_combobox = ctk.CTkComboBox(row_frame, variable=target_type_var, values=('All', 'Ground Splash', 'Air Splash'), state='readonly', width=80)
+        target_type_combobox.set('All')  # default to 'All'
+        target_type_combobox.grid(row=0, column=len(fields)+2, padx=2, pady=2, sticky='nsew')
+        tower_fields['Target Type'] = target_type_var
+        tower_fields['Target Type Combobox'] = target_type_combobox
+
+        # Bind mousewheel to combobox
+        target_type_combobox.bind("<MouseWheel>", self._on_mousewheel)
+        # Bind events for highlighting
+        target_type_combobox.bind("<Enter>", lambda e, frame=row_frame: on_enter_row(e, frame))
+        target_type_combobox.bind("<Leave>", lambda e, frame=row_frame: on_leave_row(e, frame))
+        target_type_combobox.bind("<FocusIn>", lambda e, frame=row_frame: on_focus_row(e, frame))
+        target_type_combobox.bind("<FocusOut>", lambda e, frame=row_frame: on_focus_out_row(e, frame))
+
+        # Add reset button
+        reset_button = ctk.CTkButton(row_frame, text="Reset", width=60, command=lambda idx=len(self.towers): self.reset_tower(idx))
+        reset_button.grid(row=0, column=len(fields)+3, padx=2, pady=2, sticky='nsew')
+        tower_fields['reset_button'] = reset_button
+        # Bind mousewheel to reset button
+        reset_button.bind("<MouseWheel>", self._on_mousewheel)
+        # Bind events for highlighting
+        reset_button.bind("<Enter>", lambda e, frame=row_frame: on_enter_row(e, frame))
+        reset_button.bind("<Leave>", lambda e, frame=row_frame: on_leave_row(e, frame))
+        reset_button.bind("<FocusIn>", lambda e, frame=row_frame: on_focus_row(e, frame))
+        reset_button.bind("<FocusOut>", lambda e, frame=row_frame: on_focus_out_row(e, frame))
+
+        # Add tooltip for reset button
+        Tooltip(reset_button, text='Reset this tower to default values')
+
+        # Store the tower fields in the list of towers
+        self.towers.append(tower_fields)
+
+
+    def new_tower_id(self):
+        """
+        Returns an unused Tower ID for a tower row created in the GUI.
+        """
+        self.last_tower_id += 1
+        return self.last_tower_id
+
+    def delete_tower(self, index):
+        # Hide the row and keep its widgets in the pool for the next add_tower
+        tower = self.towers[index]
+        tower['row_frame'].grid_remove()
+        if self.focused_row == tower['row_frame']:
+            tower['row_frame'].configure(fg_color='#1c1c1c')
+            self.focused_row = None
+        self.tower_pool.append(tower)
+        # Remove the tower from the list
+        self.towers.pop(index)
+        # Reorder the remaining towers
+        for idx in range(index, len(self.towers)):
+            self.update_tower_row(self.towers[idx], idx)
+        # Results computed for the old rows would be applied to the wrong rows (by tower number),
+        # so supersede any running recalculation and recalculate for the remaining towers
+        self.recompute_scheduler.schedule()
+        
+
+    def delete_last_tower(self):
+        if self.towers:
+            self.delete_tower(len(self.towers) - 1)
+
+    def reset_tower_number_label(self, tower_fields):
+        """
+        Gives the tower number label of a reused row the white color and the default font it
+        is built with, so it does not keep the rating color of the tower it showed before.
+        """
+        theme_font = ctk.ThemeManager.theme["CTkFont"]
+        tower_fields['No.'].configure(text_color="#ffffff",
+                                      font=(theme_font["family"], theme_font["size"], theme_font["weight"]))
+
+    def update_tower_row(self, tower_fields, row):
+        # Update the tower number label
+        tower_number_label = tower_fields['No.']
+        tower_number_label.configure(text=str(row+1))
+        # Re-grid the row_frame
+        tower_fields['row_frame'].grid(row=row, column=0, columnspan=len(self.headers), sticky='nsew')
+        # Update reset button command
+        reset_button = tower_fields['reset_button']
+        reset_button.configure(command=lambda idx=row: self.reset_tower(idx))
+
+    def reset_tower(self, index):
+        if not self.original_imported_df.empty:
+            # Get the race and the tower's ID, which stays the same when rows above it are deleted
+            race_name = self.race_entry.get().strip()
+            tower_id = self.towers[index]['tower_id']
+            # Filter for the specific tower from the original data
+            tower_data = self.original_imported_df[self.original_imported_df[TOWER_ID_COLUMN] == tower_id]
+            if not tower_data.empty:
+                # Populate the tower fields with original data
+                self.populate_tower_fields(self.towers[index], tower_data.iloc[0])
+                # Also update the temporary imported_df with the original data for this tower
+                self.imported_df = self.imported_df[self.imported_df[TOWER_ID_COLUMN] != tower_id]
+                self.imported_df = pd.concat([self.imported_df, tower_data.assign(**{'Tower Number': index + 1})], ignore_index=True)
+                self.invalidate_computed_towers(race_name)
+            else:
+                # Clear the fields if no original data is available
+                self.clear_tower_fields(self.towers[index])
+        else:
+            # Clear the fields if no data is imported
+            self.clear_tower_fields(self.towers[index])
+        self.calculate_all()
+
+
+
+    def populate_tower_fields(self, tower_fields, tower_row):
+        # Clear fields before populating
+        self.clear_tower_fields(tower_fields)
+        self.reset_tower_number_label(tower_fields)
+        # The row now shows this tower; rows without an ID become a new tower
+        tower_id = tower_row.get(TOWER_ID_COLUMN)
+        tower_fields['tower_id'] = int(tower_id) if pd.notna(tower_id) else self.new_tower_id()
+
+        # Define default values for specific fields
+        default_values = {
+            'Utility Boost': 1.0,
+            'Slow %': 0,
+            'Spell DPS': 0,
+            'Spell DPS CD': 1,
+            'Poison': 0,
+            'Target Type': 'All'
+        }
+
+        # Populate fields
+        integer_fields = ['Damage', 'Full Splash', 'Med Splash', 'Small Splash']
+        for field in ['Name', 'Gold Cost', 'Damage', 'Dice', 'Sides', 'Cooldown', 'Range',
+                    'Full Splash', 'Med Splash', 'Small Splash', 'Spell DPS', 'Spell DPS CD',
+                    'Slow %', 'Utility Boost']:
+            value = tower_row.get(field, '')
+            if isinstance(value, str):
+                # Names, and imported cells that are not numbers: shown as entered so the row stays invalid
+                value = value.strip()
+            elif pd.isna(value) or value == 0 or value == 0.0:
+                value = ''
+            elif field in integer_fields:
+                value = str(int(round(value)))
+            elif field in default_values and float(value) == default_values[field]:
+                # Leave the field blank if it has the default value
+                value = ''
+            else:
+                value = str(value)
+
+            # Insert the value into the entry widget
+            tower_fields[field].insert(0, value)
+            # Ensure text color is white
+            tower_fields[field].configure(text_color="#FFFFFF" if value else "#FFFFFF")
+
+        # Set checkboxes and comboboxes
+        poison_value = tower_row.get('Poison', 0)
+        tower_fields['Poison'].set(int(poison_value))
+        target_type_value = tower_row.get('Target Type', 'All')
+        tower_fields['Target Type'].set(target_type_value)
+
+        for field, default in default_values.items():
+            entry_widget = tower_fields.get(field)
+            if entry_widget and hasattr(entry_widget, 'configure'):
+                if field in integer_fields or field in default_values:
+                    try:
+                        current_value = float(tower_row.get(field, default))
+                    except ValueError:
+                        current_value = default
+                    if current_value == default:
+                        entry_widget.configure(text_color="#FFFFFF")  # Grey color for default
+                    else:
+                        entry_widget.configure(text_color="#FFFFFF")  # White color for user-set values
+
+        # Update 'original_values' to reflect the current state
+        for field in ['Name', 'Gold Cost', 'Damage', 'Dice', 'Sides', 'Cooldown', 'Range',
+                    'Full Splash', 'Med Splash', 'Small Splash', 'Spell DPS', 'Spell DPS CD',
+                    'Slow %', 'Utility Boost', 'Poison', 'Target Type']:
+            if field in ['Poison', 'Target Type']:
+                tower_fields['original_values'][field] = tower_fields[field].get()
+            else:
+                val = tower_fields[field].get()
+                tower_fields['original_values'][field] = val if val else '0'
+
+
+    def clear_tower_fields(self, tower_fields):
+        fields_to_clear = [
+            'Name', 'Gold Cost', 'Damage', 'Dice', 'Sides', 'Cooldown', 'Range',
+            'Full Splash', 'Med Splash', 'Small Splash', 'Spell DPS', 'Spell DPS CD',
+            'Slow %', 'Utility Boost'
+        ]
+        for field in fields_to_clear:
+            entry_widget = tower_fields.get(field)
+            if entry_widget:
+                entry_widget.delete(0, ctk.END)
+
+        # Uncheck the Poison checkbox
+        poison_var = tower_fields.get('Poison')
+        if poison_var:
+            poison_var.set(0)
+
+        # Reset Target Type to default ('All')
+        target_type_var = tower_fields.get('Target Type')
+        if target_type_var:
+            target_type_var.set('All')
+
+        # Clear Z-Score and Percent Rank
+        # Assuming these are stored as attributes, adjust if stored differently
+        # Since Z-Score and Percent Rank are not part of the GUI fields, this step might be unnecessary
+
+
+    def navigate_entry(self, current_row, current_col, direction, event=None):
+        if direction == 'up':
+            if current_row > 0:
+                target_entry = self.towers[current_row - 1][self.get_field_by_col(current_col)]
+                target_entry.focus_set()
+        elif direction == 'down':
+            if current_row < len(self.towers) - 1:
+                target_entry = self.towers[current_row + 1][self.get_field_by_col(current_col)]
+                target_entry.focus_set()
+        elif direction == 'left':
+            entry = self.towers[current_row][self.get_field_by_col(current_col)]
+            if event and entry.index(ctk.INSERT) == 0:
+                if current_col > 0:
+                    target_entry = self.towers[current_row][self.get_field_by_col(current_col - 1)]
+                    target_entry.focus_set()
+                    target_entry.icursor(ctk.END)
+        elif direction == 'right':
+            entry = self.towers[current_row][self.get_field_by_col(current_col)]
+            if event and entry.index(ctk.INSERT) == len(entry.get()):
+                if current_col < len(self.headers) - 1:  # Adjusted to include 'Target Type'
+                    target_entry = self.towers[current_row][self.get_field_by_col(current_col + 1)]
+                    target_entry.focus_set()
+                    target_entry.icursor(0)
+
+    def get_field_by_col(self, col):
+        fields = ['Name', 'Gold Cost', 'Damage', 'Dice', 'Sides', 'Cooldown', 'Range',
+                  'Full Splash', 'Med Splash', 'Small Splash', 'Spell DPS', 'Spell DPS CD',
+                  'Slow %', 'Utility Boost']
+        if col < len(fields):
+            return fields[col]
+        elif col == len(fields):  # Poison
+            return 'Poison'
+        elif col == len(fields) + 1:  # Target Type
+            return 'Target Type'
+        # Remove 'Z-Score', 'Percent Rank', 'Balance Status' as they are not GUI fields
+        return None
+
+    def get_computed_towers(self):
+        """
+        Returns the computed towers table: one row per imported tower (aligned with imported_df)
+        holding the parsed stats, Total DPS and DPS per Gold with and without splash, the
+        per-group Z-Score and Percent Rank, and a 'Valid' flag for rows that parsed.
+
+        The table is built once per data version and shared by the balance ranges, outlier
+        sections, race difficulty, comparison analysis and tooltip generation. When only some
+        races changed, just their rows and the statistics of their groups are recomputed.
+        """
+        if self.computed_towers is not None and self.computed_towers_version == self.data_version:
+            return self.computed_towers
+
+        computed = self.engine.derive_computed_towers(self.imported_df, self.computed_towers, self.computed_dirty_races, self.group_stats)
+        self.install_computed_towers(computed, self.group_stats)
+        return computed
+
+    def install_computed_towers(self, computed, group_stats):
+        """
+        Makes computed (aligned with imported_df) and group_stats the cached table for the current data version.
+        """
+        self.computed_towers = computed
+        self.computed_towers_version = self.data_version
+        self.computed_dirty_races = set()
+        self.group_stats = group_stats
+
+    def invalidate_computed_towers(self, race=None):
+        """
+        Marks the computed towers table as stale. With a race, only that race's rows are
+        recomputed on the next access; without one the whole table is rebuilt.
+        """
+        self.data_version += 1
+        if race is None:
+            self.computed_dirty_races = None
+        elif self.computed_dirty_races is not None:
+            self.computed_dirty_races.add(race)
+
+    def replace_race_data(self, race, race_rows):
+        """
+        Replaces the rows of one race in imported_df with race_rows (list of dicts).
+        The computed towers table is only invalidated when the race's data actually changed,
+        so it stays cached across unchanged recalculations.
+        """
+        df_race = pd.DataFrame(race_rows)
+        df_race[ROW_HASH_COLUMN] = tower_row_hashes(df_race)
+        existing = self.imported_df[self.imported_df['Race'] == race] if not self.imported_df.empty else pd.DataFrame()
+
+        if len(existing) == len(df_race) and set(df_race.columns).issubset(existing.columns):
+            existing = existing[df_race.columns].reset_index(drop=True)
+            if ((existing == df_race) | (existing.isna() & df_race.isna())).all().all():
+                return  # Nothing changed for this race
+
+        # Remove existing data for the race from imported_df
+        if not self.imported_df.empty:
+            self.imported_df = self.imported_df[self.imported_df['Race'] != race]
+
+        # Append the race's data to imported_df
+        if race_rows:
+            self.imported_df = pd.concat([self.imported_df, df_race], ignore_index=True)
+        self.invalidate_computed_towers(race)
+
+    def _calculate_all_internal(self, dirty_rows=None):
+        """
+        Starts a recalculation. The current race's GUI data is collected on the Tk thread,
+        then the statistics are computed from a snapshot in a worker thread, so the window
+        stays responsive. The result is applied in one step by _apply_balance_result.
+        """
+        # Input errors of this pass are collected first; the worker adds its output to the same report
+        self.result_report = ResultReport()
+        snapshot = None
+        try:
+            snapshot = self.take_balance_snapshot(dirty_rows, PhaseTimings())
+        finally:
+            report, self.result_report = self.result_report, None
+            if snapshot is None:
+                self.render_result_report(report)
+                self.result_text.yview_moveto(0)
+        if snapshot is None:
+            return
+
+        result_queue = queue.Queue()
+        worker = threading.Thread(target=self._recompute_worker, args=(snapshot, report, result_queue), daemon=True)
+        worker.start()
+        self.root.after(RECOMPUTE_POLL_MS, self._poll_recompute_queue, result_queue)
+
+    def take_balance_snapshot(self, dirty_rows=None, timings=None):
+        """
+        Saves the current race's GUI data to imported_df and captures everything the
+        statistics need in a BalanceSnapshot.
+
+        Parameters:
+        - dirty_rows (set, optional): Indexes of tower rows known to be edited.
+        - timings (PhaseTimings, optional): Phase timings of this recalculation.
+
+        Returns:
+        - BalanceSnapshot or None: None if no race is selected.
+        """
+        # Step 1: Collect current race's data from the GUI
+        selected_race = self.race_entry.get().strip()
+        if not selected_race:
+            messagebox.showerror("Calculation Error", "Please enter a race name.")
+            return None
+
+        with measure_phase(timings, 'GUI field collection'):
+            current_race_data = self.collect_current_race_data(selected_race, dirty_rows, timings)
+
+        # Step 2: Replace the selected race's data in imported_df with the current GUI data
+        with measure_phase(timings, 'imported_df merge'):
+            self.replace_race_data(selected_race, current_race_data)
+
+        dirty_races = self.computed_dirty_races
+        return BalanceSnapshot(
+            generation=self.recompute_scheduler.generation,
+            data_version=self.data_version,
+            selected_race=selected_race,
+            imported_df=self.imported_df,
+            computed_towers=self.computed_towers,
+            computed_towers_version=self.computed_towers_version,
+            computed_dirty_races=None if dirty_races is None else frozenset(dirty_races),
+            # The worker updates its own copy, so the cached statistics stay usable meanwhile
+            group_stats=self.group_stats.copy(),
+            dynamic_comparison=bool(self.dynamic_comparison_var.get()),
+            ignore_outliers=bool(self.ignore_outliers_var.get()),
+            preset_balance_ranges=dict(self.preset_balance_ranges),
+            original_imported_df=self.original_imported_df,
+            changes_report_version=self.changes_report_version,
+            timings=timings,
+        )
+
+    def _recompute_worker(self, snapshot, report, result_queue):
+        """
+        Computes a BalanceResult off the Tk thread. Never touches widgets; posts
+        ('done', result), ('cancelled',) or ('error', generation, report, message) to result_queue.
+        """
+        try:
+            result = self.compute_balance_result(snapshot, report)
+        except RecomputeCancelled:
+            result_queue.put(('cancelled',))
+            return
+        except Exception as e:
+            logging.exception("Recalculation failed")
+            result_queue.put(('error', snapshot.generation, report, str(e)))
+            return
+        result_queue.put(('done', result))
+
+    def _poll_recompute_queue(self, result_queue):
+        """
+        Waits on the Tk thread for a recalculation worker to finish and applies its outcome.
+        """
+        try:
+            message = result_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(RECOMPUTE_POLL_MS, self._poll_recompute_queue, result_queue)
+            return
+
+        if message[0] == 'done':
+            self._apply_balance_result(message[1])
+        elif message[0] == 'cancelled':
+            self.phase_profile.cancelled += 1
+        elif message[0] == 'error' and message[1] == self.recompute_scheduler.generation:
+            # Show the output produced before the failure along with the error
+            self.render_result_report(message[2])
+            self.show_calculation_error(message[3])
+
+    def check_recompute_generation(self, snapshot):
+        """
+        Raises RecomputeCancelled if another recalculation was requested (or the pending
+        ones cancelled) after snapshot was taken.
+        """
+        if snapshot.generation != self.recompute_scheduler.generation:
+            raise RecomputeCancelled()
+
+    def compute_balance_result(self, snapshot, report):
+        """
+        Runs the balance engine on a snapshot and lays out the results: the current race's
+        table, outliers, race difficulty levels and the changes report. Reads nothing but
+        the snapshot, so it is safe to run in a worker thread. Between phases it stops with
+        RecomputeCancelled once a newer recalculation has been requested.
+
+        Parameters:
+        - snapshot (BalanceSnapshot): Data and options captured by take_balance_snapshot.
+        - report (ResultReport): Report the results are added to.
+
+        Returns:
+        - BalanceResult: Everything _apply_balance_result shows.
+        """
+        selected_race = snapshot.selected_race
+        # Superseded while waiting for the worker to start
+        self.check_recompute_generation(snapshot)
+
+        # Collect data from all imported towers across all races, bringing the computed towers table up to date
+        timings = snapshot.timings
+        group_stats = snapshot.group_stats
+        computed_towers = snapshot.computed_towers
+        if computed_towers is None or snapshot.computed_towers_version != snapshot.data_version:
+            computed_towers = self.engine.derive_computed_towers(
+                snapshot.imported_df, computed_towers, snapshot.computed_dirty_races, group_stats, timings)
+            self.check_recompute_generation(snapshot)
+        else:
+            count_outcome(timings, 'Computed towers', 'reused')
+
+        # Derive dynamic balance ranges from the incrementally maintained group statistics
+        # Decide whether to ignore outliers (IQR filter applied inside the group summaries)
+        with measure_phase(timings, 'Balance ranges'):
+            ranges = self.engine.balance_ranges(group_stats, snapshot.dynamic_comparison and snapshot.ignore_outliers)
+            balance_ranges, global_dps_per_gold_ranges, global_raw_dps_ranges = ranges
+
+            # Rate the towers in the current race
+            race_results = self.engine.race_results(
+                computed_towers, selected_race, ranges, snapshot.dynamic_comparison, snapshot.preset_balance_ranges)
+        race_tower_data = []
+        failed_towers = set()
+        for result in race_results:
+            tower_number = result['Tower Number']
+            if tower_number in failed_towers:
+                continue  # Later variants of a tower that could not be shown are skipped too
+            try:
+                race_tower_data.append(self.format_race_result(result))
+            except ValueError as e:
+                report.add_line(f"Tower {tower_number}: Invalid - {e}", color="red")
+                failed_towers.add(tower_number)
+        self.check_recompute_generation(snapshot)
+
+        # Adjust format_string to reflect the new order and alignment
+        format_string = "{:<6} {:<30} {:<12} {:<15} {:<15} {:<10} {:<10} {:<12} {:<15} {:<15} {:<15}"
+
+        # Insert the header at the beginning of the result box
+        header = format_string.format(
+            "Tower", "Name", "DPS/Gold", "Status", "Balance Range", "Z-Score", "Rank", "Raw DPS",
+            "Target", "Global DPS/Gold", "Global Raw DPS"
+        )
+        report.add_line(header, color="#00FFFF", bold=True)
+        report.add_line("-" * 160, color="black")
+
+        # Display the results
+        for data in race_tower_data:
+            # Determine the color based on Balance Status
+            if data['Balance Status'] == "Balanced":
+                color = "green"
+            elif data['Balance Status'] in ["Underpowered", "Overpowered"]:
+                color = "red"
+            else:
+                color = "yellow"  # For outliers or undefined statuses
+
+            result_line = format_string.format(
+                data['Tower Number'],
+                data['Tower Name'],
+                data['DPS per Gold'],
+                data['Balance Status'],
+                data['Balance Range'],
+                data['Z-Score'],
+                data['Percent Rank'],
+                data['Raw DPS'],
+                data['Target'],
+                data['Global DPS per Gold'],
+                data['Global Raw DPS']
+            )
+            report.add_line(result_line, color=color)
+
+        # Append Outlier Section with Race context
+        with measure_phase(timings, 'Outlier quantiles'):
+            outliers_low, outliers_high = self.engine.find_outliers(computed_towers)
+
+        # Create a set of (Tower Number, Target Type, Race) tuples that are outliers
+        outliers_low_set = set(zip(outliers_low['Tower Number'], outliers_low['Target Type'], outliers_low['Race']))
+        outliers_high_set = set(zip(outliers_high['Tower Number'], outliers_high['Target Type'], outliers_high['Race']))
+        all_outliers = outliers_low_set | outliers_high_set
+
+        if not outliers_low.empty or not outliers_high.empty:
+            report.add_line("\n" + "="*160, color="black")
+            report.add_line("Outlier Analysis:", color="#FFFF00", bold=True)
+
+            # Display low-end outliers
+            if not outliers_low.empty:
+                report.add_line("\nLow-End Outliers:", color="red", bold=True)
+                for _, row in outliers_low.iterrows():
+                    tower_info = f"Tower {row['Tower Number']} ("
+                    race_info = f"{row['Race']}"
+                    target_type = f", {row['Target Type']}) - "
+                    dps_gold = f"DPS/Gold: {format_number(row['DPS per Gold'])}"
+                    balance_range = balance_ranges.get((row['Tower Number'], row['Target Type']), (0, 0))
+                    balance_info = f" (Balance Range: {format_number(balance_range[0])} - {format_number(balance_range[1])})"
+                    
+                    # Define segments with desired colors
+                    segments = [
+                        (tower_info, "#4DA6FF", True),       # Tower Info in Dark Turquoise
+                        (race_info, "#FFD966", True),        # Race Name in Light Blue
+                        (target_type, "#00CED1"),            # Target Type in Dark Turquoise
+                        (dps_gold, "red" if row['DPS per Gold'] < balance_range[0] else "green"),  # DPS/Gold in Red or Green
+                        (balance_info, "#A0A0A0")            # Balance Range in Light Gray
+                    ]
+                    report.add_segments(segments)
+
+            # Display high-end outliers
+            if not outliers_high.empty:
+                report.add_line("\nHigh-End Outliers:", color="red", bold=True)
+                for _, row in outliers_high.iterrows():
+                    tower_info = f"Tower {row['Tower Number']} ("
+                    race_info = f"{row['Race']}"
+                    target_type = f", {row['Target Type']}) - "
+                    dps_gold = f"DPS/Gold: {format_number(row['DPS per Gold'])}"
+                    balance_range = balance_ranges.get((row['Tower Number'], row['Target Type']), (0, 0))
+                    balance_info = f" (Balance Range: {format_number(balance_range[0])} - {format_number(balance_range[1])})"
+                    
+                    # Define segments with desired colors
+                    segments = [
+                        (tower_info, "#4DA6FF", True),       # Tower Info in Dark Turquoise
+                        (race_info, "#FFD966", True),        # Race Name in Light Blue
+                        (target_type, "#00CED1"),            # Target Type in Dark Turquoise
+                        (dps_gold, "red" if row['DPS per Gold'] > balance_range[1] else "green"),  # DPS/Gold in Red or Green
+                        (balance_info, "#A0A0A0")            # Balance Range in Light Gray
+                    ]
+                    report.add_segments(segments)
+
+        # Step 2: Update color-coding logic based on outlier status
+        label_colors = []
+        for data in race_tower_data:
+            tower_number = data['Tower Number']
+            target_type = data['Target']
+            balance_status = data['Balance Status']
+            is_outlier = (tower_number, target_type, selected_race) in all_outliers  # Check if tower is an outlier
+
+            # Set color based on outlier flag and balance status
+            if is_outlier:
+                color = "#FFFF00"  # Yellow for outliers
+            elif balance_status == "Balanced":
+                color = "#00D1A0"  # Green for Balanced
+            elif balance_status in ["Underpowered", "Overpowered"]:
+                color = "#FF4C4C"  # Red for Underpowered or Overpowered
+            else:
+                color = "white"  # Default color for undefined statuses
+
+            # The tower number label is colored when the result is applied
+            label_colors.append((tower_number, color))
+
+        # Initialize outlier_analysis_segments
+        outlier_analysis_segments = []
+        outlier_analysis_segments.append([("Outlier Analysis:\n", "#FFFF00", True)])  # Use a list of segments for each line
+
+        # Low-End Outliers
+        if not outliers_low.empty:
+            outlier_analysis_segments.append([("\nLow-End Outliers:\n", "red", True)])
+            for _, row in outliers_low.iterrows():
+                tower_info = f"Tower {row['Tower Number']} ("
+                race_info = f"{row['Race']}"
+                target_type = f", {row['Target Type']}) - "
+                dps_gold = f"DPS/Gold: {format_number(row['DPS per Gold'])}"
+                balance_range = balance_ranges.get((row['Tower Number'], row['Target Type']), (0, 0))
+                balance_info = f" (Balance Range: {format_number(balance_range[0])} - {format_number(balance_range[1])})\n"
+
+                # Define segments with desired colors
+                segments = [
+                    (tower_info, "#4DA6FF", True),       # Tower Info in Dark Turquoise, bold
+                    (race_info, "#FFD966", True),        # Race Name in Light Blue, bold
+                    (target_type, "#00CED1"),            # Target Type in Dark Turquoise
+                    (dps_gold, "red" if row['DPS per Gold'] < balance_range[0] else "green"),  # DPS/Gold in Red or Green
+                    (balance_info, "#A0A0A0")            # Balance Range in Light Gray
+                ]
+                outlier_analysis_segments.append(segments)
+
+        # High-End Outliers
+        if not outliers_high.empty:
+            outlier_analysis_segments.append([("\nHigh-End Outliers:\n", "red", True)])
+            for _, row in outliers_high.iterrows():
+                tower_info = f"Tower {row['Tower Number']} ("
+                race_info = f"{row['Race']}"
+                target_type = f", {row['Target Type']}) - "
+                dps_gold = f"DPS/Gold: {format_number(row['DPS per Gold'])}"
+                balance_range = balance_ranges.get((row['Tower Number'], row['Target Type']), (0, 0))
+                balance_info = f" (Balance Range: {format_number(balance_range[0])} - {format_number(balance_range[1])})\n"
+
+                # Define segments with desired colors
+                segments = [
+                    (tower_info, "#4DA6FF", True),       # Tower Info in Dark Turquoise, bold
+                    (race_info, "#FFD966", True),        # Race Name in Light Blue, bold
+                    (target_type, "#00CED1"),            # Target Type in Dark Turquoise
+                    (dps_gold, "red" if row['DPS per Gold'] > balance_range[1] else "green"),  # DPS/Gold in Red or Green
+                    (balance_info, "#A0A0A0")            # Balance Range in Light Gray
+                ]
+                outlier_analysis_segments.append(segments)
+
+        self.check_recompute_generation(snapshot)
+
+        # Now compute Race Difficulty Levels using weighted factors
+        if not snapshot.imported_df.empty:
+            with measure_phase(timings, 'Race difficulty'):
+                race_difficulty = self.engine.race_difficulty(computed_towers)
+
+            # Append Race Difficulty Levels to outlier_analysis_segments
+            outlier_analysis_segments.append([("\nRace Difficulty Levels:\n", "#FFFF00", True)])  # Yellow color, bold
+
+            for _, row in race_difficulty.iterrows():
+                race_name = row['Race']
+                difficulty = row['Difficulty']
+                difficulty_str = f"Difficulty Level {difficulty}"
+
+                # Determine color for difficulty level
+                if 1 <= difficulty <= 3:
+                    difficulty_color = "green"
+                elif 4 <= difficulty <= 7:
+                    difficulty_color = "orange"
+                elif 8 <= difficulty <= 10:
+                    difficulty_color = "red"
+                else:
+                    difficulty_color = "white"  # Default color
+
+                # Build the segments
+                segments = [
+                    (race_name, "#FFD966", True),  # Race Name in #FFD966, bold
+                    (": ", "white"),
+                    (difficulty_str, difficulty_color),
+                    ("\n", "white")
+                ]
+                outlier_analysis_segments.append(segments)
+        else:
+            # If imported_df is empty, display message
+            outlier_analysis_segments.append([("Import data or add races to view outlier analysis and race difficulty levels.\n", "white")])
+        self.check_recompute_generation(snapshot)
+
+        # The changes report only depends on the data, so it is rebuilt when the data changed
+        changes_report = None
+        if snapshot.changes_report_version != snapshot.data_version:
+            with measure_phase(timings, 'Changes report'):
+                changes_report = build_changes_report(snapshot.original_imported_df, snapshot.imported_df)
+            count_outcome(timings, 'Changes report', 'rebuilt')
+            self.check_recompute_generation(snapshot)
+        else:
+            count_outcome(timings, 'Changes report', 'reused')
+
+        return BalanceResult(
+            generation=snapshot.generation,
+            data_version=snapshot.data_version,
+            computed_towers=computed_towers,
+            group_stats=group_stats,
+            report=report,
+            balance_ranges=balance_ranges,
+            global_dps_per_gold_ranges=global_dps_per_gold_ranges,
+            global_raw_dps_ranges=global_raw_dps_ranges,
+            label_colors=label_colors,
+            outlier_analysis_segments=outlier_analysis_segments,
+            changes_report=changes_report,
+            timings=timings,
+        )
+
+    def format_race_result(self, result):
+        """
+        Formats one row of BalanceEngine.race_results for the results table.
+        Raises ValueError if the row holds values that cannot be shown (e.g. a NaN Percent Rank).
+        """
+        low, high = result['Balance Range']
+        global_dps_per_gold_min, global_dps_per_gold_max = result['Global DPS per Gold']
+        global_raw_dps_min, global_raw_dps_max = result['Global Raw DPS']
+
+        # **Round Percentile Rank to the nearest multiple of 5 (Updated Formatting)**
+        percent_rank_rounded = int(round(result['Percent Rank'] / 5.0)) * 5
+        # Ensure the value is within 0-100%
+        percent_rank_rounded = max(0, min(percent_rank_rounded, 100))
+
+        return {
+            'Tower Number': result['Tower Number'],
+            'Tower Name': result['Tower Name'],
+            'DPS per Gold': format_number(result['DPS per Gold']),
+            'Balance Status': result['Balance Status'],
+            'Balance Range': f"{format_number(low)} - {format_number(high)}",
+            'Z-Score': f"{round(result['Z-Score'], 2)}",
+            'Percent Rank': f"{percent_rank_rounded}%",
+            'Raw DPS': format_number(result['Total DPS']),
+            'Target': result['Target'],
+            'Global DPS per Gold': f"{format_number(global_dps_per_gold_min)} - {format_number(global_dps_per_gold_max)}",
+            'Global Raw DPS': f"{format_number(global_raw_dps_min)} - {format_number(global_raw_dps_max)}"
+        }
+
+    def _apply_balance_result(self, result):
+        """
+        Shows a finished recalculation. Results of superseded requests are dropped; their
+        computed towers table is still kept if the data has not changed since.
+        """
+        if result.data_version == self.data_version:
+            self.install_computed_towers(result.computed_towers, result.group_stats)
+            if result.changes_report is not None:
+                self.changes_report = result.changes_report
+                self.changes_report_version = result.data_version
+        if result.generation != self.recompute_scheduler.generation:
+            self.phase_profile.superseded += 1
+            return  # A newer recalculation was requested while this one ran
+
+        timings = result.timings
+        self.balance_ranges = result.balance_ranges
+        self.global_dps_per_gold_ranges = result.global_dps_per_gold_ranges
+        self.global_raw_dps_ranges = result.global_raw_dps_ranges
+        self.outlier_analysis_segments = result.outlier_analysis_segments
+
+        with measure_phase(timings, 'Text rendering'):
+            self.render_result_report(result.report)
+            # After inserting text, scroll back to the top
+            self.result_text.yview_moveto(0)
+
+            for tower_number, color in result.label_colors:
+                # Update the tower number label color and make it bold
+                self.towers[tower_number - 1]['No.'].configure(text_color=color, font=("Arial", 13, "bold"))
+
+        # Only rebuilt here if the data changed without the result carrying a report
+        self.refresh_changes_report(save=False)
+        #self.update_view_changes_tab()
+        #self.update_analysis_window()
+        try:
+            if hasattr(self, 'analysis_text') and self.analysis_text.winfo_exists() and self.analysis_text.winfo_ismapped():
+                self.update_analysis_window()
+        except tk.TclError:
+            # Widget no longer exists, skip updating
+            pass
+
+        # Safely check if the View Changes tab is open and update if necessary
+        try:
+            if hasattr(self, 'view_changes_text') and self.view_changes_text.winfo_exists() and self.view_changes_text.winfo_ismapped():
+                # Re-render only if the data changed since the tab was last drawn
+                self.update_view_changes_if_stale()
+        except tk.TclError:
+            # Widget no longer exists, skip updating
+            pass
+
+        # **Update the "Generate Tooltips" tab if it's open**
+        try:
+            if hasattr(self, 'generate_tooltips_tab') and self.generate_tooltips_tab.winfo_exists():
+                with measure_phase(timings, 'Tooltip refresh'):
+                    self.update_generate_tooltips()
+        except Exception as e:
+            print(f"Error updating tooltips: {e}")
+            pass
+
+        if timings is not None:
+            self.phase_profile.record(timings)
+            if self.options_tabview is not None and self.options_tabview.get() == "Profiler":
+                self.update_profiler_tab()
+
+    def calculate_all(self):
+        # Debounced; any edit may have changed, so every row is re-read
+        self.recompute_scheduler.schedule()
+
+    def _run_scheduled_recompute(self, dirty_rows):
+        self._calculate_all_internal(dirty_rows)
+
+    def configure_result_tag(self, color, bold=False):
+        """
+        Returns the result_text tag for a color and boldness, configuring it the first time it is used.
+        Tags configured in setup_ui keep their own styling.
+        """
+        tag = color + "_bold" if bold else color
+        if tag not in self.result_tags:
+            font_style = ("Consolas", 11, "bold") if bold else ("Consolas", 11)
+            self.result_text.tag_configure(tag, foreground=color, font=font_style)
+            self.result_tags.add(tag)
+        return tag
+
+    def display_colored_line(self, segments):
+        """
+        Adds a line with multiple colored segments, with optional bold styling, to the result report.
+
+        Parameters:
+        - segments (list of tuples): Each tuple contains (text, color, bold).
+        """
+        report = self.result_report or ResultReport()
+        report.add_segments(segments)
+
+        if self.result_report is None:
+            self.render_result_report(report, replace=False)
+
+    def display_result(self, text, color="black", bold=False):
+        """
+        Helper method to display text in the result_text with optional color and bold styling.
+        During a calculation the text is added to the pending result report.
+        """
+        report = self.result_report or ResultReport()
+        report.add_line(text, color, bold)
+
+        if self.result_report is None:
+            self.render_result_report(report, replace=False)
+            # Scroll to the end to show the latest entry
+            self.result_text.see("end")
+
+    def render_result_report(self, report, replace=True):
+        """
+        Writes a ResultReport to result_text with one insert and one tag_add per tag.
+
+        Parameters:
+        - report (ResultReport): The collected text and tag ranges.
+        - replace (bool): Whether to replace the current contents instead of appending.
+        """
+        self.result_text.configure(state=tk.NORMAL)
+        if replace:
+            self.result_text.delete("1.0", "end")
+            start = "1.0"
+        else:
+            start = self.result_text.index("end-1c")
+        self.result_text.insert(start, report.text())
+
+        # Group the ranges by tag so each tag is applied in a single call
+        tag_indices = {}
+        for range_start, range_end, style in report.ranges:
+            if style is not None:
+                tag = self.configure_result_tag(*style)
+                tag_indices.setdefault(tag, []).extend((f"{start}+{range_start}c", f"{start}+{range_end}c"))
+        for tag, indices in tag_indices.items():
+            self.result_text.tag_add(tag, *indices)
+
+        self.result_text.configure(state=tk.DISABLED)
+
+
+
+    def export_data(self):
+        # Ask the user where to save the file
+        file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        
+        if not file_path:
+            return  # Exit if no file path is selected
+
+        # Check if there is data to export
+        if self.imported_df.empty:
+            messagebox.showerror("Export Error", "No data to export.")
+            return
+
+        # Save all races in the imported DataFrame to a CSV file
+        try:
+            # Saving the DataFrame to the specified CSV file path
+            self.imported_df.drop(columns=[ROW_HASH_COLUMN], errors='ignore').to_csv(file_path, index=False)
+            messagebox.showinfo("Export Successful", f"All races have been exported to {file_path}.")
+        except Exception as e:
+            messagebox.showerror("Export Error", f"An error occurred during export: {e}")
+
+    def save_project_file(self):
+        """
+        Saves imported_df, original_imported_df, the active algorithm and the balance
+        settings to a project file (see save_project).
+        """
+        file_path = filedialog.asksaveasfilename(defaultextension=".npz", filetypes=[("Tower Balancer Project", "*.npz"), ("All files", "*.*")])
+        if not file_path:
+            return
+
+        if self.imported_df.empty:
+            messagebox.showerror("Save Project Error", "No data to save.")
+            return
+
+        # Store the race currently being edited
+        self.save_current_race_data()
+
+        try:
+            save_project(file_path, self.imported_df, self.original_imported_df, self.engine.algorithm_source,
+                         self.preset_balance_ranges, self.target_type_balance_adjustments)
+            self.show_centered_message("Project Successfully Saved")
+        except Exception as e:
+            messagebox.showerror("Save Project Error", f"An error occurred while saving the project: {e}")
+
+    def open_project_file(self):
+        """
+        Opens a project file written by save_project_file, restoring both data sets,
+        the algorithm and the balance settings, and shows the first race.
+        """
+        file_path = filedialog.askopenfilename(filetypes=[("Tower Balancer Project", "*.npz"), ("All files", "*.*")])
+        if not file_path:
+            return
+
+        try:
+            project = load_project(file_path)
+            # Validate the project's algorithm before anything is replaced
+            self.engine.algorithm_cache.load(project['algorithm_source'])
+        except Exception as e:
+            messagebox.showerror("Open Project Error", f"An error occurred while opening the project: {e}")
+            return
+
+        # Projects saved before tower IDs existed match the edited towers to the original ones
+        # by race and tower number; the row hashes are always recomputed
+        self.original_imported_df = assign_tower_ids(project['original_imported_df'])
+        self.imported_df = assign_tower_ids(project['imported_df'], reference=self.original_imported_df)
+        for df in (self.original_imported_df, self.imported_df):
+            df[ROW_HASH_COLUMN] = tower_row_hashes(df)
+        self.last_tower_id = max_tower_id(self.imported_df, self.original_imported_df)
+        self.preset_balance_ranges = project['preset_balance_ranges']
+        self.target_type_balance_adjustments = project['target_type_balance_adjustments']
+        self.engine.set_algorithm(project['algorithm_source'])
+        self.import_errors = []
+        self.invalidate_computed_towers()
+
+        races = sorted(self.imported_df['Race'].dropna().unique().tolist()) if 'Race' in self.imported_df.columns else []
+        self.show_first_race(races)
+
+
+
+
+    def import_data(self):
+        """
+        Imports race data from an Excel or CSV file. Reading, type conversion and the DPS
+        statistics run in a worker thread that reports progress through a queue; the tower
+        rows are built once, for the first race, when the worker has finished.
+        """
+        file_path = ctk.filedialog.askopenfilename(
+            defaultextension=".xlsx",
+            filetypes=[("Excel and CSV Files", "*.xlsx;*.csv"), ("All Files", "*.*")]
+        )
+        if not file_path:
+            return
+
+        if not (file_path.endswith('.xlsx') or file_path.endswith('.csv')):
+            messagebox.showerror("Import Error", "Unsupported file format. Please select an Excel or CSV file.")
+            return
+
+        # A pending recalculation would compete with the worker for the shared caches
+        self.recompute_scheduler.cancel()
+
+        self.show_importing_message("Reading file...")
+        self.import_queue = queue.Queue()
+        worker = threading.Thread(target=self._import_worker, args=(file_path, self.import_queue), daemon=True)
+        worker.start()
+        self.root.after(50, self._poll_import_queue)
+
+    def _import_worker(self, file_path, progress_queue):
+        """
+        Reads and prepares imported data off the Tk thread. Never touches widgets; posts
+        ('progress', text), ('error', title, message) or ('done', result) to progress_queue.
+        """
+        try:
+            df = read_tower_file(file_path)
+        except Exception as e:
+            progress_queue.put(('error', "Import Error", f"An error occurred while reading the file: {e}"))
+            return
+
+        if 'Race' not in df.columns:
+            progress_queue.put(('error', "Import Error", "No 'Race' column found in the data."))
+            return
+
+        try:
+            # Clean 'Race' column
+            df['Race'] = df['Race'].astype(str).str.strip()
+
+            # Get unique races and sort them alphabetically
+            races = sorted(df['Race'].dropna().unique().tolist())
+            if not races:
+                progress_queue.put(('error', "Import Error", "No races found in the data."))
+                return
+
+            # Convert tower columns to typed values once so later passes do not re-parse cells
+            progress_queue.put(('progress', f"Reading {len(df)} towers..."))
+            df, invalid_cells = coerce_tower_columns(df)
+            # Tower IDs from an earlier export are kept; the content hashes speed up the changes report
+            df = assign_tower_ids(df)
+            df[ROW_HASH_COLUMN] = tower_row_hashes(df)
+
+            # Calculate DPS and group statistics for every race in one pass
+            progress_queue.put(('progress', f"Calculating {len(races)} races..."))
+            group_stats = IncrementalGroupStats()
+            computed = self.engine.build_computed_towers(df, group_stats)
+        except Exception as e:
+            progress_queue.put(('error', "Import Error", f"An error occurred while preparing the data: {e}"))
+            return
+
+        progress_queue.put(('done', {
+            'df': df,
+            'races': races,
+            'invalid_cells': invalid_cells,
+            'computed': computed,
+            'group_stats': group_stats,
+        }))
+
+    def _poll_import_queue(self):
+        """
+        Applies messages from the import worker on the Tk thread, polling until it finishes.
+        """
+        try:
+            while True:
+                message = self.import_queue.get_nowait()
+                if message[0] == 'progress':
+                    if self.importing_message_label:
+                        self.importing_message_label.configure(text=message[1])
+                elif message[0] == 'error':
+                    self.hide_importing_message()
+                    messagebox.showerror(message[1], message[2])
+                    return
+                else:
+                    self.hide_importing_message()
+                    self._finish_import(message[1])
+                    return
+        except queue.Empty:
+            pass
+        self.root.after(50, self._poll_import_queue)
+
+    def _finish_import(self, result):
+        """
+        Installs the data prepared by _import_worker and shows the first race.
+        """
+        df = result['df']
+        self.imported_df = df.copy()  # Working DataFrame for temporary changes
+        self.original_imported_df = df.copy()  # Preserve original data
+        self.last_tower_id = max_tower_id(df)
+        self.invalidate_computed_towers()
+        # The worker already built the computed towers table for this data
+        self.install_computed_towers(result['computed'], result['group_stats'])
+
+        invalid_cells = result['invalid_cells']
+        self.import_errors = invalid_cells
+        if invalid_cells:
+            # Spreadsheet row numbers: 1-based plus the header row
+            details = "\n".join(f"Row {index + 2}, {column}: {value!r}" for index, column, value in invalid_cells[:10])
+            if len(invalid_cells) > 10:
+                details += f"\n... and {len(invalid_cells) - 10} more"
+            messagebox.showwarning("Import Warning", f"{len(invalid_cells)} cell(s) could not be read as numbers. "
+                                   f"The affected towers are skipped in calculations:\n{details}")
+
+        self.show_first_race(result['races'])
+        self.show_centered_message("All races loaded successfully!")
+
+    def show_first_race(self, races):
+        """
+        Fills the race combobox with races and builds the tower rows for the first one.
+        Unlike on_race_selected, the rows currently shown are not saved, since they belong
+        to the data that was just replaced.
+
+        Parameters:
+        - races (list): Sorted race names of the newly loaded data.
+        """
+        self.race_combobox.configure(values=races)
+        if not races:
+            self.race_combobox.set('')  # Clear selection if no races found
+            return
+
+        first_race = races[0]
+        self.race_combobox.set(first_race)
+        self.race_entry.configure(state='normal')
+        self.race_entry.delete(0, ctk.END)
+        self.race_entry.insert(0, first_race)
+        self.race_entry.configure(state='readonly')
+        self.populate_towers_from_df(self.imported_df[self.imported_df['Race'] == first_race])
+        self.calculate_all()
+
+
+
+    def quick_save(self):
+        if self.imported_file_path:
+            self.imported_df.drop(columns=[ROW_HASH_COLUMN], errors='ignore').to_excel(self.imported_file_path, index=False)
+            self.show_centered_message("Data Successfully Saved")
+        else:
+            messagebox.showerror("Quick Save Error", "No file imported to save changes.")
+
+    def save_temporary_backup(self):
+        data = []
+        for i, tower in enumerate(self.towers):
+            if not tower['Name'].get().strip() and not tower['Damage'].get().strip():
+                continue  # Skip this tower if essential fields are empty
+
+            row = {
+                'Name': tower['Name'].get() or '0',
+                'Gold Cost': tower['Gold Cost'].get() or '0',
+                'Damage': tower['Damage'].get() or '0',
+                'Dice': tower['Dice'].get() or '0',
+                'Sides': tower['Sides'].get() or '0',
+                'Cooldown': tower['Cooldown'].get() or '0',
+                'Range': tower['Range'].get() or '0',
+                'Full Splash': tower['Full Splash'].get() or '0',
+                'Med Splash': tower['Med Splash'].get() or '0',
+                'Small Splash': tower['Small Splash'].get() or '0',
+                'Spell DPS': tower['Spell DPS'].get() or '0',
+                'Spell DPS CD': tower['Spell DPS CD'].get() or '0',
+                'Slow %': tower['Slow %'].get() or '0',
+                'Utility Boost': tower['Utility Boost'].get() or '0',
+                'Poison': tower['Poison'].get(),
+                'Target Type': tower['Target Type'].get(),
+                'Z-Score': tower.get('Z-Score', ctk.StringVar()).get(),          # Updated
+                'Percent Rank': tower.get('Percent Rank', ctk.StringVar()).get(), # Updated
+                'Balance Status': tower.get('Balance Status', ctk.StringVar()).get(), # Updated
+                'Race': self.race_entry.get(),
+                'Tower Number': i+1
+            }
+            data.append(row)
+
+        if data:
+            temp_df = pd.DataFrame(data)
+            temp_df.to_csv('temp_backup.csv', index=False)
+
+    def save_current_race_data(self):
+        # Collect current GUI data
+        selected_race = self.race_entry.get().strip()
+        current_race_data = self.collect_current_race_data(selected_race)
+
+        # Replace the selected race's data in imported_df
+        self.replace_race_data(selected_race, current_race_data)
+
+    def collect_current_race_data(self, selected_race, dirty_rows=None, timings=None):
+        """
+        Reads the tower rows of the GUI into row dicts for replace_race_data.
+        A row is only parsed again if it was reported dirty or its text changed since the
+        last call. Invalid rows are reported in the results and kept with the text as
+        entered, so they stay out of the calculations but are not lost from imported_df.
+
+        Parameters:
+        - selected_race (str): Race name stored in each row.
+        - dirty_rows (set, optional): Indexes of rows known to be edited.
+        - timings (PhaseTimings, optional): Counts the row cache hits and misses.
+
+        Returns:
+        - list: One dict per tower row.
+        """
+        current_race_data = []
+        for i, tower in enumerate(self.towers):
+            # Check if essential fields are filled
+            if not tower['Name'].get().strip() and not tower['Damage'].get().strip():
+                continue  # Skip this tower if essential fields are empty
+
+            raw_values = (tower['tower_id'],) + tuple(tower[field].get() for field in [
+                'Name', 'Gold Cost', 'Damage', 'Dice', 'Sides', 'Cooldown', 'Range',
+                'Full Splash', 'Med Splash', 'Small Splash', 'Spell DPS', 'Spell DPS CD',
+                'Slow %', 'Utility Boost', 'Poison', 'Target Type'])
+            cached = self.gui_row_cache.get(i)
+            if cached is not None and cached[0] == selected_race and cached[1] == raw_values and not (dirty_rows and i in dirty_rows):
+                row = cached[2]
+                count_outcome(timings, 'GUI row cache', 'hit')
+            else:
+                row = self.parse_tower_row(tower, i + 1, selected_race)
+                self.gui_row_cache[i] = (selected_race, raw_values, row)
+                count_outcome(timings, 'GUI row cache', 'miss')
+
+            if isinstance(row, dict):
+                current_race_data.append(row)
+            else:
+                self.display_result(f"Tower {i+1}: Invalid input - {row}", color="red")
+                current_race_data.append(self.text_tower_row(tower, i + 1, selected_race))
+        return current_race_data
+
+    def text_tower_row(self, tower, tower_number, selected_race):
+        """
+        Returns the row for imported_df of a tower row that could not be parsed, with the
+        fields' text as entered. The engine marks such rows invalid.
+        """
+        row = {field: tower[field].get() for field in [
+            'Name', 'Gold Cost', 'Damage', 'Dice', 'Sides', 'Cooldown', 'Range',
+            'Full Splash', 'Med Splash', 'Small Splash', 'Spell DPS', 'Spell DPS CD',
+            'Slow %', 'Utility Boost', 'Poison', 'Target Type']}
+        row.update({'Race': selected_race, 'Tower Number': tower_number, TOWER_ID_COLUMN: tower['tower_id']})
+        return row
+
+    def parse_tower_row(self, tower, tower_number, selected_race):
+        """
+        Parses one tower row of the GUI.
+
+        Returns:
+        - dict or ValueError: The row for imported_df, or the error raised while parsing it.
+        """
+        try:
+            base_damage = float(tower['Damage'].get() or 0)
+            dice = int(float(tower['Dice'].get() or 0))
+            sides = int(float(tower['Sides'].get() or 0))
+            cooldown = float(tower['Cooldown'].get() or 1)
+            cooldown = cooldown if cooldown != 0 else 1
+            range_val = int(float(tower['Range'].get() or 300))
+            full_splash = int(float(tower['Full Splash'].get() or 0))
+            medium_splash = int(float(tower['Med Splash'].get() or 0))
+            small_splash = int(float(tower['Small Splash'].get() or 0))
+            gold_cost = int(float(tower['Gold Cost'].get() or 1))
+            gold_cost = gold_cost if gold_cost != 0 else 1
+            spell_dps = float(tower['Spell DPS'].get() or 0)
+            spell_dps_cooldown = float(tower['Spell DPS CD'].get() or 1)
+            spell_dps_cooldown = spell_dps_cooldown if spell_dps_cooldown != 0 else 1
+            poison = tower['Poison'].get()
+            slow_percentage = float(tower['Slow %'].get() or 0)
+            utility_boost = float(tower['Utility Boost'].get() or 1.0)
+            utility_boost = utility_boost if utility_boost != 0 else 1.0
+            target_type = tower['Target Type'].get()
+        except ValueError as e:
+            return e
+
+        return {
+            'Name': tower['Name'].get(),
+            'Gold Cost': gold_cost,
+            'Damage': base_damage,
+            'Dice': dice,
+            'Sides': sides,
+            'Cooldown': cooldown,
+            'Range': range_val,
+            'Full Splash': full_splash,
+            'Med Splash': medium_splash,
+            'Small Splash': small_splash,
+            'Spell DPS': spell_dps,
+            'Spell DPS CD': spell_dps_cooldown,
+            'Slow %': slow_percentage,
+            'Utility Boost': utility_boost,
+            'Poison': poison,
+            'Target Type': target_type,
+            'Race': selected_race,
+            'Tower Number': tower_number,
+            TOWER_ID_COLUMN: tower['tower_id'],
+        }
+
+
+    def on_race_selected(self, event):
+        """
+        Handles the event when a race is selected from the combobox.
+        Updates the race entry field, populates tower data, and triggers calculations.
+        
+        Parameters:
+        - event (str): The selected race name from the combobox.
+        """
+        try:
+            selected_race = event.strip()  # Correctly assign the stripped event to selected_race
+        except AttributeError:
+            # If event is not a string, handle the error
+            messagebox.showerror("Error", "Invalid race selection.")
+            return
+
+        #print(f"Selected Race: '{selected_race}'")  # Debugging
+        self.save_current_race_data()
+
+        # Update race_entry
+        self.race_entry.configure(state='normal')
+        self.race_entry.delete(0, ctk.END)
+        self.race_entry.insert(0, selected_race)
+        self.race_entry.configure(state='readonly')
+
+        # Check if imported_df is empty or doesn't contain 'Race' column
+        if self.imported_df.empty or 'Race' not in self.imported_df.columns:
+            messagebox.showerror("Error", "No data available for the selected race.")
+            print("imported_df is empty or missing 'Race' column.")
+            return
+
+        # Filter the dataframe for the selected race
+        df_filtered = self.imported_df[self.imported_df['Race'] == selected_race]
+        #print(f"Filtered DataFrame for race '{selected_race}':\n{df_filtered}")  # Debugging
+
+        if df_filtered.empty:
+            messagebox.showinfo("No Data", f"No tower data found for race '{selected_race}'.")
+            print(f"No data found for race '{selected_race}'.")
+            return
+
+        # Populate towers
+        self.populate_towers_from_df(df_filtered)
+
+        # Automatically run calculation
+        self.calculate_all()
+
+
+
+    def populate_towers_from_df(self, df):
+        # Ensure 'Tower Number' is integer
+        df.loc[:, 'Tower Number'] = df['Tower Number'].astype(int)
+        df = df.sort_values('Tower Number')
+
+        # Match the number of rows to the race: spare rows are hidden in the pool,
+        # and widgets are only built when the race has more towers than the pool holds
+        while len(self.towers) > len(df):
+            self.delete_tower(len(self.towers) - 1)
+        while len(self.towers) < len(df):
+            self.add_tower()
+
+        # Rebind the rows to the race's data
+        for tower_fields, (_, tower_row) in zip(self.towers, df.iterrows()):
+            self.populate_tower_fields(tower_fields, tower_row)
+
+        # Update the race name in the race_entry field
+        self.race_entry.delete(0, ctk.END)
+        self.race_entry.insert(0, df['Race'].iloc[0] if 'Race' in df.columns else '')
+
+        # Update tower numbers
+        for idx, tower_fields in enumerate(self.towers):
+            self.update_tower_row(tower_fields, idx)
+
+
+
+    def validate_numeric_input(self, value, field):
+        try:
+            if field in ['Dice', 'Sides', 'Full Splash', 'Med Splash', 'Small Splash', 'Poison', 'Gold Cost', 'Damage', 'Cooldown', 'Utility Boost']:
+                int_value = int(float(value))
+                if int_value < 0:
+                    raise self.show_centered_message("Invalid input detected.")
+            return True
+        except ValueError as e:
+            self.show_centered_message("Invalid input detected.")
+            return False
+
+
+    def apply_algorithm_changes(self):
+        errors = []
+        # Update calculation function
+        calc_code = self.calc_function_text.get("1.0", "end")
+        try:
+            # Validate, compile and trial the function (cached by source hash) before swapping it in
+            if self.engine.set_algorithm(calc_code):
+                # Cached DPS values were computed with the previous algorithm
+                self.invalidate_computed_towers()
+        except Exception as e:
+            errors.append(f"Calculation function: {e}")
+
+        # Update preset balance ranges
+        ranges_code = self.ranges_text.get("1.0", "end")
+        try:
+            self.preset_balance_ranges = eval(ranges_code)
+        except Exception as e:
+            errors.append(f"Preset balance ranges: {e}")
+
+        # Update target type balance adjustments
+        adjustments_code = self.target_type_adjustments_text.get("1.0", "end")
+        try:
+            self.target_type_balance_adjustments = eval(adjustments_code)
+        except Exception as e:
+            errors.append(f"Target type adjustments: {e}")
+
+        if errors:
+            messagebox.showerror("Error", "\n".join(errors))
+        else:
+            messagebox.showinfo("Success", "All changes saved successfully.")
+            # Recalculate with the new algorithm
+            self.calculate_all()
+
+    def save_algorithm_to_file(self):
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")]
+        )
+        if not file_path:
+            return
+
+        calc_code = self.calc_function_text.get("1.0", "end")
+        ranges_code = self.ranges_text.get("1.0", "end")
+        adjustments_code = self.target_type_adjustments_text.get("1.0", "end")
+
+        with open(file_path, 'w') as file:
+            file.write("# Calculation Function Code\n")
+            file.write(calc_code.strip())
+            file.write("\n\n# Preset Balance Ranges\n")
+            file.write(ranges_code.strip())
+            file.write("\n\n# Target Type Balance Adjustments\n")
+            file.write(adjustments_code.strip())
+
+        messagebox.showinfo("Saved", "Algorithm and adjustments saved successfully.")
+
+    def load_algorithm(self):
+        file_path = filedialog.askopenfilename(
+            defaultextension=".txt",
+            filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")]
+        )
+        if not file_path:
+            return
+
+        with open(file_path, 'r') as file:
+            content = file.read()
+
+        try:
+            # Split the content based on headers
+            codes = parse_algorithm_file(content)
+            calc_code = codes['calc_code']
+            ranges_code = codes['ranges_code']
+            adjustments_code = codes['adjustments_code']
+
+            # Update the text widgets
+            self.calc_function_text.delete("1.0", "end")
+            self.calc_function_text.insert("end", calc_code)
+
+            self.ranges_text.delete("1.0", "end")
+            self.ranges_text.insert("end", ranges_code)
+
+            self.target_type_adjustments_text.delete("1.0", "end")
+            self.target_type_adjustments_text.insert("end", adjustments_code)
+
+            messagebox.showinfo("Loaded", "Algorithm and adjustments loaded successfully.")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load algorithm:\n{e}")
+
+    def view_dynamic_algorithm(self):
+        if self.window_tracker['dynamic_algorithm'] is not None:
+            try:
+                self.window_tracker['dynamic_algorithm'].focus()  # Bring the window to focus if already open
+            except ctk.TclError:
+                # If the window is destroyed, reset the tracker
+                self.window_tracker['dynamic_algorithm'] = None
+        else:
+            # Open a new window for viewing the dynamic algorithm
+            dynamic_editor = ctk.CTkToplevel(self.root)
+            self.window_tracker['dynamic_algorithm'] = dynamic_editor  # Track the window
+            dynamic_editor.title("View Dynamic Algorithm")
+            dynamic_editor.geometry("1100x700")
+
+            # Bind the destroy event to reset the tracker when the window is closed
+            dynamic_editor.protocol("WM_DELETE_WINDOW", lambda: self.close_window('dynamic_algorithm', dynamic_editor))
+            dynamic_editor.bind("<Escape>", lambda event: self.close_window('dynamic_algorithm', dynamic_editor))
+
+            dynamic_editor.grid_rowconfigure(1, weight=1)
+            dynamic_editor.grid_columnconfigure(0, weight=1)
+
+            ctk.CTkLabel(dynamic_editor, text="Dynamic Balance Range Calculation Code:").grid(
+                row=0, column=0, sticky='nw', padx=10, pady=5
+            )
+            self.dynamic_calc_text = ctk.CTkTextbox(dynamic_editor, height=25, width=70)
+            self.dynamic_calc_text.grid(row=1, column=0, padx=10, pady=5, sticky="nsew")
+
+            # Load the current dynamic calculation code
+            dynamic_code = '''
+### Dynamic Balance Range Calculation
+# Outlier Removal: Uses IQR to exclude extreme outliers.
+# Mean and Std Dev: Calculates mean and standard deviation for DPS per Gold.
+# Scaling Factor: Applies a scaling factor inversely proportional to the tower number.
+
+def calculate_dynamic_balance(df):
+    balance_ranges = {}
+    grouped = df.groupby(['Tower Number', 'Target Type'])
+    for (tower_num, target_type), group in grouped:
+        Q1 = group['DPS per Gold'].quantile(0.25)
+        Q3 = group['DPS per Gold'].quantile(0.75)
+        IQR = Q3 - Q1
+        filtered = group[(group['DPS per Gold'] >= Q1 - 1.5 * IQR) & (group['DPS per Gold'] <= Q3 + 1.5 * IQR)]
+        if filtered.empty:
+            filtered = group
+        mean = filtered['DPS per Gold'].mean()
+        std = filtered['DPS per Gold'].std(ddof=0)
+        if std == 0:
+            std = mean * 0.1
+        low = mean - std
+        high = mean + std
+        scaling_factor = 1 / (tower_num ** 0.05)
+        low *= scaling_factor
+        high *= scaling_factor
+        balance_ranges[(tower_num, target_type)] = (low, high)
+    return balance_ranges
+            '''
+
+            self.dynamic_calc_text.insert("end", dynamic_code)
+            self.dynamic_calc_text.configure(state="disabled")  # Make the text read-only
+
+        # Comments explaining each part
+            comments_text = '''
+# Explanation of Key Components:
+# 1. Outlier Removal: This section uses IQR (Interquartile Range) to exclude extreme outliers from the DPS per Gold calculation.
+#    You can modify the IQR multiplier (currently 1.5) to adjust how strict the outlier removal process is.
+# 2. Mean and Standard Deviation: These are used to calculate the average DPS per Gold and its acceptable range.
+# 3. Scaling Factor: As tower numbers increase, this factor slightly widens the acceptable range of balance for more expensive or powerful towers.
+#    Adjusting the exponent (currently 0.05) will impact how much flexibility is allowed for higher-tier towers.
+            '''
+            ctk.CTkLabel(dynamic_editor, text=comments_text, justify='left', wraplength=580).grid(
+                row=2, column=0, padx=10, pady=5
+            )
+
+        # Buttons
+            button_frame = ctk.CTkFrame(dynamic_editor)
+            button_frame.grid(row=3, column=0, pady=10)
+
+            close_button = ctk.CTkButton(
+                button_frame, text="Close", command=dynamic_editor.destroy
+            )
+            close_button.pack(side="left", padx=5)
+
+
+    def update_analysis_window(self):
+        # Check if 'analysis_text' widget exists and is viewable
+        if hasattr(self, 'analysis_text') and self.analysis_text.winfo_exists() and self.analysis_text.winfo_viewable():
+            analysis_text = self.analysis_text
+            analysis_text.configure(state=tk.NORMAL)
+            analysis_text.delete("1.0", "end")  # Clear existing content
+
+            if hasattr(self, 'outlier_analysis_segments') and self.outlier_analysis_segments:
+                for item in self.outlier_analysis_segments:
+                    if isinstance(item, list):
+                        # item is a list of segments
+                        for text, color, *bold in item:
+                            tag = color + ("_bold" if bold and bold[0] else "")
+                            if tag not in analysis_text.tag_names():
+                                font_style = ("Consolas", 12, "bold") if bold and bold[0] else ("Consolas", 12)
+                                analysis_text.tag_configure(tag, foreground=color, font=font_style)
+                            analysis_text.insert("end", text, tag)
+                    elif isinstance(item, tuple) and len(item) >= 2:
+                        # item is a single segment
+                        text, color, *bold = item
+                        tag = color + ("_bold" if bold and bold[0] else "")
+                        if tag not in analysis_text.tag_names():
+                            font_style = ("Consolas", 12, "bold") if bold and bold[0] else ("Consolas", 12)
+                            analysis_text.tag_configure(tag, foreground=color, font=font_style)
+                        analysis_text.insert("end", text, tag)
+                    else:
+                        # Unexpected item format
+                        continue
+            else:
+                # Display message when there's no data
+                analysis_text.insert("end", "Import data or add races to view outlier analysis and race difficulty levels.\n", "white")
+                analysis_text.tag_configure("white", foreground="white", font=("Consolas", 12))
+
+            analysis_text.configure(state=tk.DISABLED)
+        else:
+            print("Analysis window is not initialized or visible, skipping update.")
+
+
+
+
+
+
+
+    def perform_comparison_analysis(self):
+        if self.imported_df.empty:
+            return "No data available for comparison analysis.", {'low': pd.DataFrame(), 'high': pd.DataFrame()}
+        return self.engine.comparison_analysis(
+            self.get_computed_towers(), self.dynamic_comparison_var.get() and self.ignore_outliers_var.get())
+
+    def clear_all(self):
+        """
+        Clears all input fields and resets the calculation results box after user confirmation.
+        """
+        if messagebox.askyesno("Confirm Clear All", "Are you sure you want to clear all fields and reset the results?"):
+            # Drop pending and running recalculations so they do not bring the results back
+            self.recompute_scheduler.cancel()
+
+            # Clear the calculation results text box
+            self.result_text.delete("1.0", "end")
+
+            # Clear the "Race:" text box
+            self.race_entry.delete(0, "end")
+
+            # Clear the race combobox
+            self.race_combobox.set('')
+
+            # Iterate through each tower and reset its fields
+            for tower in self.towers:
+                self.clear_tower_fields(tower)
+
+    def clear_all_skip_message(self):
+            # Drop pending and running recalculations so they do not bring the results back
+            self.recompute_scheduler.cancel()
+
+            # Clear the calculation results text box
+            self.result_text.delete("1.0", "end")
+
+            # Clear the "Race:" text box
+            self.race_entry.delete(0, "end")
+
+            # Clear the race combobox
+            self.race_combobox.set('')
+
+            # Iterate through each tower and reset its fields
+            for tower in self.towers:
+                self.clear_tower_fields(tower)
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Data files on the command line run the batch mode instead of opening the window
+        from tower_balancer_batch import main
+        sys.exit(main(sys.argv[1:]))
+
+    ctk.set_appearance_mode("Dark")  # Modes: "System" (default), "Dark", "Light"
+    ctk.set_default_color_theme("dark-blue")  # Themes: "blue" (default), "green", "dark-blue"
+
+    root = ctk.CTk()
+    app = TowerApp(root)
     root.mainloop()
\ No newline at end of file
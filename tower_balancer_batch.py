@@ -0,0 +1,449 @@
+"""
+Batch balancing of whole datasets from the command line, without opening a window.
+
+Every CSV/XLSX file is one dataset (e.g. one map version) and is balanced on its own: the
+full report of every race (the per-race results table, outliers and race difficulty levels)
+is written as CSV, JSON and/or Markdown next to the other reports in the output directory.
+Datasets are spread over a process pool, and with several datasets a comparison report
+sets their summaries side by side.
+
+Example:
+    python tower_balancer_batch.py wmw_3.2.csv wmw_3.3.xlsx --algorithm algorithm.txt --format json md
+"""
+import argparse
+import ast
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from tower_balancer_core import (
+    calculate_dps_per_gold_code, BalanceEngine, coerce_tower_columns, read_tower_file,
+    parse_algorithm_file, format_number,
+)
+
+REPORT_FORMATS = ['csv', 'json', 'md']
+
+# Columns of the per-race results table, in report order
+TOWER_REPORT_COLUMNS = [
+    'Race', 'Tower Number', 'Tower Name', 'Target', 'DPS per Gold', 'Total DPS', 'Balance Status',
+    'Balance Low', 'Balance High', 'Z-Score', 'Percent Rank', 'Outlier',
+    'Global DPS per Gold Min', 'Global DPS per Gold Max', 'Global Raw DPS Min', 'Global Raw DPS Max',
+]
+OUTLIER_REPORT_COLUMNS = [
+    'Outlier', 'Race', 'Tower Number', 'Target Type', 'DPS per Gold', 'Total DPS',
+    'Balance Low', 'Balance High', 'Z-Score', 'Percent Rank',
+]
+
+
+def load_algorithm_file(file_path):
+    """
+    Reads an algorithm file saved by the Algorithm Editor, or a plain Python file that
+    defines calculate_dps_per_gold.
+
+    Returns:
+    - tuple: (algorithm source, preset balance ranges dict or None if the file has none)
+    """
+    with open(file_path, 'r') as file:
+        content = file.read()
+    codes = parse_algorithm_file(content)
+    if not codes['calc_code']:
+        # No section headers: the whole file is the function
+        return content, None
+    preset_balance_ranges = parse_preset_balance_ranges(codes['ranges_code']) if codes['ranges_code'] else None
+    return codes['calc_code'], preset_balance_ranges
+
+
+def load_preset_file(file_path):
+    """
+    Reads preset balance ranges from an algorithm file's '# Preset Balance Ranges' section,
+    or from a file holding just the dict.
+
+    Returns:
+    - dict: Tower number -> (low, high).
+    """
+    with open(file_path, 'r') as file:
+        content = file.read()
+    ranges_code = parse_algorithm_file(content)['ranges_code']
+    return parse_preset_balance_ranges(ranges_code or content)
+
+
+def parse_preset_balance_ranges(ranges_code):
+    """
+    Parses a preset balance ranges dict literal, e.g. "{1: (225, 325), 2: (125, 175)}".
+    Unlike the Algorithm Editor this does not eval the code, since batch files are not typed in by hand.
+
+    Raises:
+    - ValueError: If the code is not a dict of tower number -> (low, high).
+    """
+    try:
+        ranges = ast.literal_eval(ranges_code.strip())
+    except (ValueError, SyntaxError) as e:
+        raise ValueError(f"Preset balance ranges are not a dict literal: {e}")
+    if not isinstance(ranges, dict) or not all(
+            isinstance(value, (tuple, list)) and len(value) == 2 for value in ranges.values()):
+        raise ValueError("Preset balance ranges must map tower numbers to (low, high).")
+    return {int(tower_number): tuple(value) for tower_number, value in ranges.items()}
+
+
+def load_dataset(file_path):
+    """
+    Reads and prepares one dataset the way the GUI import does.
+
+    Returns:
+    - tuple: (typed pd.DataFrame, list of (row index, column, value) for cells that could not be parsed)
+
+    Raises:
+    - ValueError: If the file has no 'Race' column or no races.
+    """
+    df = read_tower_file(file_path)
+    if 'Race' not in df.columns:
+        raise ValueError("No 'Race' column found in the data.")
+    # Clean 'Race' column
+    df['Race'] = df['Race'].astype(str).str.strip()
+    if df['Race'].dropna().empty:
+        raise ValueError("No races found in the data.")
+    return coerce_tower_columns(df)
+
+
+def build_report_tables(evaluation):
+    """
+    Flattens the result of BalanceEngine.evaluate into report tables.
+
+    Returns:
+    - dict: 'towers' (one row per rated tower variant of every race, flagged with its outlier side),
+      'outliers' (low and high outliers with their balance range) and 'difficulty' (race difficulty levels).
+    """
+    balance_ranges = evaluation['balance_ranges']
+    outliers = []
+    for side, frame in (('Low', evaluation['outliers_low']), ('High', evaluation['outliers_high'])):
+        frame = frame.copy()
+        frame.insert(0, 'Outlier', side)
+        outliers.append(frame)
+    outliers = pd.concat(outliers, ignore_index=True)
+    ranges = [balance_ranges.get((tower_number, target_type), (0, 0))
+              for tower_number, target_type in zip(outliers['Tower Number'], outliers['Target Type'])]
+    outliers['Balance Low'] = [low for low, high in ranges]
+    outliers['Balance High'] = [high for low, high in ranges]
+    outliers = outliers[OUTLIER_REPORT_COLUMNS].sort_values(['Race', 'Tower Number', 'Outlier'], kind='stable')
+
+    # Towers are flagged the way the GUI colors their labels: by tower, target and race
+    outlier_sides = {}
+    for side, tower_number, target_type, race in zip(
+            outliers['Outlier'], outliers['Tower Number'], outliers['Target Type'], outliers['Race']):
+        outlier_sides.setdefault((tower_number, target_type, race), side)
+
+    rows = []
+    for race, race_results in evaluation['race_results'].items():
+        for result in race_results:
+            rows.append({
+                'Race': race,
+                'Tower Number': result['Tower Number'],
+                'Tower Name': result['Tower Name'],
+                'Target': result['Target'],
+                'DPS per Gold': result['DPS per Gold'],
+                'Total DPS': result['Total DPS'],
+                'Balance Status': result['Balance Status'],
+                'Balance Low': result['Balance Range'][0],
+                'Balance High': result['Balance Range'][1],
+                'Z-Score': result['Z-Score'],
+                'Percent Rank': result['Percent Rank'],
+                'Outlier': outlier_sides.get((result['Tower Number'], result['Target'], race), ''),
+                'Global DPS per Gold Min': result['Global DPS per Gold'][0],
+                'Global DPS per Gold Max': result['Global DPS per Gold'][1],
+                'Global Raw DPS Min': result['Global Raw DPS'][0],
+                'Global Raw DPS Max': result['Global Raw DPS'][1],
+            })
+
+    return {
+        'towers': pd.DataFrame(rows, columns=TOWER_REPORT_COLUMNS),
+        'outliers': outliers.reset_index(drop=True),
+        'difficulty': evaluation['race_difficulty'][['Race', 'Weighted Score', 'Difficulty']].reset_index(drop=True),
+    }
+
+
+def _markdown_table(df):
+    """
+    Renders a DataFrame as a GitHub Markdown table, with numbers formatted as in the GUI.
+    """
+    def cell(value):
+        if not isinstance(value, str) and pd.isna(value):
+            return ''
+        if isinstance(value, float):
+            return format_number(value)
+        return str(value).replace('|', '\\|')
+
+    lines = [
+        '| ' + ' | '.join(str(column) for column in df.columns) + ' |',
+        '|' + '|'.join('---' for _ in df.columns) + '|',
+    ]
+    for row in df.itertuples(index=False):
+        lines.append('| ' + ' | '.join(cell(value) for value in row) + ' |')
+    return '\n'.join(lines)
+
+
+# Markdown headings of the report tables; 'towers' gets one section per race instead
+TABLE_HEADINGS = {
+    'outliers': "Outliers",
+    'difficulty': "Race Difficulty Levels",
+    'datasets': "Datasets",
+    'race_difficulty': "Race Difficulty Levels by Dataset",
+}
+
+
+def write_report(tables, base_path, formats, title):
+    """
+    Writes report tables in each of formats.
+
+    Parameters:
+    - tables (dict): Table name -> DataFrame, e.g. the result of build_report_tables or build_comparison_tables.
+    - base_path (str): Output path without extension; CSV writes one file per table (base_path_towers.csv, ...).
+    - formats (list): Any of REPORT_FORMATS.
+    - title (str): Report title (the dataset name) for JSON and Markdown.
+
+    Returns:
+    - list: Paths of the written files.
+    """
+    written = []
+    if 'csv' in formats:
+        for name, table in tables.items():
+            path = f"{base_path}_{name}.csv"
+            table.to_csv(path, index=False)
+            written.append(path)
+    if 'json' in formats:
+        path = base_path + '.json'
+        report = {'dataset': title}
+        for name, table in tables.items():
+            # to_json writes NaN as null and numpy scalars as plain numbers
+            report[name] = json.loads(table.to_json(orient='records'))
+        with open(path, 'w') as file:
+            json.dump(report, file, indent=2)
+        written.append(path)
+    if 'md' in formats:
+        path = base_path + '.md'
+        sections = [f"# Balance Report: {title}"]
+        for name, table in tables.items():
+            if name == 'towers':
+                for race in table['Race'].drop_duplicates():
+                    sections.append(f"## {race}\n\n" + _markdown_table(table[table['Race'] == race].drop(columns='Race')))
+            else:
+                sections.append(f"## {TABLE_HEADINGS.get(name, name)}\n\n" + (_markdown_table(table) if not table.empty else "None"))
+        with open(path, 'w') as file:
+            file.write('\n\n'.join(sections) + '\n')
+        written.append(path)
+    return written
+
+
+def summarize_dataset(name, tables, towers):
+    """
+    Condenses a dataset's report tables into one row of the comparison table.
+
+    Returns:
+    - dict: Counts of rated towers per balance status and of outliers, the mean absolute
+      Z-Score and the race difficulty levels (race -> level).
+    """
+    rated = tables['towers']
+    statuses = rated['Balance Status'].value_counts()
+    outlier_sides = tables['outliers']['Outlier'].value_counts()
+    return {
+        'Dataset': name,
+        'Races': rated['Race'].nunique(),
+        'Towers': towers,
+        'Rated': len(rated),
+        'Balanced': int(statuses.get('Balanced', 0)),
+        'Underpowered': int(statuses.get('Underpowered', 0)),
+        'Overpowered': int(statuses.get('Overpowered', 0)),
+        'Balanced %': 100.0 * statuses.get('Balanced', 0) / len(rated) if len(rated) else 0.0,
+        'Low Outliers': int(outlier_sides.get('Low', 0)),
+        'High Outliers': int(outlier_sides.get('High', 0)),
+        'Mean Abs Z-Score': float(rated['Z-Score'].abs().mean()) if len(rated) else 0.0,
+        'Race Difficulty': dict(zip(tables['difficulty']['Race'], tables['difficulty']['Difficulty'].astype(int))),
+    }
+
+
+def process_dataset(file_path, name, output_dir, formats, engine, dynamic_comparison=True, ignore_outliers=True):
+    """
+    Balances one dataset and writes its report. Errors are returned, not raised, so one
+    broken file does not stop the batch.
+
+    Returns:
+    - dict: 'file', 'races', 'towers', 'seconds', 'written', 'invalid_cells' (count),
+      'comparison' (summarize_dataset row) and 'error' (None on success).
+    """
+    start = time.perf_counter()
+    result = {'file': file_path, 'races': 0, 'towers': 0, 'seconds': 0.0, 'written': [],
+              'invalid_cells': 0, 'comparison': None, 'error': None}
+    try:
+        df, invalid_cells = load_dataset(file_path)
+        evaluation = engine.evaluate(df, dynamic_comparison, ignore_outliers)
+        tables = build_report_tables(evaluation)
+        result['written'] = write_report(tables, os.path.join(output_dir, name), formats, name)
+        result['comparison'] = summarize_dataset(name, tables, len(df))
+        result['races'] = len(evaluation['race_results'])
+        result['towers'] = len(df)
+        result['invalid_cells'] = len(invalid_cells)
+    except Exception as e:
+        result['error'] = str(e)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+# Engine of a worker process, built once by _init_worker and reused for every dataset it is given
+_worker_engine = None
+
+
+def _init_worker(algorithm_source, preset_balance_ranges):
+    global _worker_engine
+    _worker_engine = BalanceEngine(algorithm_source, preset_balance_ranges)
+
+
+def _process_dataset_in_worker(file_path, name, output_dir, formats, dynamic_comparison, ignore_outliers):
+    return process_dataset(file_path, name, output_dir, formats, _worker_engine, dynamic_comparison, ignore_outliers)
+
+
+def dataset_names(file_paths):
+    """
+    Report names of the datasets: the file names without extension, numbered when two files share a name.
+    """
+    names = []
+    for file_path in file_paths:
+        base = name = os.path.splitext(os.path.basename(file_path))[0]
+        number = 2
+        while name in names:
+            name = f"{base}_{number}"
+            number += 1
+        names.append(name)
+    return names
+
+
+def build_comparison_tables(results):
+    """
+    Merges the summaries of the balanced datasets.
+
+    Returns:
+    - dict: 'datasets' (one row per dataset) and 'race_difficulty' (one row per race, one
+      difficulty column per dataset; empty where a dataset lacks the race).
+    """
+    rows = [dict(result['comparison']) for result in results if result['error'] is None]
+    difficulty = {row['Dataset']: row.pop('Race Difficulty') for row in rows}
+    datasets = pd.DataFrame(rows, columns=[
+        'Dataset', 'Races', 'Towers', 'Rated', 'Balanced', 'Underpowered', 'Overpowered', 'Balanced %',
+        'Low Outliers', 'High Outliers', 'Mean Abs Z-Score'])
+    race_difficulty = pd.DataFrame(difficulty).rename_axis('Race').reset_index()
+    if not race_difficulty.empty:
+        race_difficulty = race_difficulty.sort_values('Race').astype({name: 'Int64' for name in difficulty})
+    return {'datasets': datasets, 'race_difficulty': race_difficulty}
+
+
+def run_batch(file_paths, output_dir, formats, engine, dynamic_comparison=True, ignore_outliers=True, jobs=1,
+              out=sys.stdout):
+    """
+    Balances every dataset in file_paths and writes its report to output_dir. With more
+    than one dataset, a comparison report of all of them is written too (comparison.*).
+    Datasets that cannot be read are reported and skipped.
+
+    With jobs > 1 the datasets are spread over a process pool, one dataset per task; each
+    worker builds its own BalanceEngine from the engine's algorithm and preset ranges.
+
+    Parameters:
+    - file_paths (list): CSV/XLSX files, one dataset each.
+    - output_dir (str): Directory the reports are written to; created if missing.
+    - formats (list): Any of REPORT_FORMATS.
+    - engine (BalanceEngine): Engine with the algorithm and preset ranges to use.
+    - dynamic_comparison (bool): Rate 'All' towers against the dynamic ranges instead of the presets.
+    - ignore_outliers (bool): Exclude IQR outliers from the dynamic ranges.
+    - jobs (int): Number of worker processes; 1 balances in this process.
+    - out (file): Where progress and throughput are printed.
+
+    Returns:
+    - list: process_dataset results, in the order of file_paths.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    names = dataset_names(file_paths)
+    batch_start = time.perf_counter()
+    jobs = max(1, min(jobs, len(file_paths)))
+    if jobs == 1:
+        results = (process_dataset(file_path, name, output_dir, formats, engine, dynamic_comparison, ignore_outliers)
+                   for file_path, name in zip(file_paths, names))
+        results = _report_progress(results, out)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(engine.algorithm_source, engine.preset_balance_ranges)) as executor:
+            futures = [executor.submit(_process_dataset_in_worker, file_path, name, output_dir, formats,
+                                       dynamic_comparison, ignore_outliers)
+                       for file_path, name in zip(file_paths, names)]
+            results = _report_progress((future.result() for future in futures), out)
+
+    if len(results) > 1:
+        write_report(build_comparison_tables(results), os.path.join(output_dir, 'comparison'), formats, "Comparison")
+
+    elapsed = max(time.perf_counter() - batch_start, 1e-9)
+    races = sum(result['races'] for result in results)
+    towers = sum(result['towers'] for result in results)
+    done = sum(1 for result in results if result['error'] is None)
+    print(f"Balanced {done}/{len(results)} datasets with {jobs} process(es): {races} races, {towers} towers "
+          f"in {elapsed:.2f} s ({races / elapsed:.1f} races/s, {towers / elapsed:.1f} towers/s)", file=out)
+    return results
+
+
+def _report_progress(results, out):
+    """
+    Prints each dataset's outcome as it arrives and returns the results as a list.
+    """
+    reported = []
+    for result in results:
+        file_path = result['file']
+        if result['error'] is not None:
+            print(f"{file_path}: {result['error']}", file=sys.stderr)
+        else:
+            if result['invalid_cells']:
+                print(f"{file_path}: {result['invalid_cells']} cell(s) could not be read as numbers; "
+                      f"the affected towers are skipped", file=sys.stderr)
+            print(f"{file_path}: {result['races']} races, {result['towers']} towers in {result['seconds']:.2f} s "
+                  f"-> {', '.join(result['written'])}", file=out)
+        reported.append(result)
+    return reported
+
+
+def main(argv=None):
+    """
+    Command-line entry point. Returns the process exit code: 0 on success, 1 if any dataset failed.
+    """
+    parser = argparse.ArgumentParser(
+        description="Balance tower datasets without opening the Tower Balancer window.")
+    parser.add_argument('files', nargs='+', help="CSV or XLSX tower data, one dataset per file")
+    parser.add_argument('-o', '--output-dir', default='balance_reports', help="directory for the reports (default: %(default)s)")
+    parser.add_argument('-f', '--format', nargs='+', choices=REPORT_FORMATS, default=REPORT_FORMATS,
+                        help="report formats (default: all)")
+    parser.add_argument('-a', '--algorithm', help="algorithm file saved by the Algorithm Editor, or a Python file "
+                                                  "defining calculate_dps_per_gold")
+    parser.add_argument('-p', '--presets', help="preset balance ranges file (overrides the algorithm file's)")
+    parser.add_argument('--preset-ranges', action='store_true',
+                        help="rate 'All' towers against the preset ranges instead of the dynamic ones")
+    parser.add_argument('--keep-outliers', action='store_true', help="include IQR outliers in the dynamic ranges")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help="worker processes, one dataset each (default: number of CPUs, %(default)s)")
+    args = parser.parse_args(argv)
+
+    try:
+        algorithm_source, preset_balance_ranges = calculate_dps_per_gold_code, None
+        if args.algorithm:
+            algorithm_source, preset_balance_ranges = load_algorithm_file(args.algorithm)
+        if args.presets:
+            preset_balance_ranges = load_preset_file(args.presets)
+        engine = BalanceEngine(algorithm_source, preset_balance_ranges)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    results = run_batch(args.files, args.output_dir, args.format, engine,
+                        dynamic_comparison=not args.preset_ranges, ignore_outliers=not args.keep_outliers,
+                        jobs=args.jobs)
+    return 1 if any(result['error'] for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
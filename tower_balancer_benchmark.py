@@ -0,0 +1,421 @@
+"""
+Benchmarks of the balancing pipeline on seeded synthetic data.
+
+generate_towers builds N races x M towers with realistic stats and a realistic mix of target
+types. Every phase of the pipeline (import, DPS and group statistics, the incremental
+recalculation after an edit, balance ranges, race results, outliers, race difficulty, the
+changes report, the comparison analysis, CSV export and project files) is timed at each
+scale. The results are written as JSON so runs of different commits can be compared.
+
+With --check, the vectorized DPS kernel is first compared with the scalar
+calculate_dps_per_gold on the generated towers and on EDGE_CASE_TOWERS.
+
+Example:
+    python tower_balancer_benchmark.py --races 10 100 1000 --output before.json
+    python tower_balancer_benchmark.py --races 10 100 1000 --baseline before.json
+    python tower_balancer_benchmark.py --races 100 --check
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from tower_balancer_core import (
+    BalanceEngine, IncrementalGroupStats, build_changes_report, save_project, load_project,
+    ROW_HASH_COLUMN, RaceDifficultyScorer, assign_tower_ids, tower_row_hashes, parse_tower_inputs,
+)
+from tower_balancer_batch import load_dataset
+
+BENCHMARK_FORMAT_VERSION = 1  # Bumped when the layout of the JSON report changes
+DEFAULT_SCALES = [10, 100, 1000, 10000]
+DEFAULT_TOWERS_PER_RACE = 11
+DEFAULT_REPEAT = 3
+REPEAT_BUDGET_SECONDS = 10.0  # A phase whose first run takes longer than this is not repeated
+MIN_COMPARABLE_SECONDS = 0.005  # Phases faster than this are too noisy to flag as regressions
+# Timed phases, in the order they run
+BENCHMARK_PHASES = [
+    'import_csv', 'calculate', 'recalculate_race', 'balance_ranges', 'race_results', 'outliers',
+    'race_difficulty', 'changes_report', 'comparison_analysis', 'export_csv', 'save_project', 'load_project',
+]
+
+# Typical Gold Cost of each tier; towers beyond the last tier keep growing by its ratio
+TIER_GOLD_COSTS = [10, 25, 50, 100, 175, 300, 500, 800, 1250, 2000, 3000, 4500]
+# Share of each target type among generated towers
+TARGET_TYPE_MIX = {'All': 0.6, 'Ground Splash': 0.2, 'Air Splash': 0.2}
+# Columns in the order the GUI exports them
+TOWER_COLUMNS = [
+    'Name', 'Gold Cost', 'Damage', 'Dice', 'Sides', 'Cooldown', 'Range', 'Full Splash', 'Med Splash',
+    'Small Splash', 'Spell DPS', 'Spell DPS CD', 'Slow %', 'Utility Boost', 'Poison', 'Target Type',
+    'Race', 'Tower Number',
+]
+# Stats at the edges of the DPS formula, each applied to an ordinary tower, checked by --check
+EDGE_CASE_TOWERS = [
+    {'Slow %': 100},  # The slow factor divides by zero
+    {'Slow %': 150},
+    {'Slow %': 100, 'Target Type': 'Ground Splash', 'Full Splash': 50},
+    {'Cooldown': 1e-320},  # Hits per second overflow to inf
+    {'Damage': 1e308, 'Utility Boost': 10},
+    {'Gold Cost': -50},
+    {'Damage': 0, 'Dice': 0, 'Sides': 0},
+    {'Full Splash': 150, 'Med Splash': 50, 'Small Splash': 100},
+    {'Spell DPS': 20, 'Spell DPS CD': -2},
+    {'Range': 5000, 'Poison': 1},
+]
+
+
+def generate_towers(races, towers_per_race=DEFAULT_TOWERS_PER_RACE, seed=0):
+    """
+    Generates tower data for races races of towers_per_race towers each.
+
+    Stats grow with the tower number the way they do in Wintermaul Wars: Gold Cost follows
+    TIER_GOLD_COSTS and Damage roughly follows Gold Cost. Splash towers get splash radii;
+    some towers get spell damage, slow, poison or a utility boost.
+
+    Parameters:
+    - races (int): Number of races.
+    - towers_per_race (int): Towers per race, numbered from 1.
+    - seed (int): Seed of the random generator; equal arguments give equal data.
+
+    Returns:
+    - pd.DataFrame: One row per tower with the columns of TOWER_COLUMNS.
+    """
+    rng = np.random.default_rng(seed)
+    count = races * towers_per_race
+    race_index = np.repeat(np.arange(races), towers_per_race)
+    tower_number = np.tile(np.arange(1, towers_per_race + 1), races)
+
+    tiers = np.array(TIER_GOLD_COSTS, dtype=float)
+    growth = tiers[-1] / tiers[-2]
+    tier_cost = np.where(
+        tower_number <= len(tiers),
+        tiers[np.minimum(tower_number, len(tiers)) - 1],
+        tiers[-1] * growth ** (tower_number - len(tiers)))
+    gold_cost = np.maximum(1, np.round(tier_cost * rng.uniform(0.8, 1.2, count))).astype(int)
+
+    target_type = rng.choice(list(TARGET_TYPE_MIX), size=count, p=list(TARGET_TYPE_MIX.values()))
+    splash = target_type != 'All'
+    # A few single-target towers have a small splash too
+    splash |= rng.random(count) < 0.1
+    full_splash = np.where(splash, rng.integers(25, 150, count), 0)
+    med_splash = np.where(splash, full_splash + rng.integers(0, 100, count), 0)
+    small_splash = np.where(splash, med_splash + rng.integers(25, 150, count), 0)
+
+    cooldown = np.round(rng.uniform(0.3, 3.0, count), 2)
+    dice = rng.integers(1, 4, count)
+    sides = rng.integers(1, 6, count) * tower_number
+    # Damage per attack scales with cost and cooldown so DPS per Gold stays in a plausible band
+    damage = np.round(gold_cost * cooldown * rng.uniform(0.3, 1.2, count), 1)
+
+    has_spell = rng.random(count) < 0.2
+    has_slow = rng.random(count) < 0.15
+    has_boost = rng.random(count) < 0.1
+
+    width = len(str(max(races - 1, 0)))
+    race_names = np.array([f"Race{index:0{width}d}" for index in range(races)])[race_index]
+    df = pd.DataFrame({
+        'Name': [f"{race} T{number}" for race, number in zip(race_names, tower_number)],
+        'Gold Cost': gold_cost,
+        'Damage': damage,
+        'Dice': dice,
+        'Sides': sides,
+        'Cooldown': cooldown,
+        'Range': rng.integers(6, 24, count) * 50,
+        'Full Splash': full_splash,
+        'Med Splash': med_splash,
+        'Small Splash': small_splash,
+        'Spell DPS': np.where(has_spell, np.round(gold_cost * rng.uniform(0.02, 0.2, count), 1), 0.0),
+        'Spell DPS CD': np.where(has_spell, np.round(rng.uniform(1, 10, count), 1), 1.0),
+        'Slow %': np.where(has_slow, rng.integers(10, 50, count).astype(float), 0.0),
+        'Utility Boost': np.where(has_boost, np.round(rng.uniform(1.05, 1.5, count), 2), 1.0),
+        'Poison': (rng.random(count) < 0.1).astype(int),
+        'Target Type': target_type,
+        'Race': race_names,
+        'Tower Number': tower_number,
+    })
+    return df[TOWER_COLUMNS]
+
+
+def edit_towers(df, fraction=0.01, seed=1):
+    """
+    Returns a copy of df with fraction of its towers edited (Damage, Gold Cost, Cooldown or
+    Name changed), like a balancing session does between imports.
+    """
+    rng = np.random.default_rng(seed)
+    edited = df.copy()
+    rows = rng.choice(len(df), size=max(1, int(len(df) * fraction)), replace=False)
+    for position, column in zip(rows, rng.choice(['Damage', 'Gold Cost', 'Cooldown', 'Name'], size=len(rows))):
+        label = edited.index[position]
+        if column == 'Name':
+            edited.at[label, column] = edited.at[label, column] + " II"
+        elif column == 'Gold Cost':
+            edited.at[label, column] = int(edited.at[label, column] * 1.1) + 1
+        else:
+            edited.at[label, column] = round(float(edited.at[label, column]) * 1.1, 2)
+    return edited
+
+
+def edge_case_towers(base):
+    """
+    Returns one tower per entry of EDGE_CASE_TOWERS: a copy of the tower base (a row of
+    generate_towers) with the entry's stats.
+    """
+    rows = [dict(base, Name=f"Edge case {number}", **stats) for number, stats in enumerate(EDGE_CASE_TOWERS, 1)]
+    return pd.DataFrame(rows, columns=TOWER_COLUMNS)
+
+
+def check_dps_kernel(df, engine=None):
+    """
+    Compares the DPS of every tower of df from the vectorized kernel with the scalar
+    calculate_dps_per_gold of the built-in algorithm. A tower must be invalid in the kernel
+    exactly where the scalar function raises or returns a result that is not finite, and
+    otherwise get the same Total DPS and DPS per Gold.
+
+    Returns:
+    - list: (index label, kernel result, scalar result) of every tower where they differ.
+    """
+    engine = engine or BalanceEngine()
+    inputs, valid = parse_tower_inputs(df)
+    total_dps, dps_per_gold, kernel_valid = engine.calculate_dps_batch(inputs, valid)
+
+    mismatches = []
+    for i in np.flatnonzero(valid):
+        try:
+            expected = engine.calculate_dps_per_gold(
+                float(inputs['Damage'][i]), int(inputs['Dice'][i]), int(inputs['Sides'][i]),
+                float(inputs['Cooldown'][i]), int(inputs['Range'][i]), int(inputs['Full Splash'][i]),
+                int(inputs['Med Splash'][i]), int(inputs['Small Splash'][i]), int(inputs['Gold Cost'][i]),
+                spell_dps=float(inputs['Spell DPS'][i]), spell_dps_cooldown=float(inputs['Spell DPS CD'][i]),
+                poison=int(inputs['Poison'][i]), utility_boost=float(inputs['Utility Boost'][i]),
+                slow_percentage=float(inputs['Slow %'][i]), target_type=inputs['Target Type'][i])
+        except (ValueError, ArithmeticError):
+            expected = None
+        if expected is not None and not np.all(np.isfinite(expected)):
+            expected = None
+        actual = (float(total_dps[i]), float(dps_per_gold[i])) if kernel_valid[i] else None
+        if actual != (None if expected is None else tuple(float(value) for value in expected)):
+            mismatches.append((df.index[i], actual, expected))
+    return mismatches
+
+
+def time_phase(run, repeat, setup=None):
+    """
+    Times run() repeat times; setup(), if given, runs untimed before each run and its
+    result is passed to run. Stops repeating once a run exceeds REPEAT_BUDGET_SECONDS.
+
+    Returns:
+    - list: Seconds of each run.
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            argument = setup()
+            start = time.perf_counter()
+            run(argument)
+        else:
+            start = time.perf_counter()
+            run()
+        timings.append(time.perf_counter() - start)
+        if timings[-1] > REPEAT_BUDGET_SECONDS:
+            break
+    return timings
+
+
+def benchmark_scale(races, towers_per_race, seed, repeat, work_dir, phases=None):
+    """
+    Times every phase of the pipeline on one synthetic dataset.
+
+    Parameters:
+    - races (int): Number of races.
+    - towers_per_race (int): Towers per race.
+    - seed (int): Seed of generate_towers.
+    - repeat (int): Runs per phase.
+    - work_dir (str): Directory for the files of the import/export phases.
+    - phases (list, optional): Names of the phases to run. Defaults to all.
+
+    Returns:
+    - list: One dict per phase with 'races', 'towers', 'phase', 'runs', 'min' and 'median' (seconds).
+    """
+    engine = BalanceEngine()
+    raw = generate_towers(races, towers_per_race, seed)
+    csv_path = os.path.join(work_dir, f"towers_{races}.csv")
+    project_path = os.path.join(work_dir, f"project_{races}.npz")
+    raw.to_csv(csv_path, index=False)
+
+    # Shared inputs of the later phases, built once outside the timings
+    df, _ = load_dataset(csv_path)
+    group_stats = IncrementalGroupStats()
+    computed = engine.build_computed_towers(df, group_stats)
+    ranges = engine.balance_ranges(group_stats, True)
+    # The GUI keeps a Tower ID and a row hash on both frames of the changes report
+    tracked = assign_tower_ids(df)
+    tracked[ROW_HASH_COLUMN] = tower_row_hashes(tracked)
+    edited = edit_towers(tracked, seed=seed + 1)
+    edited[ROW_HASH_COLUMN] = tower_row_hashes(edited)
+    # An edit in one race: imported_df drops the race's rows and re-appends the edited ones
+    first_race = df['Race'].iloc[0]
+    edited_race = df[df['Race'] == first_race].assign(Damage=lambda race_rows: race_rows['Damage'] * 1.1)
+    after_edit = pd.concat([df[df['Race'] != first_race], edited_race], ignore_index=True)
+
+    benchmarks = [
+        ('import_csv', lambda: load_dataset(csv_path), None),
+        ('calculate', lambda: engine.build_computed_towers(df, IncrementalGroupStats()), None),
+        ('recalculate_race', lambda stats: engine.derive_computed_towers(after_edit, computed, {first_race}, stats),
+         group_stats.copy),
+        ('balance_ranges', lambda: engine.balance_ranges(group_stats.copy(), True), None),
+        ('race_results', lambda: engine.race_results(computed, first_race, ranges), None),
+        # A fresh copy of the table each run; the engine keeps the outlier masks of the last one
+        ('outliers', lambda table: engine.find_outliers(table), computed.copy),
+        # A fresh scorer each run; the engine's would return its cached result
+        ('race_difficulty', lambda: RaceDifficultyScorer(engine.difficulty_scorer.weights).score(computed), None),
+        ('changes_report', lambda: build_changes_report(tracked, edited), None),
+        ('comparison_analysis', lambda table: engine.comparison_analysis(table, True), computed.copy),
+        ('export_csv', lambda: df.to_csv(os.path.join(work_dir, f"export_{races}.csv"), index=False), None),
+        ('save_project', lambda: save_project(project_path, df, df, engine.algorithm_source,
+                                              engine.preset_balance_ranges, {}), None),
+        ('load_project', lambda: load_project(project_path), None),
+    ]
+
+    results = []
+    for name, run, setup in benchmarks:
+        if phases and name not in phases:
+            continue
+        timings = time_phase(run, repeat, setup)
+        results.append({
+            'races': races,
+            'towers': len(df),
+            'phase': name,
+            'runs': len(timings),
+            'min': min(timings),
+            'median': statistics.median(timings),
+        })
+    return results
+
+
+def _git_commit():
+    """
+    Returns the commit of the working tree, or None outside a git checkout.
+    """
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(scales=DEFAULT_SCALES, towers_per_race=DEFAULT_TOWERS_PER_RACE, seed=0, repeat=DEFAULT_REPEAT,
+                   phases=None, out=sys.stdout):
+    """
+    Runs benchmark_scale at each scale and prints each phase as it finishes.
+
+    Returns:
+    - dict: The JSON report: 'version', 'created', 'commit', 'environment', 'settings' and 'results'.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for races in scales:
+            for result in benchmark_scale(races, towers_per_race, seed, repeat, work_dir, phases):
+                print(f"{result['races']:>7} races  {result['phase']:<20} {result['median'] * 1000:>11.2f} ms "
+                      f"(min {result['min'] * 1000:.2f} ms, {result['runs']} run(s))", file=out, flush=True)
+                results.append(result)
+
+    return {
+        'version': BENCHMARK_FORMAT_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'cpu_count': os.cpu_count(),
+        },
+        'settings': {
+            'scales': list(scales),
+            'towers_per_race': towers_per_race,
+            'seed': seed,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare_reports(report, baseline, tolerance, out=sys.stdout):
+    """
+    Prints the median time of each phase against a baseline report of the same settings.
+
+    Returns:
+    - list: (races, phase, ratio) of the phases more than tolerance times slower than the baseline.
+    """
+    baseline_times = {(result['races'], result['phase']): result['median'] for result in baseline['results']}
+    regressions = []
+    print(f"Compared with {baseline.get('commit') or 'baseline'} ({baseline.get('created')}):", file=out)
+    for result in report['results']:
+        key = (result['races'], result['phase'])
+        if key not in baseline_times:
+            continue
+        before, after = baseline_times[key], result['median']
+        ratio = after / before if before > 0 else float('inf')
+        flag = ""
+        if ratio > tolerance and max(before, after) >= MIN_COMPARABLE_SECONDS:
+            regressions.append((key[0], key[1], ratio))
+            flag = "  SLOWER"
+        print(f"{key[0]:>7} races  {key[1]:<20} {before * 1000:>11.2f} -> {after * 1000:>11.2f} ms  x{ratio:.2f}{flag}",
+              file=out)
+    return regressions
+
+
+def main(argv=None):
+    """
+    Command-line entry point. Returns the process exit code: 0, or 1 if a phase regressed against --baseline.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the Tower Balancer pipeline on synthetic data.")
+    parser.add_argument('--races', type=int, nargs='+', default=DEFAULT_SCALES,
+                        help="dataset sizes in races (default: %(default)s)")
+    parser.add_argument('--towers', type=int, default=DEFAULT_TOWERS_PER_RACE, help="towers per race (default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the data generator (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="runs per phase (default: %(default)s)")
+    parser.add_argument('--phases', nargs='+', choices=BENCHMARK_PHASES, help="phases to run (default: all)")
+    parser.add_argument('-o', '--output', help="write the JSON report to this file")
+    parser.add_argument('--baseline', help="JSON report of an earlier run to compare with")
+    parser.add_argument('--tolerance', type=float, default=1.25,
+                        help="slowdown factor against --baseline reported as a regression (default: %(default)s)")
+    parser.add_argument('--check', action='store_true',
+                        help="first compare the DPS kernel with the scalar algorithm; exit with 1 if they differ")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        towers = generate_towers(args.races[0], args.towers, args.seed)
+        towers = pd.concat([towers, edge_case_towers(towers.iloc[0])], ignore_index=True)
+        mismatches = check_dps_kernel(towers)
+        for label, actual, expected in mismatches:
+            print(f"DPS mismatch for {towers.at[label, 'Name']}: kernel {actual}, scalar {expected}", file=sys.stderr)
+        print(f"DPS kernel check: {len(towers) - len(mismatches)} of {len(towers)} towers match")
+        if mismatches:
+            return 1
+
+    report = run_benchmarks(args.races, args.towers, args.seed, max(1, args.repeat), args.phases)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            baseline = json.load(file)
+        if baseline['settings'].get('towers_per_race') != args.towers or baseline['settings'].get('seed') != args.seed:
+            print("Warning: the baseline was run with other data settings", file=sys.stderr)
+        if compare_reports(report, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
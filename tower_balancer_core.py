@@ -0,0 +1,2017 @@
+"""
+Balancing logic of the Warcraft 3 Tower Balancer, usable without a display.
+
+Nothing here imports Tk, so BalanceEngine can run in batch jobs, worker processes and
+tests; "WC3 Tower Balancer v2.1.py" is the GUI client built on top of it.
+"""
+import pandas as pd
+import numpy as np
+import math
+import bisect
+import ast
+import hashlib
+import numbers
+import json
+import threading
+import logging
+import time
+import contextlib
+from collections import OrderedDict
+from scipy import stats  # Added for Z-Score and Percent Rank calculations
+
+from tower_balancer_outliers import iqr_fences, sorted_quantile, outlier_masks
+
+
+# Calculation function code as a string
+calculate_dps_per_gold_code = '''
+import math
+
+def calculate_dps_per_gold(
+    base_damage, dice, sides_per_die, cooldown, range_val,
+    full_splash, medium_splash, small_splash, gold_cost,
+    spell_dps=0, spell_dps_cooldown=1, poison=False,
+    utility_boost=1.0, slow_percentage=0, poison_duration=1,
+    slow_duration=3, enemy_speed=415, target_type='All',
+    include_splash=True,
+    unit_density=64 
+):
+    """
+    Calculate Total DPS and DPS per Gold for a tower in Wintermaul Wars.
+
+    Parameters:
+        base_damage (float): Base damage of the tower.
+        dice (int): Number of dice rolled for damage.
+        sides_per_die (int): Number of sides per die.
+        cooldown (float): Time between attacks in seconds.
+        range_val (float): Attack range of the tower.
+        full_splash (float): Radius for full splash damage.
+        medium_splash (float): Radius for medium splash damage.
+        small_splash (float): Radius for small splash damage.
+        gold_cost (float): Gold cost of the tower.
+        spell_dps (float, optional): DPS from spells. Defaults to 0.
+        spell_dps_cooldown (float, optional): Cooldown for spell DPS. Defaults to 1.
+        poison (bool, optional): Whether poison is applied. Defaults to False.
+        utility_boost (float, optional): Utility boost multiplier. Defaults to 1.0.
+        slow_percentage (float, optional): Slow percentage applied. Defaults to 0.
+        poison_duration (float, optional): Duration of poison effect. Defaults to 1.
+        slow_duration (float, optional): Duration of slow effect. Defaults to 3.
+        enemy_speed (float, optional): Speed of the enemy. Defaults to 415.
+        target_type (str, optional): Target type. Defaults to 'All'.
+        include_splash (bool, optional): Whether to include splash damage. Defaults to True.
+        unit_density (float, optional): Approximates unit density in splash damage to be one unit (number is grid radius)
+
+    Returns:
+        tuple: (Total DPS, DPS per Gold)
+    """
+
+    # Calculate average damage per hit
+    avg_damage = base_damage + (dice * (sides_per_die + 1) / 2)
+
+    # Calculate hits per second
+    hits_per_second = 1 / cooldown
+
+    # Polynomial Range Modifier
+    def polynomial_range_modifier(range_val, n=1.0, max_range=2300):
+        normalized_range = (range_val - 200) / (max_range - 200)
+        normalized_range = max(0, min(normalized_range, 1))  # Clamp to [0,1]
+        return 1 + normalized_range ** n
+
+    range_adjustment = polynomial_range_modifier(range_val)
+
+    # Splash Damage Calculation
+    def calculate_splash_damage(avg_damage, full_splash, medium_splash, small_splash, unit_density):
+        """
+        Calculate the total splash damage based on splash radii and unit density.
+
+        Parameters:
+            avg_damage (float): Average damage per hit.
+            full_splash (float): Full splash radius.
+            medium_splash (float): Medium splash radius.
+            small_splash (float): Small splash radius.
+            unit_density (float): Approximates unit density by grid radius
+
+        Returns:
+            float: Total splash damage from a single hit.
+        """
+
+        # Define splash tiers with their respective radii and multipliers
+        all_splash_tiers = [
+            ('full', full_splash, 1.0),
+            ('medium', medium_splash, 0.5),
+            ('small', small_splash, 0.25)
+        ]
+
+        # Filter out splash tiers that are smaller than higher priority tiers
+        # Only include medium_splash if it's >= full_splash
+        # Only include small_splash if it's >= medium_splash and >= full_splash
+        filtered_splash_tiers = []
+
+        # Always include full_splash if it's greater than 0
+        if full_splash > 0:
+            filtered_splash_tiers.append(('full', full_splash, 1.0))
+
+        # Include medium_splash only if it's >= full_splash
+        if medium_splash >= full_splash and medium_splash > 0:
+            filtered_splash_tiers.append(('medium', medium_splash, 0.5))
+
+        # Include small_splash only if it's >= medium_splash and >= full_splash
+        if small_splash >= medium_splash and small_splash >= full_splash and small_splash > 0:
+            filtered_splash_tiers.append(('small', small_splash, 0.25))
+
+        # Sort the filtered splash tiers in ascending order based on radius
+        # This ensures that higher damage tiers (smaller radii) are processed first
+        sorted_splash_tiers = sorted(filtered_splash_tiers, key=lambda x: x[1])
+
+        total_splash_damage = 0.0
+        previous_radius = 0.0
+
+        for tier_name, radius, multiplier in sorted_splash_tiers:
+            if radius <= previous_radius:
+                continue  # Skip if current radius is not greater than previous
+
+            # Calculate units in current tier excluding units in inner tiers
+            units_in_tier = (radius - previous_radius) / unit_density
+
+            units_in_tier = max(units_in_tier, 0)  # Prevent negative units
+
+            # Calculate splash damage for this tier
+            damage = units_in_tier * multiplier * avg_damage
+            total_splash_damage += damage
+
+            # Update previous_radius for the next tier
+            previous_radius = radius
+
+        return total_splash_damage
+
+    # Adjust average damage per hit with splash
+    if include_splash and (full_splash > 0 or medium_splash > 0 or small_splash > 0):
+        splash_damage = calculate_splash_damage(avg_damage, full_splash, medium_splash, small_splash, unit_density)
+        avg_damage_with_splash = avg_damage + splash_damage  # Total damage per hit including splash
+    else:
+        splash_damage = 0.0
+        avg_damage_with_splash = avg_damage
+
+    # Calculate base DPS (damage per second)
+    base_dps = avg_damage_with_splash * hits_per_second
+
+    # Apply range adjustment
+    range_adjusted_dps = base_dps * range_adjustment
+
+    # Add Spell DPS (if provided)
+    if spell_dps and spell_dps_cooldown > 0:
+        special_dps = spell_dps / spell_dps_cooldown
+    else:
+        special_dps = 0
+
+    # Adjusted Poison Effect
+    if poison:
+        poison_dps = 5
+        total_poison_damage = poison_dps * poison_duration
+        poison_dps_contribution = total_poison_damage / poison_duration
+        special_dps += poison_dps_contribution
+
+        # Calculate additional hits due to slow effect from poison
+        effective_speed = enemy_speed * (1 - 0.3)   # slow by 30%
+        # Calculate extra time in range due to slow
+        slow_factor = 1 / (1 - 0.3)
+        extra_time_poison = slow_duration * (slow_factor - 1)
+        additional_hits_poison = extra_time_poison * hits_per_second
+        special_dps += (additional_hits_poison * avg_damage) / slow_duration
+
+    # Enhanced Slow Effect
+    if slow_percentage > 0:
+        effective_speed = enemy_speed * (1 - slow_percentage / 100)
+        # Avoid division by zero or negative speed
+        if effective_speed <= 0:
+            effective_speed = 1  # Or handle as complete immobilization
+
+        # Calculate the factor by which slow increases time in range
+        slow_factor = 1 / (1 - slow_percentage / 100)
+
+        # Extra time exposed due to slow
+        extra_time = slow_duration * (slow_factor - 1)
+
+        # Additional hits during the extra time
+        additional_hits = extra_time * hits_per_second
+
+        # Additional damage per second from the slow
+        slow_dps_contribution = (additional_hits * avg_damage) / slow_duration
+    else:
+        slow_dps_contribution = 0
+
+    # Total DPS before utility boost
+    total_dps = range_adjusted_dps + special_dps + slow_dps_contribution
+
+    # Apply utility boost
+    total_dps *= utility_boost
+
+    # Calculate DPS per Gold using linear scaling
+    dps_per_gold = (total_dps / gold_cost) * 100
+
+    return total_dps, dps_per_gold
+
+'''
+
+# Columns fed into the DPS calculation: (column, default, integer)
+# Defaults mirror the `int(float(value or default))` parsing used for the GUI fields
+DPS_INPUT_COLUMNS = [
+    ('Tower Number', 0, True),
+    ('Gold Cost', 1, True),
+    ('Damage', 0, False),
+    ('Dice', 0, True),
+    ('Sides', 0, True),
+    ('Cooldown', 1, False),
+    ('Range', 300, True),
+    ('Full Splash', 0, True),
+    ('Med Splash', 0, True),
+    ('Small Splash', 0, True),
+    ('Spell DPS', 0, False),
+    ('Spell DPS CD', 1, False),
+    ('Slow %', 0, False),
+    ('Utility Boost', 1.0, False),
+]
+
+# Columns where a zero value is replaced by the default to avoid division by zero
+ZERO_GUARDED_COLUMNS = ['Gold Cost', 'Cooldown', 'Spell DPS CD', 'Utility Boost']
+
+
+def parse_number_column(raw, default, integer=False, zero_guarded=False):
+    """
+    Parses one numeric tower column with the rules of the GUI fields'
+    `int(float(value or default))` parsing: blank, missing and zero cells take the default,
+    integer columns are truncated and zero-guarded columns never hold zero.
+
+    Parameters:
+    - raw (pd.Series): Column as imported, typed or text.
+    - default (float): Value of blank and zero cells.
+    - integer (bool): Truncate the values; infinite values cannot be parsed.
+    - zero_guarded (bool): Replace zero by the default (see ZERO_GUARDED_COLUMNS).
+
+    Returns:
+    - tuple: (np.ndarray of float values, NaN where a cell could not be parsed;
+      np.ndarray of bool marking those cells)
+    """
+    if pd.api.types.is_numeric_dtype(raw):
+        blank = raw.isna().to_numpy()
+        values = raw.to_numpy(dtype=float, na_value=np.nan, copy=True)
+    else:
+        blank = (raw.isna() | (raw.astype(str).str.strip() == '')).to_numpy()
+        values = pd.to_numeric(raw.where(~blank), errors='coerce').to_numpy(dtype=float, na_value=np.nan, copy=True)
+    invalid = np.isnan(values) & ~blank
+
+    # `value or default`: blank and zero cells take the default
+    values[blank | (values == 0)] = default
+    if integer:
+        # int() fails on infinity
+        invalid |= np.isinf(values)
+        values = np.trunc(values)
+    if zero_guarded:
+        values[values == 0] = default
+    values[invalid] = np.nan
+    return values, invalid
+
+
+def parse_tower_inputs(df):
+    """
+    Parses the DPS input columns of a tower DataFrame into float arrays in one pass.
+
+    Every column is parsed by parse_number_column; a row with a cell that cannot be
+    parsed is not valid.
+
+    Parameters:
+        df (pd.DataFrame): Tower data with the standard column names.
+
+    Returns:
+        tuple: (dict of column name -> np.ndarray, np.ndarray of bool marking rows that parsed successfully)
+    """
+    row_count = len(df)
+    valid = np.ones(row_count, dtype=bool)
+    inputs = {}
+
+    for column, default, integer in DPS_INPUT_COLUMNS:
+        if column not in df.columns:
+            inputs[column] = np.full(row_count, float(default))
+            continue
+
+        values, invalid = parse_number_column(df[column], default, integer, column in ZERO_GUARDED_COLUMNS)
+        valid &= ~invalid
+        inputs[column] = values
+
+    # Poison is used as a truthy flag
+    if 'Poison' in df.columns:
+        raw = df['Poison']
+        blank = (raw.astype(object) == '').to_numpy()
+        inputs['Poison'] = (pd.to_numeric(raw, errors='coerce').to_numpy(dtype=float) != 0) & ~blank
+    else:
+        inputs['Poison'] = np.zeros(row_count, dtype=bool)
+
+    if 'Target Type' in df.columns:
+        inputs['Target Type'] = df['Target Type'].to_numpy()
+    else:
+        inputs['Target Type'] = np.full(row_count, 'All', dtype=object)
+
+    return inputs, valid
+
+
+def coerce_tower_columns(df):
+    """
+    Converts the tower columns of an imported DataFrame to typed columns in one pass.
+
+    Numeric columns get the defaults of DPS_INPUT_COLUMNS for blank, missing and zero cells,
+    integer columns are truncated and the zero guards are applied, so the result holds the
+    same values the GUI fields produce (see parse_number_column). Cells that cannot be
+    parsed keep their text, which keeps their tower out of the calculations, and are listed
+    in the error report.
+
+    Parameters:
+        df (pd.DataFrame): Imported tower data with the standard column names.
+
+    Returns:
+        tuple: (typed pd.DataFrame, list of (row index, column, value) for cells that could not be parsed)
+    """
+    df = df.copy()
+    errors = []
+
+    for column, default, integer in DPS_INPUT_COLUMNS:
+        if column not in df.columns:
+            continue
+
+        raw = df[column]
+        values, invalid = parse_number_column(raw, default, integer, column in ZERO_GUARDED_COLUMNS)
+        if invalid.any():
+            errors.extend((index, column, raw[index]) for index in raw.index[invalid])
+            # Cells that could not be parsed keep their text: the tower stays invalid in the
+            # calculations and in the GUI fields, and exports write the text back unchanged
+            typed = pd.Series(np.where(invalid, 0, values), index=df.index)
+            typed = typed.astype('int64') if integer else typed
+            df[column] = typed.astype(object).where(~invalid, raw)
+        else:
+            df[column] = pd.Series(values, index=df.index).astype('int64') if integer else values
+
+    if 'Poison' in df.columns:
+        raw = df['Poison']
+        blank = raw.isna() | (raw.astype(str).str.strip() == '')
+        values = pd.to_numeric(raw.where(~blank), errors='coerce')
+        invalid = values.isna() & ~blank
+        errors.extend((index, 'Poison', raw[index]) for index in raw.index[invalid])
+        df['Poison'] = (values.fillna(0) != 0).astype('int64')
+    errors.sort(key=lambda error: error[0])
+
+    for column, default in [('Name', ''), ('Target Type', 'All')]:
+        if column in df.columns:
+            df[column] = df[column].fillna(default).astype(str).str.strip()
+            if default:
+                df.loc[df[column] == '', column] = default
+
+    return df, errors
+
+
+# Column holding the persistent identity of a tower. Unlike Tower Number (the row position
+# within its race) it stays with the tower when towers are added, deleted or reordered.
+TOWER_ID_COLUMN = 'Tower ID'
+
+
+def max_tower_id(*frames):
+    """
+    Returns the highest Tower ID used in any of frames, or 0 if none has one.
+    """
+    highest = 0
+    for df in frames:
+        if TOWER_ID_COLUMN in df.columns and df[TOWER_ID_COLUMN].notna().any():
+            highest = max(highest, int(df[TOWER_ID_COLUMN].max()))
+    return highest
+
+
+def assign_tower_ids(df, reference=None):
+    """
+    Returns df with a Tower ID for every row. Existing IDs are kept; rows without one, and
+    repeats of an ID already used by an earlier row, get a new ID.
+
+    Parameters:
+    - df (pd.DataFrame): Tower data, with or without a Tower ID column.
+    - reference (pd.DataFrame, optional): Data whose IDs are reused for rows with the same
+      Race and Tower Number, e.g. the original data of a project saved without IDs.
+
+    Returns:
+    - pd.DataFrame: A copy of df with an integer Tower ID column.
+    """
+    df = df.copy()
+    if TOWER_ID_COLUMN in df.columns:
+        ids = pd.to_numeric(df[TOWER_ID_COLUMN], errors='coerce')
+    else:
+        ids = pd.Series(np.nan, index=df.index)
+
+    keys = ['Race', 'Tower Number']
+    if reference is not None and TOWER_ID_COLUMN in reference.columns and all(key in df.columns and key in reference.columns for key in keys):
+        known = reference.dropna(subset=[TOWER_ID_COLUMN]).drop_duplicates(keys).set_index(keys)[TOWER_ID_COLUMN]
+        matched = pd.Series(known.reindex(pd.MultiIndex.from_frame(df[keys])).to_numpy(), index=df.index)
+        ids = ids.fillna(matched)
+
+    missing = ids.isna() | ids.duplicated()
+    if missing.any():
+        start = max(int(ids[~missing].max()) if (~missing).any() else 0,
+                    max_tower_id(reference) if reference is not None else 0)
+        ids[missing] = np.arange(start + 1, start + 1 + missing.sum())
+    df[TOWER_ID_COLUMN] = ids.astype('int64')
+    return df
+
+
+def calculate_dps_per_gold_batch(
+    base_damage, dice, sides_per_die, cooldown, range_val,
+    full_splash, medium_splash, small_splash, gold_cost,
+    spell_dps=0, spell_dps_cooldown=1, poison=False,
+    utility_boost=1.0, slow_percentage=0, poison_duration=1,
+    slow_duration=3, enemy_speed=415, target_type='All',
+    include_splash=True,
+    unit_density=64
+):
+    """
+    Vectorized version of the default calculate_dps_per_gold algorithm.
+
+    Takes array-like columns (scalars are broadcast) and evaluates every tower in one pass.
+    Each step mirrors the scalar code in calculate_dps_per_gold_code operation for operation,
+    so the results are identical to calling the scalar function once per tower.
+    Only valid for the built-in algorithm; custom algorithms fall back to per-row calls.
+
+    Returns:
+        tuple: (np.ndarray of Total DPS, np.ndarray of DPS per Gold)
+    """
+    base_damage = np.asarray(base_damage, dtype=float)
+    dice = np.asarray(dice, dtype=float)
+    sides_per_die = np.asarray(sides_per_die, dtype=float)
+    cooldown = np.asarray(cooldown, dtype=float)
+    range_val = np.asarray(range_val, dtype=float)
+    full_splash = np.asarray(full_splash, dtype=float)
+    medium_splash = np.asarray(medium_splash, dtype=float)
+    small_splash = np.asarray(small_splash, dtype=float)
+    gold_cost = np.asarray(gold_cost, dtype=float)
+    spell_dps = np.asarray(spell_dps, dtype=float)
+    spell_dps_cooldown = np.asarray(spell_dps_cooldown, dtype=float)
+    poison = np.asarray(poison, dtype=bool)
+    utility_boost = np.asarray(utility_boost, dtype=float)
+    slow_percentage = np.asarray(slow_percentage, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        # Calculate average damage per hit
+        avg_damage = base_damage + (dice * (sides_per_die + 1) / 2)
+
+        # Calculate hits per second
+        hits_per_second = 1 / cooldown
+
+        # Polynomial Range Modifier (n=1.0, max_range=2300)
+        normalized_range = (range_val - 200) / (2300 - 200)
+        normalized_range = np.maximum(0, np.minimum(normalized_range, 1))
+        range_adjustment = 1 + normalized_range ** 1.0
+
+        # Splash tiers are only included when they are not smaller than the higher priority tiers,
+        # which keeps the included radii in ascending order (full, medium, small)
+        include_full = full_splash > 0
+        include_medium = (medium_splash >= full_splash) & (medium_splash > 0)
+        include_small = (small_splash >= medium_splash) & (small_splash >= full_splash) & (small_splash > 0)
+
+        total_splash_damage = np.zeros(np.broadcast(avg_damage, full_splash).shape)
+        previous_radius = np.zeros_like(total_splash_damage)
+        for radius, multiplier, included in ((full_splash, 1.0, include_full),
+                                             (medium_splash, 0.5, include_medium),
+                                             (small_splash, 0.25, include_small)):
+            # Skip tiers whose radius is not greater than the previous one
+            applies = included & (radius > previous_radius)
+            units_in_tier = np.maximum((radius - previous_radius) / unit_density, 0)
+            damage = units_in_tier * multiplier * avg_damage
+            total_splash_damage = np.where(applies, total_splash_damage + damage, total_splash_damage)
+            previous_radius = np.where(applies, radius, previous_radius)
+
+        # Adjust average damage per hit with splash
+        has_splash = (full_splash > 0) | (medium_splash > 0) | (small_splash > 0)
+        if include_splash:
+            avg_damage_with_splash = np.where(has_splash, avg_damage + total_splash_damage, avg_damage)
+        else:
+            avg_damage_with_splash = avg_damage
+
+        # Calculate base DPS and apply range adjustment
+        base_dps = avg_damage_with_splash * hits_per_second
+        range_adjusted_dps = base_dps * range_adjustment
+
+        # Add Spell DPS (if provided)
+        has_spell = (spell_dps != 0) & (spell_dps_cooldown > 0)
+        special_dps = np.where(has_spell, spell_dps / spell_dps_cooldown, 0.0)
+
+        # Adjusted Poison Effect
+        poison_dps = 5
+        poison_dps_contribution = (poison_dps * poison_duration) / poison_duration
+        slow_factor_poison = 1 / (1 - 0.3)
+        extra_time_poison = slow_duration * (slow_factor_poison - 1)
+        additional_hits_poison = extra_time_poison * hits_per_second
+        special_dps = np.where(poison, special_dps + poison_dps_contribution, special_dps)
+        special_dps = np.where(poison, special_dps + (additional_hits_poison * avg_damage) / slow_duration, special_dps)
+
+        # Enhanced Slow Effect
+        slow_factor = 1 / (1 - slow_percentage / 100)
+        extra_time = slow_duration * (slow_factor - 1)
+        additional_hits = extra_time * hits_per_second
+        slow_dps_contribution = np.where(slow_percentage > 0, (additional_hits * avg_damage) / slow_duration, 0.0)
+
+        # Total DPS with utility boost
+        total_dps = range_adjusted_dps + special_dps + slow_dps_contribution
+        total_dps = total_dps * utility_boost
+
+        # Calculate DPS per Gold using linear scaling
+        dps_per_gold = (total_dps / gold_cost) * 100
+
+    return total_dps, dps_per_gold
+
+
+# Arguments calculate_dps_batch passes to the algorithm: nine positional values, then keywords
+ALGORITHM_POSITIONAL_ARGS = [
+    'base_damage', 'dice', 'sides_per_die', 'cooldown', 'range_val',
+    'full_splash', 'medium_splash', 'small_splash', 'gold_cost'
+]
+ALGORITHM_KEYWORD_DEFAULTS = {
+    'spell_dps': 0.0, 'spell_dps_cooldown': 1.0, 'poison': 0, 'utility_boost': 1.0,
+    'slow_percentage': 0.0, 'target_type': 'All', 'include_splash': True
+}
+
+# Sample towers every algorithm must handle before it is swapped in
+# (plain attack, splash tiers, poison with spell damage, slow with utility boost)
+ALGORITHM_TRIAL_SAMPLES = [
+    ((10.0, 1, 6, 1.0, 600, 0, 0, 0, 100), {'target_type': 'All'}),
+    ((25.0, 2, 4, 1.5, 800, 50, 100, 150, 250), {'target_type': 'Ground Splash'}),
+    ((5.0, 1, 2, 0.8, 500, 0, 0, 0, 60), {'spell_dps': 40.0, 'spell_dps_cooldown': 5.0, 'poison': 1, 'target_type': 'Air'}),
+    ((50.0, 3, 8, 2.0, 1200, 0, 0, 0, 500), {'slow_percentage': 20.0, 'utility_boost': 1.2, 'target_type': 'Ground'}),
+]
+ALGORITHM_TRIAL_TIMEOUT = 2.0  # Seconds the sample batch may take before the algorithm is rejected
+
+
+def algorithm_hash(source):
+    """
+    Returns the content hash identifying an algorithm's source code.
+    Surrounding whitespace is ignored, so the trailing newline of a text widget does not matter.
+    """
+    return hashlib.sha256(source.strip().encode('utf-8')).hexdigest()
+
+
+def _function_returns(function):
+    """
+    Yields the return statements of a function, skipping nested functions and classes.
+    """
+    pending = list(function.body)
+    while pending:
+        node = pending.pop()
+        if isinstance(node, ast.Return):
+            yield node
+        elif not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)):
+            pending.extend(ast.iter_child_nodes(node))
+
+
+def validate_algorithm_source(source):
+    """
+    Parses algorithm source code and checks that it defines calculate_dps_per_gold with a
+    signature calculate_dps_batch can call and return statements yielding (total_dps, dps_per_gold).
+
+    Parameters:
+    - source (str): The algorithm source code.
+
+    Returns:
+    - ast.Module: The parsed source.
+
+    Raises:
+    - ValueError: If the source does not define a usable calculate_dps_per_gold.
+    """
+    try:
+        tree = ast.parse(source, filename='<algorithm>')
+    except SyntaxError as e:
+        raise ValueError(f"Syntax error on line {e.lineno}: {e.msg}")
+
+    function = next((node for node in tree.body
+                     if isinstance(node, ast.FunctionDef) and node.name == 'calculate_dps_per_gold'), None)
+    if function is None:
+        raise ValueError("No top-level calculate_dps_per_gold function is defined.")
+
+    # Signature: nine positional values, then the keyword arguments
+    arguments = function.args
+    positional = [arg.arg for arg in arguments.posonlyargs + arguments.args]
+    if len(positional) < len(ALGORITHM_POSITIONAL_ARGS) and arguments.vararg is None:
+        raise ValueError(f"calculate_dps_per_gold must accept {len(ALGORITHM_POSITIONAL_ARGS)} positional arguments "
+                         f"({', '.join(ALGORITHM_POSITIONAL_ARGS)}).")
+    accepted = set(positional[len(ALGORITHM_POSITIONAL_ARGS):]) | {arg.arg for arg in arguments.kwonlyargs}
+    missing = [name for name in ALGORITHM_KEYWORD_DEFAULTS if name not in accepted]
+    if missing and arguments.kwarg is None:
+        raise ValueError(f"calculate_dps_per_gold is missing keyword arguments: {', '.join(missing)}.")
+
+    # Parameters that are never passed need defaults
+    first_default = len(positional) - len(arguments.defaults)
+    for index, name in enumerate(positional[len(ALGORITHM_POSITIONAL_ARGS):], start=len(ALGORITHM_POSITIONAL_ARGS)):
+        if index < first_default and name not in ALGORITHM_KEYWORD_DEFAULTS:
+            raise ValueError(f"calculate_dps_per_gold parameter '{name}' needs a default value.")
+    for arg, default in zip(arguments.kwonlyargs, arguments.kw_defaults):
+        if default is None and arg.arg not in ALGORITHM_KEYWORD_DEFAULTS:
+            raise ValueError(f"calculate_dps_per_gold parameter '{arg.arg}' needs a default value.")
+
+    # Return statements must produce a pair
+    returns = sorted(_function_returns(function), key=lambda node: node.lineno)
+    if not returns:
+        raise ValueError("calculate_dps_per_gold never returns (total_dps, dps_per_gold).")
+    for node in returns:
+        value = node.value
+        if (value is None
+                or isinstance(value, (ast.Constant, ast.Dict, ast.Set, ast.JoinedStr, ast.Compare))
+                or (isinstance(value, (ast.Tuple, ast.List)) and len(value.elts) != 2)):
+            raise ValueError(f"Line {node.lineno}: calculate_dps_per_gold must return (total_dps, dps_per_gold).")
+
+    return tree
+
+
+def trial_algorithm(function, timeout=ALGORITHM_TRIAL_TIMEOUT):
+    """
+    Runs an algorithm over ALGORITHM_TRIAL_SAMPLES, with and without splash, in a worker thread.
+
+    Threads cannot be stopped, so an algorithm that times out is rejected but keeps running
+    in its daemon thread until it returns or the application exits. The trial is not run in a
+    subprocess: the function is compiled from source in this process and cannot be pickled,
+    and spawning a process re-imports the GUI script on Windows.
+
+    Parameters:
+    - function (callable): The calculate_dps_per_gold function to try.
+    - timeout (float): Seconds the sample batch may take.
+
+    Raises:
+    - ValueError: If a sample raises, does not return two numbers, or the batch exceeds timeout.
+    """
+    outcome = {}
+
+    def run_samples():
+        try:
+            for args, keywords in ALGORITHM_TRIAL_SAMPLES:
+                for include_splash in (True, False):
+                    call_keywords = dict(ALGORITHM_KEYWORD_DEFAULTS, **keywords)
+                    call_keywords['include_splash'] = include_splash
+                    result = function(*args, **call_keywords)
+                    if not isinstance(result, tuple) or len(result) != 2:
+                        raise ValueError(f"returned {type(result).__name__} instead of (total_dps, dps_per_gold)")
+                    if not all(isinstance(value, numbers.Real) and not isinstance(value, bool) for value in result):
+                        raise ValueError(f"returned {result!r}, expected two numbers")
+        except Exception as e:
+            outcome['error'] = e
+
+    # A daemon thread so an algorithm that never finishes cannot block the caller or keep the
+    # application from exiting; after a timeout it is left running in the background
+    worker = threading.Thread(target=run_samples, daemon=True)
+    worker.start()
+    worker.join(timeout)
+    if worker.is_alive():
+        raise ValueError(f"Sample batch did not finish within {timeout:g} seconds. "
+                         f"The rejected algorithm keeps running in the background until the application exits.")
+    if 'error' in outcome:
+        raise ValueError(f"Sample batch failed: {outcome['error']}")
+
+
+class AlgorithmCache(object):
+    """
+    Compiled calculate_dps_per_gold functions keyed by source hash.
+
+    A source is parsed, validated, compiled and tried on the sample batch once; loading the
+    same source again returns the cached function without executing anything.
+    """
+
+    def __init__(self):
+        self.functions = {}  # source hash -> calculate_dps_per_gold
+
+    def load(self, source):
+        """
+        Returns the function defined by source, compiling and validating it on first use.
+
+        Parameters:
+        - source (str): The algorithm source code.
+
+        Returns:
+        - tuple: (source hash, calculate_dps_per_gold function)
+
+        Raises:
+        - ValueError: If the source fails validation or the sample batch.
+        """
+        digest = algorithm_hash(source)
+        if digest not in self.functions:
+            code = compile(validate_algorithm_source(source), '<algorithm>', 'exec')
+            exec_globals = {}
+            exec(code, exec_globals)
+            function = exec_globals['calculate_dps_per_gold']
+            trial_algorithm(function)
+            self.functions[digest] = function
+        return digest, self.functions[digest]
+
+
+DPS_MEMO_MAX_SIZE = 50000  # Default number of per-tower results kept by DpsMemo
+
+
+class DpsMemo(object):
+    """
+    Bounded LRU memo of per-tower calculate_dps_per_gold results.
+
+    Keys combine the algorithm's source hash with the normalized call arguments, so a
+    different algorithm never sees another one's results. Rows the algorithm rejected with
+    ValueError or an arithmetic error (e.g. ZeroDivisionError), or for which it returned a
+    result that is not finite, are remembered as None. Safe to share between the Tk thread
+    and workers.
+    """
+
+    def __init__(self, max_size=DPS_MEMO_MAX_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()  # key -> (total_dps, dps_per_gold) or None, least recent first
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()  # Guards entries; the algorithm itself runs unlocked
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def reset_stats(self):
+        """Zeroes the hit/miss counters, keeping the stored results."""
+        with self.lock:
+            self.hits = 0
+            self.misses = 0
+
+    def resize(self, max_size):
+        """Sets the maximum number of entries, evicting the least recently used ones."""
+        with self.lock:
+            self.max_size = max_size
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def call(self, function, algorithm_hash, args, keywords):
+        """
+        Returns function(*args, **keywords), reusing a stored result for the same algorithm and inputs.
+
+        Parameters:
+        - function (callable): The active calculate_dps_per_gold.
+        - algorithm_hash (str): Source hash of function.
+        - args (tuple): Positional arguments (hashable).
+        - keywords (tuple): Keyword arguments as (name, value) pairs in a fixed order.
+
+        Returns:
+        - tuple or None: (total_dps, dps_per_gold), or None when the algorithm raised ValueError
+          or ArithmeticError or its result is not finite.
+        """
+        key = (algorithm_hash, args, keywords)
+        with self.lock:
+            if key in self.entries:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return self.entries[key]
+            self.misses += 1
+
+        try:
+            result = function(*args, **dict(keywords))
+            if not np.all(np.isfinite(result)):
+                result = None
+        except (ValueError, ArithmeticError):
+            result = None
+        with self.lock:
+            self.entries[key] = result
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        return result
+
+    def stats(self):
+        """Returns hit/miss counters and the current size."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self.entries),
+            'max_size': self.max_size,
+        }
+
+
+BUILTIN_ALGORITHM_HASH = algorithm_hash(calculate_dps_per_gold_code)
+
+
+PROJECT_FORMAT_VERSION = 1  # Bumped when the layout written by save_project changes
+
+
+def _frame_to_arrays(df, prefix, arrays):
+    """
+    Adds one array per column of df to arrays and returns the column metadata needed to rebuild it.
+    Numeric and boolean columns are stored as-is; other columns are stored as text with a
+    missing-value mask, so no pickling is needed.
+    """
+    arrays[f'{prefix}/index'] = df.index.to_numpy()
+    columns = []
+    for position, column in enumerate(df.columns):
+        series = df[column]
+        key = f'{prefix}/{position}'
+        if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            arrays[key] = series.to_numpy()
+        else:
+            missing = series.isna().to_numpy()
+            arrays[key] = np.array(['' if is_missing else str(value) for value, is_missing in zip(series, missing)], dtype=str)
+            arrays[f'{key}/na'] = missing
+        columns.append({'name': column, 'key': key, 'dtype': str(series.dtype)})
+    return columns
+
+
+def _frame_from_arrays(columns, prefix, arrays):
+    """
+    Rebuilds a DataFrame written by _frame_to_arrays.
+    """
+    index = arrays[f'{prefix}/index']
+    data = {}
+    for column in columns:
+        values = arrays[column['key']]
+        if f"{column['key']}/na" in arrays:
+            series = pd.Series(values, index=index, dtype=object)
+            series[arrays[f"{column['key']}/na"]] = np.nan
+            data[column['name']] = series.astype(column['dtype'])
+        else:
+            data[column['name']] = pd.Series(values, index=index, dtype=column['dtype'])
+    return pd.DataFrame(data, index=index, columns=[column['name'] for column in columns])
+
+
+def save_project(file_path, imported_df, original_imported_df, algorithm_source,
+                 preset_balance_ranges, target_type_balance_adjustments):
+    """
+    Writes a project file: both data frames column by column, with their dtypes, plus the
+    active algorithm source, preset balance ranges and target type adjustments.
+
+    The file is an uncompressed numpy .npz archive, so loading it is a plain read of
+    each column's buffer.
+
+    Parameters:
+    - file_path (str): Destination path.
+    - imported_df (pd.DataFrame): Working tower data.
+    - original_imported_df (pd.DataFrame): Tower data as originally imported.
+    - algorithm_source (str): Source of the active calculate_dps_per_gold.
+    - preset_balance_ranges (dict): Tower number -> (low, high).
+    - target_type_balance_adjustments (dict): Target type -> (low adjustment, high adjustment).
+    """
+    arrays = {}
+    metadata = {
+        'version': PROJECT_FORMAT_VERSION,
+        'frames': {
+            'imported_df': _frame_to_arrays(imported_df, 'imported_df', arrays),
+            'original_imported_df': _frame_to_arrays(original_imported_df, 'original_imported_df', arrays),
+        },
+        'algorithm_source': algorithm_source,
+        'preset_balance_ranges': repr(preset_balance_ranges),
+        'target_type_balance_adjustments': repr(target_type_balance_adjustments),
+    }
+    arrays['metadata'] = np.array(json.dumps(metadata))
+    # Writing through a file object keeps numpy from appending '.npz' to the path
+    with open(file_path, 'wb') as file:
+        np.savez(file, **arrays)
+
+
+def load_project(file_path):
+    """
+    Reads a project file written by save_project.
+
+    Returns:
+    - dict: 'imported_df', 'original_imported_df', 'algorithm_source',
+      'preset_balance_ranges' and 'target_type_balance_adjustments'.
+
+    Raises:
+    - ValueError: If the file is not a project file of a supported version.
+    """
+    with np.load(file_path, allow_pickle=False) as archive:
+        arrays = {key: archive[key] for key in archive.files}
+    if 'metadata' not in arrays:
+        raise ValueError("Not a Tower Balancer project file.")
+    metadata = json.loads(str(arrays['metadata']))
+    if metadata.get('version') != PROJECT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported project version: {metadata.get('version')}")
+
+    return {
+        'imported_df': _frame_from_arrays(metadata['frames']['imported_df'], 'imported_df', arrays),
+        'original_imported_df': _frame_from_arrays(metadata['frames']['original_imported_df'], 'original_imported_df', arrays),
+        'algorithm_source': metadata['algorithm_source'],
+        'preset_balance_ranges': ast.literal_eval(metadata['preset_balance_ranges']),
+        'target_type_balance_adjustments': ast.literal_eval(metadata['target_type_balance_adjustments']),
+    }
+
+
+def read_tower_file(file_path):
+    """
+    Reads tower data from an Excel (.xlsx) or CSV file.
+
+    Returns:
+    - pd.DataFrame: The raw file contents.
+
+    Raises:
+    - ValueError: If the file is neither .xlsx nor .csv.
+    """
+    if file_path.endswith('.xlsx'):
+        # Specify engine='openpyxl' for .xlsx files
+        return pd.read_excel(file_path, engine='openpyxl')
+    if file_path.endswith('.csv'):
+        return pd.read_csv(file_path)
+    raise ValueError("Unsupported file format. Please select an Excel or CSV file.")
+
+
+# Section headers of the algorithm files written by the Algorithm Editor
+ALGORITHM_FILE_SECTIONS = OrderedDict([
+    ('calc_code', '# Calculation Function Code'),
+    ('ranges_code', '# Preset Balance Ranges'),
+    ('adjustments_code', '# Target Type Balance Adjustments'),
+])
+
+
+def parse_algorithm_file(content):
+    """
+    Splits the contents of an algorithm file into its sections.
+
+    Parameters:
+    - content (str): File contents, sections separated by blank lines and headed by ALGORITHM_FILE_SECTIONS.
+
+    Returns:
+    - dict: 'calc_code', 'ranges_code' and 'adjustments_code'; '' for missing sections.
+    """
+    codes = dict.fromkeys(ALGORITHM_FILE_SECTIONS, '')
+    current_section = ''
+    for section in content.split('\n\n'):
+        for key, header in ALGORITHM_FILE_SECTIONS.items():
+            if header in section:
+                current_section = key
+                codes[key] = section.replace(header, '').strip()
+                break
+        else:
+            # Blank lines inside a section, e.g. in the function source; keep the indentation
+            if current_section:
+                codes[current_section] += '\n\n' + section.strip('\n').rstrip()
+    return codes
+
+
+class IncrementalGroupStats(object):
+    """
+    Per-(Tower Number, Target Type) statistics of DPS per Gold and Total DPS that can be
+    updated one race at a time.
+
+    Each group keeps a running count/mean/M2 (Welford) for the mean and standard deviation
+    and sorted value lists for quantiles and min/max. Replacing a race's towers only touches
+    the groups those towers belong to, and summaries are cached until their group changes.
+    """
+
+    def __init__(self):
+        self.groups = {}          # group -> {'count', 'mean', 'm2', 'entries': sorted [(dps_per_gold, total_dps)], 'totals': sorted [total_dps]}
+        self.race_members = {}    # race -> [(group, dps_per_gold, total_dps)]
+        self.summary_cache = {}   # (group, ignore_outliers) -> summary dict
+
+    def clear(self):
+        self.groups.clear()
+        self.race_members.clear()
+        self.summary_cache.clear()
+
+    def copy(self):
+        """
+        Returns an independent copy that can be updated without affecting this one.
+        """
+        duplicate = IncrementalGroupStats()
+        duplicate.groups = {
+            group: dict(stats_entry, entries=list(stats_entry['entries']), totals=list(stats_entry['totals']))
+            for group, stats_entry in self.groups.items()
+        }
+        # Member lists and summaries are replaced, never modified, so they can be shared
+        duplicate.race_members = dict(self.race_members)
+        duplicate.summary_cache = dict(self.summary_cache)
+        return duplicate
+
+    def rebuild(self, df):
+        """
+        Rebuilds every group from a DataFrame with 'Race', 'Tower Number', 'Target Type',
+        'DPS per Gold' and 'Total DPS' columns.
+        """
+        self.clear()
+        for race, race_df in df.groupby('Race', sort=False):
+            self.replace_race(race, race_df)
+
+    def replace_race(self, race, race_df):
+        """
+        Replaces all members of a race with the rows of race_df.
+
+        Returns:
+            set: The groups whose statistics changed.
+        """
+        touched = set()
+        for group, dps_per_gold, total_dps in self.race_members.pop(race, []):
+            self._remove(group, dps_per_gold, total_dps)
+            touched.add(group)
+
+        members = []
+        for tower_number, target_type, dps_per_gold, total_dps in zip(
+                race_df['Tower Number'], race_df['Target Type'], race_df['DPS per Gold'], race_df['Total DPS']):
+            if pd.isna(target_type) or pd.isna(dps_per_gold) or pd.isna(total_dps):
+                continue  # Grouping and aggregates skip missing values
+            group = (int(tower_number), target_type)
+            self._add(group, float(dps_per_gold), float(total_dps))
+            members.append((group, float(dps_per_gold), float(total_dps)))
+            touched.add(group)
+        if members:
+            self.race_members[race] = members
+
+        for group in touched:
+            self.summary_cache.pop((group, True), None)
+            self.summary_cache.pop((group, False), None)
+        return touched
+
+    def _add(self, group, dps_per_gold, total_dps):
+        stats_entry = self.groups.setdefault(group, {'count': 0, 'mean': 0.0, 'm2': 0.0, 'entries': [], 'totals': []})
+        stats_entry['count'] += 1
+        delta = dps_per_gold - stats_entry['mean']
+        stats_entry['mean'] += delta / stats_entry['count']
+        stats_entry['m2'] += delta * (dps_per_gold - stats_entry['mean'])
+        bisect.insort(stats_entry['entries'], (dps_per_gold, total_dps))
+        bisect.insort(stats_entry['totals'], total_dps)
+
+    def _remove(self, group, dps_per_gold, total_dps):
+        stats_entry = self.groups[group]
+        if stats_entry['count'] == 1:
+            del self.groups[group]
+            return
+        delta = dps_per_gold - stats_entry['mean']
+        stats_entry['count'] -= 1
+        stats_entry['mean'] -= delta / stats_entry['count']
+        stats_entry['m2'] = max(stats_entry['m2'] - delta * (dps_per_gold - stats_entry['mean']), 0.0)
+        entries = stats_entry['entries']
+        del entries[bisect.bisect_left(entries, (dps_per_gold, total_dps))]
+        totals = stats_entry['totals']
+        del totals[bisect.bisect_left(totals, total_dps)]
+        if stats_entry['count'] == 1:
+            # Reset the running values so removals leave no rounding drift behind
+            stats_entry['mean'] = entries[0][0]
+            stats_entry['m2'] = 0.0
+
+    def group_keys(self):
+        return sorted(self.groups)
+
+    def summary(self, group, ignore_outliers=False):
+        """
+        Returns the mean, population standard deviation and min/max of DPS per Gold and
+        Total DPS for a group, optionally excluding IQR outliers (1.5 x IQR beyond Q1/Q3).
+        Runs in time proportional to the group size and is cached until the group changes.
+        """
+        key = (group, ignore_outliers)
+        if key in self.summary_cache:
+            return self.summary_cache[key]
+
+        stats_entry = self.groups[group]
+        entries = stats_entry['entries']
+        if ignore_outliers:
+            # Entries are sorted by DPS per Gold, so the quartiles are read off directly
+            # and the kept towers form one contiguous slice
+            dps_per_gold = [entry[0] for entry in entries]
+            low_fence, high_fence = iqr_fences(sorted_quantile(dps_per_gold, 0.25), sorted_quantile(dps_per_gold, 0.75))
+            start = bisect.bisect_left(entries, (low_fence, -math.inf))
+            stop = bisect.bisect_right(entries, (high_fence, math.inf))
+            if stop > start:
+                entries = entries[start:stop]
+                dps_per_gold = dps_per_gold[start:stop]
+            dps_per_gold = np.array(dps_per_gold)
+            total_dps = [entry[1] for entry in entries]
+            summary = {
+                'mean': dps_per_gold.mean(),
+                'std': dps_per_gold.std(),
+                'dps_per_gold_range': (entries[0][0], entries[-1][0]),
+                'total_dps_range': (min(total_dps), max(total_dps)),
+            }
+        else:
+            # Identical values have exactly zero spread, regardless of rounding in the running sums
+            std = 0.0 if entries[0][0] == entries[-1][0] else math.sqrt(stats_entry['m2'] / stats_entry['count'])
+            summary = {
+                'mean': stats_entry['mean'],
+                'std': std,
+                'dps_per_gold_range': (entries[0][0], entries[-1][0]),
+                'total_dps_range': (stats_entry['totals'][0], stats_entry['totals'][-1]),
+            }
+        self.summary_cache[key] = summary
+        return summary
+
+
+# Tower fields compared by the changes report, in report order
+CHANGES_REPORT_COLUMNS = [
+    'Name', 'Gold Cost', 'Damage', 'Dice', 'Sides', 'Cooldown', 'Range',
+    'Full Splash', 'Med Splash', 'Small Splash', 'Spell DPS', 'Spell DPS CD',
+    'Slow %', 'Utility Boost', 'Poison', 'Target Type',
+]
+
+# Fields whose changes are not reported while both values are one of the listed ones.
+# field -> (value of blank and zero cells, ignored values)
+CHANGES_REPORT_IGNORED_VALUES = {
+    'Spell DPS': (0.0, [0.0]),
+    'Utility Boost': (1.0, [1.0]),
+    'Slow %': (0.0, [0.0, 1.0]),
+    'Spell DPS CD': (0.0, [0.0, 1.0]),
+}
+
+
+def _parse_cells(column):
+    """
+    float() and truthiness of every cell of column. Missing cells read as '0', the way the
+    changes report shows them. Numeric columns are converted at once; other columns parse
+    each distinct value once.
+
+    Returns:
+    - tuple: (float array with NaN where float() fails, bool array of falsy cells)
+    """
+    missing = column.isna().to_numpy()
+    if pd.api.types.is_numeric_dtype(column):
+        values = np.where(missing, 0.0, column.to_numpy(dtype=float, na_value=np.nan))
+        return values, (values == 0) & ~missing
+
+    codes, uniques = pd.factorize(column)  # Missing cells get code -1, the extra last entry
+    parsed = np.zeros(len(uniques) + 1)
+    falsy = np.zeros(len(uniques) + 1, dtype=bool)
+    for i, value in enumerate(uniques):
+        try:
+            parsed[i] = float(value)
+        except (TypeError, ValueError):
+            parsed[i] = np.nan
+        falsy[i] = not value
+    return parsed[codes], falsy[codes]
+
+
+def _cell_text(column, rows):
+    """
+    Returns str() of the cells of column at positions rows, with missing cells shown as '0'.
+    """
+    return ['0' if pd.isnull(value) else str(value) for value in column.to_numpy(dtype=object)[rows]]
+
+
+# Column caching tower_row_hashes of each row, kept up to date where rows are replaced
+ROW_HASH_COLUMN = 'Row Hash'
+
+
+def tower_row_hashes(df):
+    """
+    Returns a content hash of every row of df over the changes report fields present in df.
+
+    Numeric columns are hashed by value (59 and 59.0 hash alike), other columns by trimmed
+    text, and missing cells as 0, so two rows with equal hashes hold no reportable change.
+    Rows with different hashes may still be equal under the report's rules (e.g. '59' text
+    against the number 59); build_changes_report compares those field by field.
+
+    Parameters:
+    - df (pd.DataFrame): Tower data.
+
+    Returns:
+    - np.ndarray: One uint64 hash per row of df.
+    """
+    hashes = np.zeros(len(df), dtype=np.uint64)
+    for column in CHANGES_REPORT_COLUMNS:
+        if column not in df.columns:
+            continue
+        values = df[column]
+        if pd.api.types.is_numeric_dtype(values):
+            column_hashes = pd.util.hash_array(values.to_numpy(dtype=float, na_value=0.0))
+        else:
+            # Hash each distinct value once; missing cells (code -1) read as '0'
+            codes, uniques = pd.factorize(values)
+            texts = np.array([str(value).strip() for value in uniques] + ['0'], dtype=object)
+            column_hashes = pd.util.hash_array(texts)[codes]
+        # Mix the column hashes in order, so equal values in different fields do not cancel out
+        hashes = hashes * np.uint64(1000003) ^ column_hashes
+    return hashes
+
+
+def _row_hashes(df):
+    """
+    Returns the cached ROW_HASH_COLUMN of df, or computes the hashes if df has none.
+    """
+    if ROW_HASH_COLUMN in df.columns:
+        return df[ROW_HASH_COLUMN].to_numpy()
+    return tower_row_hashes(df)
+
+
+def build_changes_report(original_df, current_df):
+    """
+    Builds the changes report for current_df compared with original_df: per race, every
+    changed field of every tower, as lines of (text, color, bold) segments for the
+    View Changes tab.
+
+    Towers are matched on their Tower ID, so inserting or deleting a tower does not shift
+    the towers after it; data without IDs is matched on (Race, Tower Number). The frames
+    are joined on the match key and the content hash of each row (ROW_HASH_COLUMN, or
+    tower_row_hashes for frames without it), and only the rows whose hashes differ are
+    compared field by field: numerically where both cells are numbers (so 59 equals 59.0),
+    as trimmed text otherwise.
+    """
+    report_lines = []
+    if original_df.empty:
+        report_lines.append([("No original data to compare changes.", "white", False)])
+        return report_lines
+
+    if TOWER_ID_COLUMN in original_df.columns and TOWER_ID_COLUMN in current_df.columns:
+        keys = [TOWER_ID_COLUMN]
+    else:
+        keys = ['Race', 'Tower Number']
+    columns = [column for column in CHANGES_REPORT_COLUMNS if column in original_df.columns and column in current_df.columns]
+
+    original_rows = original_df[keys].assign(_hash=_row_hashes(original_df), _row=np.arange(len(original_df)))
+    current_rows = current_df[list(dict.fromkeys(keys + ['Race']))].assign(
+        _hash=_row_hashes(current_df), _row=np.arange(len(current_df)))
+    # Inner join keeps the original's row order; races are then listed alphabetically
+    pairs = pd.merge(original_rows, current_rows, on=keys, suffixes=('_orig', '_curr'))
+    pairs = pairs[(pairs['_hash_orig'] != pairs['_hash_curr']) & pairs['Race'].notna()]
+    pairs = pairs.sort_values('Race', kind='stable')
+
+    # Only the rows with a different hash are gathered for the field comparisons
+    merged = pd.concat([
+        pairs[['Race']].reset_index(drop=True),
+        original_df.iloc[pairs['_row_orig'].to_numpy()][columns].add_suffix('_orig').reset_index(drop=True),
+        current_df.iloc[pairs['_row_curr'].to_numpy()][columns].add_suffix('_curr').reset_index(drop=True),
+    ], axis=1)
+
+    # changed[row, field]: the field of that tower changed and is not ignored
+    changed = np.zeros((len(merged), len(columns)), dtype=bool)
+    increased = np.zeros((len(merged), len(columns)), dtype=bool)
+    numeric = np.zeros((len(merged), len(columns)), dtype=bool)
+    for position, column in enumerate(columns):
+        orig_column, curr_column = merged[f"{column}_orig"], merged[f"{column}_curr"]
+        orig_num, orig_falsy = _parse_cells(orig_column)
+        curr_num, curr_falsy = _parse_cells(curr_column)
+
+        # Compare values numerically to handle trailing zeroes, as trimmed strings otherwise
+        both_numeric = ~np.isnan(orig_num) & ~np.isnan(curr_num)
+        column_changed = both_numeric & (orig_num != curr_num)
+        text_rows = np.flatnonzero(~both_numeric)
+        if len(text_rows):
+            orig_text = np.array([text.strip() for text in _cell_text(orig_column, text_rows)], dtype=object)
+            curr_text = np.array([text.strip() for text in _cell_text(curr_column, text_rows)], dtype=object)
+            column_changed[text_rows] = orig_text != curr_text
+
+        # Ignore specific fields while both values are at their defaults
+        if column in CHANGES_REPORT_IGNORED_VALUES:
+            default, ignored = CHANGES_REPORT_IGNORED_VALUES[column]
+            orig_value = np.where(orig_falsy, default, orig_num)
+            curr_value = np.where(curr_falsy, default, curr_num)
+            column_changed &= ~(np.isin(orig_value, ignored) & np.isin(curr_value, ignored))
+
+        changed[:, position] = column_changed
+        increased[:, position] = curr_num > orig_num
+        numeric[:, position] = both_numeric
+
+    changed_rows, changed_columns = np.nonzero(changed)  # Row by row, fields in report order
+    if len(changed_rows):
+        races = merged['Race'].to_numpy(dtype=object)
+        names = merged['Name_curr'].to_numpy(dtype=object) if 'Name' in columns else np.full(len(merged), '', dtype=object)
+        text = {}
+        for position, column in enumerate(columns):
+            rows = changed_rows[changed_columns == position]
+            if len(rows):
+                text[column] = (dict(zip(rows, _cell_text(merged[f"{column}_orig"], rows))),
+                                dict(zip(rows, _cell_text(merged[f"{column}_curr"], rows))))
+
+        current_race = None
+        current_row = None
+        for row, position in zip(changed_rows, changed_columns):
+            column = columns[position]
+            if row != current_row:
+                if current_row is not None:
+                    # Add a blank line after each tower
+                    report_lines.append([("\n", "white", False)])
+                if races[row] != current_race:
+                    if current_race is not None:
+                        # Add only one blank line between races
+                        report_lines.append([("\n", "white", False)])
+                    current_race = races[row]
+                    report_lines.append([(str(current_race) + ":\n", "green", True)])  # Race name in green, bold
+                current_row = row
+
+            # Increases go from red to green, decreases from green to red; text changes from red to green
+            if numeric[row, position] and not increased[row, position]:
+                from_color, to_color = "green", "red"
+            else:
+                from_color, to_color = "red", "green"
+            orig_text, curr_text = text[column]
+            report_lines.append([
+                ("    - ", "white", False),  # Indent and bullet
+                (str(names[row]) + ": ", "#FFC107", True),  # Tower name in amber color, bold
+                (column, "#FFC107", True),  # Variable name in amber color, bold
+                (" changed from ", "white", False),
+                (orig_text[row], from_color, False),  # Original value
+                (" to ", "white", False),
+                (curr_text[row], to_color, False),  # New value
+                ("\n", "white", False)
+            ])
+        report_lines.append([("\n", "white", False)])
+        report_lines.append([("\n", "white", False)])
+
+    if not report_lines:
+        report_lines.append([("No changes detected across the data set.", "white", False)])
+
+    return report_lines
+
+
+# Preset balance ranges: Tower number -> (low, high) DPS per Gold
+PRESET_BALANCE_RANGES = {
+    1: (225, 325),
+    2: (125, 175),
+    3: (100, 125),
+    4: (50, 75),
+    5: (25, 30),
+    6: (15, 25),
+    7: (10, 15),
+    8: (5, 10),
+    9: (3, 5),
+    10: (1, 3),
+    11: (0.5, 1),
+    12: (0.5, 1)
+}
+
+
+def format_number(num):
+    if isinstance(num, float):
+        if num >= 100:
+            return str(int(round(num)))
+        elif num >= 10:
+            return f"{round(num,1):.1f}".rstrip('0').rstrip('.')
+        else:
+            return f"{round(num,2):.2f}".rstrip('0').rstrip('.')
+    else:
+        return str(num)
+
+
+def check_balance(dps_per_gold, low, high, z_score, percentile_rank):
+    """
+    Determines the balance status of a tower based on DPS/Gold, Z-Score, and Percentile Rank.
+
+    Parameters:
+    - dps_per_gold (float): The DPS per Gold value of the tower.
+    - low (float): The lower bound of the balanced DPS/Gold range.
+    - high (float): The upper bound of the balanced DPS/Gold range.
+    - z_score (float): The Z-Score of the tower's DPS/Gold.
+    - percentile_rank (float): The Percentile Rank of the tower's DPS/Gold.
+
+    Returns:
+    - str: "Balanced", "Underpowered", or "Overpowered".
+    """
+    if (low <= dps_per_gold <= high) and (-1 <= z_score <= 1) and (40 <= percentile_rank <= 60):
+        return "Balanced"
+    elif dps_per_gold < low or percentile_rank < 40:
+        return "Underpowered"
+    else:
+        return "Overpowered"
+
+
+class PhaseTimings(object):
+    """
+    Wall-clock time of the named phases of one recalculation, plus counts of cache
+    outcomes (e.g. ('GUI row cache', 'hit')). A recalculation passes its instance along
+    from the Tk thread to the worker and back, so it is only written by one thread at a time.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total = None          # Seconds from creation to finish()
+        self.seconds = OrderedDict()  # phase -> seconds, in the order the phases first ran
+        self.calls = {}            # phase -> number of measurements
+        self.counts = {}           # (counter, outcome) -> count
+
+    @contextlib.contextmanager
+    def measure(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[phase] = self.seconds.get(phase, 0.0) + time.perf_counter() - start
+            self.calls[phase] = self.calls.get(phase, 0) + 1
+
+    def count(self, counter, outcome, amount=1):
+        self.counts[(counter, outcome)] = self.counts.get((counter, outcome), 0) + amount
+
+    def finish(self):
+        self.total = time.perf_counter() - self.started
+
+
+def measure_phase(timings, phase):
+    """
+    Returns timings.measure(phase), or a context that measures nothing when timings is None.
+    """
+    return timings.measure(phase) if timings is not None else contextlib.nullcontext()
+
+
+def count_outcome(timings, counter, outcome, amount=1):
+    """
+    Counts a cache outcome in timings, if given.
+    """
+    if timings is not None:
+        timings.count(counter, outcome, amount)
+
+
+PHASE_PROFILE_HISTORY = 20  # Recalculations kept by PhaseProfile
+
+
+class PhaseProfile(object):
+    """
+    The PhaseTimings of the last recalculations, with running totals of the cache outcome
+    counts and of recalculations that were superseded or cancelled before they were shown.
+    """
+
+    def __init__(self, history=PHASE_PROFILE_HISTORY):
+        self.history = history
+        self.reset()
+
+    def reset(self):
+        self.runs = []
+        self.counts = {}
+        self.superseded = 0
+        self.cancelled = 0
+
+    def record(self, timings):
+        if timings.total is None:
+            timings.finish()
+        self.runs.append(timings)
+        del self.runs[:-self.history]
+        for key, amount in timings.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + amount
+
+    def summary(self):
+        """
+        Returns:
+        - list: (phase, last seconds, mean seconds, max seconds, calls) per phase seen in
+          the recorded runs, in the order the phases ran; a phase missing from a run counts as 0.
+        """
+        phases = OrderedDict()
+        for timings in self.runs:
+            for phase in timings.seconds:
+                phases[phase] = None
+        rows = []
+        for phase in phases:
+            values = [timings.seconds.get(phase, 0.0) for timings in self.runs]
+            calls = sum(timings.calls.get(phase, 0) for timings in self.runs)
+            rows.append((phase, values[-1], sum(values) / len(values), max(values), calls))
+        return rows
+
+    def outcomes(self, counter):
+        """
+        Returns:
+        - dict: outcome -> running count for counter.
+        """
+        return {outcome: amount for (name, outcome), amount in self.counts.items() if name == counter}
+
+
+# Tower factors the race difficulty can weigh; 'Splash' is the sum of the three splash radii
+RACE_DIFFICULTY_FACTORS = ['DPS per Gold', 'Total DPS', 'Range', 'Utility Boost', 'Splash', 'Slow %', 'Spell DPS']
+
+# Default weight of each factor in a tower's score
+RACE_DIFFICULTY_WEIGHTS = {
+    'DPS per Gold': 0.2,
+    'Total DPS': 0.2,
+    'Range': 0.2,
+    'Utility Boost': 0.1,
+    'Splash': 0.2,
+    'Slow %': 0.1,
+}
+
+
+class RaceDifficultyScorer(object):
+    """
+    Rates each race from 1 to 10 from a computed towers table. Every factor is min-max
+    normalized over all towers, each tower scores the weighted sum of its normalized
+    factors, and the races' mean scores are mapped to 1-10, inverted, so stronger towers
+    give a lower level (the level is from the opposing player's perspective).
+
+    The DPS values come from the computed towers table, so nothing is evaluated again. The
+    last result is kept until the table or the weights change; the engine replaces its
+    table whenever the data or the algorithm change.
+
+    Example:
+        scorer = RaceDifficultyScorer({'DPS per Gold': 0.5, 'Range': 0.5})
+        scorer.score(engine.build_computed_towers(df, IncrementalGroupStats()))
+    """
+
+    def __init__(self, weights=None):
+        self.weights = {}
+        self._cached = None  # (computed towers table, weights items, result)
+        self.set_weights(RACE_DIFFICULTY_WEIGHTS if weights is None else weights)
+
+    def set_weights(self, weights):
+        """
+        Makes weights (factor -> weight, factors from RACE_DIFFICULTY_FACTORS) the weights
+        of the tower scores. Raises ValueError for unknown factors.
+        """
+        unknown = [factor for factor in weights if factor not in RACE_DIFFICULTY_FACTORS]
+        if unknown:
+            raise ValueError(f"Unknown race difficulty factor(s): {', '.join(map(str, unknown))}. "
+                             f"Expected: {', '.join(RACE_DIFFICULTY_FACTORS)}")
+        self.weights = {factor: float(weight) for factor, weight in weights.items()}
+
+    def score(self, computed):
+        """
+        Returns the difficulty level of every race of computed. Races without a valid tower
+        are not rated. The returned DataFrame is shared with later calls; do not modify it.
+
+        Parameters:
+        - computed (pd.DataFrame): Computed towers table (see BalanceEngine.build_computed_towers).
+
+        Returns:
+        - pd.DataFrame: 'Race', 'Weighted Score' and 'Difficulty', sorted by race.
+        """
+        weights = tuple(self.weights.items())
+        cached = self._cached
+        if cached is not None and cached[0] is computed and cached[1] == weights:
+            return cached[2]
+
+        factors = pd.DataFrame({factor: self._factor_values(computed, factor) for factor, _ in weights}, index=computed.index)
+
+        # Min-max normalize every factor over all towers; factors without variation count 0.5
+        low = factors.min().to_numpy()
+        span = factors.max().to_numpy() - low
+        with np.errstate(invalid='ignore', divide='ignore'):
+            normalized = np.where(span == 0, 0.5, (factors.to_numpy(dtype=float) - low) / span)
+        tower_scores = normalized @ np.array([weight for _, weight in weights])
+
+        # Mean score per race, mapped to 1-10 and inverted
+        race_scores = pd.Series(tower_scores, index=computed.index).groupby(computed['Race']).mean().dropna()
+        race_difficulty = race_scores.rename('Weighted Score').rename_axis('Race').reset_index()
+        scores = race_difficulty['Weighted Score'].to_numpy()
+        if len(scores) == 0 or scores.max() == scores.min():
+            difficulty = np.full(len(scores), 5)  # Default difficulty if no variation
+        else:
+            inverted = 1 - (scores - scores.min()) / (scores.max() - scores.min())
+            difficulty = np.rint(inverted * 9 + 1)  # Rounds half to even like round()
+        race_difficulty['Difficulty'] = difficulty.astype('int64')
+
+        self._cached = (computed, weights, race_difficulty)
+        return race_difficulty
+
+    @staticmethod
+    def _factor_values(computed, factor):
+        """
+        Returns the values of factor for every row of computed as a float array.
+        """
+        if factor == 'Splash':
+            return (computed['Full Splash'] + computed['Med Splash'] + computed['Small Splash']).to_numpy(dtype=float)
+        return computed[factor].to_numpy(dtype=float)
+
+
+class BalanceEngine(object):
+    """
+    The balancing pipeline for a tower DataFrame and a calculate_dps_per_gold algorithm:
+    per-tower DPS, dynamic balance ranges, balance status, Z-Score, Percent Rank, outliers
+    and race difficulty levels. Results are plain DataFrames, dicts and lists.
+
+    Example:
+        engine = BalanceEngine()
+        evaluation = engine.evaluate(pd.read_csv('races.csv'))
+        evaluation['race_results']['Human']
+    """
+
+    def __init__(self, algorithm_source=calculate_dps_per_gold_code, preset_balance_ranges=None, difficulty_weights=None):
+        self.algorithm_cache = AlgorithmCache()
+        self.difficulty_scorer = RaceDifficultyScorer(difficulty_weights)
+        self._outlier_masks = None  # (computed towers table, its outlier masks)
+        self.dps_memo = DpsMemo()  # Per-tower results of custom algorithms, keyed by inputs and algorithm hash
+        self.preset_balance_ranges = dict(PRESET_BALANCE_RANGES if preset_balance_ranges is None else preset_balance_ranges)
+        self.algorithm_source = None
+        self.algorithm_hash = None
+        self.calculate_dps_per_gold = None
+        self.set_algorithm(algorithm_source)
+
+    def set_algorithm(self, source):
+        """
+        Validates, compiles and trials source (cached by source hash) and makes it the active algorithm.
+        If it fails, the error from AlgorithmCache.load is raised and the active algorithm is kept.
+
+        Returns:
+        - bool: True if the algorithm changed, making previously computed DPS values stale.
+        """
+        source_hash, function = self.algorithm_cache.load(source)
+        self.algorithm_source = source
+        if source_hash == self.algorithm_hash:
+            return False
+        self.algorithm_hash = source_hash
+        self.calculate_dps_per_gold = function
+        # Cached DPS values were computed with the previous algorithm
+        self.dps_memo.clear()
+        return True
+
+    def calculate_dps_batch(self, inputs, valid=None, include_splash=True):
+        """
+        Calculates Total DPS and DPS per Gold for every row of parsed tower columns.
+        Uses the vectorized kernel while the built-in algorithm is active and falls back
+        to calling the user's calculate_dps_per_gold once per row for custom algorithms.
+
+        Parameters:
+        - inputs (dict): Column arrays as returned by parse_tower_inputs.
+        - valid (np.ndarray, optional): Mask of rows to calculate. Defaults to all rows.
+        - include_splash (bool): Whether splash damage is included.
+
+        Returns:
+        - tuple: (total_dps array, dps_per_gold array, valid mask). Rows whose result is
+          not a finite number (e.g. Slow % of 100) are not valid, as the scalar function
+          raises for them.
+        """
+        row_count = len(inputs['Damage'])
+        valid = np.ones(row_count, dtype=bool) if valid is None else valid.copy()
+
+        if self.algorithm_hash == BUILTIN_ALGORITHM_HASH:
+            total_dps, dps_per_gold = calculate_dps_per_gold_batch(
+                inputs['Damage'], inputs['Dice'], inputs['Sides'], inputs['Cooldown'], inputs['Range'],
+                inputs['Full Splash'], inputs['Med Splash'], inputs['Small Splash'], inputs['Gold Cost'],
+                spell_dps=inputs['Spell DPS'], spell_dps_cooldown=inputs['Spell DPS CD'], poison=inputs['Poison'],
+                utility_boost=inputs['Utility Boost'], slow_percentage=inputs['Slow %'],
+                target_type=inputs['Target Type'], include_splash=include_splash)
+            # Where the scalar code divides by zero, the kernel gives inf or NaN instead
+            valid &= np.isfinite(total_dps) & np.isfinite(dps_per_gold)
+            return total_dps, dps_per_gold, valid
+
+        # Custom algorithm: evaluate the scalar function row by row, reusing memoized results
+        total_dps = np.full(row_count, np.nan)
+        dps_per_gold = np.full(row_count, np.nan)
+        for i in np.flatnonzero(valid):
+            args = (
+                float(inputs['Damage'][i]), int(inputs['Dice'][i]), int(inputs['Sides'][i]),
+                float(inputs['Cooldown'][i]), int(inputs['Range'][i]), int(inputs['Full Splash'][i]),
+                int(inputs['Med Splash'][i]), int(inputs['Small Splash'][i]), int(inputs['Gold Cost'][i])
+            )
+            # Keyword arguments as (name, value) pairs in a fixed order so equal calls share a key
+            keywords = (
+                ('spell_dps', float(inputs['Spell DPS'][i])), ('spell_dps_cooldown', float(inputs['Spell DPS CD'][i])),
+                ('poison', int(inputs['Poison'][i])), ('utility_boost', float(inputs['Utility Boost'][i])),
+                ('slow_percentage', float(inputs['Slow %'][i])), ('target_type', inputs['Target Type'][i]),
+                ('include_splash', include_splash)
+            )
+            result = self.dps_memo.call(self.calculate_dps_per_gold, self.algorithm_hash, args, keywords)
+            if result is None:
+                valid[i] = False
+            else:
+                total_dps[i], dps_per_gold[i] = result
+        logging.debug("DPS memo: %s", self.dps_memo.stats())
+        return total_dps, dps_per_gold, valid
+
+    def derive_computed_towers(self, df, previous, dirty_races, group_stats, timings=None):
+        """
+        Brings a computed towers table up to date with df and updates group_stats to match.
+        Only the rows of dirty_races are recomputed when previous can be reused; otherwise
+        the table is rebuilt. With timings (PhaseTimings), the phases are measured there.
+        """
+        computed = None
+        if previous is not None and dirty_races is not None:
+            computed = self._update_computed_towers(df, previous, dirty_races, group_stats, timings)
+
+        if computed is None:
+            # Full rebuild
+            computed = self.build_computed_towers(df, group_stats, timings)
+            count_outcome(timings, 'Computed towers', 'rebuilt')
+        else:
+            count_outcome(timings, 'Computed towers', 'incremental')
+        return computed
+
+    def build_computed_towers(self, df, group_stats, timings=None):
+        """
+        Builds the full computed towers table for df and rebuilds group_stats from it.
+        """
+        with measure_phase(timings, 'DPS evaluation'):
+            computed = self._compute_tower_rows(df)
+        with measure_phase(timings, 'Group statistics'):
+            group_stats.rebuild(computed[computed['Valid']])
+        with measure_phase(timings, 'Z-Score / Percent Rank'):
+            self._assign_group_ranks(computed, computed['Valid'].to_numpy())
+        return computed
+
+    def _update_computed_towers(self, df, previous, dirty_races, group_stats, timings=None):
+        """
+        Recomputes only the rows of dirty_races. Rows of other races keep their relative order
+        in imported_df (races are only ever removed and re-appended), so they are carried over.
+        Returns None when the previous table cannot be reused.
+        """
+        races = df['Race'] if 'Race' in df.columns else pd.Series('', index=df.index)
+        new_mask = races.isin(dirty_races).to_numpy()
+        old_mask = previous['Race'].isin(dirty_races).to_numpy()
+        if (~new_mask).sum() != (~old_mask).sum():
+            return None
+
+        with measure_phase(timings, 'DPS evaluation'):
+            fresh = self._compute_tower_rows(df[new_mask])
+            kept = previous[~old_mask].copy()
+            kept.index = df.index[~new_mask]
+            computed = pd.concat([kept, fresh]).reindex(df.index)
+
+        with measure_phase(timings, 'Group statistics'):
+            touched = set()
+            for race in dirty_races:
+                race_rows = fresh[(fresh['Race'] == race) & fresh['Valid']]
+                touched |= group_stats.replace_race(race, race_rows)
+
+        # Z-Score and Percent Rank only change within the touched groups
+        with measure_phase(timings, 'Z-Score / Percent Rank'):
+            groups = pd.MultiIndex.from_arrays([computed['Tower Number'], computed['Target Type']])
+            rows = computed['Valid'].to_numpy() & groups.isin(list(touched))
+            self._assign_group_ranks(computed, rows)
+        return computed
+
+    def _compute_tower_rows(self, df):
+        """
+        Builds computed towers rows (without Z-Score and Percent Rank) for the rows of df.
+        """
+        inputs, valid = parse_tower_inputs(df)
+        total_dps, dps_per_gold, valid = self.calculate_dps_batch(inputs, valid)
+
+        computed = pd.DataFrame(inputs, index=df.index)
+        computed.insert(0, 'Race', df['Race'] if 'Race' in df.columns else '')
+        computed.insert(1, 'Name', df['Name'] if 'Name' in df.columns else '')
+        computed['Tower Number'] = np.where(valid, inputs['Tower Number'], 0).astype(int)
+        computed['Valid'] = valid
+        computed['Total DPS'] = np.where(valid, total_dps, np.nan)
+        computed['DPS per Gold'] = np.where(valid, dps_per_gold, np.nan)
+
+        # Splash towers are also rated against the non-splash target type, without splash damage
+        splash_rows = valid & np.isin(inputs['Target Type'], ['Ground Splash', 'Air Splash'])
+        computed['Total DPS (No Splash)'] = np.nan
+        computed['DPS per Gold (No Splash)'] = np.nan
+        if splash_rows.any():
+            variant_inputs = {column: values[splash_rows] for column, values in inputs.items()}
+            for column in ['Full Splash', 'Med Splash', 'Small Splash']:
+                variant_inputs[column] = np.zeros(splash_rows.sum())
+            variant_inputs['Target Type'] = np.where(variant_inputs['Target Type'] == 'Ground Splash', 'Air', 'Ground').astype(object)
+            variant_total, variant_per_gold, variant_valid = self.calculate_dps_batch(variant_inputs, include_splash=False)
+            computed.loc[splash_rows, 'Total DPS (No Splash)'] = np.where(variant_valid, variant_total, np.nan)
+            computed.loc[splash_rows, 'DPS per Gold (No Splash)'] = np.where(variant_valid, variant_per_gold, np.nan)
+
+        computed['Z-Score'] = np.nan
+        computed['Percent Rank'] = np.nan
+        return computed
+
+    def _assign_group_ranks(self, computed, rows):
+        """
+        Calculates Z-Score and Percent Rank within each (Tower Number, Target Type) group
+        for the given rows. rows must cover whole groups.
+        """
+        def calculate_z_score(x):
+            if len(x) > 1:
+                return stats.zscore(x, ddof=0)
+            else:
+                return np.array([0])
+
+        if rows.any():
+            grouped = computed[rows].groupby(['Tower Number', 'Target Type'])['DPS per Gold']
+            computed.loc[rows, 'Z-Score'] = grouped.transform(calculate_z_score)
+            computed.loc[rows, 'Percent Rank'] = grouped.transform(lambda x: x.rank(pct=True) * 100 if len(x) > 1 else np.full(len(x), 50))
+
+    def balance_ranges(self, group_stats, ignore_outliers=False):
+        """
+        Derives each group's dynamic balance range (mean ± one standard deviation, scaled by
+        tower number) and its global DPS per Gold and Raw DPS ranges.
+
+        Parameters:
+        - group_stats (IncrementalGroupStats): Statistics of the computed towers table.
+        - ignore_outliers (bool): Whether IQR outliers are excluded from the statistics.
+
+        Returns:
+        - tuple: (balance_ranges, global_dps_per_gold_ranges, global_raw_dps_ranges), each a
+          dict of (Tower Number, Target Type) -> (low, high).
+        """
+        balance_ranges = {}
+        global_dps_per_gold_ranges = {}
+        global_raw_dps_ranges = {}
+        for tower_num, target_type in group_stats.group_keys():
+            summary = group_stats.summary((tower_num, target_type), ignore_outliers)
+            mean_dps_per_gold = summary['mean']
+            std_dps_per_gold = summary['std']
+
+            # Handle cases with zero std deviation
+            if std_dps_per_gold == 0:
+                std_dps_per_gold = mean_dps_per_gold * 0.1  # Assume 10% variation
+
+            # Define balance range as mean ± one standard deviation
+            low_range = mean_dps_per_gold - std_dps_per_gold
+            high_range = mean_dps_per_gold + std_dps_per_gold
+
+            # Scaling factor inversely proportional to tower number
+            scaling_factor = 1 / (tower_num ** 0.05)  # Implemented scaling_factor as per request
+            low_range *= scaling_factor
+            high_range *= scaling_factor
+
+            balance_ranges[(tower_num, target_type)] = (low_range, high_range)
+            global_dps_per_gold_ranges[(tower_num, target_type)] = summary['dps_per_gold_range']
+            global_raw_dps_ranges[(tower_num, target_type)] = summary['total_dps_range']
+        return balance_ranges, global_dps_per_gold_ranges, global_raw_dps_ranges
+
+    def race_results(self, computed, race, ranges, dynamic_comparison=True, preset_balance_ranges=None):
+        """
+        Rates every valid tower of a race. 'All' towers get one row. Splash towers get a row
+        against their own target type (with splash, 1.25x the 'All' range) and one against
+        the other target type (without splash, 0.75x the 'All' range).
+
+        Parameters:
+        - computed (pd.DataFrame): Computed towers table.
+        - race (str): The race to rate.
+        - ranges (tuple): Result of balance_ranges.
+        - dynamic_comparison (bool): Rate 'All' towers against the dynamic ranges instead of the presets.
+        - preset_balance_ranges (dict, optional): Tower number -> (low, high). Defaults to the engine's.
+
+        Returns:
+        - list: One dict per row, in tower order, with 'Tower Number', 'Tower Name', 'Target',
+          'DPS per Gold', 'Total DPS', 'Balance Status', 'Z-Score', 'Percent Rank' and the
+          (low, high) pairs 'Balance Range', 'Global DPS per Gold' and 'Global Raw DPS'.
+        """
+        balance_ranges, global_dps_per_gold_ranges, global_raw_dps_ranges = ranges
+        if preset_balance_ranges is None:
+            preset_balance_ranges = self.preset_balance_ranges
+
+        race_towers = computed[(computed['Race'] == race) & computed['Valid']]
+        # Index Z-Score and Percent Rank by (Tower Number, Target Type) once per race; first match wins
+        group_ranks = {}
+        for key, z_score, percent_rank in zip(
+                zip(race_towers['Tower Number'], race_towers['Target Type']),
+                race_towers['Z-Score'], race_towers['Percent Rank']):
+            group_ranks.setdefault(key, (z_score, percent_rank))
+
+        race_tower_data = []
+        for tower_number, computed_row in race_towers.set_index('Tower Number').iterrows():
+            tower_number = int(tower_number)
+            target_type = computed_row['Target Type']
+            tower_name = computed_row['Name']
+
+            # Variants to rate: (name, target, balance range, DPS column suffix, default Z-Score and Percent Rank)
+            if target_type == 'All':
+                if dynamic_comparison:
+                    # Use dynamic balance ranges
+                    balance_range = balance_ranges.get((tower_number, target_type), (0, 0))
+                else:
+                    # Use preset balance ranges
+                    balance_range = preset_balance_ranges.get(tower_number, (0, 0))
+                variants = [(tower_name, target_type, balance_range, '', (0, 0))]
+            elif target_type in ('Ground Splash', 'Air Splash'):
+                other_type = 'Air' if target_type == 'Ground Splash' else 'Ground'
+                variants = [
+                    (f"{tower_name} ({target_type})", target_type,
+                     self._splash_balance_range(balance_ranges, tower_number, target_type, 1.25), '', (0, 0)),
+                    (f"{tower_name} ({other_type})", other_type,
+                     self._splash_balance_range(balance_ranges, tower_number, other_type, 0.75), ' (No Splash)', (0, 50)),
+                ]
+            else:
+                # Handle unexpected target types
+                continue
+
+            # Global ranges always come from the tower's own target type
+            global_dps_per_gold_range = global_dps_per_gold_ranges.get((tower_number, target_type), (0, 0))
+            global_raw_dps_range = global_raw_dps_ranges.get((tower_number, target_type), (0, 0))
+
+            for name, variant_target, (low, high), suffix, default_ranks in variants:
+                dps_per_gold = computed_row['DPS per Gold' + suffix]
+                z_score, percent_rank = group_ranks.get((tower_number, variant_target), default_ranks)
+                race_tower_data.append({
+                    'Tower Number': tower_number,
+                    'Tower Name': name,
+                    'Target': variant_target,
+                    'DPS per Gold': dps_per_gold,
+                    'Total DPS': computed_row['Total DPS' + suffix],
+                    'Balance Status': check_balance(dps_per_gold, low, high, z_score, percent_rank),
+                    'Balance Range': (low, high),
+                    'Z-Score': z_score,
+                    'Percent Rank': percent_rank,
+                    'Global DPS per Gold': global_dps_per_gold_range,
+                    'Global Raw DPS': global_raw_dps_range,
+                })
+        return race_tower_data
+
+    def _splash_balance_range(self, balance_ranges, tower_number, target_type, scale):
+        """
+        Returns the tower's 'All' balance range scaled by scale, or the target type's own
+        range without scaling when there is no 'All' range.
+        """
+        all_balance = balance_ranges.get((tower_number, 'All'), None)
+        if all_balance and all_balance != (0, 0):
+            return all_balance[0] * scale, all_balance[1] * scale
+        return balance_ranges.get((tower_number, target_type), (0, 0))
+
+    def outlier_masks(self, computed):
+        """
+        Returns the outlier masks of the valid towers of computed (see
+        tower_balancer_outliers.outlier_masks), aligned with computed; invalid towers are in
+        no mask. Computed once per table and shared by find_outliers and comparison_analysis.
+        """
+        cached = self._outlier_masks
+        if cached is not None and cached[0] is computed:
+            return cached[1]
+        masks = outlier_masks(computed[computed['Valid']]).reindex(computed.index, fill_value=False)
+        self._outlier_masks = (computed, masks)
+        return masks
+
+    def find_outliers(self, computed):
+        """
+        Finds the valid towers below the 5th or above the 95th percentile of DPS per Gold
+        within their (Tower Number, Target Type) group.
+
+        Returns:
+        - tuple: (outliers_low, outliers_high) DataFrames with 'Tower Number', 'Total DPS',
+          'DPS per Gold', 'Target Type', 'Race', 'Z-Score' and 'Percent Rank'.
+        """
+        valid = computed['Valid']
+        masks = self.outlier_masks(computed)[valid].reset_index(drop=True)
+        df_all_towers = computed.loc[
+            valid,
+            ['Tower Number', 'Total DPS', 'DPS per Gold', 'Target Type', 'Race', 'Z-Score', 'Percent Rank']
+        ].reset_index(drop=True)
+        return df_all_towers[masks['low']], df_all_towers[masks['high']]
+
+    def race_difficulty(self, computed):
+        """
+        Rates each race from 1 to 10 with weighted, normalized tower factors (see
+        RaceDifficultyScorer). Repeated calls with the same table reuse the last result.
+
+        Returns:
+        - pd.DataFrame: 'Race', 'Weighted Score' and 'Difficulty', sorted by race.
+        """
+        return self.difficulty_scorer.score(computed)
+
+    def comparison_analysis(self, computed_towers, iqr_outliers=False):
+        """
+        Compares the weakest and strongest tower of every tier and target type by DPS per
+        Gold and names the stats that set them apart.
+
+        The pairs come from one groupby on (Tower Number, Target Type) with idxmin/idxmax,
+        and the stats of all pairs are compared column by column.
+
+        Parameters:
+        - computed_towers (pd.DataFrame): Computed towers table.
+        - iqr_outliers (bool): Also collect the IQR outliers of each tier and target type.
+
+        Returns:
+        - tuple: (analysis text, {'low': DataFrame, 'high': DataFrame} of IQR outliers)
+        """
+        outliers = {'low': pd.DataFrame(), 'high': pd.DataFrame()}
+
+        # DPS for every imported tower comes from the computed towers table
+        df_dps = computed_towers.loc[
+            computed_towers['Valid'] & computed_towers['DPS per Gold'].notna(),
+            ['Race', 'Name', 'DPS per Gold', 'Total DPS', 'Gold Cost', 'Damage', 'Cooldown',
+             'Range', 'Utility Boost', 'Slow %', 'Tower Number', 'Target Type']
+        ].rename(columns={'Damage': 'Base Damage'})
+        if df_dps.empty:
+            return "", outliers
+
+        # Weakest and strongest tower of every (Tower Number, Target Type) group, one row per group.
+        # Tiers are listed in order, their target types in the order they appear in the data
+        grouped = df_dps.groupby(['Tower Number', 'Target Type'], sort=False)['DPS per Gold']
+        weakest_rows, strongest_rows = grouped.idxmin(), grouped.idxmax()
+        order = np.argsort(weakest_rows.index.get_level_values('Tower Number'), kind='stable')
+        weakest = df_dps.loc[weakest_rows.to_numpy()[order]].reset_index(drop=True)
+        strongest = df_dps.loc[strongest_rows.to_numpy()[order]].reset_index(drop=True)
+
+        # Analyze contributing factors: the stats in which the strongest tower is ahead
+        contributing = pd.DataFrame({
+            'Base Damage': strongest['Base Damage'] > weakest['Base Damage'],
+            'Cooldown': strongest['Cooldown'] < weakest['Cooldown'],
+            'Range': strongest['Range'] > weakest['Range'],
+            'Utility Boost': strongest['Utility Boost'] > weakest['Utility Boost'],
+            'Slow %': strongest['Slow %'] > weakest['Slow %'],
+        })
+        factor_names = contributing.columns.to_numpy()
+        factors = [", ".join(factor_names[row]) or "Unknown" for row in contributing.to_numpy()]
+
+        separator = '─' * 50
+        analysis = "".join(
+            f"{separator}\n"
+            f"**Tower {weak['Tower Number']}** - **Target Type: {weak['Target Type']}**\n"
+            f"Weakest: {weak['Race']} - {weak['Name']} (DPS/Gold: {format_number(weak['DPS per Gold'])})\n"
+            f"Strongest: {strong['Race']} - {strong['Name']} (DPS/Gold: {format_number(strong['DPS per Gold'])})\n"
+            f"Main Contributing Factor(s): {factor}\n"
+            f"Recommendation: Consider adjusting {factor} for balancing.\n\n"
+            for weak, strong, factor in zip(weakest.to_dict('records'), strongest.to_dict('records'), factors)
+        )
+
+        # Identify Outliers
+        if iqr_outliers:
+            masks = self.outlier_masks(computed_towers).loc[df_dps.index]
+            outliers['low'] = df_dps[masks['iqr_low']].reset_index(drop=True)
+            outliers['high'] = df_dps[masks['iqr_high']].reset_index(drop=True)
+
+        return analysis, outliers
+
+    def evaluate(self, df, dynamic_comparison=True, ignore_outliers=True, races=None):
+        """
+        Runs the whole pipeline for a tower DataFrame.
+
+        Parameters:
+        - df (pd.DataFrame): Tower data, one row per tower, with a 'Race' column.
+        - dynamic_comparison (bool): Rate 'All' towers against the dynamic ranges instead of the presets.
+        - ignore_outliers (bool): Exclude IQR outliers from the dynamic ranges (with dynamic_comparison only).
+        - races (list, optional): Races to rate. Defaults to every race in df.
+
+        Returns:
+        - dict: 'computed_towers', 'group_stats', 'balance_ranges', 'global_dps_per_gold_ranges',
+          'global_raw_dps_ranges', 'race_results' (race -> race_results rows),
+          'outliers_low', 'outliers_high' and 'race_difficulty'.
+        """
+        group_stats = IncrementalGroupStats()
+        computed = self.build_computed_towers(df, group_stats)
+        ranges = self.balance_ranges(group_stats, dynamic_comparison and ignore_outliers)
+        if races is None:
+            races = sorted(computed['Race'].dropna().unique().tolist())
+        outliers_low, outliers_high = self.find_outliers(computed)
+
+        return {
+            'computed_towers': computed,
+            'group_stats': group_stats,
+            'balance_ranges': ranges[0],
+            'global_dps_per_gold_ranges': ranges[1],
+            'global_raw_dps_ranges': ranges[2],
+            'race_results': {race: self.race_results(computed, race, ranges, dynamic_comparison) for race in races},
+            'outliers_low': outliers_low,
+            'outliers_high': outliers_high,
+            'race_difficulty': self.race_difficulty(computed),
+        }
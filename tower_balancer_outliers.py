@@ -0,0 +1,110 @@
+"""
+Outlier detection shared by the Tower Balancer's results, analysis window and comparison
+analysis.
+
+The DPS per Gold quantiles Q05, Q25, Q75 and Q95 of every (Tower Number, Target Type) group
+come from one grouped quantile pass and are broadcast to the towers with one join. The
+percentile outliers (below Q05 or above Q95) and the IQR outliers (more than 1.5 x IQR
+below Q25 or above Q75) are masks derived from them.
+
+Example:
+    masks = outlier_masks(computed_towers[computed_towers['Valid']])
+    computed_towers.loc[masks.index[masks['high']]]
+"""
+import math
+from collections import OrderedDict
+
+import pandas as pd
+
+# Towers are compared with the other towers of their tier and target type
+OUTLIER_GROUP_KEYS = ['Tower Number', 'Target Type']
+
+# Quantile columns of group_quantiles: name -> probability
+OUTLIER_QUANTILES = OrderedDict([
+    ('Q05', 0.05),
+    ('Q25', 0.25),
+    ('Q75', 0.75),
+    ('Q95', 0.95),
+])
+
+IQR_FENCE = 1.5  # IQR outliers lie more than IQR_FENCE x IQR below Q25 or above Q75
+
+
+def iqr_fences(q25, q75):
+    """
+    Returns the (low, high) IQR fences for the quartiles q25 and q75 (numbers or arrays).
+    """
+    iqr = q75 - q25
+    return q25 - IQR_FENCE * iqr, q75 + IQR_FENCE * iqr
+
+
+def sorted_quantile(values, probability):
+    """
+    Returns the quantile of already sorted values with linear interpolation, the default
+    method of numpy and pandas, in constant time.
+
+    Parameters:
+    - values (sequence): Sorted numbers; must not be empty.
+    - probability (float): Quantile between 0 and 1.
+
+    Returns:
+    - float: The quantile.
+    """
+    position = (len(values) - 1) * probability
+    below = int(math.floor(position))
+    fraction = position - below
+    if fraction == 0:
+        return float(values[below])
+    low, high = float(values[below]), float(values[below + 1])
+    # Interpolate from the nearer end, as numpy does, so the results match np.quantile exactly
+    if fraction >= 0.5:
+        return high - (high - low) * (1 - fraction)
+    return low + (high - low) * fraction
+
+
+def group_quantiles(df, value='DPS per Gold', keys=OUTLIER_GROUP_KEYS):
+    """
+    Computes the OUTLIER_QUANTILES of value for every group of df in one grouped pass.
+
+    Parameters:
+    - df (pd.DataFrame): Towers, with the keys columns and the value column.
+    - value (str): Column the quantiles are taken of. Missing values are skipped.
+    - keys (list): Grouping columns.
+
+    Returns:
+    - pd.DataFrame: One row per group (indexed by keys) with the columns of OUTLIER_QUANTILES.
+    """
+    probabilities = list(OUTLIER_QUANTILES.values())
+    # Without any group unstack() has no columns, so they are added explicitly
+    quantiles = df.groupby(keys)[value].quantile(probabilities).unstack().reindex(columns=probabilities)
+    quantiles.columns = list(OUTLIER_QUANTILES)
+    return quantiles
+
+
+def outlier_masks(df, value='DPS per Gold', keys=OUTLIER_GROUP_KEYS, quantiles=None):
+    """
+    Flags the outliers of every tower of df within its group.
+
+    Parameters:
+    - df (pd.DataFrame): Towers, with the keys columns and the value column.
+    - value (str): Column the towers are compared by.
+    - keys (list): Grouping columns.
+    - quantiles (pd.DataFrame, optional): Result of group_quantiles for df, if already computed.
+
+    Returns:
+    - pd.DataFrame: Boolean columns aligned with df: 'low' (below Q05), 'high' (above Q95),
+      'iqr_low' and 'iqr_high' (beyond the IQR fences). Towers whose value or group is
+      missing are in no mask.
+    """
+    if quantiles is None:
+        quantiles = group_quantiles(df, value, keys)
+    # Broadcast the group quantiles to the towers with one join
+    bounds = df[keys].join(quantiles, on=keys)
+    values = df[value]
+    low_fence, high_fence = iqr_fences(bounds['Q25'], bounds['Q75'])
+    return pd.DataFrame({
+        'low': values < bounds['Q05'],
+        'high': values > bounds['Q95'],
+        'iqr_low': values < low_fence,
+        'iqr_high': values > high_fence,
+    }, index=df.index)